@@ -0,0 +1,36 @@
+"""Add next_run_at column to areas table
+
+Revision ID: 202511010900
+Revises: 202510301200
+Create Date: 2025-11-01 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = "202511010900"
+down_revision = "202510301200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Persisted fire time for interval triggers, shared by every scheduler replica
+    op.add_column("areas", sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Partial index covering only enabled time triggers claimed by the scheduler
+    op.create_index(
+        "ix_areas_interval_next_run_at",
+        "areas",
+        ["next_run_at"],
+        postgresql_where=sa.text(
+            "enabled AND trigger_service = 'time' AND trigger_action = 'every_interval'"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_areas_interval_next_run_at", table_name="areas")
+    op.drop_column("areas", "next_run_at")
@@ -0,0 +1,48 @@
+"""Create sync_cursors table
+
+Revision ID: 202511020900
+Revises: 202511010900
+Create Date: 2025-11-02 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = "202511020900"
+down_revision = "202511010900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Incremental sync positions (Gmail history ID, Graph delta link, ...) per connection
+    op.create_table(
+        "sync_cursors",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "connection_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("service_connections.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("cursor_key", sa.String(length=255), nullable=False),
+        sa.Column("value", sa.String(length=4096), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "connection_id",
+            "cursor_key",
+            name="uq_sync_cursors_connection_id_cursor_key",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sync_cursors")
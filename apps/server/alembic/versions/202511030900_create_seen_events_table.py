@@ -0,0 +1,46 @@
+"""Create seen_events table
+
+Revision ID: 202511030900
+Revises: 202511020900
+Create Date: 2025-11-03 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = "202511030900"
+down_revision = "202511020900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Provider event IDs already handled by trigger sources, pruned by age
+    op.create_table(
+        "seen_events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("service", sa.String(length=64), nullable=False),
+        sa.Column("scope", sa.String(length=255), nullable=False),
+        sa.Column("event_id", sa.String(length=512), nullable=False),
+        sa.Column(
+            "seen_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "service",
+            "scope",
+            "event_id",
+            name="uq_seen_events_service_scope_event_id",
+        ),
+    )
+    op.create_index("ix_seen_events_seen_at", "seen_events", ["seen_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_seen_events_seen_at", table_name="seen_events")
+    op.drop_table("seen_events")
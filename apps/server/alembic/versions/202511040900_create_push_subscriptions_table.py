@@ -0,0 +1,65 @@
+"""Create push_subscriptions table
+
+Revision ID: 202511040900
+Revises: 202511030900
+Create Date: 2025-11-04 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = "202511040900"
+down_revision = "202511030900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Provider push channels (webhooks, watches, change subscriptions) per trigger scope
+    op.create_table(
+        "push_subscriptions",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("service", sa.String(length=64), nullable=False),
+        sa.Column("scope", sa.String(length=255), nullable=False),
+        sa.Column(
+            "connection_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("service_connections.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("channel_id", sa.String(length=255), nullable=False),
+        sa.Column("resource_id", sa.String(length=512), nullable=True),
+        sa.Column("encrypted_secret", sa.String(length=512), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.UniqueConstraint(
+            "service",
+            "channel_id",
+            name="uq_push_subscriptions_service_channel_id",
+        ),
+        sa.UniqueConstraint(
+            "service",
+            "scope",
+            name="uq_push_subscriptions_service_scope",
+        ),
+    )
+    op.create_index("ix_push_subscriptions_expires_at", "push_subscriptions", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_push_subscriptions_expires_at", table_name="push_subscriptions")
+    op.drop_table("push_subscriptions")
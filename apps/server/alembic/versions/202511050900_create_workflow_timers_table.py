@@ -0,0 +1,53 @@
+"""Create workflow_timers table
+
+Revision ID: 202511050900
+Revises: 202511040900
+Create Date: 2025-11-05 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = "202511050900"
+down_revision = "202511040900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Area runs paused on a delay step, resumed by the timer service when due
+    op.create_table(
+        "workflow_timers",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "area_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("areas.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("delay_step_id", sa.String(length=64), nullable=False),
+        sa.Column("next_step_ids", postgresql.JSONB(), nullable=False),
+        sa.Column("variables", postgresql.JSONB(), nullable=False),
+        sa.Column("trigger_data", postgresql.JSONB(), nullable=False),
+        sa.Column("executed_step_ids", postgresql.JSONB(), nullable=False),
+        sa.Column("due_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_workflow_timers_area_id", "workflow_timers", ["area_id"])
+    op.create_index("ix_workflow_timers_due_at", "workflow_timers", ["due_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_workflow_timers_due_at", table_name="workflow_timers")
+    op.drop_index("ix_workflow_timers_area_id", table_name="workflow_timers")
+    op.drop_table("workflow_timers")
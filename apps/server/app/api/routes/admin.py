@@ -27,6 +27,7 @@ from app.schemas.user_admin import PaginatedUserList, UpdateAdminStatusRequest,
 from pydantic import BaseModel, Field
 from app.schemas.user_detail_admin import UserDetailAdminResponse
 from app.services.admin_audit import create_admin_audit_log
+from app.services.execution_pool import get_execution_pool_stats
 
 
 router = APIRouter(
@@ -136,6 +137,14 @@ def get_admin_status(
     }
 
 
+@router.get("/execution-pool")
+def get_execution_pool_status(
+    current_user: User = Depends(require_admin_user),
+):
+    """Get queue depth and worker saturation of the area execution pool (admin only)."""
+    return get_execution_pool_stats()
+
+
 @router.get("/users/{user_id}", response_model=UserDetailAdminResponse)
 def get_user_detail(
     user_id: UUID,
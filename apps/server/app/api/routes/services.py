@@ -83,8 +83,7 @@ def list_service_actions_reactions() -> ServiceCatalogResponse:
         # Filter reactions to only those with registered handlers
         filtered_reactions = []
         for reaction in service.reactions:
-            handler = registry.get_reaction_handler(service.slug, reaction.key)
-            if handler is not None:
+            if registry.has_reaction_handler(service.slug, reaction.key):
                 filtered_reactions.append(reaction)
 
         # Include service if it has at least one trigger (action) OR at least one reaction
@@ -0,0 +1,171 @@
+"""Inbound push notification routes.
+
+Providers call these endpoints when something changed for a push subscription
+(see :mod:`app.services.push_manager`). Every notification is authenticated
+with the secret of its subscription, then the polling engine polls the
+subscription's scope right away; no event is executed from the notification
+body itself. The routes read the request body asynchronously, so their
+subscription lookups run in the threadpool to keep the event loop free.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_db
+from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import notify_polling_engine
+from app.models.push_subscription import PushSubscription
+from app.services.push_subscriptions import get_push_subscription, is_live, subscription_secret
+
+logger = logging.getLogger("area")
+
+router = APIRouter(tags=["webhooks"])
+
+
+def _matches(expected: str | None, provided: str | None) -> bool:
+    """Compare a shared secret in constant time."""
+    if not expected or provided is None:
+        return False
+    return hmac.compare_digest(expected.encode(), provided.encode())
+
+
+def verify_github_signature(secret: str | None, body: bytes, signature: str | None) -> bool:
+    """Check the ``X-Hub-Signature-256`` header of a GitHub delivery.
+
+    Args:
+        secret: Secret the webhook was created with
+        body: Raw request body
+        signature: Header value (``sha256=<hex digest>``)
+
+    Returns:
+        True if the body was signed with the secret
+    """
+    if not secret or not signature:
+        return False
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return _matches(f"sha256={digest}", signature)
+
+
+def _notify(subscription: PushSubscription) -> None:
+    if not notify_polling_engine(subscription.service, subscription.scope):
+        logger.debug(
+            "Push notification not routed, polling engine not running",
+            extra={"service": subscription.service, "scope": subscription.scope},
+        )
+
+
+@router.post("/github", status_code=status.HTTP_202_ACCEPTED)
+async def github_webhook(request: Request, db: Session = Depends(get_db)) -> Response:
+    """Receive a GitHub repository webhook delivery."""
+    hook_id = request.headers.get("X-GitHub-Hook-ID")
+    subscription = await run_in_threadpool(get_push_subscription, db, "github", hook_id) if hook_id else None
+    if subscription is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown webhook")
+
+    body = await request.body()
+    signature = request.headers.get("X-Hub-Signature-256")
+    if not verify_github_signature(subscription_secret(subscription), body, signature):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
+
+    if request.headers.get("X-GitHub-Event") != "ping":
+        _notify(subscription)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.post("/microsoft-graph", status_code=status.HTTP_202_ACCEPTED)
+async def microsoft_graph_webhook(
+    request: Request,
+    validationToken: str | None = None,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Receive Microsoft Graph change notifications.
+
+    Graph validates the URL of a new subscription by posting a
+    ``validationToken`` that must be echoed back as plain text.
+    """
+    if validationToken is not None:
+        return PlainTextResponse(validationToken)
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid notification")
+
+    notified: set[str] = set()
+    for notification in payload.get("value", []) if isinstance(payload, dict) else []:
+        subscription = await run_in_threadpool(
+            get_push_subscription, db, "outlook", str(notification.get("subscriptionId", ""))
+        )
+        if subscription is None or not _matches(
+            subscription_secret(subscription), notification.get("clientState")
+        ):
+            logger.warning(
+                "Discarding Microsoft Graph notification with unknown subscription or client state",
+                extra={"subscription_id": notification.get("subscriptionId")},
+            )
+            continue
+        if subscription.scope not in notified:
+            notified.add(subscription.scope)
+            _notify(subscription)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.post("/gmail", status_code=status.HTTP_204_NO_CONTENT)
+async def gmail_webhook(
+    request: Request,
+    token: str | None = None,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Receive a Cloud Pub/Sub push message published by a Gmail watch.
+
+    The Pub/Sub push subscription must target this URL with
+    ``?token=<GMAIL_PUSH_TOKEN>``.
+    """
+    if not _matches(settings.gmail_push_token, token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    try:
+        payload = await request.json()
+        data = json.loads(base64.b64decode(payload["message"]["data"]))
+        email_address = str(data["emailAddress"]).lower()
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Pub/Sub message")
+
+    # Unknown mailboxes are acknowledged too, so Pub/Sub stops redelivering them
+    subscription = await run_in_threadpool(get_push_subscription, db, "gmail", email_address)
+    if subscription is not None and is_live(subscription):
+        _notify(subscription)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/google-drive", status_code=status.HTTP_204_NO_CONTENT)
+async def google_drive_webhook(request: Request, db: Session = Depends(get_db)) -> Response:
+    """Receive a Google Drive ``changes.watch`` channel notification."""
+    channel_id = request.headers.get("X-Goog-Channel-ID")
+    subscription = (
+        await run_in_threadpool(get_push_subscription, db, "google_drive", channel_id) if channel_id else None
+    )
+    if subscription is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown channel")
+
+    if not _matches(subscription_secret(subscription), request.headers.get("X-Goog-Channel-Token")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid channel token")
+
+    # The "sync" message only confirms that the channel was created
+    if request.headers.get("X-Goog-Resource-State") != "sync":
+        _notify(subscription)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+__all__ = ["router", "verify_github_signature"]
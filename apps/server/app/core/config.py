@@ -127,12 +127,163 @@ class Settings(BaseSettings):
         description="Encrypted Discord Bot Token (takes precedence over DISCORD_BOT_TOKEN if set)",
     )
 
+    # Interval (time) Scheduler Configuration
+    scheduler_resync_interval_seconds: int = Field(
+        default=60,
+        alias="SCHEDULER_RESYNC_INTERVAL_SECONDS",
+        description="How often the interval scheduler reconciles its in-memory schedule with the database (default: 60).",
+    )
+    scheduler_claim_batch_size: int = Field(
+        default=100,
+        alias="SCHEDULER_CLAIM_BATCH_SIZE",
+        description="Maximum number of due interval areas a scheduler replica claims per transaction (default: 100).",
+    )
+
+    # Area Execution Pool Configuration
+    execution_pool_workers: int = Field(
+        default=8,
+        alias="EXECUTION_POOL_WORKERS",
+        description="Number of areas executed concurrently by the shared execution pool (default: 8).",
+    )
+    execution_pool_queue_size: int = Field(
+        default=1000,
+        alias="EXECUTION_POOL_QUEUE_SIZE",
+        description="Maximum number of triggered areas waiting for a worker before schedulers block (default: 1000).",
+    )
+    execution_thread_pool_size: int = Field(
+        default=16,
+        alias="EXECUTION_THREAD_POOL_SIZE",
+        description="Threads shared by synchronous step handlers and execution bookkeeping (default: 16).",
+    )
+    execution_plan_cache_size: int = Field(
+        default=1024,
+        alias="EXECUTION_PLAN_CACHE_SIZE",
+        description="Maximum number of compiled area step graphs kept in memory (default: 1024).",
+    )
+    execution_branch_concurrency: int = Field(
+        default=4,
+        alias="EXECUTION_BRANCH_CONCURRENCY",
+        description="Maximum number of independent branches of one area run executed at once (default: 4).",
+    )
+
+    # Delay Step Timers Configuration
+    workflow_timer_poll_seconds: int = Field(
+        default=30,
+        alias="WORKFLOW_TIMER_POLL_SECONDS",
+        description="Maximum seconds between two scans of the delay step timer table (default: 30).",
+    )
+    workflow_timer_batch_size: int = Field(
+        default=100,
+        alias="WORKFLOW_TIMER_BATCH_SIZE",
+        description="Maximum number of due timers claimed per scan (default: 100).",
+    )
+    workflow_timer_lease_seconds: int = Field(
+        default=900,
+        alias="WORKFLOW_TIMER_LEASE_SECONDS",
+        description="Seconds a claimed timer stays hidden from other workers before it is resumed again (default: 900).",
+    )
+    workflow_timer_max_attempts: int = Field(
+        default=5,
+        alias="WORKFLOW_TIMER_MAX_ATTEMPTS",
+        description="Number of claims after which a timer that never completed is dropped (default: 5).",
+    )
+
+    # Polling Engine Configuration
+    polling_per_provider_concurrency: int = Field(
+        default=8,
+        alias="POLLING_PER_PROVIDER_CONCURRENCY",
+        description="Maximum number of concurrent polls against a single provider (default: 8).",
+    )
+    polling_per_user_concurrency: int = Field(
+        default=2,
+        alias="POLLING_PER_USER_CONCURRENCY",
+        description="Maximum number of concurrent polls for a single user across providers (default: 2).",
+    )
+    polling_jitter_ratio: float = Field(
+        default=0.1,
+        alias="POLLING_JITTER_RATIO",
+        description="Random spread applied to every poll interval to avoid thundering herds (default: 0.1).",
+    )
+    polling_max_backoff_seconds: int = Field(
+        default=900,
+        alias="POLLING_MAX_BACKOFF_SECONDS",
+        description="Upper bound of the exponential backoff applied to failing polls (default: 900).",
+    )
+
+    # Seen Trigger Events Configuration
+    seen_events_ttl_seconds: int = Field(
+        default=604800,
+        alias="SEEN_EVENTS_TTL_SECONDS",
+        description="Seen trigger event IDs not observed for this many seconds are pruned (default: 604800).",
+    )
+    seen_events_cache_size: int = Field(
+        default=50000,
+        alias="SEEN_EVENTS_CACHE_SIZE",
+        description="Maximum number of seen event IDs kept in memory per trigger source (default: 50000).",
+    )
+    seen_events_prune_interval_seconds: int = Field(
+        default=3600,
+        alias="SEEN_EVENTS_PRUNE_INTERVAL_SECONDS",
+        description="Seconds between two prunes of expired seen event IDs (default: 3600).",
+    )
+
+    # Credential Manager Configuration
+    credential_cache_ttl_seconds: int = Field(
+        default=300,
+        alias="CREDENTIAL_CACHE_TTL_SECONDS",
+        description="Maximum time decrypted service connection tokens are kept in memory (default: 300).",
+    )
+    credential_refresh_margin_seconds: int = Field(
+        default=300,
+        alias="CREDENTIAL_REFRESH_MARGIN_SECONDS",
+        description="Access tokens expiring within this many seconds are treated as expired and refreshed (default: 300).",
+    )
+
+    # Background Token Refresh Configuration
+    token_refresh_enabled: bool = Field(
+        default=True,
+        alias="TOKEN_REFRESH_ENABLED",
+        description="Refresh OAuth tokens in the background before they expire (default: True).",
+    )
+    token_refresh_interval_seconds: int = Field(
+        default=60,
+        alias="TOKEN_REFRESH_INTERVAL_SECONDS",
+        description="Seconds between two scans for expiring service connection tokens (default: 60).",
+    )
+    token_refresh_window_seconds: int = Field(
+        default=1200,
+        alias="TOKEN_REFRESH_WINDOW_SECONDS",
+        description="Tokens expiring within this many seconds are refreshed in the background (default: 1200).",
+    )
+    token_refresh_batch_size: int = Field(
+        default=10,
+        alias="TOKEN_REFRESH_BATCH_SIZE",
+        description="Maximum number of tokens refreshed concurrently by the background refresher (default: 10).",
+    )
+    token_refresh_batch_interval_seconds: float = Field(
+        default=1.0,
+        alias="TOKEN_REFRESH_BATCH_INTERVAL_SECONDS",
+        description="Pause between two background refresh batches to rate-limit provider calls (default: 1.0).",
+    )
+
+    # Google API Client Configuration
+    google_client_cache_size: int = Field(
+        default=256,
+        alias="GOOGLE_CLIENT_CACHE_SIZE",
+        description="Maximum number of Google API clients cached per worker thread (default: 256).",
+    )
+
     # Gmail Scheduler Configuration
     gmail_poll_interval_seconds: int = Field(
         default=15,
         alias="GMAIL_POLL_INTERVAL_SECONDS",
         description="Gmail polling interval in seconds (default: 15). Lower values increase API usage.",
     )
+    gmail_history_sync: bool = Field(
+        default=True,
+        alias="GMAIL_HISTORY_SYNC",
+        description="Poll Gmail incrementally via users.history.list instead of re-listing messages every tick (default: True).",
+    )
 
     # Google Calendar Scheduler Configuration
     calendar_poll_interval_seconds: int = Field(
@@ -140,6 +291,16 @@ class Settings(BaseSettings):
         alias="CALENDAR_POLL_INTERVAL_SECONDS",
         description="Google Calendar polling interval in seconds (default: 15). Lower values increase API usage.",
     )
+    calendar_sync_tokens: bool = Field(
+        default=True,
+        alias="CALENDAR_SYNC_TOKENS",
+        description="Poll Google Calendar through incremental sync tokens instead of re-listing time windows every tick (default: True).",
+    )
+    calendar_index_horizon_hours: int = Field(
+        default=24,
+        alias="CALENDAR_INDEX_HORIZON_HOURS",
+        description="How far ahead the local Google Calendar event index reaches before it is re-listed (default: 24).",
+    )
 
     # Google Drive Scheduler Configuration
     google_drive_poll_interval_seconds: int = Field(
@@ -148,6 +309,114 @@ class Settings(BaseSettings):
         description="Google Drive polling interval in seconds (default: 15). Lower values increase API usage.",
     )
 
+    # GitHub Scheduler Configuration
+    github_poll_interval_seconds: int = Field(
+        default=30,
+        alias="GITHUB_POLL_INTERVAL_SECONDS",
+        description="GitHub polling interval in seconds (default: 30).",
+    )
+    github_client_cache_size: int = Field(
+        default=256,
+        alias="GITHUB_CLIENT_CACHE_SIZE",
+        description="Maximum number of GitHub tokens keeping a long-lived HTTP client (default: 256).",
+    )
+    github_etag_cache_size: int = Field(
+        default=2048,
+        alias="GITHUB_ETAG_CACHE_SIZE",
+        description="Maximum number of GitHub responses kept for conditional requests (default: 2048).",
+    )
+    github_rate_limit_reserve: int = Field(
+        default=50,
+        alias="GITHUB_RATE_LIMIT_RESERVE",
+        description="Remaining GitHub requests below which a token's polls pause until its rate limit resets (default: 50).",
+    )
+    github_repo_access_ttl_seconds: int = Field(
+        default=3600,
+        alias="GITHUB_REPO_ACCESS_TTL_SECONDS",
+        description="How long a user's confirmed read access to a watched GitHub repository is trusted (default: 3600).",
+    )
+
+    # Push Subscription Configuration
+    webhook_base_url: str = Field(
+        default="",
+        alias="WEBHOOK_BASE_URL",
+        description="Public base URL of this server that providers deliver push notifications to, e.g. https://area.example.com (default: empty, push disabled).",
+    )
+    push_reconcile_interval_seconds: int = Field(
+        default=900,
+        alias="PUSH_RECONCILE_INTERVAL_SECONDS",
+        description="Polling interval of trigger groups covered by a live push subscription (default: 900).",
+    )
+    push_subscription_ttl_seconds: int = Field(
+        default=2 * 24 * 3600,
+        alias="PUSH_SUBSCRIPTION_TTL_SECONDS",
+        description="Requested lifetime of expiring push subscriptions, capped by each provider (default: 172800).",
+    )
+    push_renew_window_seconds: int = Field(
+        default=6 * 3600,
+        alias="PUSH_RENEW_WINDOW_SECONDS",
+        description="Push subscriptions expiring within this many seconds are renewed (default: 21600).",
+    )
+    push_manager_interval_seconds: int = Field(
+        default=300,
+        alias="PUSH_MANAGER_INTERVAL_SECONDS",
+        description="Seconds between two push subscription lifecycle scans (default: 300).",
+    )
+    push_retry_seconds: int = Field(
+        default=3600,
+        alias="PUSH_RETRY_SECONDS",
+        description="Seconds before subscribing a scope is retried after the provider refused it (default: 3600).",
+    )
+    gmail_pubsub_topic: str = Field(
+        default="",
+        alias="GMAIL_PUBSUB_TOPIC",
+        description="Cloud Pub/Sub topic Gmail watches publish to, e.g. projects/<project>/topics/<topic> (default: empty, Gmail push disabled).",
+    )
+    gmail_push_token: str = Field(
+        default="",
+        alias="GMAIL_PUSH_TOKEN",
+        description="Shared token the Pub/Sub push subscription appends to the Gmail webhook URL as ?token= (default: empty).",
+    )
+
+    # Discord Scheduler Configuration
+    discord_poll_interval_seconds: int = Field(
+        default=10,
+        alias="DISCORD_POLL_INTERVAL_SECONDS",
+        description="Discord polling interval in seconds (default: 10). Discord API rate limits apply.",
+    )
+    discord_global_rate_limit: int = Field(
+        default=50,
+        alias="DISCORD_GLOBAL_RATE_LIMIT",
+        description="Maximum Discord API requests per second across all routes for the bot (default: 50).",
+    )
+    discord_max_catchup_pages: int = Field(
+        default=5,
+        alias="DISCORD_MAX_CATCHUP_PAGES",
+        description="Maximum pages of 100 messages read per channel and poll when catching up (default: 5).",
+    )
+
+    # Weather Scheduler Configuration
+    weather_poll_interval_seconds: int = Field(
+        default=300,
+        alias="WEATHER_POLL_INTERVAL_SECONDS",
+        description="Weather polling interval in seconds (default: 300).",
+    )
+    weather_cache_ttl_seconds: int = Field(
+        default=600,
+        alias="WEATHER_CACHE_TTL_SECONDS",
+        description="How long an OpenWeatherMap response is reused for the same location and units (default: 600).",
+    )
+    weather_cache_size: int = Field(
+        default=1024,
+        alias="WEATHER_CACHE_SIZE",
+        description="Maximum number of locations kept in the weather cache (default: 1024).",
+    )
+    weather_cache_grid_degrees: float = Field(
+        default=0.01,
+        alias="WEATHER_CACHE_GRID_DEGREES",
+        description="Grid that coordinates are rounded to before weather lookups, in degrees (default: 0.01, about 1 km).",
+    )
+
     # OpenWeatherMap API Configuration
     openweathermap_api_key: str = Field(
         default="",
@@ -169,6 +438,16 @@ class Settings(BaseSettings):
         alias="OUTLOOK_POLL_INTERVAL_SECONDS",
         description="Outlook polling interval in seconds (default: 15).",
     )
+    outlook_delta_sync: bool = Field(
+        default=True,
+        alias="OUTLOOK_DELTA_SYNC",
+        description="Poll the Outlook inbox through Microsoft Graph delta queries instead of re-listing it every tick (default: True).",
+    )
+    outlook_delta_page_size: int = Field(
+        default=50,
+        alias="OUTLOOK_DELTA_PAGE_SIZE",
+        description="Maximum number of messages per page of an Outlook delta query (default: 50).",
+    )
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -4,20 +4,23 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 
-from app.core.encryption import decrypt_token
 from app.core.config import settings
+from app.integrations.simple_plugins.google_clients import (
+    build_google_credentials,
+    get_google_client,
+    get_google_credentials,
+)
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.integrations.variable_extractor import extract_calendar_variables
 from app.integrations.simple_plugins.exceptions import (
     CalendarAuthError,
@@ -25,20 +28,39 @@ from app.integrations.simple_plugins.exceptions import (
     CalendarConnectionError,
 )
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import (
-    get_service_connection_by_user_and_service,
-    update_service_connection,
-)
-from app.schemas.service_connection import ServiceConnectionUpdate
-from app.services.step_executor import execute_area
+from app.services.credential_manager import credential_manager
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.seen_events import SeenEventStore
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 logger = logging.getLogger("area")
 
-# In-memory storage for last seen event IDs and processed events
-_last_seen_events: Dict[str, set[str]] = {}
-_calendar_scheduler_task: asyncio.Task | None = None
+# Sync cursor holding the latest nextSyncToken of a connection's primary calendar
+CALENDAR_SYNC_CURSOR = "google_calendar:sync:primary"
+
+# Events created this long before the last sync still count as new: the sync
+# token is issued before the cursor is stored, repeats are dropped by the seen set
+_CREATED_SLACK = timedelta(minutes=5)
+
+# Event IDs already seen per AREA
+_seen_events = SeenEventStore("google_calendar")
+
+
+@dataclass
+class _EventIndex:
+    """Upcoming events of a primary calendar, kept current through sync tokens.
+
+    Attributes:
+        valid_until: End of the window the index was listed for
+        events: Events starting before ``valid_until``, by event ID
+    """
+
+    valid_until: datetime
+    events: Dict[str, dict] = field(default_factory=dict)
+
+
+# Event index per Calendar connection ID
+_event_indexes: Dict[str, _EventIndex] = {}
 
 
 def _get_calendar_service(user_id, db: Session):
@@ -52,47 +74,18 @@ def _get_calendar_service(user_id, db: Session):
         Calendar service object or None if connection not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "google_calendar")
-        if not connection:
+        credentials = get_google_credentials(db, user_id, "google_calendar")
+        if credentials is None:
             return None
-
-        access_token = decrypt_token(connection.encrypted_access_token)
-        refresh_token = None
-        if connection.encrypted_refresh_token:
-            refresh_token = decrypt_token(connection.encrypted_refresh_token)
-
-        creds = Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
+        return get_google_client(
+            credentials.connection_id, 'calendar', 'v3', build_google_credentials(credentials)
         )
-
-        # Refresh if needed and persist new access token
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-                update_service_connection(
-                    db,
-                    str(connection.id),
-                    ServiceConnectionUpdate(
-                        service_name=connection.service_name,
-                        access_token=creds.token,
-                        expires_at=creds.expiry,
-                    ),
-                )
-            except RefreshError as refresh_err:
-                logger.warning(
-                    f"Google Calendar token expired or revoked for user {user_id}. "
-                    f"User needs to reconnect their Google Calendar account."
-                )
-                return None
-            except Exception as refresh_err:
-                logger.error(f"Failed to refresh Google Calendar token: {refresh_err}")
-                return None
-
-        return build('calendar', 'v3', credentials=creds)
+    except RefreshError:
+        logger.warning(
+            f"Google Calendar token expired or revoked for user {user_id}. "
+            f"User needs to reconnect their Google Calendar account."
+        )
+        return None
     except Exception as e:
         logger.error(f"Failed to get Google Calendar service: {e}", exc_info=True)
         return None
@@ -129,6 +122,155 @@ def _fetch_events(service, time_min: str, time_max: str, max_results: int = 50)
         return []
 
 
+def _list_event_pages(service, **params) -> tuple[list[dict], str | None]:
+    """List every page of the primary calendar's events.
+
+    Args:
+        service: Calendar API service
+        **params: ``events.list`` parameters (a ``syncToken`` or a time window)
+
+    Returns:
+        Tuple of (events, nextSyncToken of the last page or None)
+
+    Raises:
+        HttpError: On API errors, including 410 when the sync token expired
+    """
+    events: list[dict] = []
+    page_token = None
+    while True:
+        results = service.events().list(
+            calendarId='primary',
+            singleEvents=True,
+            maxResults=250,
+            pageToken=page_token,
+            **params,
+        ).execute()
+        events.extend(results.get('items', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return events, results.get('nextSyncToken')
+
+
+def _list_event_index(service, now: datetime, horizon: timedelta) -> tuple[_EventIndex, str | None]:
+    """List the events starting within a horizon into a fresh index.
+
+    Returns:
+        Tuple of (index, nextSyncToken continuing from the listing)
+    """
+    index = _EventIndex(valid_until=now + horizon)
+    events, sync_token = _list_event_pages(
+        service, timeMin=now.isoformat(), timeMax=index.valid_until.isoformat()
+    )
+    _apply_event_changes(index, events, now)
+    return index, sync_token
+
+
+def _apply_event_changes(index: _EventIndex, changes: list[dict], now: datetime) -> None:
+    """Apply created, updated and cancelled events to an index."""
+    for cal_event in changes:
+        start = _event_start(cal_event)
+        if (
+            cal_event.get('status') == 'cancelled'
+            or start is None
+            or not now <= start < index.valid_until
+        ):
+            index.events.pop(cal_event.get('id'), None)
+        else:
+            index.events[cal_event['id']] = cal_event
+
+
+def _created_since(cal_event: dict, since: datetime) -> bool:
+    """Check whether a live event was created at or after a point in time."""
+    if cal_event.get('status') == 'cancelled' or not cal_event.get('created'):
+        return False
+    try:
+        created = datetime.fromisoformat(cal_event['created'].replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return created >= since
+
+
+def _sync_calendar(
+    service, db: Session, user_id, now: datetime, horizon: timedelta
+) -> tuple[list[dict], list[dict]]:
+    """Sync a user's primary calendar through the connection's stored sync token.
+
+    Only events changed since the last sync are fetched; they update the local
+    event index. The index is re-listed once less than half of ``horizon`` is
+    left before its end, and when Google answers 410 (sync token expired). The
+    first sync of a connection only records a sync token, so enabling an area
+    does not replay the calendar.
+
+    Args:
+        service: Calendar API service
+        db: Database session
+        user_id: User UUID
+        now: Current timestamp
+        horizon: How far ahead a re-listed index reaches
+
+    Returns:
+        Tuple of (events created since the last sync, oldest first; upcoming
+        events of the index ordered by start)
+    """
+    credentials = credential_manager.get(db, user_id, "google_calendar")
+    if credentials is None:
+        return [], []
+
+    index_key = str(credentials.connection_id)
+    index = _event_indexes.get(index_key)
+    cursor = get_sync_cursor(db, credentials.connection_id, CALENDAR_SYNC_CURSOR)
+    changes: list[dict] = []
+    sync_token = None
+    since = None
+    expired = False
+    if cursor is not None:
+        since = cursor.updated_at
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        since -= _CREATED_SLACK
+        try:
+            changes, sync_token = _list_event_pages(service, syncToken=cursor.value)
+        except HttpError as e:
+            if e.resp.status != 410:
+                raise
+            # Sync token expired: re-list and treat events created meanwhile as new
+            logger.warning(
+                f"Google Calendar sync token expired for user {user_id}, running a full resync",
+                extra={"user_id": str(user_id)},
+            )
+            expired = True
+
+    if index is None or expired or now + horizon / 2 > index.valid_until:
+        index, listed_token = _list_event_index(service, now, horizon)
+        _event_indexes[index_key] = index
+        sync_token = listed_token or sync_token
+        if expired:
+            changes = list(index.events.values())
+    else:
+        _apply_event_changes(index, changes, now)
+
+    # Drop the events that started since the previous sync
+    for event_id in [
+        event_id for event_id, cal_event in index.events.items()
+        if _event_starts_before(cal_event, now)
+    ]:
+        del index.events[event_id]
+
+    if sync_token:
+        set_sync_cursor(db, credentials.connection_id, CALENDAR_SYNC_CURSOR, sync_token)
+
+    created = []
+    if since is not None:
+        created = sorted(
+            (cal_event for cal_event in changes if _created_since(cal_event, since)),
+            key=lambda cal_event: cal_event.get('created', ''),
+        )
+    upcoming = sorted(index.events.values(), key=lambda cal_event: _event_start(cal_event))
+    return created, upcoming
+
+
 def _extract_event_data(event: dict) -> dict:
     """Extract relevant data from Calendar event.
 
@@ -186,149 +328,206 @@ def _fetch_due_calendar_areas(db: Session) -> list[Area]:
     )
 
 
-async def calendar_scheduler_task() -> None:
-    """Background task that polls Google Calendar for events based on AREA triggers."""
-    from app.db.session import SessionLocal
+class CalendarTriggerSource(TriggerSource):
+    """Polls Google Calendar for events matching each area's trigger.
 
-    logger.info("Starting Google Calendar polling scheduler task")
+    Areas are grouped per user. With ``CALENDAR_SYNC_TOKENS`` the user's primary
+    calendar is synced incrementally once per poll: ``event_created`` areas get
+    the events created since the last sync and ``event_starting_soon`` areas the
+    indexed events starting within their window. Otherwise the widest window
+    any of the user's areas needs is listed once and each area keeps the events
+    starting within its own window.
+    """
+
+    service = "google_calendar"
+    name = "Calendar"
+
+    @property
+    def seen(self) -> SeenEventStore:
+        return _seen_events
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.calendar_poll_interval_seconds
+
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_calendar_areas(db)
+
+    def group_key(self, area: Area) -> str:
+        # One Calendar connection per user, so all of a user's areas share a fetch
+        return str(area.user_id)
+
+    def primes_when_empty(self, area: Area) -> bool:
+        # Listing errors return no event, so listed areas prime from a real listing
+        return settings.calendar_sync_tokens and area.trigger_action == "event_created"
+
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        user_id = areas[0].user_id
+
+        windows = {str(area.id): _trigger_window(area) for area in areas}
+        if not any(windows.values()):
+            return []
 
-    while True:
         try:
-            # Poll at configurable interval (default: 15 seconds)
-            await asyncio.sleep(settings.calendar_poll_interval_seconds)
-
-            now = datetime.now(timezone.utc)
-
-            # Fetch all enabled Calendar areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_calendar_areas, db)
-
-                logger.info(
-                    f"Calendar scheduler tick: found {len(areas)} calendar area(s)",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                        "area_ids": [str(a.id) for a in areas] if areas else [],
-                    },
+            # Get Calendar service for user
+            service = await asyncio.to_thread(_get_calendar_service, user_id, db)
+            if not service:
+                logger.warning(
+                    f"Calendar service not available for user {user_id}, skipping {len(areas)} area(s)"
                 )
+                return []
+
+            if settings.calendar_sync_tokens:
+                return await self._poll_sync(db, service, areas, windows, now)
+
+            # Fetch the widest window once and filter it locally for every area
+            horizon = max(window[0] for window in windows.values() if window)
+            max_results = max(window[1] for window in windows.values() if window)
+            cal_events = await asyncio.to_thread(
+                _fetch_events,
+                service,
+                now.isoformat(),
+                (now + horizon).isoformat(),
+                max_results,
+            )
+        except RefreshError:
+            # Token expired/revoked - show clean warning
+            logger.warning(
+                f"Calendar areas of user {user_id} skipped: token expired or revoked. "
+                f"User needs to reconnect Google Calendar account."
+            )
+            return []
+
+        events: list[TriggerEvent] = []
+        for area in areas:
+            window = windows[str(area.id)]
+            if not window:
+                continue
+            matched = [
+                cal_event for cal_event in cal_events
+                if _event_starts_before(cal_event, now + window[0])
+            ][:window[1]]
+            events.extend(TriggerEvent(area, cal_event, cal_event['id']) for cal_event in matched)
+        return events
+
+    async def _poll_sync(
+        self,
+        db: Session,
+        service,
+        areas: list[Area],
+        windows: dict[str, tuple[timedelta, int] | None],
+        now: datetime,
+    ) -> list[TriggerEvent]:
+        user_id = areas[0].user_id
+
+        # The sync token, not a first poll, marks where event_created areas start
+        await asyncio.to_thread(_prime_created_areas, db, areas)
+
+        # Keep the index at least twice as wide as the widest starting-soon window
+        horizon = timedelta(hours=settings.calendar_index_horizon_hours)
+        for area in areas:
+            window = windows[str(area.id)]
+            if window and area.trigger_action == "event_starting_soon":
+                horizon = max(horizon, 2 * window[0])
 
-            # Process each area with its own scoped session
-            for area in areas:
-                area_id_str = str(area.id)
-
-                # Initialize last seen events set for this area
-                if area_id_str not in _last_seen_events:
-                    _last_seen_events[area_id_str] = set()
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get Calendar service for user
-                        service = await asyncio.to_thread(_get_calendar_service, area.user_id, db)
-                        if not service:
-                            logger.warning(
-                                f"Calendar service not available for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Build query based on trigger action
-                        events = await _fetch_events_for_trigger(service, area, now)
-
-                        if not events:
-                            continue
-
-                        # On first run for this area, prime the seen set to avoid backlog
-                        if len(_last_seen_events[area_id_str]) == 0:
-                            _last_seen_events[area_id_str].update(e['id'] for e in events)
-                            logger.info(
-                                f"Initialized seen set for area {area_id_str} with {len(events)} event(s)"
-                            )
-                            continue
-
-                        # Filter for new events
-                        new_events = [
-                            evt for evt in events
-                            if evt['id'] not in _last_seen_events[area_id_str]
-                        ]
-
-                        if new_events:
-                            logger.info(
-                                f"Found {len(new_events)} NEW event(s) for area {area_id_str}",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "area_name": area.name,
-                                    "user_id": str(area.user_id),
-                                    "new_events_count": len(new_events),
-                                    "event_ids": [e['id'] for e in new_events],
-                                }
-                            )
-
-                        # Process each new event
-                        for cal_event in new_events:
-                            await _process_calendar_trigger(db, area, cal_event, now)
-                            # Mark as seen
-                            _last_seen_events[area_id_str].add(cal_event['id'])
-
-                except RefreshError as e:
-                    # Token expired/revoked - show clean warning
-                    logger.warning(
-                        f"Calendar area {area_id_str} skipped: token expired or revoked. "
-                        f"User needs to reconnect Google Calendar account."
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Error processing Calendar area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-
-        except asyncio.CancelledError:
-            logger.info("Calendar scheduler task cancelled, shutting down gracefully")
-            break
-
-        except Exception as e:
-            logger.error("Calendar scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
-
-    logger.info("Calendar scheduler task stopped")
-
-
-async def _fetch_events_for_trigger(service, area: Area, now: datetime) -> list[dict]:
-    """Fetch events based on trigger type.
+        try:
+            created, upcoming = await asyncio.to_thread(
+                _sync_calendar, service, db, user_id, now, horizon
+            )
+        except HttpError as e:
+            logger.error(f"Google Calendar API error syncing events: {e}", exc_info=True)
+            return []
+
+        events: list[TriggerEvent] = []
+        for area in areas:
+            window = windows[str(area.id)]
+            if not window:
+                continue
+            if area.trigger_action == "event_created":
+                matched = created[:window[1]]
+            else:
+                matched = [
+                    cal_event for cal_event in upcoming
+                    if _event_starts_before(cal_event, now + window[0])
+                ][:window[1]]
+            events.extend(TriggerEvent(area, cal_event, cal_event['id']) for cal_event in matched)
+        return events
+
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _process_calendar_trigger(db, event.area, event.payload, now)
+
+
+def _prime_created_areas(db: Session, areas: list[Area]) -> None:
+    """Prime the event_created areas fed by the sync token that were never polled."""
+    for area in areas:
+        if area.trigger_action == "event_created" and not _seen_events.is_primed(db, str(area.id)):
+            _seen_events.prime(db, str(area.id), [])
+
+
+def _trigger_window(area: Area) -> tuple[timedelta, int] | None:
+    """Return how far ahead and how many events an area's trigger looks at.
 
     Args:
-        service: Calendar API service
         area: Area with trigger configuration
-        now: Current timestamp
 
     Returns:
-        List of matching events
+        Tuple of (window after now, max results), or None for unknown triggers
     """
     trigger_action = area.trigger_action
     params = area.trigger_params or {}
 
     if trigger_action == "event_created":
-        # Fetch all upcoming events (next 30 days)
-        # We track which ones are new via the seen set
-        time_min = now.isoformat()
-        time_max = (now + timedelta(days=30)).isoformat()
-        return await asyncio.to_thread(_fetch_events, service, time_min, time_max, 100)
-
-    elif trigger_action == "event_starting_soon":
-        # Fetch events starting within the specified minutes
+        # All upcoming events (next 30 days), new ones are detected via the seen set
+        return timedelta(days=30), 100
+
+    if trigger_action == "event_starting_soon":
+        # Events starting within the specified minutes
         minutes_before = int(params.get("minutes_before", 15))
-        time_min = now.isoformat()
-        time_max = (now + timedelta(minutes=minutes_before + 1)).isoformat()
-        return await asyncio.to_thread(_fetch_events, service, time_min, time_max, 20)
+        return timedelta(minutes=minutes_before + 1), 20
 
-    return []
+    return None
+
+
+def _event_start(cal_event: dict) -> datetime | None:
+    """Return when an event starts (all-day events start at midnight UTC).
+
+    Args:
+        cal_event: Calendar event object
+
+    Returns:
+        Timezone-aware start time, or None when the event has no valid start
+    """
+    start = cal_event.get('start', {})
+    try:
+        if start.get('dateTime'):
+            start_time = datetime.fromisoformat(start['dateTime'])
+        elif start.get('date'):
+            start_time = datetime.fromisoformat(start['date']).replace(tzinfo=timezone.utc)
+        else:
+            return None
+    except ValueError:
+        return None
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    return start_time
+
+
+def _event_starts_before(cal_event: dict, time_max: datetime) -> bool:
+    """Check whether an event starts before a point in time.
+
+    Args:
+        cal_event: Calendar event object
+        time_max: Exclusive upper bound of the event start
+
+    Returns:
+        True if the event starts before time_max (all-day events start at midnight UTC)
+    """
+    start_time = _event_start(cal_event)
+    return start_time is not None and start_time < time_max
 
 
 async def _process_calendar_trigger(db: Session, area: Area, cal_event: dict, now: datetime) -> None:
-    """Process a Calendar trigger event and execute the area.
+    """Process a Calendar trigger event and queue the area for execution.
 
     Args:
         db: Database session
@@ -339,170 +538,47 @@ async def _process_calendar_trigger(db: Session, area: Area, cal_event: dict, no
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Extract event data
-        event_data = _extract_event_data(cal_event)
-
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "event_id": event_data.get('id'),
-                    "summary": event_data.get('summary'),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Use extract_calendar_variables to get variables from event
-        variables = extract_calendar_variables(event_data)
-
-        # Build trigger_data with calendar variables
-        trigger_data = {
-            **variables,  # Include all extracted calendar.* variables
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Calendar trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "event_id": event_data.get('id'),
-        }
-        db.commit()
-
-        logger.info(
-            "Calendar trigger executed",
-            extra={
+    # Extract event data
+    event_data = _extract_event_data(cal_event)
+
+    # Use extract_calendar_variables to get variables from event
+    variables = extract_calendar_variables(event_data)
+
+    # Build trigger_data with calendar variables
+    trigger_data = {
+        **variables,  # Include all extracted calendar.* variables
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Calendar",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "event_id": event_data.get('id'),
                 "summary": event_data.get('summary'),
-                "start_time": event_data.get('start_time'),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
             },
+            details={"event_id": event_data.get('id')},
         )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Calendar trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
-
-
-def start_calendar_scheduler() -> None:
-    """Start the Google Calendar polling scheduler task."""
-    global _calendar_scheduler_task
-
-    if _calendar_scheduler_task is not None:
-        logger.warning("Calendar scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start Calendar scheduler")
-        return
-
-    _calendar_scheduler_task = loop.create_task(calendar_scheduler_task())
-    logger.info("Calendar scheduler task started")
-
-
-def stop_calendar_scheduler() -> None:
-    """Stop the Google Calendar polling scheduler task."""
-    global _calendar_scheduler_task
-
-    if _calendar_scheduler_task is not None:
-        _calendar_scheduler_task.cancel()
-        _calendar_scheduler_task = None
-        logger.info("Calendar scheduler task stopped")
-
-
-def is_calendar_scheduler_running() -> bool:
-    """Check if the Calendar scheduler task is running.
-
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _calendar_scheduler_task
-    return _calendar_scheduler_task is not None and not _calendar_scheduler_task.done()
+    )
 
 
 def clear_calendar_seen_state() -> None:
-    """Clear the in-memory seen events state (useful for testing)."""
-    global _last_seen_events
-    _last_seen_events.clear()
-
-
-def cleanup_old_seen_events(max_age_hours: int = 24) -> int:
-    """Clean up old event IDs from memory to prevent unbounded growth.
-
-    This function removes event IDs from areas that haven't been seen in the last
-    max_age_hours. Since we only track event IDs (not timestamps), we use a simple
-    approach: if an area has too many events tracked (> 1000), we clear its seen set
-    to allow fresh polling.
-
-    Args:
-        max_age_hours: Maximum age in hours before cleaning (default: 24)
-                       Note: Currently used as a threshold for max events (max_age_hours * 10)
-
-    Returns:
-        Number of event IDs removed from memory
-    """
-    global _last_seen_events
-    removed_count = 0
-    max_events_per_area = max_age_hours * 10  # Rough heuristic: ~10 events per hour max
-
-    area_ids_to_clean = []
-    for area_id, seen_events in _last_seen_events.items():
-        if len(seen_events) > max_events_per_area:
-            area_ids_to_clean.append(area_id)
-            removed_count += len(seen_events)
-
-    for area_id in area_ids_to_clean:
-        logger.info(
-            f"Cleaning up old seen events for area {area_id}: {len(_last_seen_events[area_id])} events removed"
-        )
-        _last_seen_events[area_id].clear()
-
-    return removed_count
+    """Clear the in-memory seen events state and event indexes (useful for testing)."""
+    _seen_events.clear()
+    _event_indexes.clear()
 
 
 __all__ = [
-    "calendar_scheduler_task",
-    "start_calendar_scheduler",
-    "is_calendar_scheduler_running",
-    "stop_calendar_scheduler",
+    "CALENDAR_SYNC_CURSOR",
+    "CalendarTriggerSource",
     "clear_calendar_seen_state",
-    "cleanup_old_seen_events",
 ]
@@ -12,31 +12,45 @@ if TYPE_CHECKING:
 logger = logging.getLogger("area")
 
 
-async def delay_handler(area: Area, params: dict, event: dict) -> None:
-    """Handle delay steps by pausing execution for specified duration.
-    
+_UNIT_SECONDS = {
+    "seconds": 1,
+    "minutes": 60,
+    "hours": 60 * 60,
+    "days": 60 * 60 * 24,
+}
+
+
+def delay_duration_seconds(params: dict) -> float:
+    """Return the duration of a delay step in seconds.
+
     Args:
-        area: The Area containing the delay step
-        params: Configuration parameters for the delay step, including duration and unit
-        event: Event data with context about the execution
+        params: Delay step configuration with ``duration`` (default 1) and
+            ``unit`` ("seconds", "minutes", "hours" or "days", default seconds)
     """
     # Get duration and unit from config - default to 1 second if not provided
     duration = params.get("duration", 1)
     unit = params.get("unit", "seconds")
-    
-    # Convert to seconds based on unit
-    if unit == "seconds":
-        delay_seconds = duration
-    elif unit == "minutes":
-        delay_seconds = duration * 60
-    elif unit == "hours":
-        delay_seconds = duration * 60 * 60
-    elif unit == "days":
-        delay_seconds = duration * 60 * 60 * 24
-    else:
+
+    if unit not in _UNIT_SECONDS:
         # Default to seconds if unit is not recognized
-        delay_seconds = duration
         logger.warning(f"Unrecognized time unit '{unit}' for delay, defaulting to seconds")
+        unit = "seconds"
+    return float(duration) * _UNIT_SECONDS[unit]
+
+
+async def delay_handler(area: Area, params: dict, event: dict) -> None:
+    """Handle delay steps by pausing execution for specified duration.
+
+    The step executor never calls this handler: a delay step persists the
+    run on a timer instead (see :mod:`app.services.timer_service`), and a
+    delay reaction with no following step completes immediately.
+
+    Args:
+        area: The Area containing the delay step
+        params: Configuration parameters for the delay step, including duration and unit
+        event: Event data with context about the execution
+    """
+    delay_seconds = delay_duration_seconds(params)
     
     # Log the delay operation
     logger.info(
@@ -61,4 +75,4 @@ async def delay_handler(area: Area, params: dict, event: dict) -> None:
     )
 
 
-__all__ = ["delay_handler"]
\ No newline at end of file
+__all__ = ["delay_duration_seconds", "delay_handler"]
\ No newline at end of file
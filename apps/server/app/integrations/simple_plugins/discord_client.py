@@ -0,0 +1,267 @@
+"""Process-wide Discord REST client shared by the Discord scheduler and actions.
+
+Discord rate limits requests per bucket: routes that report the same
+``X-RateLimit-Bucket`` for the same major parameter (channel, guild or webhook
+ID) draw from one allowance, and every request also counts against the bot's
+global limit. The scheduler and the actions used to track limits per route in
+two separate limiters and opened a new connection for each request, so neither
+knew about the other's usage. :data:`discord_rate_limiter` learns which bucket
+a route belongs to from the response headers, reserves a request from that
+bucket before it is sent and waits out bucket and global resets, while
+:func:`discord_request` sends every call through one pooled ``httpx.Client``.
+
+Actions run on their own event loops in executor threads, so the limiter state
+is guarded by a ``threading.Lock`` and waiting happens outside of it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger("area")
+
+DISCORD_API_BASE = "https://discord.com/api/v10"
+
+# Top-level resources whose ID is a major parameter of the rate limit bucket
+_MAJOR_PARAMETER = re.compile(r"^/(?:channels|guilds|webhooks)/\d+")
+_SNOWFLAKE = re.compile(r"\d{17,20}")
+
+# Expired buckets are pruned once the table grows past this size
+_MAX_TRACKED_BUCKETS = 1024
+
+
+def route_key(method: str, path: str) -> str:
+    """Return the rate limit route of a request.
+
+    IDs other than the major parameter are replaced by a placeholder, so that
+    e.g. every message of a channel maps to the same route.
+
+    Args:
+        method: HTTP method
+        path: API path relative to :data:`DISCORD_API_BASE`
+
+    Returns:
+        Route such as ``"GET /channels/123456789012345678/messages/:id"``
+    """
+    major = _MAJOR_PARAMETER.match(path)
+    head = major.group(0) if major else ""
+    return f"{method.upper()} {head}{_SNOWFLAKE.sub(':id', path[len(head):])}"
+
+
+def _major_parameter(route: str) -> str:
+    major = _MAJOR_PARAMETER.match(route.split(" ", 1)[-1])
+    return major.group(0) if major else ""
+
+
+def _retry_after(response: httpx.Response) -> tuple[float, bool]:
+    """Return the delay and scope requested by a 429 response."""
+    retry_after, is_global = None, False
+    try:
+        data = response.json()
+        retry_after = float(data.get("retry_after"))
+        is_global = bool(data.get("global", False))
+    except Exception:
+        pass
+    if retry_after is None:
+        try:
+            retry_after = float(response.headers.get("Retry-After", 1.0))
+        except (TypeError, ValueError):
+            retry_after = 1.0
+    is_global = is_global or response.headers.get("X-RateLimit-Scope") == "global"
+    return max(retry_after, 0.0), is_global
+
+
+@dataclass
+class _Bucket:
+    remaining: int
+    reset_at: float
+
+
+class DiscordRateLimiter:
+    """Per-bucket and global Discord rate limits shared by every caller."""
+
+    def __init__(self, global_limit: int | None = None) -> None:
+        self._global_limit = global_limit
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+        self._window_start = 0.0
+        self._window_count = 0
+
+    @property
+    def global_limit(self) -> int:
+        return max(self._global_limit or settings.discord_global_rate_limit, 1)
+
+    def reserve(self, route: str, now: float | None = None) -> float:
+        """Reserve a request on a route, or return how long to wait first.
+
+        Args:
+            route: Route returned by :func:`route_key`
+            now: Monotonic timestamp (defaults to the current time)
+
+        Returns:
+            0 once a request was reserved, else the seconds to wait before
+            trying again
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now < self._global_reset_at:
+                return self._global_reset_at - now
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            if self._window_count >= self.global_limit:
+                return self._window_start + 1.0 - now
+
+            bucket = self._buckets.get(self._route_buckets.get(route, route))
+            if bucket is not None and now < bucket.reset_at:
+                if bucket.remaining <= 0:
+                    return bucket.reset_at - now
+                bucket.remaining -= 1
+            self._window_count += 1
+            return 0.0
+
+    async def acquire(self, route: str) -> None:
+        """Wait until a request may be sent on a route and reserve it."""
+        while True:
+            delay = self.reserve(route)
+            if delay <= 0:
+                return
+            logger.debug(f"Discord rate limit reached for {route}, waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def update(self, route: str, response: httpx.Response) -> None:
+        """Record the rate limit state reported by a response.
+
+        Args:
+            route: Route the request was sent on
+            response: Discord API response
+        """
+        headers = response.headers
+        if not isinstance(headers, Mapping):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            bucket_id = headers.get("X-RateLimit-Bucket")
+            if bucket_id:
+                key = self._route_buckets[route] = f"{bucket_id}:{_major_parameter(route)}"
+            else:
+                key = self._route_buckets.get(route, route)
+
+            if response.status_code == 429:
+                retry_after, is_global = _retry_after(response)
+                if is_global:
+                    self._global_reset_at = max(self._global_reset_at, now + retry_after)
+                    logger.warning(f"Discord global rate limit hit, reset in {retry_after}s")
+                else:
+                    self._buckets[key] = _Bucket(0, now + retry_after)
+                    logger.warning(f"Discord rate limit hit for {route}, reset in {retry_after}s")
+            elif bucket_id and "X-RateLimit-Remaining" in headers:
+                try:
+                    self._buckets[key] = _Bucket(
+                        int(headers["X-RateLimit-Remaining"]),
+                        now + float(headers.get("X-RateLimit-Reset-After", 1.0)),
+                    )
+                except ValueError:
+                    pass
+
+            if len(self._buckets) > _MAX_TRACKED_BUCKETS:
+                for stale in [k for k, b in self._buckets.items() if b.reset_at <= now]:
+                    del self._buckets[stale]
+
+    def clear(self) -> None:
+        """Forget every bucket and reset (useful for testing)."""
+        with self._lock:
+            self._route_buckets.clear()
+            self._buckets.clear()
+            self._global_reset_at = 0.0
+            self._window_start, self._window_count = 0.0, 0
+
+
+# Shared by the Discord scheduler and the Discord actions
+discord_rate_limiter = DiscordRateLimiter()
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_discord_client() -> httpx.Client:
+    """Return the pooled HTTP client used for Discord API calls."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(timeout=10.0)
+        return _client
+
+
+async def discord_request(
+    method: str,
+    path: str,
+    bot_token: str,
+    *,
+    params: dict | None = None,
+    json: Any = None,
+    max_retries: int = 1,
+) -> httpx.Response:
+    """Send a request to the Discord API through the shared client.
+
+    Waits for the route's bucket and the global limit before sending, and
+    retries a 429 response once its reset has passed.
+
+    Args:
+        method: HTTP method
+        path: API path relative to :data:`DISCORD_API_BASE`
+        bot_token: Discord bot token
+        params: Optional query parameters
+        json: Optional JSON body
+        max_retries: Number of retries of rate limited requests
+
+    Returns:
+        Last response received (callers check its status)
+
+    Raises:
+        httpx.HTTPError: If the request fails at the transport level
+    """
+    route = route_key(method, path)
+    headers = {"Authorization": f"Bot {bot_token}"}
+    if json is not None:
+        headers["Content-Type"] = "application/json"
+
+    for attempt in range(max_retries + 1):
+        await discord_rate_limiter.acquire(route)
+        response = await asyncio.to_thread(
+            get_discord_client().request,
+            method,
+            f"{DISCORD_API_BASE}{path}",
+            headers=headers,
+            params=params,
+            json=json,
+            timeout=10.0,
+        )
+        discord_rate_limiter.update(route, response)
+        if response.status_code != 429 or attempt == max_retries:
+            break
+        logger.warning(f"Discord API rate limited on {route}, retrying (attempt {attempt + 1})")
+    return response
+
+
+__all__ = [
+    "DISCORD_API_BASE",
+    "DiscordRateLimiter",
+    "discord_rate_limiter",
+    "discord_request",
+    "get_discord_client",
+    "route_key",
+]
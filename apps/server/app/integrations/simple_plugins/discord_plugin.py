@@ -2,116 +2,18 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
-import time
 from typing import TYPE_CHECKING, Any
 
 import httpx
 
+from app.integrations.simple_plugins.discord_client import discord_request
+
 if TYPE_CHECKING:
     from app.models.area import Area
 
 logger = logging.getLogger("area")
 
-# Rate limiter for Discord API calls that respects Discord's rate limits
-class DiscordRateLimiter:
-    def __init__(self):
-        """Initialize rate limiter with Discord's rate limit parameters."""
-        self.global_limit_reset_time = 0  # Time when global rate limit resets
-        self.route_limits = {}  # Store rate limits for each endpoint
-        self.lock = asyncio.Lock()  # To prevent race conditions
-    
-    async def wait_if_needed(self, route: str) -> None:
-        """Wait if rate limit would be exceeded for the given route."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Check if global rate limit is active
-            if current_time < self.global_limit_reset_time:
-                sleep_time = self.global_limit_reset_time - current_time
-                logger.warning(f"Discord API global rate limit active, sleeping for {sleep_time:.2f}s")
-                await asyncio.sleep(sleep_time)
-                return
-            
-            # Check if route-specific rate limit is active
-            if route in self.route_limits:
-                route_info = self.route_limits[route]
-                
-                # If we're past the reset time for this route, reset counters
-                if current_time >= route_info['reset_time']:
-                    route_info['remaining'] = route_info['limit']
-                    route_info['reset_time'] = current_time + (route_info.get('reset_after', 1))
-                
-                # If no requests remaining, wait until reset
-                if route_info['remaining'] <= 0:
-                    sleep_time = route_info['reset_time'] - current_time
-                    if sleep_time > 0:
-                        logger.warning(f"Discord API rate limit for route {route}, sleeping for {sleep_time:.2f}s")
-                        await asyncio.sleep(sleep_time)
-    
-    async def update_rate_limit_info(self, route: str, response: httpx.Response) -> None:
-        """Update rate limit info based on response headers."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Check for global rate limit
-            if response.status_code == 429:
-                try:
-                    data = response.json()
-                    retry_after = data.get('retry_after', 1.0)
-                    is_global = data.get('global', False)
-                    
-                    if is_global:
-                        self.global_limit_reset_time = current_time + retry_after
-                        logger.warning(f"Global rate limit hit, reset in {retry_after}s")
-                    else:
-                        # Update route-specific rate limit
-                        self.route_limits[route] = {
-                            'limit': data.get('limit', 1),
-                            'remaining': 0,
-                            'reset_time': current_time + retry_after,
-                            'reset_after': retry_after
-                        }
-                except Exception:
-                    # Fallback if response is not JSON
-                    self.global_limit_reset_time = current_time + 1.0
-            
-            # Check for rate limit headers - properly handle mocked responses
-            else:
-                try:
-                    # Check if the header exists in the response
-                    if hasattr(response.headers, '__contains__') and 'X-RateLimit-Limit' in response.headers:
-                        limit = int(response.headers['X-RateLimit-Limit'])
-                        remaining = int(response.headers['X-RateLimit-Remaining'])
-                        reset_after = float(response.headers.get('X-RateLimit-Reset-After', 1.0))
-                        
-                        # Calculate reset time (Discord sends reset_after as seconds from now)
-                        reset_time = current_time + reset_after
-                        
-                        self.route_limits[route] = {
-                            'limit': limit,
-                            'remaining': remaining,
-                            'reset_time': reset_time,
-                            'reset_after': reset_after
-                        }
-                        
-                        logger.debug(f"Updated rate limit info for {route}: {remaining}/{limit} remaining, resets in {reset_after}s")
-                except (ValueError, KeyError):
-                    # Headers might be missing or malformed
-                    pass
-    
-    async def decrement_remaining(self, route: str) -> None:
-        """Decrement the remaining count for the given route."""
-        async with self.lock:
-            if route in self.route_limits:
-                if self.route_limits[route]['remaining'] > 0:
-                    self.route_limits[route]['remaining'] -= 1
-
-
-# Global rate limiter instance
-_discord_rate_limiter = DiscordRateLimiter()
-
 
 async def validate_discord_id(value: str | None) -> str:
     """Validate a Discord ID to ensure it's a valid snowflake ID format.
@@ -205,54 +107,9 @@ async def send_message_handler(area: Area, params: dict, event: dict) -> None:
             # Clean up None fields
             payload["embeds"][0] = {k: v for k, v in payload["embeds"][0].items() if v is not None}
     
-    route = f"POST:/channels/{channel_id}/messages"
-    await _discord_rate_limiter.wait_if_needed(route)
-    
-    with httpx.Client() as client:
-        response = client.post(
-            f"https://discord.com/api/v10/channels/{channel_id}/messages",
-            headers={
-                "Authorization": f"Bot {bot_token}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=10.0
-        )
-    
-    # Update rate limit info based on response
-    await _discord_rate_limiter.update_rate_limit_info(route, response)
-    
-    # Handle rate limit response (429) with exponential backoff
-    if response.status_code == 429:
-        try:
-            data = response.json()
-            retry_after = data.get('retry_after', 1.0)
-            is_global = data.get('global', False)
-            
-            logger.warning(f"Discord API rate limited (global: {is_global}), waiting {retry_after}s")
-            
-            # Sleep for the required time
-            await asyncio.sleep(retry_after)
-            
-            # Retry the request
-            with httpx.Client() as client:
-                response = client.post(
-                    f"https://discord.com/api/v10/channels/{channel_id}/messages",
-                    headers={
-                        "Authorization": f"Bot {bot_token}",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                    timeout=10.0
-                )
-                
-                # Update rate limit info for the retry
-                await _discord_rate_limiter.update_rate_limit_info(route, response)
-        except Exception as e:
-            logger.error(f"Error handling rate limit response: {e}")
-            error_detail = f"Failed to send Discord message: {str(e)}"
-            logger.error(error_detail)
-            raise
+    response = await discord_request(
+        "POST", f"/channels/{channel_id}/messages", bot_token, json=payload
+    )
     
     try:
         response.raise_for_status()
@@ -310,60 +167,15 @@ async def create_channel_handler(area: Area, params: dict, event: dict) -> None:
     # Resolve variables in channel name
     channel_name = resolve_variables(name_template, event)
     
-    route = f"POST:/guilds/{guild_id}/channels"
-    await _discord_rate_limiter.wait_if_needed(route)
-    
-    with httpx.Client() as client:
-        response = client.post(
-            f"https://discord.com/api/v10/guilds/{guild_id}/channels",
-            headers={
-                "Authorization": f"Bot {bot_token}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "name": channel_name,
-                "type": channel_type,
-            },
-            timeout=10.0
-        )
-    
-    # Update rate limit info based on response
-    await _discord_rate_limiter.update_rate_limit_info(route, response)
-    
-    # Handle rate limit response (429) with exponential backoff
-    if response.status_code == 429:
-        try:
-            data = response.json()
-            retry_after = data.get('retry_after', 1.0)
-            is_global = data.get('global', False)
-            
-            logger.warning(f"Discord API rate limited (global: {is_global}), waiting {retry_after}s")
-            
-            # Sleep for the required time
-            await asyncio.sleep(retry_after)
-            
-            # Retry the request
-            with httpx.Client() as client:
-                response = client.post(
-                    f"https://discord.com/api/v10/guilds/{guild_id}/channels",
-                    headers={
-                        "Authorization": f"Bot {bot_token}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "name": channel_name,
-                        "type": channel_type,
-                    },
-                    timeout=10.0
-                )
-                
-                # Update rate limit info for the retry
-                await _discord_rate_limiter.update_rate_limit_info(route, response)
-        except Exception as e:
-            logger.error(f"Error handling rate limit response: {e}")
-            error_detail = f"Failed to create Discord channel: {str(e)}"
-            logger.error(error_detail)
-            raise
+    response = await discord_request(
+        "POST",
+        f"/guilds/{guild_id}/channels",
+        bot_token,
+        json={
+            "name": channel_name,
+            "type": channel_type,
+        },
+    )
     
     try:
         response.raise_for_status()
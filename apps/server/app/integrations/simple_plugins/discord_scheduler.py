@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
 from collections import OrderedDict
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
@@ -15,174 +14,107 @@ if TYPE_CHECKING:
 import httpx
 
 from app.core.config import settings
+from app.integrations.simple_plugins.discord_client import discord_request
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.step_executor import execute_area
+from app.services.execution_pool import ExecutionJob, submit_execution_job
 
 logger = logging.getLogger("area")
 
 
-# Rate limiter for Discord API calls in scheduler that respects Discord's rate limits
-class DiscordRateLimiter:
-    def __init__(self):
-        """Initialize rate limiter with Discord's rate limit parameters."""
-        self.global_limit_reset_time = 0  # Time when global rate limit resets
-        self.route_limits = {}  # Store rate limits for each endpoint
-        self.lock = asyncio.Lock()  # To prevent race conditions
-    
-    async def wait_if_needed(self, route: str = "general") -> None:
-        """Wait if rate limit would be exceeded for the given route."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Check if global rate limit is active
-            if current_time < self.global_limit_reset_time:
-                sleep_time = self.global_limit_reset_time - current_time
-                logger.warning(f"Discord API global rate limit active in scheduler, sleeping for {sleep_time:.2f}s")
-                await asyncio.sleep(sleep_time)
-                return
-            
-            # Check if route-specific rate limit is active
-            if route in self.route_limits:
-                route_info = self.route_limits[route]
-                
-                # If we're past the reset time for this route, reset counters
-                if current_time >= route_info['reset_time']:
-                    route_info['remaining'] = route_info['limit']
-                    route_info['reset_time'] = current_time + (route_info.get('reset_after', 1))
-                
-                # If no requests remaining, wait until reset
-                if route_info['remaining'] <= 0:
-                    sleep_time = route_info['reset_time'] - current_time
-                    if sleep_time > 0:
-                        logger.warning(f"Discord API rate limit for route {route} in scheduler, sleeping for {sleep_time:.2f}s")
-                        await asyncio.sleep(sleep_time)
-    
-    async def update_rate_limit_info(self, route: str, response: httpx.Response) -> None:
-        """Update rate limit info based on response headers."""
-        async with self.lock:
-            current_time = time.time()
-            
-            # Check for global rate limit
-            if response.status_code == 429:
-                try:
-                    data = response.json()
-                    retry_after = data.get('retry_after', 1.0)
-                    is_global = data.get('global', False)
-                    
-                    if is_global:
-                        self.global_limit_reset_time = current_time + retry_after
-                        logger.warning(f"Global rate limit hit in scheduler, reset in {retry_after}s")
-                    else:
-                        # Update route-specific rate limit
-                        self.route_limits[route] = {
-                            'limit': data.get('limit', 1),
-                            'remaining': 0,
-                            'reset_time': current_time + retry_after,
-                            'reset_after': retry_after
-                        }
-                except Exception:
-                    # Fallback if response is not JSON
-                    self.global_limit_reset_time = current_time + 1.0
-            
-            # Check for rate limit headers - properly handle mocked responses
-            else:
-                try:
-                    # Check if the header exists in the response
-                    if hasattr(response.headers, '__contains__') and 'X-RateLimit-Limit' in response.headers:
-                        limit = int(response.headers['X-RateLimit-Limit'])
-                        remaining = int(response.headers['X-RateLimit-Remaining'])
-                        reset_after = float(response.headers.get('X-RateLimit-Reset-After', 1.0))
-                        
-                        # Calculate reset time (Discord sends reset_after as seconds from now)
-                        reset_time = current_time + reset_after
-                        
-                        self.route_limits[route] = {
-                            'limit': limit,
-                            'remaining': remaining,
-                            'reset_time': reset_time,
-                            'reset_after': reset_after
-                        }
-                        
-                        logger.debug(f"Updated rate limit info for {route} in scheduler: {remaining}/{limit} remaining, resets in {reset_after}s")
-                except (ValueError, KeyError):
-                    # Headers might be missing or malformed
-                    pass
-    
-    async def decrement_remaining(self, route: str) -> None:
-        """Decrement the remaining count for the given route."""
-        async with self.lock:
-            if route in self.route_limits:
-                if self.route_limits[route]['remaining'] > 0:
-                    self.route_limits[route]['remaining'] -= 1
+# TTL cache implementation for tracking seen messages and reactions
+class TTLCache:
+    """Bounded set of ``"<area_id>:..."`` keys that expire after a TTL.
 
+    Keys are kept in an ``OrderedDict`` ordered by last insertion time, so the
+    head always holds the oldest entry: expired entries are dropped lazily from
+    the head and the size bound evicts the head, both in amortized O(1). A
+    per-area index makes removing an area O(entries of that area).
+    """
 
-# LRU Cache implementation for tracking seen messages and reactions
-class LRUCache:
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 7 * 24 * 3600):  # 7 days default
         """
-        Initialize an LRU cache with a maximum size and time-to-live.
-        
+        Initialize a TTL cache with a maximum size and time-to-live.
+
         Args:
             max_size: Maximum number of items to keep in the cache
             ttl_seconds: Time-to-live for cache entries in seconds (default 7 days)
         """
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self.cache = OrderedDict()
-    
+        self.cache: OrderedDict[str, float] = OrderedDict()
+        self._keys_by_area: Dict[str, set[str]] = {}
+
+    @staticmethod
+    def _area_of(key: str) -> str:
+        return key.split(":", 1)[0]
+
     def add(self, key: str) -> None:
-        """Add a key to the cache."""
-        current_time = time.time()
-        
+        """Add a key to the cache, refreshing its timestamp if already present."""
+        current_time = time.monotonic()
+        self._expire_head(current_time)
+
         if key in self.cache:
-            # Move existing key to end (mark as most recently used) and update timestamp
+            # Move existing key to end so the dict stays ordered by timestamp
             self.cache.move_to_end(key)
-            self.cache[key] = current_time
         else:
-            # Add new key with current timestamp
-            self.cache[key] = current_time
-            
-            # Clean up expired entries before checking size
-            self._cleanup_expired()
-            
-            # If cache is too large, remove oldest item
-            if len(self.cache) > self.max_size:
-                self.cache.popitem(last=False)  # Remove oldest (first) item
-    
+            self._keys_by_area.setdefault(self._area_of(key), set()).add(key)
+        self.cache[key] = current_time
+
+        # If cache is too large, remove oldest items
+        while len(self.cache) > self.max_size:
+            self._pop_head()
+
     def contains(self, key: str) -> bool:
         """Check if a key exists in the cache and is not expired."""
-        if key not in self.cache:
+        timestamp = self.cache.get(key)
+        if timestamp is None:
             return False
-        
+
         # Check if entry has expired
-        if time.time() - self.cache[key] > self.ttl_seconds:
-            del self.cache[key]
+        if time.monotonic() - timestamp > self.ttl_seconds:
+            self._discard(key)
             return False
-        
+
         return True
-    
+
+    def _pop_head(self) -> None:
+        key, _ = self.cache.popitem(last=False)
+        self._unindex(key)
+
+    def _expire_head(self, current_time: float) -> None:
+        """Drop expired entries, which are all at the head of the dict."""
+        while self.cache:
+            key = next(iter(self.cache))
+            if current_time - self.cache[key] <= self.ttl_seconds:
+                break
+            self._pop_head()
+
+    def _discard(self, key: str) -> None:
+        if self.cache.pop(key, None) is not None:
+            self._unindex(key)
+
+    def _unindex(self, key: str) -> None:
+        area_id = self._area_of(key)
+        keys = self._keys_by_area.get(area_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_area[area_id]
+
     def _cleanup_expired(self) -> None:
         """Remove expired entries from the cache."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, timestamp in self.cache.items()
-            if current_time - timestamp > self.ttl_seconds
-        ]
-        for key in expired_keys:
-            del self.cache[key]
-    
+        self._expire_head(time.monotonic())
+
     def remove_area_cache(self, area_id: str) -> None:
         """Remove cache entries for a specific area ID (when area is deleted/disabled)."""
-        keys_to_remove = [key for key in self.cache.keys() if key.startswith(f"{area_id}:")]
-        for key in keys_to_remove:
+        for key in self._keys_by_area.pop(str(area_id), set()):
             self.cache.pop(key, None)
-    
+
     def clear_area_entries(self, area_id: str) -> None:
         """Clear all cache entries for a specific area ID."""
         self.remove_area_cache(area_id)
-    
+
     def set_area_entries(self, area_id: str, message_ids: set[str]) -> None:
         """Set cache entries for a specific area ID with given message IDs (for testing)."""
         # Clear existing entries for this area
@@ -191,7 +123,7 @@ class LRUCache:
         for msg_id in message_ids:
             cache_key = f"{area_id}:{msg_id}"
             self.add(cache_key)
-    
+
     def get_cache_size(self) -> int:
         """Get the current size of the cache after cleaning up expired entries."""
         self._cleanup_expired()
@@ -199,12 +131,16 @@ class LRUCache:
 
 
 # Global cache instances with reasonable limits
-_last_seen_messages = LRUCache(max_size=10000)  # Max 10k message IDs across all areas
-_last_seen_reactions = LRUCache(max_size=5000)  # Max 5k reaction records across all areas
-_discord_scheduler_task: asyncio.Task | None = None
+_last_seen_messages = TTLCache(max_size=10000)  # Max 10k message IDs across all areas
+_last_seen_reactions = TTLCache(max_size=5000)  # Max 5k reaction records across all areas
+
+# Newest message ID read per channel, and the message areas that were polled
+# when the cursor last moved (areas joining later start from the cursor)
+_channel_cursors: Dict[str, str] = {}
+_channel_areas: Dict[str, set[str]] = {}
 
-# Global rate limiter instance
-_discord_scheduler_rate_limiter = DiscordRateLimiter()
+# Discord returns at most 100 messages per request
+_MESSAGE_PAGE_SIZE = 100
 
 
 def validate_discord_id(value: str | None) -> str:
@@ -233,15 +169,28 @@ def validate_discord_id(value: str | None) -> str:
     return value
 
 
-async def _fetch_channel_messages(channel_id: str, limit: int = 10) -> list[dict]:
-    """Fetch recent messages from a Discord channel.
+def _snowflake(message: dict) -> int:
+    """Return the numeric ID of a message (snowflakes grow over time)."""
+    message_id = str(message.get('id', ''))
+    return int(message_id) if message_id.isdigit() else -1
+
+
+async def _fetch_channel_messages(
+    channel_id: str, after: str | None = None, limit: int = 10
+) -> list[dict]:
+    """Fetch messages from a Discord channel.
+
+    Without ``after`` the ``limit`` most recent messages are returned. With
+    ``after`` the messages posted after that ID are read, up to
+    ``DISCORD_MAX_CATCHUP_PAGES`` pages.
 
     Args:
         channel_id: Discord channel ID
-        limit: Maximum number of messages to fetch
+        after: ID of the newest message already read
+        limit: Maximum number of recent messages to fetch without ``after``
 
     Returns:
-        List of message objects from Discord API
+        List of message objects from Discord API, newest first
     """
     # Validate Discord channel ID
     try:
@@ -257,53 +206,25 @@ async def _fetch_channel_messages(channel_id: str, limit: int = 10) -> list[dict
         logger.error("Discord bot token not configured")
         return []
 
+    path = f"/channels/{channel_id}/messages"
     try:
-        route = f"GET:/channels/{channel_id}/messages"
-        await _discord_scheduler_rate_limiter.wait_if_needed(route)
-        
-        with httpx.Client() as client:
-            response = client.get(
-                f"https://discord.com/api/v10/channels/{channel_id}/messages",
-                headers={
-                    "Authorization": f"Bot {bot_token}",
-                },
-                params={"limit": limit},
-                timeout=10.0
-            )
-            
-            # Update rate limit info based on response
-            await _discord_scheduler_rate_limiter.update_rate_limit_info(route, response)
-            
-            # Handle rate limit response (429) with exponential backoff
-            if response.status_code == 429:
-                try:
-                    data = response.json()
-                    retry_after = data.get('retry_after', 1.0)
-                    is_global = data.get('global', False)
-                    
-                    logger.warning(f"Discord API rate limited in scheduler (global: {is_global}), waiting {retry_after}s")
-                    
-                    # Sleep for the required time
-                    await asyncio.sleep(retry_after)
-                    
-                    # Retry the request
-                    response = client.get(
-                        f"https://discord.com/api/v10/channels/{channel_id}/messages",
-                        headers={
-                            "Authorization": f"Bot {bot_token}",
-                        },
-                        params={"limit": limit},
-                        timeout=10.0
-                    )
-                    
-                    # Update rate limit info for the retry
-                    await _discord_scheduler_rate_limiter.update_rate_limit_info(route, response)
-                except Exception as e:
-                    logger.error(f"Error handling rate limit response: {e}")
-                    return []
-            
+        if after is None:
+            response = await discord_request("GET", path, bot_token, params={"limit": limit})
             response.raise_for_status()
             return response.json()
+
+        messages: list[dict] = []
+        for _ in range(max(settings.discord_max_catchup_pages, 1)):
+            response = await discord_request(
+                "GET", path, bot_token, params={"after": after, "limit": _MESSAGE_PAGE_SIZE}
+            )
+            response.raise_for_status()
+            page = response.json()
+            messages.extend(page)
+            if len(page) < _MESSAGE_PAGE_SIZE:
+                break
+            after = max(page, key=_snowflake)['id']
+        return sorted(messages, key=_snowflake, reverse=True)
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch Discord messages: {e}", exc_info=True)
         return []
@@ -335,51 +256,12 @@ async def _fetch_message_reactions(channel_id: str, message_id: str) -> list[dic
         return []
 
     try:
-        route = f"GET:/channels/{channel_id}/messages/{message_id}"
-        await _discord_scheduler_rate_limiter.wait_if_needed(route)
-        
-        with httpx.Client() as client:
-            response = client.get(
-                f"https://discord.com/api/v10/channels/{channel_id}/messages/{message_id}",
-                headers={
-                    "Authorization": f"Bot {bot_token}",
-                },
-                timeout=10.0
-            )
-            
-            # Update rate limit info based on response
-            await _discord_scheduler_rate_limiter.update_rate_limit_info(route, response)
-            
-            # Handle rate limit response (429) with exponential backoff
-            if response.status_code == 429:
-                try:
-                    data = response.json()
-                    retry_after = data.get('retry_after', 1.0)
-                    is_global = data.get('global', False)
-                    
-                    logger.warning(f"Discord API rate limited in scheduler (global: {is_global}), waiting {retry_after}s")
-                    
-                    # Sleep for the required time
-                    await asyncio.sleep(retry_after)
-                    
-                    # Retry the request
-                    response = client.get(
-                        f"https://discord.com/api/v10/channels/{channel_id}/messages/{message_id}",
-                        headers={
-                            "Authorization": f"Bot {bot_token}",
-                        },
-                        timeout=10.0
-                    )
-                    
-                    # Update rate limit info for the retry
-                    await _discord_scheduler_rate_limiter.update_rate_limit_info(route, response)
-                except Exception as e:
-                    logger.error(f"Error handling rate limit response: {e}")
-                    return []
-            
-            response.raise_for_status()
-            message_data = response.json()
-            return message_data.get('reactions', [])
+        response = await discord_request(
+            "GET", f"/channels/{channel_id}/messages/{message_id}", bot_token
+        )
+        response.raise_for_status()
+        message_data = response.json()
+        return message_data.get('reactions', [])
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch Discord message reactions: {e}", exc_info=True)
         return []
@@ -465,196 +347,244 @@ def _fetch_due_discord_areas(db: Session, trigger_type: str | None = None) -> li
     return query.all()
 
 
-async def discord_scheduler_task() -> None:
-    """Background task that polls Discord channels for new messages and reactions based on AREA triggers."""
-    from app.db.session import SessionLocal
-
-    logger.info("Starting Discord polling scheduler task")
-
-    cleanup_counter = 0  # Counter to track how many iterations since last cleanup
-
-    while True:
-        try:
-            # Poll every 10 seconds (Discord API rate limits apply)
-            await asyncio.sleep(10)
-
-            now = datetime.now(timezone.utc)
-
-            # Fetch all enabled Discord areas using a scoped session
-            with SessionLocal() as db:
-                message_areas = await asyncio.to_thread(_fetch_due_discord_areas, db, "new_message_in_channel")
-                reaction_areas = await asyncio.to_thread(_fetch_due_discord_areas, db, "reaction_added")
-
-                logger.info("Discord scheduler tick")
-
-            # Process message trigger areas
-            for area in message_areas:
-                area_id_str = str(area.id)
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get channel_id from trigger params
-                        params = area.trigger_params or {}
-                        channel_id = params.get("channel_id")
-                        
-                        if not channel_id:
-                            logger.warning(
-                                f"Missing channel_id for Discord message area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Validate Discord channel ID
-                        try:
-                            channel_id = validate_discord_id(channel_id)
-                        except ValueError as e:
-                            logger.error(f"Invalid channel_id for area {area_id_str}: {str(e)}, skipping")
-                            continue
-
-                        # Fetch recent messages from the channel
-                        messages = await _fetch_channel_messages(channel_id)
-
-                        # Check if this is the first run for this area by checking if any messages from this area exist in the cache
-                        first_run = True
-                        for msg in messages:
-                            cache_key = f"{area_id_str}:{msg['id']}"
-                            if _last_seen_messages.contains(cache_key):
-                                first_run = False
-                                break
-
-                        # On first run for this area, prime the seen cache with fetched IDs to avoid backlog
-                        if first_run and messages:
-                            for msg in messages:
-                                cache_key = f"{area_id_str}:{msg['id']}"
-                                _last_seen_messages.add(cache_key)
-                            logger.info(
-                                f"Initialized seen cache for Discord message area {area_id_str} with {len(messages)} message(s)"
-                            )
-
-                        logger.debug(
-                            f"Discord fetched {len(messages)} message(s) for area {area_id_str}",
-                        )
-
-                        # Filter for new messages (exclude bot messages to prevent infinite loops)
-                        new_messages = []
-                        for msg in messages:
-                            cache_key = f"{area_id_str}:{msg['id']}"
-                            # Also check if author exists to prevent errors when author is missing
-                            author_data = msg.get('author', {})
-                            if not _last_seen_messages.contains(cache_key) and not author_data.get('bot', False):
-                                new_messages.append(msg)
-
-                        if new_messages:
-                            logger.info(
-                                f"Found {len(new_messages)} NEW Discord message(s) for area {area_id_str}",
-                            )
-
-                        # Process each new message (oldest first)
-                        for message in reversed(new_messages):
-                            await _process_discord_trigger(db, area, message, now)
-                            # Mark as seen by adding to cache
-                            cache_key = f"{area_id_str}:{message['id']}"
-                            _last_seen_messages.add(cache_key)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing Discord message area {area_id_str}: {str(e)}",
-                        exc_info=True,
-                    )
+class DiscordTriggerSource(TriggerSource):
+    """Polls Discord channels for new messages and reactions.
 
-            # Process reaction trigger areas
-            for area in reaction_areas:
-                area_id_str = str(area.id)
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get channel_id and message_id from trigger params
-                        params = area.trigger_params or {}
-                        channel_id = params.get("channel_id")
-                        message_id = params.get("message_id")
-                        
-                        if not channel_id or not message_id:
-                            logger.warning(
-                                f"Missing channel_id or message_id for Discord reaction area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Validate Discord IDs
-                        try:
-                            channel_id = validate_discord_id(channel_id)
-                            message_id = validate_discord_id(message_id)
-                        except ValueError as e:
-                            logger.error(f"Invalid Discord IDs for area {area_id_str}: {str(e)}, skipping")
-                            continue
-
-                        # Fetch reactions from the specific message
-                        reactions = await _fetch_message_reactions(channel_id, message_id)
-
-                        # Check if this is the first run by checking if any reactions from this area/message exist in the cache
-                        first_run = True
-                        for reaction in reactions:
-                            emoji_key = reaction.get('emoji', {}).get('name', '')
-                            cache_key = f"{area_id_str}:{message_id}:{emoji_key}"
-                            if _last_seen_reactions.contains(cache_key):
-                                first_run = False
-                                break
-
-                        # On first run, prime the seen cache with fetched reactions to avoid backlog
-                        if first_run and reactions:
-                            for reaction in reactions:
-                                emoji_key = reaction.get('emoji', {}).get('name', '')
-                                cache_key = f"{area_id_str}:{message_id}:{emoji_key}"
-                                _last_seen_reactions.add(cache_key)
-                            logger.info(
-                                f"Initialized reaction cache for Discord reaction area {area_id_str} with {len(reactions)} reaction(s)"
-                            )
-                            continue  # Skip processing on first run
-
-                        logger.debug(
-                            f"Discord fetched {len(reactions)} reaction(s) for area {area_id_str}",
-                        )
-
-                        # Check for new reactions
-                        for reaction in reactions:
-                            emoji_key = reaction.get('emoji', {}).get('name', '')
-                            cache_key = f"{area_id_str}:{message_id}:{emoji_key}"
-                            
-                            # Check if this is a new reaction (not seen before)
-                            if not _last_seen_reactions.contains(cache_key):
-                                logger.info(
-                                    f"Found NEW Discord reaction for area {area_id_str}: {emoji_key}",
-                                )
-                                
-                                await _process_discord_reaction_trigger(db, area, reaction, message_id, channel_id, now)
-                                # Mark as seen by adding to cache
-                                _last_seen_reactions.add(cache_key)
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing Discord reaction area {area_id_str}: {str(e)}",
-                        exc_info=True,
-                    )
+    Areas watching the same channel (or the same message for reactions) are
+    polled together: each channel is read once per tick from its own
+    ``after`` cursor and the messages are fanned out to every area.
+
+    Discord keeps its own bounded TTL caches of seen messages and reactions
+    (shared across areas and pruned by TTL), so events are deduped here rather
+    than by the engine.
+    """
+
+    service = "discord"
+    name = "Discord"
+
+    # Prune expired cache entries every 60 ticks (~10 minutes at 10s intervals)
+    cleanup_every_ticks = 60
+
+    def __init__(self) -> None:
+        self._ticks_since_cleanup = 0
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.discord_poll_interval_seconds
+
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_discord_areas(db)
+
+    def group_key(self, area: Area) -> str:
+        params = area.trigger_params or {}
+        channel_id = params.get("channel_id")
+        if not channel_id:
+            return str(area.id)
+        if area.trigger_action == "reaction_added":
+            message_id = params.get("message_id")
+            return f"{channel_id}:{message_id}" if message_id else str(area.id)
+        return str(channel_id)
+
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        message_areas = [area for area in areas if area.trigger_action == "new_message_in_channel"]
+        reaction_areas = [area for area in areas if area.trigger_action == "reaction_added"]
+
+        events: list[TriggerEvent] = []
+        if message_areas:
+            events.extend(await _poll_channel_messages(message_areas))
+        if reaction_areas:
+            events.extend(await _poll_message_reactions(reaction_areas))
+        return events
+
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        payload = event.payload
+        if event.area.trigger_action == "reaction_added":
+            await _process_discord_reaction_trigger(
+                db, event.area, payload["reaction"], payload["message_id"], payload["channel_id"], now
+            )
+            # Mark as seen by adding to cache
+            _last_seen_reactions.add(payload["cache_key"])
+        else:
+            await _process_discord_trigger(db, event.area, payload["message"], now)
+            # Mark as seen by adding to cache
+            _last_seen_messages.add(payload["cache_key"])
+
+    def after_tick(self) -> None:
+        self._ticks_since_cleanup += 1
+        if self._ticks_since_cleanup >= self.cleanup_every_ticks:
+            cleanup_discord_scheduler_caches()
+            self._ticks_since_cleanup = 0
+
+
+async def _poll_channel_messages(areas: list[Area]) -> list[TriggerEvent]:
+    """Fetch the new, non-bot messages of a channel watched by message trigger areas.
+
+    The first poll of a channel reads its recent messages and primes the areas
+    that have not seen any of them yet. Later polls only read the messages
+    posted after the channel's cursor; areas that joined since the previous
+    poll are primed with them instead of receiving them.
+
+    Args:
+        areas: Areas with a new_message_in_channel trigger on the same channel
+
+    Returns:
+        Events for unseen messages, oldest first for each area
+    """
+    params = areas[0].trigger_params or {}
+    channel_id = params.get("channel_id")
+
+    if not channel_id:
+        for area in areas:
+            logger.warning(
+                f"Missing channel_id for Discord message area {area.id}, skipping"
+            )
+        return []
+
+    # Validate Discord channel ID
+    try:
+        channel_id = validate_discord_id(channel_id)
+    except ValueError as e:
+        for area in areas:
+            logger.error(f"Invalid channel_id for area {area.id}: {str(e)}, skipping")
+        return []
+
+    cursor = _channel_cursors.get(channel_id)
+    messages = await _fetch_channel_messages(channel_id, after=cursor)
+    if messages:
+        _channel_cursors[channel_id] = max(messages, key=_snowflake)['id']
+    known_areas = _channel_areas.setdefault(channel_id, set())
+
+    logger.debug(
+        f"Discord fetched {len(messages)} message(s) from channel {channel_id} for {len(areas)} area(s)",
+    )
+
+    events: list[TriggerEvent] = []
+    for area in areas:
+        area_id_str = str(area.id)
+
+        if cursor is None:
+            # Without a cursor the recent messages may predate the area: it is
+            # new unless it already saw one of them
+            first_run = not any(
+                _last_seen_messages.contains(f"{area_id_str}:{msg['id']}") for msg in messages
+            )
+        else:
+            first_run = area_id_str not in known_areas
+        known_areas.add(area_id_str)
+
+        # On first run for this area, prime the seen cache with fetched IDs to avoid backlog
+        if first_run:
+            for msg in messages:
+                _last_seen_messages.add(f"{area_id_str}:{msg['id']}")
+            if messages:
+                logger.info(
+                    f"Initialized seen cache for Discord message area {area_id_str} with {len(messages)} message(s)"
+                )
+            continue
+
+        # Filter for new messages (exclude bot messages to prevent infinite loops)
+        new_messages = []
+        for msg in messages:
+            cache_key = f"{area_id_str}:{msg['id']}"
+            # Also check if author exists to prevent errors when author is missing
+            author_data = msg.get('author', {})
+            if not _last_seen_messages.contains(cache_key) and not author_data.get('bot', False):
+                new_messages.append(msg)
+
+        if new_messages:
+            logger.info(
+                f"Found {len(new_messages)} NEW Discord message(s) for area {area_id_str}",
+            )
 
-            # Perform cleanup every 60 iterations (every 10 minutes at 10s intervals)
-            cleanup_counter += 1
-            if cleanup_counter >= 60:  # ~10 minutes
-                cleanup_discord_scheduler_caches()
-                cleanup_counter = 0  # Reset counter
+        # Process each new message (oldest first)
+        events.extend(
+            TriggerEvent(area, {"message": message, "cache_key": f"{area_id_str}:{message['id']}"})
+            for message in reversed(new_messages)
+        )
+    return events
 
-        except asyncio.CancelledError:
-            logger.info("Discord scheduler task cancelled, shutting down gracefully")
-            break
 
-        except Exception as e:
-            logger.error(f"Discord scheduler task error: {str(e)}", exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
+async def _poll_message_reactions(areas: list[Area]) -> list[TriggerEvent]:
+    """Fetch the new reactions of a message watched by reaction trigger areas.
 
-    logger.info("Discord scheduler task stopped")
+    Args:
+        areas: Areas with a reaction_added trigger on the same message
+
+    Returns:
+        Events for unseen reactions
+    """
+    # Get channel_id and message_id from trigger params
+    params = areas[0].trigger_params or {}
+    channel_id = params.get("channel_id")
+    message_id = params.get("message_id")
+
+    if not channel_id or not message_id:
+        for area in areas:
+            logger.warning(
+                f"Missing channel_id or message_id for Discord reaction area {area.id}, skipping"
+            )
+        return []
+
+    # Validate Discord IDs
+    try:
+        channel_id = validate_discord_id(channel_id)
+        message_id = validate_discord_id(message_id)
+    except ValueError as e:
+        for area in areas:
+            logger.error(f"Invalid Discord IDs for area {area.id}: {str(e)}, skipping")
+        return []
+
+    # Fetch reactions from the specific message once for every area
+    reactions = await _fetch_message_reactions(channel_id, message_id)
+
+    logger.debug(
+        f"Discord fetched {len(reactions)} reaction(s) on message {message_id} for {len(areas)} area(s)",
+    )
+
+    events = []
+    for area in areas:
+        area_id_str = str(area.id)
+        cache_keys = [
+            (reaction, f"{area_id_str}:{message_id}:{reaction.get('emoji', {}).get('name', '')}")
+            for reaction in reactions
+        ]
+
+        # Check if this is the first run by checking if any reactions from this area/message exist in the cache
+        first_run = not any(_last_seen_reactions.contains(cache_key) for _, cache_key in cache_keys)
+
+        # On first run, prime the seen cache with fetched reactions to avoid backlog
+        if first_run:
+            for _, cache_key in cache_keys:
+                _last_seen_reactions.add(cache_key)
+            if reactions:
+                logger.info(
+                    f"Initialized reaction cache for Discord reaction area {area_id_str} with {len(reactions)} reaction(s)"
+                )
+            continue
+
+        # Check for new reactions
+        for reaction, cache_key in cache_keys:
+            # Check if this is a new reaction (not seen before)
+            if not _last_seen_reactions.contains(cache_key):
+                logger.info(
+                    f"Found NEW Discord reaction for area {area_id_str}: {reaction.get('emoji', {}).get('name', '')}",
+                )
+                events.append(
+                    TriggerEvent(
+                        area,
+                        {
+                            "reaction": reaction,
+                            "message_id": message_id,
+                            "channel_id": channel_id,
+                            "cache_key": cache_key,
+                        },
+                    )
+                )
+    return events
 
 
 async def _process_discord_trigger(db: Session, area: Area, message: dict, now: datetime) -> None:
-    """Process a Discord message trigger event and execute the area.
+    """Process a Discord message trigger event and queue the area for execution.
 
     Args:
         db: Database session
@@ -662,105 +592,56 @@ async def _process_discord_trigger(db: Session, area: Area, message: dict, now:
         message: Discord message data
         now: Current timestamp
     """
-    # Re-attach the Area instance to the current session so lazy-loaded
-    # relationships (like `steps`) can be accessed during execution.
+    # Re-attach the Area instance to the current session so its attributes
+    # can be read even if a previous commit expired them.
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Extract message data
-        message_data = _extract_message_data(message)
-
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "message_id": message_data.get('id'),
-                    "content_preview": message_data.get('content', '')[:50],
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Build trigger_data with discord variables
-        trigger_data = {
-            # Discord message variables
-            "discord.message.id": message_data.get('id'),
-            "discord.message.content": message_data.get('content'),
-            "discord.message.timestamp": message_data.get('timestamp'),
-            "discord.message.channel_id": message_data.get('channel_id'),
-            "discord.author.id": message_data.get('author_id'),
-            "discord.author.username": message_data.get('author_username'),
-            "discord.author.discriminator": message_data.get('author_discriminator'),
-            "discord.author.global_name": message_data.get('author_global_name'),
-            "discord.author.is_bot": message_data.get('author_is_bot'),
-            "discord.attachments": message_data.get('attachments'),
-            "discord.embeds": message_data.get('embeds'),
-            # General context
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Discord trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "message_id": message_data.get('id'),
-        }
-        db.commit()
-
-        logger.info(
-            "Discord trigger executed",
-            extra={
+    # Extract message data
+    message_data = _extract_message_data(message)
+
+    # Build trigger_data with discord variables
+    trigger_data = {
+        # Discord message variables
+        "discord.message.id": message_data.get('id'),
+        "discord.message.content": message_data.get('content'),
+        "discord.message.timestamp": message_data.get('timestamp'),
+        "discord.message.channel_id": message_data.get('channel_id'),
+        "discord.author.id": message_data.get('author_id'),
+        "discord.author.username": message_data.get('author_username'),
+        "discord.author.discriminator": message_data.get('author_discriminator'),
+        "discord.author.global_name": message_data.get('author_global_name'),
+        "discord.author.is_bot": message_data.get('author_is_bot'),
+        "discord.attachments": message_data.get('attachments'),
+        "discord.embeds": message_data.get('embeds'),
+        # General context
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Discord",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "message_id": message_data.get('id'),
-                "channel_id": message_data.get('channel_id'),
-                "author": message_data.get('author_username'),
-                "content_preview": message_data.get('content', '')[:50],
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
+                "content_preview": (message_data.get('content') or '')[:50],
             },
+            details={"message_id": message_data.get('id')},
         )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Discord trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
+    )
 
 
 async def _process_discord_reaction_trigger(
     db: Session, area: Area, reaction: dict, message_id: str, channel_id: str, now: datetime
 ) -> None:
-    """Process a Discord reaction trigger event and execute the area.
+    """Process a Discord reaction trigger event and queue the area for execution.
 
     Args:
         db: Database session
@@ -773,135 +654,53 @@ async def _process_discord_reaction_trigger(
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Extract reaction data
-        reaction_data = _extract_reaction_data(reaction, message_id, channel_id)
-
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "message_id": message_id,
-                    "emoji": reaction_data.get('emoji_name'),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Build trigger_data with discord reaction variables
-        trigger_data = {
-            # Discord reaction variables
-            "discord.reaction.message_id": reaction_data.get('message_id'),
-            "discord.reaction.channel_id": reaction_data.get('channel_id'),
-            "discord.reaction.emoji_name": reaction_data.get('emoji_name'),
-            "discord.reaction.emoji_id": reaction_data.get('emoji_id'),
-            "discord.reaction.emoji_animated": reaction_data.get('emoji_animated'),
-            "discord.reaction.count": reaction_data.get('count'),
-            # General context
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Discord reaction trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "message_id": message_id,
-            "emoji": reaction_data.get('emoji_name'),
-        }
-        db.commit()
-
-        logger.info(
-            "Discord reaction trigger executed",
-            extra={
+    # Extract reaction data
+    reaction_data = _extract_reaction_data(reaction, message_id, channel_id)
+
+    # Build trigger_data with discord reaction variables
+    trigger_data = {
+        # Discord reaction variables
+        "discord.reaction.message_id": reaction_data.get('message_id'),
+        "discord.reaction.channel_id": reaction_data.get('channel_id'),
+        "discord.reaction.emoji_name": reaction_data.get('emoji_name'),
+        "discord.reaction.emoji_id": reaction_data.get('emoji_id'),
+        "discord.reaction.emoji_animated": reaction_data.get('emoji_animated'),
+        "discord.reaction.count": reaction_data.get('count'),
+        # General context
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Discord reaction",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "message_id": message_id,
-                "channel_id": channel_id,
                 "emoji": reaction_data.get('emoji_name'),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
             },
-        )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Discord reaction trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
+            details={
+                "message_id": message_id,
+                "emoji": reaction_data.get('emoji_name'),
             },
-            exc_info=True,
         )
-
-
-def start_discord_scheduler() -> None:
-    """Start the Discord polling scheduler task."""
-    global _discord_scheduler_task
-
-    if _discord_scheduler_task is not None:
-        logger.warning("Discord scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start Discord scheduler")
-        return
-
-    _discord_scheduler_task = loop.create_task(discord_scheduler_task())
-    logger.info("Discord scheduler task started")
-
-
-def stop_discord_scheduler() -> None:
-    """Stop the Discord polling scheduler task."""
-    global _discord_scheduler_task
-
-    if _discord_scheduler_task is not None:
-        _discord_scheduler_task.cancel()
-        _discord_scheduler_task = None
-        logger.info("Discord scheduler task stopped")
-
-
-def is_discord_scheduler_running() -> bool:
-    """Check if the Discord scheduler task is running.
-
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _discord_scheduler_task
-    return _discord_scheduler_task is not None and not _discord_scheduler_task.done()
+    )
 
 
 def clear_discord_seen_state() -> None:
     """Clear the in-memory seen messages and reactions state (useful for testing)."""
     global _last_seen_messages, _last_seen_reactions
-    _last_seen_messages = LRUCache(max_size=10000)  # Reset to empty cache
-    _last_seen_reactions = LRUCache(max_size=5000)  # Reset to empty cache
+    _last_seen_messages = TTLCache(max_size=10000)  # Reset to empty cache
+    _last_seen_reactions = TTLCache(max_size=5000)  # Reset to empty cache
+    _channel_cursors.clear()
+    _channel_areas.clear()
 
 
 def cleanup_discord_scheduler_caches() -> None:
@@ -910,19 +709,23 @@ def cleanup_discord_scheduler_caches() -> None:
     _last_seen_messages._cleanup_expired()
     _last_seen_reactions._cleanup_expired()
 
+    # Forget the cursors of channels no area watches anymore
+    for channel_id in [channel for channel, areas in _channel_areas.items() if not areas]:
+        del _channel_areas[channel_id]
+        _channel_cursors.pop(channel_id, None)
+
 
 def clear_area_from_seen_state(area_id: str) -> None:
     """Remove all cache entries for a specific area ID (when area is deleted/disabled)."""
     global _last_seen_messages, _last_seen_reactions
     _last_seen_messages.remove_area_cache(area_id)
     _last_seen_reactions.remove_area_cache(area_id)
+    for areas in _channel_areas.values():
+        areas.discard(str(area_id))
 
 
 __all__ = [
-    "discord_scheduler_task",
-    "start_discord_scheduler",
-    "is_discord_scheduler_running",
-    "stop_discord_scheduler",
+    "DiscordTriggerSource",
     "clear_discord_seen_state",
     "clear_area_from_seen_state",
     "cleanup_discord_scheduler_caches",
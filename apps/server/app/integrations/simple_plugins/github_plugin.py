@@ -7,7 +7,7 @@ from typing import TYPE_CHECKING, Any, Dict
 
 import httpx
 
-from app.services.service_connections import get_service_connection_by_user_and_service
+from app.services.credential_manager import credential_manager
 from app.integrations.simple_plugins.exceptions import (
     GitHubAuthError,
     GitHubAPIError,
@@ -24,7 +24,7 @@ GITHUB_API_BASE = "https://api.github.com"
 GITHUB_API_VERSION = "2022-11-28"
 
 
-def _get_github_access_token(area: Area, db: "Session") -> str:
+async def _get_github_access_token(area: Area, db: "Session") -> str:
     """Get GitHub access token for a user.
 
     Args:
@@ -38,14 +38,12 @@ def _get_github_access_token(area: Area, db: "Session") -> str:
         GitHubConnectionError: If service connection not found
         GitHubAuthError: If authentication fails
     """
-    # Get service connection for GitHub
-    connection = get_service_connection_by_user_and_service(db, area.user_id, "github")
-    if not connection:
+    # Get cached credentials for GitHub
+    credentials = await credential_manager.aget(db, area.user_id, "github")
+    if credentials is None:
         raise GitHubConnectionError("GitHub service connection not found. Please connect your GitHub account.")
 
-    # Decrypt access token
-    from app.core.encryption import decrypt_token
-    access_token = decrypt_token(connection.encrypted_access_token)
+    access_token = credentials.access_token
 
     if not access_token:
         raise GitHubAuthError("GitHub access token is invalid or expired.")
@@ -147,7 +145,7 @@ async def create_issue_handler(area: Area, params: dict, event: dict, db: "Sessi
             raise ValueError("'title' parameter is required for create_issue action")
 
         # Get GitHub access token
-        access_token = _get_github_access_token(area, db)
+        access_token = await _get_github_access_token(area, db)
 
         # Prepare issue data
         issue_data = {
@@ -241,7 +239,7 @@ async def add_comment_handler(area: Area, params: dict, event: dict, db: "Sessio
             raise ValueError("'body' parameter is required for add_comment action")
 
         # Get GitHub access token
-        access_token = _get_github_access_token(area, db)
+        access_token = await _get_github_access_token(area, db)
 
         # Add comment via GitHub API
         endpoint = f"/repos/{repo_owner}/{repo_name}/issues/{issue_number}/comments"
@@ -322,7 +320,7 @@ async def close_issue_handler(area: Area, params: dict, event: dict, db: "Sessio
             raise ValueError("'issue_number' is required. Use {{github.issue_number}} for trigger events or provide a specific issue number.")
 
         # Get GitHub access token
-        access_token = _get_github_access_token(area, db)
+        access_token = await _get_github_access_token(area, db)
 
         # Close issue via GitHub API
         endpoint = f"/repos/{repo_owner}/{repo_name}/issues/{issue_number}"
@@ -410,7 +408,7 @@ async def add_label_handler(area: Area, params: dict, event: dict, db: "Session"
             labels = [labels]
 
         # Get GitHub access token
-        access_token = _get_github_access_token(area, db)
+        access_token = await _get_github_access_token(area, db)
 
         # Add labels via GitHub API
         endpoint = f"/repos/{repo_owner}/{repo_name}/issues/{issue_number}/labels"
@@ -481,7 +479,7 @@ async def create_branch_handler(area: Area, params: dict, event: dict, db: "Sess
             raise ValueError("'branch_name' parameter is required for create_branch action")
 
         # Get GitHub access token
-        access_token = _get_github_access_token(area, db)
+        access_token = await _get_github_access_token(area, db)
 
         # First, get the SHA of the source branch
         source_ref_endpoint = f"/repos/{repo_owner}/{repo_name}/git/ref/heads/{from_branch}"
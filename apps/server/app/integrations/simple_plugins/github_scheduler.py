@@ -1,36 +1,161 @@
-"""GitHub polling scheduler for trigger-based automation."""
+"""GitHub polling scheduler for trigger-based automation.
+
+Polls are conditional: the ``ETag`` and ``Last-Modified`` of every GET are kept
+per (token, endpoint) and sent back as ``If-None-Match`` / ``If-Modified-Since``,
+so unchanged resources answer 304, which does not count against the rate limit.
+An endpoint is not requested again before its ``X-Poll-Interval`` elapsed, and a
+token whose ``X-RateLimit-Remaining`` drops below ``GITHUB_RATE_LIMIT_RESERVE``
+pauses until its rate limit resets instead of running into 403s. Each token
+keeps one long-lived HTTP client.
+
+Areas are grouped per watched repository, across users: each (repository,
+trigger) is fetched once per poll with any token allowed to read the repository
+and its events are routed to every subscribed area whose owner can read it.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
-from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Dict
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict
+from urllib.parse import urlencode
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
 import httpx
 
-from app.core.encryption import decrypt_token
 from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.integrations.variable_extractor import extract_github_variables
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import get_service_connection_by_user_and_service
-from app.services.step_executor import execute_area
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.credential_manager import credential_manager
+from app.services.seen_events import SeenEventStore
 
 logger = logging.getLogger("area")
 
-# In-memory storage for last seen event IDs per AREA
-_last_seen_events: Dict[str, set[str]] = {}
-_github_scheduler_task: asyncio.Task | None = None
+# Event IDs already seen per AREA
+_seen_events = SeenEventStore("github")
 
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_API_VERSION = "2022-11-28"
 
 
+@dataclass
+class _TokenState:
+    """Long-lived HTTP client and rate limit of one GitHub token.
+
+    Attributes:
+        client: Client reused by every request made with the token
+        loop: Event loop the client belongs to
+        remaining: Last ``X-RateLimit-Remaining`` seen, None before the first answer
+        paused_until: Epoch time before which the token is not used
+    """
+
+    client: httpx.AsyncClient
+    loop: asyncio.AbstractEventLoop
+    remaining: int | None = None
+    paused_until: float = 0.0
+
+
+@dataclass
+class _ConditionalResponse:
+    """Validators and body of the last successful GET of an endpoint.
+
+    Attributes:
+        etag: ``ETag`` answered by GitHub
+        last_modified: ``Last-Modified`` answered by GitHub
+        body: Decoded JSON body, returned again on 304
+        poll_after: Epoch time before which the endpoint is not requested again
+    """
+
+    etag: str | None
+    last_modified: str | None
+    body: Any
+    poll_after: float = 0.0
+
+
+# Client and rate limit per token digest
+_token_states: OrderedDict[str, _TokenState] = OrderedDict()
+# Last response per (token digest, endpoint with query)
+_conditional_responses: OrderedDict[tuple[str, str], _ConditionalResponse] = OrderedDict()
+# Epoch time until which a token's read access to a repository is trusted,
+# per (token digest, lowercased "owner/name")
+_repo_access: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+
+def _token_digest(access_token: str) -> str:
+    """Key a token without keeping it in cache keys."""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def _get_token_state(access_token: str) -> _TokenState:
+    """Return the state of a token, creating its HTTP client on first use."""
+    digest = _token_digest(access_token)
+    loop = asyncio.get_running_loop()
+    state = _token_states.get(digest)
+    if state is not None and state.loop is loop:
+        _token_states.move_to_end(digest)
+        return state
+
+    state = _TokenState(
+        client=httpx.AsyncClient(
+            base_url=GITHUB_API_BASE,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/vnd.github.v3+json",
+                "X-GitHub-Api-Version": GITHUB_API_VERSION,
+                "User-Agent": "AREA-App/1.0",
+            },
+            timeout=30.0,
+        ),
+        loop=loop,
+    )
+    _token_states[digest] = state
+    while len(_token_states) > max(settings.github_client_cache_size, 1):
+        _, evicted = _token_states.popitem(last=False)
+        if evicted.loop is loop:
+            loop.create_task(evicted.client.aclose())
+    return state
+
+
+def _header_number(response: httpx.Response, name: str) -> float | None:
+    try:
+        return float(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _track_rate_limit(state: _TokenState, response: httpx.Response, now: float) -> None:
+    """Pause a token once its rate limit is (nearly) exhausted."""
+    remaining = _header_number(response, "X-RateLimit-Remaining")
+    reset = _header_number(response, "X-RateLimit-Reset")
+    retry_after = _header_number(response, "Retry-After")
+    if remaining is not None:
+        state.remaining = int(remaining)
+
+    if response.status_code in (403, 429) and retry_after is not None:
+        # Secondary rate limit
+        state.paused_until = now + retry_after
+    elif remaining is not None and reset is not None and remaining <= settings.github_rate_limit_reserve:
+        state.paused_until = reset
+    else:
+        return
+    logger.warning(
+        "GitHub rate limit nearly exhausted, pausing token",
+        extra={
+            "remaining": state.remaining,
+            "paused_seconds": round(max(state.paused_until - now, 0.0)),
+        },
+    )
+
+
 def _get_github_access_token(user_id, db: Session) -> str | None:
     """Get GitHub access token for a user.
 
@@ -42,12 +167,10 @@ def _get_github_access_token(user_id, db: Session) -> str | None:
         GitHub access token or None if connection not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "github")
-        if not connection:
+        credentials = credential_manager.get(db, user_id, "github")
+        if credentials is None:
             return None
-
-        access_token = decrypt_token(connection.encrypted_access_token)
-        return access_token
+        return credentials.access_token
     except Exception as e:
         logger.error(f"Failed to get GitHub access token: {e}", exc_info=True)
         return None
@@ -58,40 +181,117 @@ async def _make_github_request(
     endpoint: str,
     access_token: str,
     params: dict = None,
+    json: dict | None = None,
 ) -> dict | list | None:
     """Make an authenticated request to GitHub API.
 
+    GET requests are conditional: the body of the last successful answer is
+    returned on 304, while the endpoint's ``X-Poll-Interval`` has not elapsed
+    and while the token is paused by its rate limit.
+
     Args:
         method: HTTP method (GET, POST, etc.)
         endpoint: API endpoint
         access_token: GitHub access token
         params: Query parameters
+        json: JSON body of write requests
 
     Returns:
         Response JSON or None on error
     """
-    url = f"{GITHUB_API_BASE}{endpoint}"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/vnd.github.v3+json",
-        "X-GitHub-Api-Version": GITHUB_API_VERSION,
-        "User-Agent": "AREA-App/1.0",
-    }
+    state = _get_token_state(access_token)
+    now = time.time()
+
+    cache_key = None
+    cached = None
+    if method == "GET":
+        query = urlencode(sorted((params or {}).items()))
+        cache_key = (_token_digest(access_token), f"{endpoint}?{query}")
+        cached = _conditional_responses.get(cache_key)
+        if cached is not None:
+            _conditional_responses.move_to_end(cache_key)
+            if now < cached.poll_after:
+                return cached.body
+
+    if now < state.paused_until:
+        logger.debug(f"GitHub token paused by its rate limit, skipping {endpoint}")
+        return cached.body if cached is not None else None
+
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json() if response.content else {}
-        except httpx.HTTPError as e:
-            logger.error(f"GitHub API error: {e}", exc_info=True)
-            return None
+    try:
+        response = await state.client.request(
+            method=method,
+            url=endpoint,
+            headers=headers,
+            params=params,
+            json=json,
+        )
+        _track_rate_limit(state, response, now)
+        poll_interval = _header_number(response, "X-Poll-Interval") or 0.0
+        if response.status_code == 304 and cached is not None:
+            cached.poll_after = now + poll_interval
+            return cached.body
+        response.raise_for_status()
+        body = response.json() if response.content else {}
+    except httpx.HTTPError as e:
+        logger.error(f"GitHub API error: {e}", exc_info=True)
+        return None
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache_key is not None and (etag or last_modified):
+        _conditional_responses[cache_key] = _ConditionalResponse(
+            etag=etag,
+            last_modified=last_modified,
+            body=body,
+            poll_after=now + poll_interval,
+        )
+        _conditional_responses.move_to_end(cache_key)
+        while len(_conditional_responses) > max(settings.github_etag_cache_size, 1):
+            _conditional_responses.popitem(last=False)
+    return body
+
+
+async def _can_read_repo(access_token: str, repo_owner: str, repo_name: str) -> bool:
+    """Check whether a token can read a repository.
+
+    Confirmed access is trusted for ``GITHUB_REPO_ACCESS_TTL_SECONDS``; denials
+    and errors are not cached so access granted later is picked up next poll.
+    """
+    key = (_token_digest(access_token), f"{repo_owner}/{repo_name}".lower())
+    now = time.time()
+    if _repo_access.get(key, 0.0) > now:
+        _repo_access.move_to_end(key)
+        return True
+
+    repository = await _make_github_request("GET", f"/repos/{repo_owner}/{repo_name}", access_token)
+    if not repository:
+        return False
+    _repo_access[key] = now + settings.github_repo_access_ttl_seconds
+    _repo_access.move_to_end(key)
+    while len(_repo_access) > max(settings.github_etag_cache_size, 1):
+        _repo_access.popitem(last=False)
+    return True
+
+
+def _pick_token(access_tokens: list[str]) -> str:
+    """Pick the token with the most rate limit left, preferring tokens not paused."""
+    now = time.time()
+
+    def headroom(access_token: str) -> tuple[bool, float]:
+        state = _token_states.get(_token_digest(access_token))
+        if state is None:
+            return True, float("inf")
+        remaining = float("inf") if state.remaining is None else state.remaining
+        return state.paused_until <= now, remaining
+
+    return max(access_tokens, key=headroom)
 
 
 def _fetch_due_github_areas(db: Session) -> list[Area]:
@@ -233,123 +433,111 @@ async def _fetch_github_events(
     return events
 
 
-async def github_scheduler_task() -> None:
-    """Background task that polls GitHub for events based on AREA triggers."""
-    from app.db.session import SessionLocal
+class GitHubTriggerSource(TriggerSource):
+    """Polls the GitHub REST API for repository events matching each area's trigger.
 
-    logger.info("Starting GitHub polling scheduler task")
+    Areas are grouped per watched repository, whichever user owns them, so each
+    (repository, action) is requested once per poll and its events are routed
+    to every subscribed area.
+    """
 
-    while True:
-        try:
-            # Poll at 30-second intervals (configurable)
-            await asyncio.sleep(30)
+    service = "github"
+    name = "GitHub"
 
-            now = datetime.now(timezone.utc)
+    @property
+    def seen(self) -> SeenEventStore:
+        return _seen_events
 
-            # Fetch all enabled GitHub areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_github_areas, db)
+    @property
+    def poll_interval(self) -> float:
+        return settings.github_poll_interval_seconds
 
-                logger.info(
-                    "GitHub scheduler tick",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
-                )
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_github_areas(db)
 
-            # Process each area with its own scoped session
-            for area in areas:
-                area_id_str = str(area.id)
-
-                # Initialize last seen events set for this area
-                if area_id_str not in _last_seen_events:
-                    _last_seen_events[area_id_str] = set()
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get GitHub access token for user
-                        access_token = await asyncio.to_thread(_get_github_access_token, area.user_id, db)
-                        if not access_token:
-                            logger.warning(
-                                f"GitHub access token not available for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Fetch events based on trigger action
-                        events = await _fetch_github_events(
-                            access_token,
-                            area.trigger_action,
-                            area.trigger_params or {},
-                        )
-
-                        # On first run for this area, prime the seen set to avoid backlog
-                        if len(_last_seen_events[area_id_str]) == 0 and events:
-                            _last_seen_events[area_id_str].update(e["id"] for e in events)
-                            logger.info(
-                                f"Initialized seen set for area {area_id_str} with {len(events)} event(s)"
-                            )
-                            continue
-
-                        logger.info(
-                            f"GitHub fetched {len(events)} event(s) for area {area_id_str}",
-                            extra={
-                                "area_id": area_id_str,
-                                "area_name": area.name,
-                                "user_id": str(area.user_id),
-                                "events_fetched": len(events),
-                                "trigger_action": area.trigger_action,
-                            }
-                        )
-
-                        # Filter for new events
-                        new_events = [
-                            event for event in events
-                            if event["id"] not in _last_seen_events[area_id_str]
-                        ]
-
-                        if new_events:
-                            logger.info(
-                                f"Found {len(new_events)} NEW event(s) for area {area_id_str}",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "area_name": area.name,
-                                    "user_id": str(area.user_id),
-                                    "new_events_count": len(new_events),
-                                    "event_ids": [e["id"] for e in new_events],
-                                }
-                            )
-
-                        # Process each new event
-                        for event in new_events:
-                            await _process_github_trigger(db, area, event, now)
-                            # Mark as seen
-                            _last_seen_events[area_id_str].add(event["id"])
-
-                except Exception as e:
-                    logger.error(
-                        "Error processing GitHub area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
+    def group_key(self, area: Area) -> str:
+        # Areas of every user watching the same repository share its requests
+        params = area.trigger_params or {}
+        return f"{params.get('repo_owner') or ''}/{params.get('repo_name') or ''}".lower()
 
-        except asyncio.CancelledError:
-            logger.info("GitHub scheduler task cancelled, shutting down gracefully")
-            break
+    def push_scope(self, area: Area) -> str | None:
+        # A repository webhook reports the events of every area watching the repository
+        params = area.trigger_params or {}
+        if not params.get("repo_owner") or not params.get("repo_name"):
+            return None
+        return self.group_key(area)
+
+    def primes_when_empty(self, area: Area) -> bool:
+        # Polls skip areas without repository access and swallow API errors, so an
+        # empty poll says nothing about the repository's recent events
+        return False
+
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        params = areas[0].trigger_params or {}
+        repo_owner = params.get("repo_owner")
+        repo_name = params.get("repo_name")
+        if not repo_owner or not repo_name:
+            logger.warning(
+                f"Missing repo_owner or repo_name for {len(areas)} GitHub area(s), skipping"
+            )
+            return []
+
+        # Only areas whose owner can read the repository receive its events
+        user_ids = {str(area.user_id): area.user_id for area in areas}
+        access_tokens: Dict[str, str] = {}
+        for user_key, user_id in user_ids.items():
+            access_token = await asyncio.to_thread(_get_github_access_token, user_id, db)
+            if not access_token:
+                logger.warning(
+                    f"GitHub access token not available for user {user_id}, skipping its area(s)"
+                )
+                continue
+            if not await _can_read_repo(access_token, repo_owner, repo_name):
+                logger.warning(
+                    f"User {user_id} cannot read GitHub repository {repo_owner}/{repo_name}, "
+                    f"skipping its area(s)"
+                )
+                continue
+            access_tokens[user_key] = access_token
+        if not access_tokens:
+            return []
+
+        # Each action of the repository is requested once with any authorized token
+        access_token = _pick_token(list(access_tokens.values()))
+        streams: Dict[str, list[dict]] = {}
+        events: list[TriggerEvent] = []
+        for area in areas:
+            if str(area.user_id) not in access_tokens:
+                continue
+            area_id_str = str(area.id)
+
+            if area.trigger_action not in streams:
+                streams[area.trigger_action] = await _fetch_github_events(
+                    access_token,
+                    area.trigger_action,
+                    area.trigger_params or {},
+                )
+            github_events = streams[area.trigger_action]
 
-        except Exception as e:
-            logger.error("GitHub scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
+            logger.info(
+                f"GitHub fetched {len(github_events)} event(s) for area {area_id_str}",
+                extra={
+                    "area_id": area_id_str,
+                    "area_name": area.name,
+                    "user_id": str(area.user_id),
+                    "events_fetched": len(github_events),
+                    "trigger_action": area.trigger_action,
+                }
+            )
+            events.extend(TriggerEvent(area, event, event["id"]) for event in github_events)
+        return events
 
-    logger.info("GitHub scheduler task stopped")
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _process_github_trigger(db, event.area, event.payload, now)
 
 
 async def _process_github_trigger(db: Session, area: Area, event: dict, now: datetime) -> None:
-    """Process a GitHub trigger event and execute the area.
+    """Process a GitHub trigger event and queue the area for execution.
 
     Args:
         db: Database session
@@ -360,132 +548,48 @@ async def _process_github_trigger(db: Session, area: Area, event: dict, now: dat
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "event_type": event.get("type"),
-                    "event_action": event.get("action"),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Use extract_github_variables to get variables from event
-        variables = extract_github_variables(event)
-
-        # Build trigger_data with github variables
-        trigger_data = {
-            **variables,  # Include all extracted github.* variables
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"GitHub trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "event_type": event.get("type"),
-            "event_id": event.get("id"),
-        }
-        db.commit()
-
-        logger.info(
-            "GitHub trigger executed",
-            extra={
+    # Use extract_github_variables to get variables from event
+    variables = extract_github_variables(event)
+
+    # Build trigger_data with github variables
+    trigger_data = {
+        **variables,  # Include all extracted github.* variables
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="GitHub",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "event_type": event.get("type"),
                 "event_action": event.get("action"),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
             },
-        )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing GitHub trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
+            details={
+                "event_type": event.get("type"),
+                "event_id": event.get("id"),
             },
-            exc_info=True,
         )
-
-
-def start_github_scheduler() -> None:
-    """Start the GitHub polling scheduler task."""
-    global _github_scheduler_task
-
-    if _github_scheduler_task is not None:
-        logger.warning("GitHub scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start GitHub scheduler")
-        return
-
-    _github_scheduler_task = loop.create_task(github_scheduler_task())
-    logger.info("GitHub scheduler task started")
-
-
-def stop_github_scheduler() -> None:
-    """Stop the GitHub polling scheduler task."""
-    global _github_scheduler_task
-
-    if _github_scheduler_task is not None:
-        _github_scheduler_task.cancel()
-        _github_scheduler_task = None
-        logger.info("GitHub scheduler task stopped")
-
-
-def is_github_scheduler_running() -> bool:
-    """Check if the GitHub scheduler task is running.
-
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _github_scheduler_task
-    return _github_scheduler_task is not None and not _github_scheduler_task.done()
+    )
 
 
 def clear_github_seen_state() -> None:
-    """Clear the in-memory seen events state (useful for testing)."""
-    global _last_seen_events
-    _last_seen_events.clear()
+    """Clear the in-memory seen events, clients and conditional caches (useful for testing)."""
+    _seen_events.clear()
+    _token_states.clear()
+    _conditional_responses.clear()
+    _repo_access.clear()
 
 
 __all__ = [
-    "github_scheduler_task",
-    "start_github_scheduler",
-    "is_github_scheduler_running",
-    "stop_github_scheduler",
+    "GitHubTriggerSource",
     "clear_github_seen_state",
 ]
@@ -8,18 +8,14 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import TYPE_CHECKING, Any, Dict
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
 
 from app.db.session import SessionLocal
-from app.services.service_connections import (
-    get_service_connection_by_user_and_service,
-    update_service_connection,
+from app.integrations.simple_plugins.google_clients import (
+    build_google_credentials,
+    get_google_client,
+    get_google_credentials,
 )
-from app.schemas.service_connection import ServiceConnectionUpdate
-from app.core.config import settings
 from app.integrations.simple_plugins.exceptions import (
     GmailAuthError,
     GmailAPIError,
@@ -51,54 +47,27 @@ def _get_gmail_service(area: Area, db=None):
         close_db = True
 
     try:
-        # Get service connection for Gmail
-        connection = get_service_connection_by_user_and_service(db, area.user_id, "gmail")
-        if not connection:
+        # Get cached credentials, refreshing the token if it is about to expire
+        try:
+            credentials = get_google_credentials(db, area.user_id, "gmail")
+        except Exception as refresh_err:
+            logger.error(
+                "Failed to refresh Gmail token",
+                extra={
+                    "user_id": str(area.user_id),
+                    "area_id": str(area.id),
+                    "error": str(refresh_err),
+                },
+                exc_info=True,
+            )
+            raise GmailAuthError("Failed to refresh Gmail token") from refresh_err
+        if credentials is None:
             raise GmailConnectionError("Gmail service connection not found. Please connect your Gmail account.")
 
-        # Create credentials from stored tokens
-        from app.core.encryption import decrypt_token
-        access_token = decrypt_token(connection.encrypted_access_token)
-        refresh_token = None
-        if connection.encrypted_refresh_token:
-            refresh_token = decrypt_token(connection.encrypted_refresh_token)
-
-        creds = Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
-        )
-
-        # Auto-refresh if expired and persist new token
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-                update_service_connection(
-                    db,
-                    str(connection.id),
-                    ServiceConnectionUpdate(
-                        service_name=connection.service_name,
-                        access_token=creds.token,
-                        expires_at=creds.expiry,
-                    ),
-                )
-            except Exception as refresh_err:
-                logger.error(
-                    "Failed to refresh Gmail token",
-                    extra={
-                        "user_id": str(area.user_id),
-                        "area_id": str(area.id),
-                        "error": str(refresh_err),
-                    },
-                    exc_info=True,
-                )
-                # Preserve the expected error message for tests and callers
-                raise GmailAuthError("Failed to refresh Gmail token") from refresh_err
-
         # Build Gmail service
-        service = build('gmail', 'v1', credentials=creds)
+        service = get_google_client(
+            credentials.connection_id, 'gmail', 'v1', build_google_credentials(credentials)
+        )
         return service
     finally:
         if close_db:
@@ -3,37 +3,50 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import json
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Dict
 
+from sqlalchemy.orm import selectinload
+
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 
-from app.core.encryption import decrypt_token
 from app.core.config import settings
+from app.integrations.simple_plugins.google_clients import (
+    build_google_credentials,
+    get_google_client,
+    get_google_credentials,
+)
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.integrations.variable_extractor import extract_gmail_variables
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import (
-    get_service_connection_by_user_and_service,
-    update_service_connection,
-)
-from app.schemas.service_connection import ServiceConnectionUpdate
-from app.services.step_executor import execute_area
+from app.services.credential_manager import credential_manager
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.seen_events import SeenEventStore
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 logger = logging.getLogger("area")
 
-# In-memory storage for last seen message IDs per AREA
-_last_seen_messages: Dict[str, set[str]] = {}
-_gmail_scheduler_task: asyncio.Task | None = None
+# Message IDs already seen per AREA (list sync mode only)
+_seen_events = SeenEventStore("gmail")
+
+# Sync cursor key holding the last processed Gmail historyId of a connection
+GMAIL_HISTORY_CURSOR = "gmail:history"
+
+# Headers kept by _extract_message_data; metadata fetches download nothing else
+_METADATA_HEADERS = ['From', 'Subject', 'Date']
+
+# Gmail recommends at most 50 requests per batch to avoid rate limiting
+_BATCH_SIZE = 50
+
+# Step variables that need the full message instead of its metadata
+_BODY_VARIABLES = ("gmail.body",)
 
 
 def _get_gmail_service(user_id, db: Session):
@@ -47,64 +60,39 @@ def _get_gmail_service(user_id, db: Session):
         Gmail service object or None if connection not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "gmail")
-        if not connection:
+        credentials = get_google_credentials(db, user_id, "gmail")
+        if credentials is None:
             return None
-
-        access_token = decrypt_token(connection.encrypted_access_token)
-        refresh_token = None
-        if connection.encrypted_refresh_token:
-            refresh_token = decrypt_token(connection.encrypted_refresh_token)
-
-        creds = Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
+        return get_google_client(
+            credentials.connection_id, 'gmail', 'v1', build_google_credentials(credentials)
         )
-
-        # Refresh if needed and persist new access token
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-                # Persist updated access token and expiry
-                update_service_connection(
-                    db,
-                    str(connection.id),
-                    ServiceConnectionUpdate(
-                        service_name=connection.service_name,
-                        access_token=creds.token,
-                        # Keep same refresh token (Google rarely rotates it)
-                        expires_at=creds.expiry,
-                    ),
-                )
-            except RefreshError as refresh_err:
-                logger.warning(
-                    f"Gmail token expired or revoked for user {user_id}. "
-                    f"User needs to reconnect their Gmail account."
-                )
-                return None
-            except Exception as refresh_err:
-                logger.error(f"Failed to refresh Gmail token: {refresh_err}")
-                return None
-
-        return build('gmail', 'v1', credentials=creds)
+    except RefreshError:
+        logger.warning(
+            f"Gmail token expired or revoked for user {user_id}. "
+            f"User needs to reconnect their Gmail account."
+        )
+        return None
     except Exception as e:
         logger.error(f"Failed to get Gmail service: {e}", exc_info=True)
         return None
 
 
-def _fetch_messages(service, query: str, max_results: int = 10) -> list[dict]:
+def _fetch_messages(
+    service,
+    query: str,
+    max_results: int = 10,
+    message_format: str = 'metadata',
+) -> list[dict]:
     """Fetch messages from Gmail API.
 
     Args:
         service: Gmail API service
         query: Gmail search query
         max_results: Maximum number of messages to fetch
+        message_format: 'metadata' (headers, labels, snippet) or 'full'
 
     Returns:
-        List of message objects with full details
+        List of message objects
     """
     try:
         # List messages matching query
@@ -116,21 +104,8 @@ def _fetch_messages(service, query: str, max_results: int = 10) -> list[dict]:
 
         messages = results.get('messages', [])
 
-        # Fetch full details for each message
-        full_messages = []
-        for msg in messages:
-            try:
-                full_msg = service.users().messages().get(
-                    userId='me',
-                    id=msg['id'],
-                    format='full'
-                ).execute()
-                full_messages.append(full_msg)
-            except HttpError as e:
-                logger.warning(f"Failed to fetch message {msg['id']}: {e}")
-                continue
-
-        return full_messages
+        # Fetch details of every listed message in batched requests
+        return _get_messages(service, [msg['id'] for msg in messages], message_format)
     except RefreshError:
         # Token expired/revoked - already logged in _get_gmail_service
         return []
@@ -139,6 +114,178 @@ def _fetch_messages(service, query: str, max_results: int = 10) -> list[dict]:
         return []
 
 
+def _get_messages(service, message_ids: list[str], message_format: str = 'metadata') -> list[dict]:
+    """Fetch messages by ID in batches, skipping the ones that fail.
+
+    Each batch of up to ``_BATCH_SIZE`` messages costs a single HTTP round-trip.
+    Metadata fetches only return the headers read by :func:`_extract_message_data`.
+
+    Args:
+        service: Gmail API service
+        message_ids: IDs of the messages to fetch
+        message_format: 'metadata' (headers, labels, snippet) or 'full'
+
+    Returns:
+        List of message objects, in the order of message_ids
+    """
+    message_ids = list(dict.fromkeys(message_ids))
+    fetched: Dict[str, dict] = {}
+
+    def _collect(request_id, response, exception) -> None:
+        if exception is not None:
+            logger.warning(f"Failed to fetch message {request_id}: {exception}")
+            return
+        fetched[request_id] = response
+
+    for start in range(0, len(message_ids), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_collect)
+        for message_id in message_ids[start:start + _BATCH_SIZE]:
+            if message_format == 'full':
+                request = service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='full'
+                )
+            else:
+                request = service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='metadata',
+                    metadataHeaders=_METADATA_HEADERS
+                )
+            batch.add(request, request_id=message_id)
+        batch.execute()
+
+    return [fetched[message_id] for message_id in message_ids if message_id in fetched]
+
+
+def _list_history(service, start_history_id: str) -> tuple[str, list[str], list[str]]:
+    """List mailbox changes since a history ID, draining every page.
+
+    Args:
+        service: Gmail API service
+        start_history_id: Last processed history ID
+
+    Returns:
+        Tuple of (latest history ID, IDs of added messages, IDs of newly starred messages)
+
+    Raises:
+        HttpError: 404 when the start history ID is too old to be served
+    """
+    added: list[str] = []
+    starred: list[str] = []
+    history_id = start_history_id
+    page_token = None
+
+    while True:
+        request = {
+            'userId': 'me',
+            'startHistoryId': start_history_id,
+            'historyTypes': ['messageAdded', 'labelAdded'],
+        }
+        if page_token:
+            request['pageToken'] = page_token
+        results = service.users().history().list(**request).execute()
+
+        for record in results.get('history', []):
+            for change in record.get('messagesAdded', []):
+                added.append(change['message']['id'])
+            for change in record.get('labelsAdded', []):
+                if 'STARRED' in change.get('labelIds', []):
+                    starred.append(change['message']['id'])
+
+        history_id = results.get('historyId', history_id)
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            break
+
+    return str(history_id), added, starred
+
+
+def _sync_history(
+    service,
+    db: Session,
+    user_id,
+    message_format: str = 'metadata',
+) -> Dict[str, list[dict]]:
+    """Fetch the messages added or starred since the connection's last sync.
+
+    The first sync of a connection only records the current history ID, so
+    enabling an area does not replay the mailbox. When Gmail no longer serves the
+    stored history ID, the inbox is re-listed from the time of the last sync.
+
+    Args:
+        service: Gmail API service
+        db: Database session
+        user_id: User UUID
+        message_format: 'metadata' (headers, labels, snippet) or 'full'
+
+    Returns:
+        Messages per stream query (see :func:`_build_stream_query`)
+    """
+    credentials = credential_manager.get(db, user_id, "gmail")
+    if credentials is None:
+        return {}
+
+    cursor = get_sync_cursor(db, credentials.connection_id, GMAIL_HISTORY_CURSOR)
+    if cursor is None:
+        profile = service.users().getProfile(userId='me').execute()
+        set_sync_cursor(db, credentials.connection_id, GMAIL_HISTORY_CURSOR, str(profile['historyId']))
+        logger.info(
+            f"Initialized Gmail history cursor for user {user_id}",
+            extra={"user_id": str(user_id), "history_id": str(profile['historyId'])},
+        )
+        return {}
+
+    try:
+        history_id, added_ids, starred_ids = _list_history(service, cursor.value)
+    except HttpError as e:
+        if getattr(e.resp, 'status', None) != 404:
+            raise
+        # History ID expired: re-list what arrived since the last successful sync
+        last_sync = int(cursor.updated_at.timestamp())
+        logger.warning(
+            f"Gmail history expired for user {user_id}, re-listing inbox since last sync",
+            extra={"user_id": str(user_id), "history_id": cursor.value},
+        )
+        profile = service.users().getProfile(userId='me').execute()
+        messages = _fetch_messages(
+            service, f"in:inbox after:{last_sync}", max_results=100, message_format=message_format
+        )
+        set_sync_cursor(db, credentials.connection_id, GMAIL_HISTORY_CURSOR, str(profile['historyId']))
+        return {
+            "in:inbox": messages,
+            "is:starred": [m for m in messages if 'STARRED' in m.get('labelIds', [])],
+        }
+
+    messages = {
+        message['id']: message
+        for message in _get_messages(service, added_ids + starred_ids, message_format)
+    }
+    set_sync_cursor(db, credentials.connection_id, GMAIL_HISTORY_CURSOR, history_id)
+
+    added = [messages[message_id] for message_id in dict.fromkeys(added_ids) if message_id in messages]
+    starred_set = set(starred_ids)
+    return {
+        "in:inbox": added,
+        "is:starred": [
+            message for message in messages.values()
+            if message['id'] in starred_set or 'STARRED' in message.get('labelIds', [])
+        ],
+    }
+
+
+def _prime_history_areas(db: Session, areas: list[Area]) -> None:
+    """Prime the areas fed by history sync that were never polled.
+
+    History streams only carry what changed since the previous sync, so the
+    first message an area receives is new and must not be taken for backlog.
+    """
+    for area in areas:
+        if not _seen_events.is_primed(db, str(area.id)):
+            _seen_events.prime(db, str(area.id), [])
+
+
 def _extract_message_data(message: dict) -> dict:
     """Extract relevant data from Gmail message.
 
@@ -164,7 +311,7 @@ def _extract_message_data(message: dict) -> dict:
         elif name == 'date':
             date = value
 
-    return {
+    data = {
         'id': message.get('id'),
         'threadId': message.get('threadId'),
         'snippet': message.get('snippet', ''),
@@ -182,6 +329,34 @@ def _extract_message_data(message: dict) -> dict:
         'date': date,
     }
 
+    # Only full messages carry the body (see _area_needs_body)
+    body = _extract_body(message.get('payload', {}))
+    if body:
+        data['body'] = body
+
+    return data
+
+
+def _extract_body(payload: dict) -> str:
+    """Return the first text/plain part of a full Gmail message payload, decoded.
+
+    Args:
+        payload: Message payload (MIME tree)
+
+    Returns:
+        Decoded plain text body or an empty string
+    """
+    data = payload.get('body', {}).get('data')
+    if payload.get('mimeType') == 'text/plain' and data:
+        padded = data + '=' * (-len(data) % 4)
+        return base64.urlsafe_b64decode(padded).decode('utf-8', errors='replace')
+
+    for part in payload.get('parts', []):
+        body = _extract_body(part)
+        if body:
+            return body
+    return ""
+
 
 def _fetch_due_gmail_areas(db: Session) -> list[Area]:
     """Fetch all enabled areas with Gmail triggers.
@@ -194,6 +369,8 @@ def _fetch_due_gmail_areas(db: Session) -> list[Area]:
     """
     return (
         db.query(Area)
+        # Steps are read by _area_needs_body once the session is closed
+        .options(selectinload(Area.steps))
         .filter(
             Area.enabled == True,  # noqa: E712
             Area.trigger_service == "gmail",
@@ -202,130 +379,112 @@ def _fetch_due_gmail_areas(db: Session) -> list[Area]:
     )
 
 
-async def gmail_scheduler_task() -> None:
-    """Background task that polls Gmail for new messages based on AREA triggers."""
-    from app.db.session import SessionLocal
+class GmailTriggerSource(TriggerSource):
+    """Polls Gmail for new messages matching each area's trigger.
 
-    logger.info("Starting Gmail polling scheduler task")
+    Areas are grouped per user: the mailbox is fetched once per stream (inbox,
+    starred) for all of a user's areas and each area's filter is applied locally.
+    With history sync, a stream only holds the messages added or starred since the
+    previous poll; the seen set still drops the messages re-listed when Gmail
+    expires the history ID.
+    """
 
-    while True:
-        try:
-            # Poll at configurable interval (default: 60 seconds)
-            await asyncio.sleep(settings.gmail_poll_interval_seconds)
+    service = "gmail"
+    name = "Gmail"
 
-            now = datetime.now(timezone.utc)
+    @property
+    def seen(self) -> SeenEventStore:
+        return _seen_events
 
-            # Fetch all enabled Gmail areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_gmail_areas, db)
+    @property
+    def poll_interval(self) -> float:
+        return settings.gmail_poll_interval_seconds
 
-                logger.info(
-                    "Gmail scheduler tick",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_gmail_areas(db)
+
+    def group_key(self, area: Area) -> str:
+        # One Gmail connection per user, so all of a user's areas share a fetch
+        return str(area.user_id)
+
+    def push_scope(self, area: Area) -> str | None:
+        # A mailbox watch reports every change of the user's mailbox
+        return str(area.user_id)
+
+    def primes_when_empty(self, area: Area) -> bool:
+        # Listing errors return no message, so listed areas prime from a real listing
+        return settings.gmail_history_sync
+
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        user_id = areas[0].user_id
+        try:
+            # Get Gmail service for user
+            service = await asyncio.to_thread(_get_gmail_service, user_id, db)
+            if not service:
+                logger.warning(
+                    f"Gmail service not available for user {user_id}, skipping {len(areas)} area(s)"
+                )
+                return []
+
+            # Download bodies only when one of the user's areas reads them
+            message_format = 'full' if any(_area_needs_body(area) for area in areas) else 'metadata'
+
+            streams: Dict[str, list[dict]] = {}
+            if settings.gmail_history_sync:
+                # The history cursor, not a first poll, marks where each area starts
+                await asyncio.to_thread(_prime_history_areas, db, areas)
+                streams = await asyncio.to_thread(
+                    _sync_history, service, db, user_id, message_format
                 )
 
-            # Process each area with its own scoped session
+            events: list[TriggerEvent] = []
             for area in areas:
                 area_id_str = str(area.id)
 
-                # Initialize last seen messages set for this area
-                if area_id_str not in _last_seen_messages:
-                    _last_seen_messages[area_id_str] = set()
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get Gmail service for user
-                        service = await asyncio.to_thread(_get_gmail_service, area.user_id, db)
-                        if not service:
-                            logger.warning(
-                                f"Gmail service not available for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Build query based on trigger action
-                        query = _build_gmail_query(area)
-                        if not query:
-                            logger.warning(
-                                f"Unknown Gmail trigger action: {area.trigger_action} for area {area_id_str}"
-                            )
-                            continue
-
-                        # Fetch messages
-                        messages = await asyncio.to_thread(_fetch_messages, service, query)
-
-                        # On first run for this area, prime the seen set with fetched IDs to avoid backlog
-                        if len(_last_seen_messages[area_id_str]) == 0 and messages:
-                            _last_seen_messages[area_id_str].update(m['id'] for m in messages)
-                            logger.info(
-                                f"Initialized seen set for area {area_id_str} with {len(messages)} message(s)"
-                            )
-
-                        logger.info(
-                            f"Gmail fetched {len(messages)} message(s) for area {area_id_str}, "
-                            f"already seen: {len(_last_seen_messages[area_id_str])}",
-                            extra={
-                                "area_id": area_id_str,
-                                "area_name": area.name,
-                                "user_id": str(area.user_id),
-                                "messages_fetched": len(messages),
-                                "messages_already_seen": len(_last_seen_messages[area_id_str]),
-                                "query": query,
-                            }
-                        )
-
-                        # Filter for new messages
-                        new_messages = [
-                            msg for msg in messages
-                            if msg['id'] not in _last_seen_messages[area_id_str]
-                        ]
-
-                        if new_messages:
-                            logger.info(
-                                f"Found {len(new_messages)} NEW message(s) for area {area_id_str}",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "area_name": area.name,
-                                    "user_id": str(area.user_id),
-                                    "new_messages_count": len(new_messages),
-                                    "message_ids": [msg['id'] for msg in new_messages],
-                                }
-                            )
-
-                        # Process each new message
-                        for message in new_messages:
-                            await _process_gmail_trigger(db, area, message, now)
-                            # Mark as seen
-                            _last_seen_messages[area_id_str].add(message['id'])
-
-                except RefreshError as e:
-                    # Token expired/revoked - show clean warning
+                # Build query based on trigger action
+                query = _build_gmail_query(area)
+                if not query:
                     logger.warning(
-                        f"Gmail area {area_id_str} skipped: token expired or revoked. "
-                        f"User needs to reconnect Gmail account."
+                        f"Unknown Gmail trigger action: {area.trigger_action} for area {area_id_str}"
                     )
-                except Exception as e:
-                    logger.error(
-                        "Error processing Gmail area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
+                    continue
+
+                # Fetch each stream once per user and filter it locally for every area
+                stream_query = _build_stream_query(area)
+                if settings.gmail_history_sync:
+                    streams.setdefault(stream_query, [])
+                elif stream_query not in streams:
+                    streams[stream_query] = await asyncio.to_thread(
+                        _fetch_messages, service, stream_query, message_format=message_format
                     )
+                messages = [
+                    message for message in streams[stream_query]
+                    if _message_matches_area(area, message)
+                ]
 
-        except asyncio.CancelledError:
-            logger.info("Gmail scheduler task cancelled, shutting down gracefully")
-            break
-
-        except Exception as e:
-            logger.error("Gmail scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
+                logger.info(
+                    f"Gmail matched {len(messages)} message(s) for area {area_id_str}",
+                    extra={
+                        "area_id": area_id_str,
+                        "area_name": area.name,
+                        "user_id": str(user_id),
+                        "messages_fetched": len(streams[stream_query]),
+                        "messages_matched": len(messages),
+                        "query": query,
+                    }
+                )
+                events.extend(TriggerEvent(area, message, message['id']) for message in messages)
+            return events
+        except RefreshError:
+            # Token expired/revoked - show clean warning
+            logger.warning(
+                f"Gmail areas of user {user_id} skipped: token expired or revoked. "
+                f"User needs to reconnect Gmail account."
+            )
+            return []
 
-    logger.info("Gmail scheduler task stopped")
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _process_gmail_trigger(db, event.area, event.payload, now)
 
 
 def _build_gmail_query(area: Area) -> str | None:
@@ -362,152 +521,119 @@ def _build_gmail_query(area: Area) -> str | None:
     return None
 
 
-async def _process_gmail_trigger(db: Session, area: Area, message: dict, now: datetime) -> None:
-    """Process a Gmail trigger event and execute the area.
+def _area_needs_body(area: Area) -> bool:
+    """Check whether an area's reaction or steps reference the message body.
 
     Args:
-        db: Database session
-        area: Area to execute
-        message: Gmail message data
-        now: Current timestamp
+        area: Area with Gmail trigger (steps loaded)
+
+    Returns:
+        True if a full message fetch is needed to resolve the area's variables
     """
-    # Re-attach the Area instance to the current session so lazy-loaded
-    # relationships (like `steps`) can be accessed during execution.
-    area = db.merge(area)
-    area_id_str = str(area.id)
-    execution_log = None
+    configs = [area.reaction_params or {}] + [step.config or {} for step in area.steps]
+    serialized = json.dumps(configs, default=str)
+    return any(variable in serialized for variable in _BODY_VARIABLES)
 
-    try:
-        # Extract message data
-        message_data = _extract_message_data(message)
-
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "message_id": message_data.get('id'),
-                    "subject": message_data.get('subject'),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Use extract_gmail_variables to get variables from message
-        variables = extract_gmail_variables(message_data)
-
-        # Build trigger_data with gmail variables
-        trigger_data = {
-            **variables,  # Include all extracted gmail.* variables
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
 
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Gmail trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "message_id": message_data.get('id'),
-        }
-        db.commit()
+def _build_stream_query(area: Area) -> str:
+    """Return the per-user message stream an area's trigger is matched against.
 
-        logger.info(
-            "Gmail trigger executed",
-            extra={
-                "area_id": area_id_str,
-                "area_name": area.name,
-                "user_id": str(area.user_id),
-                "message_id": message_data.get('id'),
-                "thread_id": message_data.get('threadId'),
-                "subject": message_data.get('subject'),
-                "sender": message_data.get('sender'),
-                "snippet": message_data.get('snippet'),
-                "date": message_data.get('date'),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
-                "execution_log": result.get("execution_log", []),
-            },
-        )
+    Inbox triggers (new, from sender, unread) share a single inbox listing while
+    starred messages, which can be old, are listed separately.
 
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Gmail trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
+    Args:
+        area: Area with Gmail trigger
 
+    Returns:
+        Gmail search query of the stream
+    """
+    if area.trigger_action == "email_starred":
+        return "is:starred"
+    return "in:inbox"
 
-def start_gmail_scheduler() -> None:
-    """Start the Gmail polling scheduler task."""
-    global _gmail_scheduler_task
 
-    if _gmail_scheduler_task is not None:
-        logger.warning("Gmail scheduler task already running")
-        return
+def _message_matches_area(area: Area, message: dict) -> bool:
+    """Check locally whether a fetched message satisfies an area's trigger.
 
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start Gmail scheduler")
-        return
+    Args:
+        area: Area with Gmail trigger
+        message: Full Gmail message object
+
+    Returns:
+        True if the message would be returned by the area's own Gmail query
+    """
+    trigger_action = area.trigger_action
+    params = area.trigger_params or {}
+    labels = message.get('labelIds', [])
 
-    _gmail_scheduler_task = loop.create_task(gmail_scheduler_task())
-    logger.info("Gmail scheduler task started")
+    if trigger_action == "email_starred":
+        return "STARRED" in labels
 
+    if "INBOX" not in labels:
+        return False
 
-def stop_gmail_scheduler() -> None:
-    """Stop the Gmail polling scheduler task."""
-    global _gmail_scheduler_task
+    if trigger_action == "new_email_from_sender":
+        sender = (params.get("sender_email") or "").strip().lower()
+        return not sender or sender in _extract_message_data(message)['sender'].lower()
 
-    if _gmail_scheduler_task is not None:
-        _gmail_scheduler_task.cancel()
-        _gmail_scheduler_task = None
-        logger.info("Gmail scheduler task stopped")
+    if trigger_action == "new_unread_email":
+        return "UNREAD" in labels
 
+    return trigger_action == "new_email"
 
-def is_gmail_scheduler_running() -> bool:
-    """Check if the Gmail scheduler task is running.
 
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
+async def _process_gmail_trigger(db: Session, area: Area, message: dict, now: datetime) -> None:
+    """Process a Gmail trigger event and queue the area for execution.
+
+    Args:
+        db: Database session
+        area: Area to execute
+        message: Gmail message data
+        now: Current timestamp
     """
-    global _gmail_scheduler_task
-    return _gmail_scheduler_task is not None and not _gmail_scheduler_task.done()
+    # Re-attach the Area instance to the current session so its attributes
+    # can be read even if a previous commit expired them.
+    area = db.merge(area)
+    area_id_str = str(area.id)
+
+    # Extract message data
+    message_data = _extract_message_data(message)
+
+    # Use extract_gmail_variables to get variables from message
+    variables = extract_gmail_variables(message_data)
+
+    # Build trigger_data with gmail variables
+    trigger_data = {
+        **variables,  # Include all extracted gmail.* variables
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Gmail",
+            event={
+                "now": now.isoformat(),
+                "area_id": area_id_str,
+                "user_id": str(area.user_id),
+                "message_id": message_data.get('id'),
+                "subject": message_data.get('subject'),
+            },
+            details={"message_id": message_data.get('id')},
+        )
+    )
 
 
 def clear_gmail_seen_state() -> None:
-    """Clear the in-memory seen messages state (useful for testing)."""
-    global _last_seen_messages
-    _last_seen_messages.clear()
+    """Clear the in-memory seen messages state of list sync mode (useful for testing)."""
+    _seen_events.clear()
 
 
 __all__ = [
-    "gmail_scheduler_task",
-    "start_gmail_scheduler",
-    "is_gmail_scheduler_running",
-    "stop_gmail_scheduler",
+    "GmailTriggerSource",
     "clear_gmail_seen_state",
 ]
@@ -0,0 +1,178 @@
+"""Per-connection cache of Google API client objects.
+
+``googleapiclient.discovery.build()`` parses the API's discovery document and
+creates a new HTTP transport on every call, which used to happen for every area,
+every poll and every action. :func:`get_google_client` parses each discovery
+document once per process and reuses the client built for a service connection
+until that connection is updated or deleted. httplib2 transports are not
+thread-safe, so clients are cached per thread.
+
+Tokens come from the shared :mod:`app.services.credential_manager`, so every
+scheduler and plugin reuses the same decrypted tokens and a token is refreshed
+once for all concurrent callers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+from app.core.config import settings
+from app.integrations.oauth.base import OAuth2TokenSet
+from app.services.credential_manager import ConnectionCredentials, credential_manager
+
+logger = logging.getLogger("area")
+
+_discovery_documents: Dict[tuple[str, str], dict] = {}
+_generations: Dict[str, int] = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _discovery_document(api: str, version: str) -> dict:
+    """Return the parsed static discovery document of an API, parsing it once."""
+    key = (api, version)
+    document = _discovery_documents.get(key)
+    if document is None:
+        with _lock:
+            document = _discovery_documents.get(key)
+            if document is None:
+                raw = discovery_cache.get_static_doc(api, version)
+                if raw is None:
+                    raise ValueError(f"No static discovery document for {api} {version}")
+                document = json.loads(raw)
+                _discovery_documents[key] = document
+    return document
+
+
+def _thread_clients() -> OrderedDict:
+    clients = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = OrderedDict()
+    return clients
+
+
+def get_google_client(connection_id, api: str, version: str, credentials) -> Any:
+    """Return the Google API client of a service connection, building it on first use.
+
+    A cached client adopts the token and expiry of ``credentials`` so a token
+    refreshed by another worker or replica is used right away.
+
+    Args:
+        connection_id: ServiceConnection ID the credentials belong to
+        api: API name (e.g. "gmail", "calendar", "drive")
+        version: API version (e.g. "v1")
+        credentials: Current credentials of the connection
+
+    Returns:
+        Google API client resource
+    """
+    connection_id = str(connection_id)
+    key = (connection_id, api, version)
+    generation = _generations.get(connection_id, 0)
+    clients = _thread_clients()
+
+    entry = clients.get(key)
+    if entry is not None and entry[0] == generation:
+        _, client, cached_credentials = entry
+        clients.move_to_end(key)
+        if cached_credentials.token != credentials.token:
+            cached_credentials.token = credentials.token
+            cached_credentials.expiry = credentials.expiry
+        return client
+
+    client = build_from_document(_discovery_document(api, version), credentials=credentials)
+    clients[key] = (generation, client, credentials)
+    clients.move_to_end(key)
+    while len(clients) > max(settings.google_client_cache_size, 1):
+        clients.popitem(last=False)
+    return client
+
+
+def build_google_credentials(credentials: ConnectionCredentials) -> Credentials:
+    """Wrap the tokens of a Google service connection in google-auth credentials."""
+    return Credentials(
+        token=credentials.access_token,
+        refresh_token=credentials.refresh_token,
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=settings.google_client_id,
+        client_secret=settings.google_client_secret,
+    )
+
+
+def refresh_google_token(credentials: ConnectionCredentials) -> OAuth2TokenSet:
+    """Refresh a Google access token through google-auth.
+
+    Raises:
+        google.auth.exceptions.RefreshError: If the token is expired or revoked
+    """
+    creds = build_google_credentials(credentials)
+    creds.refresh(Request())
+    expires_in = None
+    if creds.expiry is not None:
+        # google-auth expiries are naive UTC datetimes
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        expires_in = max(int((creds.expiry - now).total_seconds()), 0)
+    return OAuth2TokenSet(
+        access_token=creds.token,
+        # Google rarely rotates refresh tokens
+        refresh_token=creds.refresh_token if creds.refresh_token != credentials.refresh_token else None,
+        expires_in=expires_in,
+    )
+
+
+def get_google_credentials(db: Session, user_id, service_name: str) -> Optional[ConnectionCredentials]:
+    """Return valid credentials of a user's Google connection, refreshing them if needed.
+
+    Args:
+        db: Database session
+        user_id: User UUID
+        service_name: Connection service ("gmail", "google_calendar", "google_drive")
+
+    Returns:
+        Credentials or None if the user has no such connection
+
+    Raises:
+        google.auth.exceptions.RefreshError: If the token is expired or revoked
+    """
+    credentials = credential_manager.get(db, user_id, service_name)
+    if credentials is not None and credentials.expired and credentials.refresh_token:
+        credentials = credential_manager.refresh(db, credentials, refresh_google_token)
+    return credentials
+
+
+def invalidate_google_clients(connection_id) -> None:
+    """Drop the cached clients of a connection in every thread (lazily, on next use)."""
+    connection_id = str(connection_id)
+    with _lock:
+        _generations[connection_id] = _generations.get(connection_id, 0) + 1
+
+
+def clear_google_client_cache() -> None:
+    """Clear cached clients and discovery documents (useful for testing)."""
+    with _lock:
+        _discovery_documents.clear()
+        _generations.clear()
+    _local.clients = OrderedDict()
+
+
+__all__ = [
+    "build_google_credentials",
+    "clear_google_client_cache",
+    "get_google_client",
+    "get_google_credentials",
+    "invalidate_google_clients",
+    "refresh_google_token",
+]
@@ -4,37 +4,42 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
 from google.auth.exceptions import RefreshError
 
-from app.core.encryption import decrypt_token
 from app.core.config import settings
+from app.integrations.simple_plugins.google_clients import (
+    build_google_credentials,
+    get_google_client,
+    get_google_credentials,
+)
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.integrations.variable_extractor import extract_google_drive_variables
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import (
-    get_service_connection_by_user_and_service,
-    update_service_connection,
-)
-from app.schemas.service_connection import ServiceConnectionUpdate
-from app.services.step_executor import execute_area
+from app.services.credential_manager import credential_manager
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.seen_events import SeenEventStore
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 logger = logging.getLogger("area")
 
-# In-memory storage for tracking changes per user
-_last_page_tokens: Dict[str, str] = {}
-_last_seen_files: Dict[str, set[str]] = {}
-_google_drive_scheduler_task: asyncio.Task | None = None
+# Sync cursor holding the Changes API page token of a connection
+DRIVE_CHANGES_CURSOR = "google_drive:changes"
+
+# File IDs already seen per AREA
+_seen_files = SeenEventStore("google_drive")
+
+# Triggers that record the files they fired for
+_SEEN_TRACKING_ACTIONS = {"new_file", "file_in_folder", "file_shared_with_me"}
+
+# Triggers matched against the connection's change feed
+_CHANGE_FEED_ACTIONS = {"new_file", "file_modified", "file_trashed"}
 
 
 def _get_drive_service(user_id, db: Session):
@@ -48,48 +53,18 @@ def _get_drive_service(user_id, db: Session):
         Drive service object or None if connection not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "google_drive")
-        if not connection:
+        credentials = get_google_credentials(db, user_id, "google_drive")
+        if credentials is None:
             return None
-
-        access_token = decrypt_token(connection.encrypted_access_token)
-        refresh_token = None
-        if connection.encrypted_refresh_token:
-            refresh_token = decrypt_token(connection.encrypted_refresh_token)
-
-        creds = Credentials(
-            token=access_token,
-            refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
+        return get_google_client(
+            credentials.connection_id, 'drive', 'v3', build_google_credentials(credentials)
         )
-
-        # Refresh if needed and persist new access token
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(Request())
-                # Persist updated access token and expiry
-                update_service_connection(
-                    db,
-                    str(connection.id),
-                    ServiceConnectionUpdate(
-                        service_name=connection.service_name,
-                        access_token=creds.token,
-                        expires_at=creds.expiry,
-                    ),
-                )
-            except RefreshError as refresh_err:
-                logger.warning(
-                    f"Google Drive token expired or revoked for user {user_id}. "
-                    f"User needs to reconnect their Google Drive account."
-                )
-                return None
-            except Exception as refresh_err:
-                logger.error(f"Failed to refresh Google Drive token: {refresh_err}")
-                return None
-
-        return build('drive', 'v3', credentials=creds)
+    except RefreshError:
+        logger.warning(
+            f"Google Drive token expired or revoked for user {user_id}. "
+            f"User needs to reconnect their Google Drive account."
+        )
+        return None
     except Exception as e:
         logger.error(f"Failed to get Google Drive service: {e}", exc_info=True)
         return None
@@ -105,7 +80,7 @@ def _get_start_page_token(service) -> str | None:
         Page token string or None
     """
     try:
-        response = service.changes().getStartPageToken().execute()
+        response = service.changes().getStartPageToken(supportsAllDrives=True).execute()
         return response.get('startPageToken')
     except HttpError as e:
         logger.error(f"Failed to get start page token: {e}")
@@ -113,34 +88,77 @@ def _get_start_page_token(service) -> str | None:
 
 
 def _fetch_changes(service, page_token: str) -> tuple[list[dict], str | None]:
-    """Fetch changes from Google Drive API.
+    """Drain the Changes API from a page token across all pages.
+
+    Changes of My Drive and of the shared drives the user belongs to are
+    included. When a page fails, the changes fetched so far are returned with
+    the token of the failed page so the next poll resumes there.
 
     Args:
         service: Google Drive API service
         page_token: Page token to start from
 
     Returns:
-        Tuple of (list of changes, next page token)
+        Tuple of (list of changes, token to resume from or None when no page was read)
     """
-    try:
-        response = service.changes().list(
-            pageToken=page_token,
-            spaces='drive',
-            fields='changes(file(id,name,mimeType,trashed,createdTime,modifiedTime,owners,webViewLink,parents,shared,size),fileId,removed,time),newStartPageToken,nextPageToken',
-            pageSize=100
-        ).execute()
+    changes: list[dict] = []
+    resume_token = None
+    while True:
+        try:
+            response = service.changes().list(
+                pageToken=page_token,
+                spaces='drive',
+                fields='changes(file(id,name,mimeType,trashed,createdTime,modifiedTime,owners,webViewLink,parents,shared,size),fileId,removed,time),newStartPageToken,nextPageToken',
+                pageSize=100,
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True,
+            ).execute()
+        except RefreshError:
+            # Token expired/revoked - already logged in _get_drive_service
+            return changes, resume_token
+        except HttpError as e:
+            logger.error(f"Google Drive API error fetching changes: {e}", exc_info=True)
+            return changes, resume_token
+
+        changes.extend(response.get('changes', []))
+        if response.get('newStartPageToken'):
+            return changes, response['newStartPageToken']
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return changes, resume_token
+        resume_token = page_token
+
+
+def _sync_changes(service, db: Session, user_id) -> list[dict] | None:
+    """Fetch the changes of a user's Drive since the connection's stored page token.
+
+    The first sync of a connection only records a start page token, so
+    enabling an area does not replay the Drive history.
 
-        changes = response.get('changes', [])
-        new_start_page_token = response.get('newStartPageToken')
-        next_page_token = response.get('nextPageToken')
+    Args:
+        service: Google Drive API service
+        db: Database session
+        user_id: User UUID
 
-        return changes, new_start_page_token or next_page_token
-    except RefreshError:
-        # Token expired/revoked - already logged in _get_drive_service
-        return [], None
-    except HttpError as e:
-        logger.error(f"Google Drive API error fetching changes: {e}", exc_info=True)
-        return [], None
+    Returns:
+        List of changes, or None when the change feed was just initialized
+    """
+    credentials = credential_manager.get(db, user_id, "google_drive")
+    if credentials is None:
+        return None
+
+    cursor = get_sync_cursor(db, credentials.connection_id, DRIVE_CHANGES_CURSOR)
+    if cursor is None:
+        token = _get_start_page_token(service)
+        if token:
+            set_sync_cursor(db, credentials.connection_id, DRIVE_CHANGES_CURSOR, token)
+            logger.info(f"Initialized page token for user {user_id}")
+        return None
+
+    changes, new_token = _fetch_changes(service, cursor.value)
+    if new_token:
+        set_sync_cursor(db, credentials.connection_id, DRIVE_CHANGES_CURSOR, new_token)
+    return changes
 
 
 def _fetch_files_in_folder(service, folder_id: str) -> list[dict]:
@@ -237,258 +255,186 @@ def _fetch_due_google_drive_areas(db: Session) -> list[Area]:
     )
 
 
-async def google_drive_scheduler_task() -> None:
-    """Background task that polls Google Drive for changes based on AREA triggers."""
-    from app.db.session import SessionLocal
+class GoogleDriveTriggerSource(TriggerSource):
+    """Polls Google Drive changes and file listings for each area's trigger.
 
-    logger.info("Starting Google Drive polling scheduler task")
+    Areas are grouped per user: the connection's change feed is drained once per
+    poll and every folder or shared-with-me listing is fetched once, then each
+    area's matcher picks its files. Drive records seen file IDs per area itself,
+    only for the triggers that fire once per file.
+    """
 
-    while True:
-        try:
-            # Poll at configurable interval (default: 60 seconds)
-            await asyncio.sleep(settings.google_drive_poll_interval_seconds)
+    service = "google_drive"
+    name = "Google Drive"
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.google_drive_poll_interval_seconds
 
-            now = datetime.now(timezone.utc)
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_google_drive_areas(db)
+
+    def group_key(self, area: Area) -> str:
+        # One Drive connection per user, so all of a user's areas share its change feed
+        return str(area.user_id)
+
+    def push_scope(self, area: Area) -> str | None:
+        # A changes.watch channel only covers the triggers read from the change feed
+        if area.trigger_action in _CHANGE_FEED_ACTIONS:
+            return str(area.user_id)
+        return None
 
-            # Fetch all enabled Google Drive areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_google_drive_areas, db)
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        user_id = areas[0].user_id
 
-                logger.info(
-                    "Google Drive scheduler tick",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
+        events: list[TriggerEvent] = []
+        try:
+            # Get Drive service for user
+            service = await asyncio.to_thread(_get_drive_service, user_id, db)
+            if not service:
+                logger.warning(
+                    f"Google Drive service not available for user {user_id}, skipping {len(areas)} area(s)"
                 )
+                return []
 
-            # Process each area with its own scoped session
+            # Drain the change feed once and share it with every area of the user
+            changes = None
+            if any(area.trigger_action in _CHANGE_FEED_ACTIONS for area in areas):
+                changes = await asyncio.to_thread(_sync_changes, service, db, user_id)
+
+            listings: Dict[str, list[dict]] = {}
             for area in areas:
-                area_id_str = str(area.id)
-                user_id_str = str(area.user_id)
-
-                # Initialize tracking for this area
-                if area_id_str not in _last_seen_files:
-                    _last_seen_files[area_id_str] = set()
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get Drive service for user
-                        service = await asyncio.to_thread(_get_drive_service, area.user_id, db)
-                        if not service:
-                            logger.warning(
-                                f"Google Drive service not available for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Process based on trigger action
-                        await _process_area_trigger(db, area, service, now)
-
-                except RefreshError as e:
-                    # Token expired/revoked - show clean warning
-                    logger.warning(
-                        f"Google Drive area {area_id_str} skipped: token expired or revoked. "
-                        f"User needs to reconnect Google Drive account."
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Error processing Google Drive area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-
-        except asyncio.CancelledError:
-            logger.info("Google Drive scheduler task cancelled, shutting down gracefully")
-            break
-
-        except Exception as e:
-            logger.error("Google Drive scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
-
-    logger.info("Google Drive scheduler task stopped")
-
-
-async def _process_area_trigger(db: Session, area: Area, service, now: datetime) -> None:
-    """Process a specific area's trigger logic.
+                files = await _process_area_trigger(db, area, service, changes, listings)
+                events.extend(TriggerEvent(area, _extract_file_data(file_obj)) for file_obj in files)
+        except RefreshError:
+            # Token expired/revoked - show clean warning
+            logger.warning(
+                f"Google Drive areas of user {user_id} skipped: token expired or revoked. "
+                f"User needs to reconnect Google Drive account."
+            )
+            return []
+
+        await asyncio.to_thread(_seen_files.maybe_prune, db)
+        return events
+
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _execute_drive_trigger(db, event.area, event.payload, now)
+        if event.area.trigger_action in _SEEN_TRACKING_ACTIONS:
+            await asyncio.to_thread(_seen_files.add, db, str(event.area.id), [event.payload['id']])
+
+
+async def _process_area_trigger(
+    db: Session,
+    area: Area,
+    service,
+    changes: list[dict] | None,
+    listings: Dict[str, list[dict]],
+) -> list[dict]:
+    """Match the files that fire a specific area's trigger.
 
     Args:
-        db: Database session
+        db: Database session holding the seen files
         area: Area to process
         service: Google Drive service
-        now: Current timestamp
+        changes: Changes drained from the user's feed this poll, None if not synced yet
+        listings: Folder and shared-with-me listings of this poll, filled on first use
+
+    Returns:
+        Drive file objects to trigger the area with
     """
     area_id_str = str(area.id)
-    user_id_str = str(area.user_id)
     trigger_action = area.trigger_action
     params = area.trigger_params or {}
 
     # Route to specific trigger handler
     if trigger_action == "new_file":
-        await _handle_new_file_trigger(db, area, service, now)
+        return await _handle_new_file_trigger(db, area, changes)
     elif trigger_action == "file_modified":
-        await _handle_file_modified_trigger(db, area, service, now)
+        return _handle_file_modified_trigger(changes)
     elif trigger_action == "file_in_folder":
-        await _handle_file_in_folder_trigger(db, area, service, now, params)
+        return await _handle_file_in_folder_trigger(db, area, service, params, listings)
     elif trigger_action == "file_shared_with_me":
-        await _handle_file_shared_trigger(db, area, service, now)
+        return await _handle_file_shared_trigger(db, area, service, listings)
     elif trigger_action == "file_trashed":
-        await _handle_file_trashed_trigger(db, area, service, now)
-    else:
-        logger.warning(
-            f"Unknown Google Drive trigger action: {trigger_action} for area {area_id_str}"
-        )
-
-
-async def _handle_new_file_trigger(db: Session, area: Area, service, now: datetime) -> None:
-    """Handle new_file trigger using Changes API."""
-    user_id_str = str(area.user_id)
-    area_id_str = str(area.id)
-
-    # Initialize page token if not exists
-    if user_id_str not in _last_page_tokens:
-        token = await asyncio.to_thread(_get_start_page_token, service)
-        if token:
-            _last_page_tokens[user_id_str] = token
-            logger.info(f"Initialized page token for user {user_id_str}")
-        return
+        return _handle_file_trashed_trigger(changes)
 
-    # Fetch changes
-    changes, new_token = await asyncio.to_thread(
-        _fetch_changes, service, _last_page_tokens[user_id_str]
+    logger.warning(
+        f"Unknown Google Drive trigger action: {trigger_action} for area {area_id_str}"
     )
+    return []
 
-    if new_token:
-        _last_page_tokens[user_id_str] = new_token
 
-    # Filter for new files (not removed, not trashed)
-    new_files = [
-        change['file'] for change in changes
+def _changed_files(changes: list[dict] | None, trashed: bool) -> list[dict]:
+    """Return the files of changes that were not removed, trashed or not."""
+    return [
+        change['file'] for change in changes or []
         if not change.get('removed', False)
         and 'file' in change
-        and not change['file'].get('trashed', False)
-        and change['file']['id'] not in _last_seen_files[area_id_str]
+        and change['file'].get('trashed', False) == trashed
     ]
 
-    # Process each new file
-    for file_obj in new_files:
-        file_data = _extract_file_data(file_obj)
-        await _execute_drive_trigger(db, area, file_data, now)
-        _last_seen_files[area_id_str].add(file_obj['id'])
 
+async def _unseen_files(db: Session, area: Area, files: list[dict]) -> list[dict]:
+    """Keep the files the area has not fired for yet."""
+    unseen = await asyncio.to_thread(_seen_files.unseen, db, str(area.id), [f['id'] for f in files])
+    return [f for f in files if f['id'] in unseen]
 
-async def _handle_file_modified_trigger(db: Session, area: Area, service, now: datetime) -> None:
-    """Handle file_modified trigger using Changes API."""
-    user_id_str = str(area.user_id)
-    area_id_str = str(area.id)
-
-    # Initialize page token if not exists
-    if user_id_str not in _last_page_tokens:
-        token = await asyncio.to_thread(_get_start_page_token, service)
-        if token:
-            _last_page_tokens[user_id_str] = token
-        return
 
-    # Fetch changes
-    changes, new_token = await asyncio.to_thread(
-        _fetch_changes, service, _last_page_tokens[user_id_str]
-    )
+async def _handle_new_file_trigger(db: Session, area: Area, changes: list[dict] | None) -> list[dict]:
+    """Handle new_file trigger using Changes API."""
+    # Filter for new files (not removed, not trashed)
+    return await _unseen_files(db, area, _changed_files(changes, trashed=False))
 
-    if new_token:
-        _last_page_tokens[user_id_str] = new_token
 
-    # Filter for modified files (existing files with changes)
-    modified_files = [
-        change['file'] for change in changes
-        if not change.get('removed', False)
-        and 'file' in change
-        and not change['file'].get('trashed', False)
-        and change['file']['id'] in _last_seen_files[area_id_str]
+def _handle_file_modified_trigger(changes: list[dict] | None) -> list[dict]:
+    """Handle file_modified trigger using Changes API."""
+    # Filter for modified files (changed after they were created)
+    return [
+        f for f in _changed_files(changes, trashed=False)
+        if f.get('modifiedTime') and f.get('modifiedTime') != f.get('createdTime')
     ]
 
-    # Process each modified file
-    for file_obj in modified_files:
-        file_data = _extract_file_data(file_obj)
-        await _execute_drive_trigger(db, area, file_data, now)
 
-
-async def _handle_file_in_folder_trigger(db: Session, area: Area, service, now: datetime, params: dict) -> None:
+async def _handle_file_in_folder_trigger(
+    db: Session, area: Area, service, params: dict, listings: Dict[str, list[dict]]
+) -> list[dict]:
     """Handle file_in_folder trigger."""
     area_id_str = str(area.id)
     folder_id = params.get("folder_id")
 
     if not folder_id:
         logger.warning(f"No folder_id specified for file_in_folder trigger in area {area_id_str}")
-        return
+        return []
 
-    # Fetch files in folder
-    files = await asyncio.to_thread(_fetch_files_in_folder, service, folder_id)
+    # Fetch files in folder once per poll
+    listing_key = f"folder:{folder_id}"
+    if listing_key not in listings:
+        listings[listing_key] = await asyncio.to_thread(_fetch_files_in_folder, service, folder_id)
 
     # Filter for new files
-    new_files = [f for f in files if f['id'] not in _last_seen_files[area_id_str]]
+    return await _unseen_files(db, area, listings[listing_key])
 
-    # Process each new file
-    for file_obj in new_files:
-        file_data = _extract_file_data(file_obj)
-        await _execute_drive_trigger(db, area, file_data, now)
-        _last_seen_files[area_id_str].add(file_obj['id'])
 
-
-async def _handle_file_shared_trigger(db: Session, area: Area, service, now: datetime) -> None:
+async def _handle_file_shared_trigger(
+    db: Session, area: Area, service, listings: Dict[str, list[dict]]
+) -> list[dict]:
     """Handle file_shared_with_me trigger."""
-    area_id_str = str(area.id)
-
-    # Fetch shared files
-    files = await asyncio.to_thread(_fetch_shared_files, service)
+    # Fetch shared files once per poll
+    if "shared" not in listings:
+        listings["shared"] = await asyncio.to_thread(_fetch_shared_files, service)
 
     # Filter for new shared files
-    new_files = [f for f in files if f['id'] not in _last_seen_files[area_id_str]]
-
-    # Process each new shared file
-    for file_obj in new_files:
-        file_data = _extract_file_data(file_obj)
-        await _execute_drive_trigger(db, area, file_data, now)
-        _last_seen_files[area_id_str].add(file_obj['id'])
+    return await _unseen_files(db, area, listings["shared"])
 
 
-async def _handle_file_trashed_trigger(db: Session, area: Area, service, now: datetime) -> None:
+def _handle_file_trashed_trigger(changes: list[dict] | None) -> list[dict]:
     """Handle file_trashed trigger using Changes API."""
-    user_id_str = str(area.user_id)
-
-    # Initialize page token if not exists
-    if user_id_str not in _last_page_tokens:
-        token = await asyncio.to_thread(_get_start_page_token, service)
-        if token:
-            _last_page_tokens[user_id_str] = token
-        return
-
-    # Fetch changes
-    changes, new_token = await asyncio.to_thread(
-        _fetch_changes, service, _last_page_tokens[user_id_str]
-    )
-
-    if new_token:
-        _last_page_tokens[user_id_str] = new_token
-
     # Filter for trashed files
-    trashed_files = [
-        change['file'] for change in changes
-        if not change.get('removed', False)
-        and 'file' in change
-        and change['file'].get('trashed', False)
-    ]
-
-    # Process each trashed file
-    for file_obj in trashed_files:
-        file_data = _extract_file_data(file_obj)
-        await _execute_drive_trigger(db, area, file_data, now)
+    return _changed_files(changes, trashed=True)
 
 
 async def _execute_drive_trigger(db: Session, area: Area, file_data: dict, now: datetime) -> None:
-    """Execute the area with Drive file data.
+    """Queue the area for execution with Drive file data.
 
     Args:
         db: Database session
@@ -499,133 +445,43 @@ async def _execute_drive_trigger(db: Session, area: Area, file_data: dict, now:
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "file_id": file_data.get('id'),
-                    "file_name": file_data.get('name'),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Use extract_google_drive_variables to get variables from file
-        variables = extract_google_drive_variables(file_data)
-
-        # Build trigger_data with drive variables
-        trigger_data = {
-            **variables,  # Include all extracted drive.* variables
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Google Drive trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "file_id": file_data.get('id'),
-        }
-        db.commit()
-
-        logger.info(
-            "Google Drive trigger executed",
-            extra={
+    # Use extract_google_drive_variables to get variables from file
+    variables = extract_google_drive_variables(file_data)
+
+    # Build trigger_data with drive variables
+    trigger_data = {
+        **variables,  # Include all extracted drive.* variables
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Google Drive",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "file_id": file_data.get('id'),
                 "file_name": file_data.get('name'),
-                "mime_type": file_data.get('mimeType'),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
             },
+            details={"file_id": file_data.get('id')},
         )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Google Drive trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
-
-
-def start_google_drive_scheduler() -> None:
-    """Start the Google Drive polling scheduler task."""
-    global _google_drive_scheduler_task
-
-    if _google_drive_scheduler_task is not None:
-        logger.warning("Google Drive scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start Google Drive scheduler")
-        return
-
-    _google_drive_scheduler_task = loop.create_task(google_drive_scheduler_task())
-    logger.info("Google Drive scheduler task started")
-
-
-def stop_google_drive_scheduler() -> None:
-    """Stop the Google Drive polling scheduler task."""
-    global _google_drive_scheduler_task
-
-    if _google_drive_scheduler_task is not None:
-        _google_drive_scheduler_task.cancel()
-        _google_drive_scheduler_task = None
-        logger.info("Google Drive scheduler task stopped")
-
-
-def is_google_drive_scheduler_running() -> bool:
-    """Check if the Google Drive scheduler task is running.
-
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _google_drive_scheduler_task
-    return _google_drive_scheduler_task is not None and not _google_drive_scheduler_task.done()
+    )
 
 
 def clear_google_drive_seen_state() -> None:
     """Clear the in-memory seen files state (useful for testing)."""
-    global _last_seen_files, _last_page_tokens
-    _last_seen_files.clear()
-    _last_page_tokens.clear()
+    _seen_files.clear()
 
 
 __all__ = [
-    "google_drive_scheduler_task",
-    "start_google_drive_scheduler",
-    "is_google_drive_scheduler_running",
-    "stop_google_drive_scheduler",
+    "DRIVE_CHANGES_CURSOR",
+    "GoogleDriveTriggerSource",
     "clear_google_drive_seen_state",
 ]
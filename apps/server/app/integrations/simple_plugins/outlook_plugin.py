@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, Any, Dict
 import httpx
 
 from app.db.session import SessionLocal
-from app.services.service_connections import get_service_connection_by_user_and_service
+from app.services.credential_manager import credential_manager
 from app.integrations.simple_plugins.exceptions import (
     OutlookAuthError,
     OutlookAPIError,
@@ -44,8 +44,8 @@ async def _get_outlook_client(area: Area, db=None) -> httpx.AsyncClient:
 
     try:
         # Get service connection for Outlook
-        connection = get_service_connection_by_user_and_service(db, area.user_id, "outlook")
-        if not connection:
+        credentials = await credential_manager.aget(db, area.user_id, "outlook")
+        if credentials is None:
             raise OutlookConnectionError(
                 "Outlook service connection not found. Please connect your Outlook account."
             )
@@ -53,7 +53,7 @@ async def _get_outlook_client(area: Area, db=None) -> httpx.AsyncClient:
         # Get valid access token (will refresh if expired)
         try:
             access_token = await get_outlook_access_token(
-                connection, db, user_id=str(area.user_id), area_id=str(area.id)
+                credentials, db, user_id=str(area.user_id), area_id=str(area.id)
             )
         except Exception as e:
             logger.error(
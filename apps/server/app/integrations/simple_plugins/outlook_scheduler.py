@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
@@ -13,19 +13,32 @@ if TYPE_CHECKING:
 import httpx
 
 from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
 from app.integrations.variable_extractor import extract_outlook_variables
 from app.integrations.simple_plugins.outlook_utils import get_outlook_access_token
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import get_service_connection_by_user_and_service
-from app.services.step_executor import execute_area
+from app.services.credential_manager import credential_manager
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.seen_events import SeenEventStore
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 logger = logging.getLogger("area")
 
-# In-memory storage for last seen message IDs per AREA
-_last_seen_messages: Dict[str, set[str]] = {}
-_outlook_scheduler_task: asyncio.Task | None = None
+# Message IDs already seen per AREA
+_seen_events = SeenEventStore("outlook")
+
+# Sync cursor key holding the inbox @odata.deltaLink of a connection
+OUTLOOK_DELTA_CURSOR = "outlook:delta:inbox"
+
+# Stream of recently received messages shared by the new/sender/unread triggers
+_RECENT_STREAM = "receivedDateTime ge 1900-01-01"
+
+# Message properties requested by delta queries (everything _extract_message_data
+# and _message_matches_area read)
+_DELTA_SELECT = (
+    "id,conversationId,subject,bodyPreview,from,receivedDateTime,sentDateTime,"
+    "isRead,importance,hasAttachments,webLink,flag"
+)
 
 
 async def _get_outlook_client(user_id, db: Session) -> httpx.AsyncClient | None:
@@ -39,8 +52,8 @@ async def _get_outlook_client(user_id, db: Session) -> httpx.AsyncClient | None:
         Authenticated httpx.AsyncClient or None if connection not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "outlook")
-        if not connection:
+        credentials = await credential_manager.aget(db, user_id, "outlook")
+        if credentials is None:
             logger.warning(
                 "No Outlook connection found for user",
                 extra={"user_id": str(user_id)}
@@ -50,7 +63,7 @@ async def _get_outlook_client(user_id, db: Session) -> httpx.AsyncClient | None:
         # Get valid access token (will refresh if expired)
         try:
             access_token = await get_outlook_access_token(
-                connection, db, user_id=str(user_id)
+                credentials, db, user_id=str(user_id)
             )
         except Exception as e:
             logger.error(
@@ -74,7 +87,7 @@ async def _get_outlook_client(user_id, db: Session) -> httpx.AsyncClient | None:
             extra={
                 "user_id": str(user_id),
                 "token_prefix": access_token[:20] if access_token else None,
-                "expires_at": connection.expires_at.isoformat() if connection.expires_at else None,
+                "expires_at": credentials.expires_at.isoformat() if credentials.expires_at else None,
             }
         )
 
@@ -133,6 +146,116 @@ async def _fetch_messages(client: httpx.AsyncClient, filter_query: str, max_resu
         return []
 
 
+async def _fetch_delta(
+    client: httpx.AsyncClient, url: str, params: dict | None = None
+) -> tuple[list[dict], str | None]:
+    """Run one delta round, following ``@odata.nextLink`` until the delta link.
+
+    Args:
+        client: Authenticated httpx client
+        url: Delta endpoint or the delta link stored by the previous round
+        params: Query parameters of the initial round
+
+    Returns:
+        Changed messages (removals skipped) and the ``@odata.deltaLink`` of the
+        next round
+
+    Raises:
+        httpx.HTTPStatusError: If Graph rejects a page (410 when the delta
+            token expired)
+    """
+    headers = {"Prefer": f"odata.maxpagesize={settings.outlook_delta_page_size}"}
+    messages: list[dict] = []
+    delta_link = None
+    next_url: str | None = url
+    while next_url:
+        response = await client.get(next_url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        messages.extend(message for message in data.get("value", []) if "@removed" not in message)
+        # Next links and delta links already carry the query parameters
+        params = None
+        next_url = data.get("@odata.nextLink")
+        delta_link = data.get("@odata.deltaLink", delta_link)
+    return messages, delta_link
+
+
+def _initial_delta_params(since: datetime) -> dict:
+    """Query parameters starting a delta round at messages received since a time."""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    since = since.astimezone(timezone.utc)
+    return {
+        "$select": _DELTA_SELECT,
+        "$filter": f"receivedDateTime ge {since.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+    }
+
+
+async def _sync_delta(client: httpx.AsyncClient, db: Session, user_id) -> list[dict]:
+    """Fetch the inbox messages received or changed since the connection's last sync.
+
+    The first sync of a connection only records a delta link, so enabling an
+    area does not replay the inbox. When Graph no longer serves the stored delta
+    link, a new round is started at the time of the last sync.
+
+    Args:
+        client: Authenticated httpx client
+        db: Database session
+        user_id: User UUID
+
+    Returns:
+        Messages of the recent stream, oldest first
+    """
+    credentials = await credential_manager.aget(db, user_id, "outlook")
+    if credentials is None:
+        return []
+
+    delta_url = "/me/mailFolders/inbox/messages/delta"
+    cursor = await asyncio.to_thread(get_sync_cursor, db, credentials.connection_id, OUTLOOK_DELTA_CURSOR)
+    if cursor is None:
+        _, delta_link = await _fetch_delta(
+            client, delta_url, _initial_delta_params(datetime.now(timezone.utc))
+        )
+        if delta_link:
+            await asyncio.to_thread(
+                set_sync_cursor, db, credentials.connection_id, OUTLOOK_DELTA_CURSOR, delta_link
+            )
+            logger.info(
+                f"Initialized Outlook delta cursor for user {user_id}",
+                extra={"user_id": str(user_id)},
+            )
+        return []
+
+    try:
+        messages, delta_link = await _fetch_delta(client, cursor.value)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 410:
+            raise
+        # Delta token expired: start a new round at the last successful sync
+        logger.warning(
+            f"Outlook delta token expired for user {user_id}, resyncing since last sync",
+            extra={"user_id": str(user_id)},
+        )
+        messages, delta_link = await _fetch_delta(
+            client, delta_url, _initial_delta_params(cursor.updated_at)
+        )
+
+    if delta_link:
+        await asyncio.to_thread(
+            set_sync_cursor, db, credentials.connection_id, OUTLOOK_DELTA_CURSOR, delta_link
+        )
+    return sorted(messages, key=lambda message: message.get("receivedDateTime", ""))
+
+
+def _prime_delta_areas(db: Session, areas: list[Area]) -> None:
+    """Prime the areas reading the delta-fed recent stream that were never polled."""
+    for area in areas:
+        if _build_stream_filter(area) != _RECENT_STREAM:
+            continue
+        if not _seen_events.is_primed(db, str(area.id)):
+            _seen_events.prime(db, str(area.id), [])
+
+
 def _extract_message_data(message: dict) -> dict:
     """Extract relevant data from Outlook message.
 
@@ -192,122 +315,92 @@ def _fetch_due_outlook_areas(db: Session) -> list[Area]:
     )
 
 
-async def outlook_scheduler_task() -> None:
-    """Background task that polls Outlook for new messages based on AREA triggers."""
-    from app.db.session import SessionLocal
+class OutlookTriggerSource(TriggerSource):
+    """Polls Microsoft Graph for new Outlook messages matching each area's trigger.
 
-    logger.info("Starting Outlook polling scheduler task")
+    Areas are grouped per user: one Graph client lists the recent (and, when
+    needed, flagged) messages once and each area's filter is applied locally.
+    With delta sync, the recent stream only holds the inbox messages received or
+    changed since the previous poll; flagged messages, which can be old, are
+    still listed.
+    """
 
-    while True:
-        try:
-            # Poll at configurable interval (default: 60 seconds)
-            await asyncio.sleep(settings.outlook_poll_interval_seconds)
+    service = "outlook"
+    name = "Outlook"
 
-            now = datetime.now(timezone.utc)
+    @property
+    def seen(self) -> SeenEventStore:
+        return _seen_events
 
-            # Fetch all enabled Outlook areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_outlook_areas, db)
+    @property
+    def poll_interval(self) -> float:
+        return settings.outlook_poll_interval_seconds
 
-                logger.info(
-                    "Outlook scheduler tick",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
-                )
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_outlook_areas(db)
+
+    def group_key(self, area: Area) -> str:
+        # One Outlook connection per user, so all of a user's areas share a fetch
+        return str(area.user_id)
+
+    def push_scope(self, area: Area) -> str | None:
+        # A Graph subscription on the inbox reports received and changed messages
+        return str(area.user_id)
+
+    def primes_when_empty(self, area: Area) -> bool:
+        # Listing errors return no message, so listed areas prime from a real listing
+        return settings.outlook_delta_sync and _build_stream_filter(area) == _RECENT_STREAM
 
-            # Process each area with its own scoped session
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        user_id = areas[0].user_id
+
+        # Get Outlook client for user
+        client = await _get_outlook_client(user_id, db)
+        if not client:
+            logger.warning(
+                f"Outlook client not available for user {user_id}, skipping {len(areas)} area(s)"
+            )
+            return []
+
+        try:
+            streams: Dict[str, list[dict]] = {}
+            if settings.outlook_delta_sync:
+                # The delta cursor, not a first poll, marks where each area reading
+                # it starts; flagged areas still prime from their first listing
+                await asyncio.to_thread(_prime_delta_areas, db, areas)
+                streams[_RECENT_STREAM] = await _sync_delta(client, db, user_id)
+
+            events: list[TriggerEvent] = []
             for area in areas:
                 area_id_str = str(area.id)
 
-                # Initialize last seen messages set for this area
-                if area_id_str not in _last_seen_messages:
-                    _last_seen_messages[area_id_str] = set()
-
-                client = None
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get Outlook client for user
-                        client = await _get_outlook_client(area.user_id, db)
-                        if not client:
-                            logger.warning(
-                                f"Outlook client not available for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Build filter query based on trigger action
-                        filter_query = _build_outlook_filter(area)
-
-                        # Fetch messages
-                        messages = await _fetch_messages(client, filter_query)
-
-                        # On first run for this area, prime the seen set to avoid backlog
-                        if len(_last_seen_messages[area_id_str]) == 0 and messages:
-                            _last_seen_messages[area_id_str].update(m["id"] for m in messages)
-                            logger.info(
-                                f"Initialized seen set for area {area_id_str} with {len(messages)} message(s)"
-                            )
-
-                        logger.info(
-                            f"Outlook fetched {len(messages)} message(s) for area {area_id_str}, "
-                            f"already seen: {len(_last_seen_messages[area_id_str])}",
-                            extra={
-                                "area_id": area_id_str,
-                                "area_name": area.name,
-                                "user_id": str(area.user_id),
-                                "messages_fetched": len(messages),
-                                "messages_already_seen": len(_last_seen_messages[area_id_str]),
-                                "filter_query": filter_query,
-                            },
-                        )
-
-                        # Filter for new messages
-                        new_messages = [
-                            msg for msg in messages if msg["id"] not in _last_seen_messages[area_id_str]
-                        ]
-
-                        if new_messages:
-                            logger.info(
-                                f"Found {len(new_messages)} NEW message(s) for area {area_id_str}",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "area_name": area.name,
-                                    "user_id": str(area.user_id),
-                                    "new_messages_count": len(new_messages),
-                                    "message_ids": [msg["id"] for msg in new_messages],
-                                },
-                            )
-
-                        # Process each new message
-                        for message in new_messages:
-                            await _process_outlook_trigger(db, area, message, now)
-                            # Mark as seen
-                            _last_seen_messages[area_id_str].add(message["id"])
-
-                except Exception as e:
-                    logger.error(
-                        "Error processing Outlook area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-                finally:
-                    if client:
-                        await client.aclose()
-
-        except asyncio.CancelledError:
-            logger.info("Outlook scheduler task cancelled, shutting down gracefully")
-            break
+                # Fetch each stream once per user and filter it locally for every area
+                stream_filter = _build_stream_filter(area)
+                if stream_filter not in streams:
+                    streams[stream_filter] = await _fetch_messages(client, stream_filter)
+                messages = [
+                    message for message in streams[stream_filter]
+                    if _message_matches_area(area, message)
+                ]
 
-        except Exception as e:
-            logger.error("Outlook scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(30)  # Back off on error
+                logger.info(
+                    f"Outlook matched {len(messages)} message(s) for area {area_id_str}",
+                    extra={
+                        "area_id": area_id_str,
+                        "area_name": area.name,
+                        "user_id": str(user_id),
+                        "messages_fetched": len(streams[stream_filter]),
+                        "messages_matched": len(messages),
+                        "filter_query": _build_outlook_filter(area),
+                    },
+                )
+                events.extend(TriggerEvent(area, message, message["id"]) for message in messages)
+            return events
+        finally:
+            await client.aclose()
 
-    logger.info("Outlook scheduler task stopped")
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _process_outlook_trigger(db, event.area, event.payload, now)
 
 
 def _build_outlook_filter(area: Area) -> str:
@@ -345,8 +438,52 @@ def _build_outlook_filter(area: Area) -> str:
     return "receivedDateTime ge 1900-01-01"
 
 
+def _build_stream_filter(area: Area) -> str:
+    """Return the per-user message stream an area's trigger is matched against.
+
+    New, from-sender and unread triggers share the recent messages listing while
+    flagged messages, which can be old, are listed separately.
+
+    Args:
+        area: Area with Outlook trigger
+
+    Returns:
+        OData filter query of the stream
+    """
+    if area.trigger_action == "email_flagged":
+        return "flag/flagStatus eq 'flagged'"
+    return _RECENT_STREAM
+
+
+def _message_matches_area(area: Area, message: dict) -> bool:
+    """Check locally whether a fetched message satisfies an area's trigger.
+
+    Args:
+        area: Area with Outlook trigger
+        message: Message object from Microsoft Graph
+
+    Returns:
+        True if the message would be returned by the area's own filter query
+    """
+    trigger_action = area.trigger_action
+    params = area.trigger_params or {}
+
+    if trigger_action == "new_email_from_sender":
+        sender = (params.get("sender_email") or "").strip().lower()
+        address = message.get("from", {}).get("emailAddress", {}).get("address", "")
+        return not sender or address.lower() == sender
+
+    if trigger_action == "new_unread_email":
+        return not message.get("isRead", False)
+
+    if trigger_action == "email_flagged":
+        return message.get("flag", {}).get("flagStatus") == "flagged"
+
+    return True
+
+
 async def _process_outlook_trigger(db: Session, area: Area, message: dict, now: datetime) -> None:
-    """Process an Outlook trigger event and execute the area.
+    """Process an Outlook trigger event and queue the area for execution.
 
     Args:
         db: Database session
@@ -357,136 +494,45 @@ async def _process_outlook_trigger(db: Session, area: Area, message: dict, now:
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Extract message data
-        message_data = _extract_message_data(message)
-
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "message_id": message_data.get("id"),
-                    "subject": message_data.get("subject"),
-                }
-            },
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Use extract_outlook_variables to get variables from message
-        variables = extract_outlook_variables(message_data)
-
-        # Build trigger_data with outlook variables
-        trigger_data = {
-            **variables,  # Include all extracted outlook.* variables
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
+    # Extract message data
+    message_data = _extract_message_data(message)
 
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Outlook trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "message_id": message_data.get("id"),
-        }
-        db.commit()
+    # Use extract_outlook_variables to get variables from message
+    variables = extract_outlook_variables(message_data)
 
-        logger.info(
-            "Outlook trigger executed",
-            extra={
+    # Build trigger_data with outlook variables
+    trigger_data = {
+        **variables,  # Include all extracted outlook.* variables
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Outlook",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "area_name": area.name,
                 "user_id": str(area.user_id),
                 "message_id": message_data.get("id"),
                 "subject": message_data.get("subject"),
-                "sender_email": message_data.get("sender_email"),
-                "bodyPreview": message_data.get("bodyPreview"),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
             },
+            details={"message_id": message_data.get("id")},
         )
-
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing Outlook trigger",
-            extra={
-                "area_id": area_id_str,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
-
-
-def start_outlook_scheduler() -> None:
-    """Start the Outlook polling scheduler task."""
-    global _outlook_scheduler_task
-
-    if _outlook_scheduler_task is not None:
-        logger.warning("Outlook scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start Outlook scheduler")
-        return
-
-    _outlook_scheduler_task = loop.create_task(outlook_scheduler_task())
-    logger.info("Outlook scheduler task started")
-
-
-def stop_outlook_scheduler() -> None:
-    """Stop the Outlook polling scheduler task."""
-    global _outlook_scheduler_task
-
-    if _outlook_scheduler_task is not None:
-        _outlook_scheduler_task.cancel()
-        _outlook_scheduler_task = None
-        logger.info("Outlook scheduler task stopped")
-
-
-def is_outlook_scheduler_running() -> bool:
-    """Check if the Outlook scheduler task is running.
-
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _outlook_scheduler_task
-    return _outlook_scheduler_task is not None and not _outlook_scheduler_task.done()
+    )
 
 
 def clear_outlook_seen_state() -> None:
     """Clear the in-memory seen messages state (useful for testing)."""
-    global _last_seen_messages
-    _last_seen_messages.clear()
+    _seen_events.clear()
 
 
 __all__ = [
-    "outlook_scheduler_task",
-    "start_outlook_scheduler",
-    "is_outlook_scheduler_running",
-    "stop_outlook_scheduler",
+    "OutlookTriggerSource",
     "clear_outlook_seen_state",
 ]
@@ -0,0 +1,593 @@
+"""Shared polling engine driving every provider trigger source.
+
+Each provider (Gmail, Outlook, GitHub, ...) plugs a :class:`TriggerSource`
+into a single :class:`PollingEngine`. A source only knows how to list its
+areas, poll the provider for a group of areas and dispatch one event; the engine
+owns everything the per-provider loops used to copy-paste: per-source poll
+intervals with jitter, per-provider and per-user concurrency caps, persistent
+dedupe of already seen events and exponential backoff of failing groups.
+
+Providers that can push changes (webhooks, watches, change subscriptions) map
+their areas to a :meth:`TriggerSource.push_scope`. Groups whose scopes all
+have a live push subscription are only polled every
+``PUSH_RECONCILE_INTERVAL_SECONDS`` to catch missed notifications, and a
+notification polls the groups of its scope right away through
+:meth:`PollingEngine.notify`, so pushed events follow the same dedupe and
+dispatch path as polled ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.area import Area
+from app.services.seen_events import SeenEventStore
+
+logger = logging.getLogger("area")
+
+
+@dataclass
+class TriggerEvent:
+    """An event produced by a trigger source for a single area.
+
+    Attributes:
+        area: Area the event belongs to
+        payload: Provider data handed back to :meth:`TriggerSource.dispatch`
+        event_id: Stable provider ID used for dedupe; ``None`` disables
+            engine-side dedupe for sources that track their own state
+    """
+
+    area: Area
+    payload: Any
+    event_id: str | None = None
+
+
+class TriggerSource(ABC):
+    """Adapter between the polling engine and one provider.
+
+    Attributes:
+        service: Area ``trigger_service`` handled by this source
+        name: Human readable provider name used in logs
+        seen: Persistent store of the event IDs seen per area ID, managed by
+            the engine for events carrying an ``event_id``
+    """
+
+    service: str = ""
+    name: str = ""
+    seen: SeenEventStore | None = None
+
+    @property
+    def poll_interval(self) -> float:
+        """Seconds between two polls of this source."""
+        return 60.0
+
+    @property
+    def max_concurrency(self) -> int:
+        """Maximum number of groups of this source polled at the same time."""
+        return settings.polling_per_provider_concurrency
+
+    def fetch_areas(self, db: Session) -> list[Area]:
+        """Return the enabled areas this source should poll."""
+        return (
+            db.query(Area)
+            .filter(
+                Area.enabled == True,  # noqa: E712
+                Area.trigger_service == self.service,
+            )
+            .all()
+        )
+
+    def group_key(self, area: Area) -> str:
+        """Key of the group an area is polled with (one poll call per group)."""
+        return str(area.id)
+
+    def user_key(self, area: Area) -> str:
+        """Key used for the per-user concurrency cap."""
+        return str(area.user_id)
+
+    def push_scope(self, area: Area) -> str | None:
+        """Scope of the push subscription reporting an area's changes.
+
+        ``None`` (the default) means changes of the area are only found by
+        polling.
+        """
+        return None
+
+    def primes_when_empty(self, area: Area) -> bool:
+        """Whether a first poll returning no event for an area still primes it.
+
+        Delta streams and empty listings start with nothing, so their first
+        real event must be dispatched rather than taken for the backlog.
+        Sources whose poll can skip an area without reading its stream return
+        False, so the area primes from its first actual listing instead.
+        """
+        return True
+
+    @abstractmethod
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        """Fetch candidate events for a group of areas.
+
+        Args:
+            db: Database session scoped to this group
+            areas: Areas sharing the same :meth:`group_key`
+            now: Tick timestamp
+
+        Returns:
+            Events in the order they should be dispatched
+        """
+
+    @abstractmethod
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        """Queue the event's area for execution."""
+
+    def after_tick(self) -> None:
+        """Hook called once a tick of this source completed (cache housekeeping)."""
+
+
+class PollingEngine:
+    """Runs every trigger source on its own jittered schedule."""
+
+    def __init__(
+        self,
+        sources: Iterable[TriggerSource],
+        per_user_concurrency: int | None = None,
+        jitter_ratio: float | None = None,
+        max_backoff_seconds: float | None = None,
+    ) -> None:
+        self.sources = list(sources)
+        self.per_user_concurrency = max(
+            per_user_concurrency or settings.polling_per_user_concurrency, 1
+        )
+        self.jitter_ratio = (
+            settings.polling_jitter_ratio if jitter_ratio is None else jitter_ratio
+        )
+        self.max_backoff_seconds = (
+            settings.polling_max_backoff_seconds
+            if max_backoff_seconds is None
+            else max_backoff_seconds
+        )
+        self._task: asyncio.Task | None = None
+        self._ticks: Dict[str, asyncio.Task] = {}
+        self._next_run: Dict[str, float] = {}
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._user_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._failures: Dict[tuple[str, str | None], int] = {}
+        self._backoff_until: Dict[tuple[str, str | None], float] = {}
+        self._polled_at: Dict[tuple[str, str], float] = {}
+        self._group_locks: Dict[tuple[str, str], asyncio.Lock] = {}
+        self._pending_scopes: Dict[str, set[str]] = {}
+        self._push_ticks: Dict[str, asyncio.Task] = {}
+
+    def is_running(self) -> bool:
+        """Return True while the engine task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the engine task on the running event loop."""
+        if self.is_running():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the engine task and any tick still in flight."""
+        for task in [self._task, *self._ticks.values(), *self._push_ticks.values()]:
+            if task is not None and not task.done() and not task.get_loop().is_closed():
+                task.cancel()
+        self._task = None
+        self._ticks.clear()
+        self._push_ticks.clear()
+        self._pending_scopes.clear()
+
+    def _jittered(self, interval: float) -> float:
+        spread = interval * self.jitter_ratio
+        return max(interval + random.uniform(-spread, spread), 0.1)
+
+    def _backoff_delay(self, source: TriggerSource, failures: int) -> float:
+        return min(source.poll_interval * (2 ** failures), self.max_backoff_seconds)
+
+    def _record_failure(self, source: TriggerSource, key: str | None) -> float:
+        failures = self._failures.get((source.service, key), 0) + 1
+        self._failures[(source.service, key)] = failures
+        delay = self._backoff_delay(source, failures)
+        self._backoff_until[(source.service, key)] = time.monotonic() + delay
+        return delay
+
+    def _record_success(self, source: TriggerSource, key: str | None) -> None:
+        self._failures.pop((source.service, key), None)
+        self._backoff_until.pop((source.service, key), None)
+
+    def is_backing_off(self, source: TriggerSource, key: str | None = None) -> bool:
+        """Return True if a source (or one of its groups) is in error backoff."""
+        return self._backoff_until.get((source.service, key), 0.0) > time.monotonic()
+
+    def _provider_semaphore(self, source: TriggerSource) -> asyncio.Semaphore:
+        if source.service not in self._provider_semaphores:
+            self._provider_semaphores[source.service] = asyncio.Semaphore(
+                max(source.max_concurrency, 1)
+            )
+        return self._provider_semaphores[source.service]
+
+    def _user_semaphore(self, user_key: str) -> asyncio.Semaphore:
+        if user_key not in self._user_semaphores:
+            self._user_semaphores[user_key] = asyncio.Semaphore(self.per_user_concurrency)
+        return self._user_semaphores[user_key]
+
+    def _group_lock(self, source: TriggerSource, key: str) -> asyncio.Lock:
+        # A pushed poll and a scheduled tick never poll the same group at once
+        if (source.service, key) not in self._group_locks:
+            self._group_locks[(source.service, key)] = asyncio.Lock()
+        return self._group_locks[(source.service, key)]
+
+    def notify(self, service: str, scope: str) -> bool:
+        """Poll the groups of a push subscription scope as soon as possible.
+
+        Notifications arriving while a pushed poll of the same source runs are
+        coalesced into the next one.
+
+        Args:
+            service: Trigger service the notification is for
+            scope: Scope returned by the source's :meth:`TriggerSource.push_scope`
+
+        Returns:
+            True if a poll was scheduled, False if the engine is not running or
+            does not poll the service
+        """
+        source = next((source for source in self.sources if source.service == service), None)
+        if source is None or not self.is_running():
+            return False
+
+        self._pending_scopes.setdefault(service, set()).add(scope)
+        running = self._push_ticks.get(service)
+        if running is None or running.done():
+            self._push_ticks[service] = asyncio.get_running_loop().create_task(self._push_tick(source))
+        return True
+
+    async def _push_tick(self, source: TriggerSource) -> None:
+        while self._pending_scopes.get(source.service):
+            scopes = self._pending_scopes.pop(source.service)
+            try:
+                await self.run_source(source, scopes=scopes)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"{source.name} pushed poll error",
+                    extra={"service": source.service, "error": str(e)},
+                    exc_info=True,
+                )
+
+    def _due_groups(
+        self, source: TriggerSource, groups: Dict[str, list[Area]], live_scopes: set[str]
+    ) -> Dict[str, list[Area]]:
+        """Drop the groups covered by push subscriptions until their reconcile poll is due."""
+        if not live_scopes:
+            return groups
+
+        now = time.monotonic()
+        due = {}
+        for key, group in groups.items():
+            covered = all(source.push_scope(area) in live_scopes for area in group)
+            polled_at = self._polled_at.get((source.service, key))
+            if (
+                covered
+                and polled_at is not None
+                and now - polled_at < settings.push_reconcile_interval_seconds
+            ):
+                continue
+            due[key] = group
+        return due
+
+    async def _run(self) -> None:
+        logger.info(
+            "Starting polling engine",
+            extra={"sources": [source.service for source in self.sources]},
+        )
+        start = time.monotonic()
+        for source in self.sources:
+            self._next_run[source.service] = start + self._jittered(source.poll_interval)
+
+        try:
+            while True:
+                now = time.monotonic()
+                for source in self.sources:
+                    if self._next_run[source.service] > now:
+                        continue
+                    self._next_run[source.service] = now + self._jittered(source.poll_interval)
+
+                    running = self._ticks.get(source.service)
+                    if running is not None and not running.done():
+                        logger.warning(
+                            f"{source.name} poll still running, skipping tick",
+                            extra={"service": source.service},
+                        )
+                        continue
+                    self._ticks[source.service] = asyncio.create_task(self._tick(source))
+
+                if not self._next_run:
+                    return
+                await asyncio.sleep(max(min(self._next_run.values()) - time.monotonic(), 0.0))
+        except asyncio.CancelledError:
+            for task in self._ticks.values():
+                task.cancel()
+            logger.info("Polling engine cancelled, shutting down gracefully")
+
+    async def _tick(self, source: TriggerSource) -> None:
+        try:
+            await self.run_source(source)
+            self._record_success(source, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            delay = self._record_failure(source, None)
+            self._next_run[source.service] = max(
+                self._next_run.get(source.service, 0.0), time.monotonic() + delay
+            )
+            logger.error(
+                f"{source.name} poll tick error",
+                extra={"service": source.service, "error": str(e), "backoff_seconds": delay},
+                exc_info=True,
+            )
+
+    async def run_source(
+        self,
+        source: TriggerSource,
+        now: datetime | None = None,
+        scopes: set[str] | None = None,
+    ) -> None:
+        """Poll every due group of a source once and dispatch their new events.
+
+        Args:
+            source: Source to poll
+            now: Tick timestamp (defaults to the current UTC time)
+            scopes: Push scopes that were notified; only their groups are
+                polled, whether or not their reconcile poll is due
+        """
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+        from app.services.push_subscriptions import live_push_scopes
+
+        now = now or datetime.now(timezone.utc)
+
+        live_scopes: set[str] = set()
+        with SessionLocal() as db:
+            areas = await asyncio.to_thread(source.fetch_areas, db)
+            if scopes is None and settings.webhook_base_url and any(
+                source.push_scope(area) is not None for area in areas
+            ):
+                live_scopes = await asyncio.to_thread(live_push_scopes, db, source.service)
+
+        logger.info(
+            f"{source.name} scheduler tick",
+            extra={"utc_now": now.isoformat(), "areas_count": len(areas)},
+        )
+
+        groups: Dict[str, list[Area]] = {}
+        for area in areas:
+            groups.setdefault(source.group_key(area), []).append(area)
+        if scopes is not None:
+            groups = {
+                key: group for key, group in groups.items()
+                if any(source.push_scope(area) in scopes for area in group)
+            }
+        else:
+            groups = self._due_groups(source, groups, live_scopes)
+
+        if groups:
+            await asyncio.gather(
+                *(self._poll_group(source, key, group, now) for key, group in groups.items())
+            )
+        if source.seen is not None:
+            with SessionLocal() as db:
+                await asyncio.to_thread(source.seen.maybe_prune, db)
+        source.after_tick()
+
+    async def _poll_group(
+        self, source: TriggerSource, key: str, areas: list[Area], now: datetime
+    ) -> None:
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+
+        if self.is_backing_off(source, key):
+            logger.debug(
+                f"{source.name} group in error backoff, skipping",
+                extra={"service": source.service, "group": key},
+            )
+            return
+
+        async with self._group_lock(source, key), self._provider_semaphore(source), \
+                self._user_semaphore(source.user_key(areas[0])):
+            self._polled_at[(source.service, key)] = time.monotonic()
+            try:
+                with SessionLocal() as db:
+                    events = await source.poll(db, areas, now)
+                    fresh = await asyncio.to_thread(self._unseen_events, db, source, areas, events)
+                    dispatched: list[TriggerEvent] = []
+                    try:
+                        for event in fresh:
+                            await source.dispatch(db, event, now)
+                            dispatched.append(event)
+                    finally:
+                        # Record what was dispatched even if a later dispatch fails
+                        if dispatched:
+                            await asyncio.to_thread(self._mark_seen, db, source, dispatched)
+            except Exception as e:
+                delay = self._record_failure(source, key)
+                logger.error(
+                    f"Error processing {source.name} area",
+                    extra={
+                        "service": source.service,
+                        "group": key,
+                        "area_ids": [str(area.id) for area in areas],
+                        "error": str(e),
+                        "backoff_seconds": delay,
+                    },
+                    exc_info=True,
+                )
+            else:
+                self._record_success(source, key)
+
+    @staticmethod
+    def _unseen_events(
+        db: Session, source: TriggerSource, areas: list[Area], events: list[TriggerEvent]
+    ) -> list[TriggerEvent]:
+        """Drop the events already seen and prime the areas polled for the first time.
+
+        The first poll of an area only records what already exists so enabling an
+        area does not replay the provider's backlog. Areas without events are
+        primed too, unless their source opts out with
+        :meth:`TriggerSource.primes_when_empty`. Priming is persisted, so a
+        restart resumes from the recorded IDs instead of priming again.
+
+        Returns:
+            Events to dispatch, in poll order
+        """
+        if source.seen is None:
+            return events
+
+        event_ids: Dict[str, list[str]] = {
+            str(area.id): [] for area in areas if source.primes_when_empty(area)
+        }
+        for event in events:
+            if event.event_id is not None:
+                event_ids.setdefault(str(event.area.id), []).append(event.event_id)
+
+        unseen: Dict[str, set[str]] = {}
+        for area_id, ids in event_ids.items():
+            if source.seen.is_primed(db, area_id):
+                unseen[area_id] = source.seen.unseen(db, area_id, ids)
+                continue
+            source.seen.prime(db, area_id, ids)
+            unseen[area_id] = set()
+            logger.info(
+                f"Initialized seen set for area {area_id} with {len(set(ids))} event(s)",
+                extra={"service": source.service, "area_id": area_id},
+            )
+
+        fresh = []
+        for event in events:
+            if event.event_id is None:
+                fresh.append(event)
+                continue
+            area_unseen = unseen[str(event.area.id)]
+            if event.event_id in area_unseen:
+                # Dispatch an ID returned twice by the same poll only once
+                area_unseen.discard(event.event_id)
+                fresh.append(event)
+        return fresh
+
+    @staticmethod
+    def _mark_seen(db: Session, source: TriggerSource, events: list[TriggerEvent]) -> None:
+        """Record the IDs of dispatched events so later polls skip them."""
+        if source.seen is None:
+            return
+
+        event_ids: Dict[str, list[str]] = {}
+        for event in events:
+            if event.event_id is not None:
+                event_ids.setdefault(str(event.area.id), []).append(event.event_id)
+        for area_id, ids in event_ids.items():
+            source.seen.add(db, area_id, ids)
+
+
+def default_trigger_sources() -> list[TriggerSource]:
+    """Instantiate the trigger source of every polled provider."""
+    # Import here to avoid circular imports
+    from app.integrations.simple_plugins.calendar_scheduler import CalendarTriggerSource
+    from app.integrations.simple_plugins.discord_scheduler import DiscordTriggerSource
+    from app.integrations.simple_plugins.github_scheduler import GitHubTriggerSource
+    from app.integrations.simple_plugins.gmail_scheduler import GmailTriggerSource
+    from app.integrations.simple_plugins.google_drive_scheduler import GoogleDriveTriggerSource
+    from app.integrations.simple_plugins.outlook_scheduler import OutlookTriggerSource
+    from app.integrations.simple_plugins.weather_scheduler import WeatherTriggerSource
+
+    return [
+        GmailTriggerSource(),
+        OutlookTriggerSource(),
+        GitHubTriggerSource(),
+        CalendarTriggerSource(),
+        GoogleDriveTriggerSource(),
+        DiscordTriggerSource(),
+        WeatherTriggerSource(),
+    ]
+
+
+_polling_engine: PollingEngine | None = None
+
+
+def start_polling_engine(sources: Iterable[TriggerSource] | None = None) -> None:
+    """Start the shared polling engine.
+
+    Args:
+        sources: Trigger sources to poll (defaults to every provider)
+    """
+    global _polling_engine
+
+    if _polling_engine is not None and _polling_engine.is_running():
+        logger.warning("Polling engine already running")
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.error("No event loop running, cannot start polling engine")
+        return
+
+    _polling_engine = PollingEngine(default_trigger_sources() if sources is None else sources)
+    _polling_engine.start()
+    logger.info("Polling engine started")
+
+
+def stop_polling_engine() -> None:
+    """Stop the shared polling engine."""
+    global _polling_engine
+
+    if _polling_engine is not None:
+        _polling_engine.stop()
+        _polling_engine = None
+        logger.info("Polling engine stopped")
+
+
+def is_polling_engine_running() -> bool:
+    """Check if the shared polling engine is running."""
+    return _polling_engine is not None and _polling_engine.is_running()
+
+
+def get_polling_engine() -> PollingEngine | None:
+    """Return the shared polling engine, if started."""
+    return _polling_engine
+
+
+def notify_polling_engine(service: str, scope: str) -> bool:
+    """Poll the groups of a push subscription scope on the shared engine right away.
+
+    Returns:
+        True if a poll was scheduled; otherwise the scope's next scheduled
+        poll picks the change up
+    """
+    if _polling_engine is None:
+        return False
+    return _polling_engine.notify(service, scope)
+
+
+__all__ = [
+    "PollingEngine",
+    "TriggerEvent",
+    "TriggerSource",
+    "default_trigger_sources",
+    "get_polling_engine",
+    "is_polling_engine_running",
+    "notify_polling_engine",
+    "start_polling_engine",
+    "stop_polling_engine",
+]
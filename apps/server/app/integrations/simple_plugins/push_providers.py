@@ -0,0 +1,393 @@
+"""Provider push channels that let trigger sources skip most of their polls.
+
+Each :class:`PushProvider` creates, renews and removes the provider resource
+that delivers change notifications for one trigger scope (see
+:meth:`TriggerSource.push_scope`):
+
+- Gmail: a mailbox ``users.watch`` publishing to ``GMAIL_PUBSUB_TOPIC``, whose
+  Pub/Sub push subscription targets ``/api/v1/webhooks/gmail``
+- Google Drive: a ``changes.watch`` web hook channel on the connection's
+  change feed
+- Outlook: a Microsoft Graph change notification subscription on the inbox
+- GitHub: a repository web hook, created with the token of the first watching
+  user allowed to manage the repository's hooks
+
+Notifications carry no events themselves; the webhook routes only poke the
+polling engine, which polls the scope through the regular trigger source.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.area import Area
+from app.models.push_subscription import PushSubscription
+from app.services.credential_manager import credential_manager, credentials_from_connection
+from app.services.push_subscriptions import subscription_secret
+from app.services.service_connections import get_service_connection_by_id
+
+logger = logging.getLogger("area")
+
+# Longest lifetime Microsoft Graph grants to subscriptions on Outlook messages
+_GRAPH_MAX_LIFETIME = timedelta(minutes=4230)
+# Longest lifetime Google Drive grants to changes.watch channels
+_DRIVE_MAX_LIFETIME = timedelta(days=7)
+
+
+@dataclass
+class PushChannel:
+    """Provider push resource created for a scope.
+
+    Attributes:
+        connection_id: Connection whose credentials manage the resource
+        channel_id: ID notifications are delivered with
+        secret: Token notifications must carry, if the provider echoes one
+        resource_id: Extra provider ID needed to stop the resource
+        expires_at: Expiry of the resource, ``None`` if it does not expire
+    """
+
+    connection_id: Any
+    channel_id: str
+    secret: str | None = None
+    resource_id: str | None = None
+    expires_at: datetime | None = None
+
+
+def _from_millis(value: Any) -> datetime | None:
+    if value in (None, ""):
+        return None
+    return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc)
+
+
+def _requested_expiry(now: datetime, max_lifetime: timedelta) -> datetime:
+    return now + min(timedelta(seconds=settings.push_subscription_ttl_seconds), max_lifetime)
+
+
+def _subscription_user_id(db: Session, subscription: PushSubscription):
+    connection = get_service_connection_by_id(db, str(subscription.connection_id))
+    return connection.user_id if connection is not None else None
+
+
+class PushProvider(ABC):
+    """Manages the push resources of one trigger service."""
+
+    service: str = ""
+    name: str = ""
+    # Path of the webhook route under /api/v1/webhooks/
+    webhook_path: str = ""
+
+    @property
+    def enabled(self) -> bool:
+        """Whether push subscriptions can be created with the current settings."""
+        return bool(settings.webhook_base_url)
+
+    def callback_url(self) -> str:
+        """Public URL the provider delivers notifications to."""
+        return f"{settings.webhook_base_url.rstrip('/')}/api/v1/webhooks/{self.webhook_path}"
+
+    @abstractmethod
+    async def subscribe(self, db: Session, scope: str, areas: list[Area]) -> PushChannel | None:
+        """Create the push resource of a scope.
+
+        Args:
+            db: Database session
+            scope: Push scope of the areas
+            areas: Enabled areas covered by the scope
+
+        Returns:
+            The created channel, or None if the provider cannot push for it
+        """
+
+    async def renew(
+        self, db: Session, subscription: PushSubscription, areas: list[Area]
+    ) -> PushChannel | None:
+        """Extend an expiring subscription, by default by replacing it.
+
+        Returns:
+            The renewed channel, or None if the subscription could not be renewed
+        """
+        channel = await self.subscribe(db, subscription.scope, areas)
+        if channel is not None and channel.channel_id != subscription.channel_id:
+            await self.unsubscribe(db, subscription)
+        return channel
+
+    @abstractmethod
+    async def unsubscribe(self, db: Session, subscription: PushSubscription) -> None:
+        """Remove the provider resource of a subscription (best effort)."""
+
+
+class GmailPushProvider(PushProvider):
+    service = "gmail"
+    name = "Gmail"
+    webhook_path = "gmail"
+
+    @property
+    def enabled(self) -> bool:
+        return super().enabled and bool(settings.gmail_pubsub_topic)
+
+    async def subscribe(self, db: Session, scope: str, areas: list[Area]) -> PushChannel | None:
+        from app.integrations.simple_plugins.gmail_scheduler import _get_gmail_service
+
+        user_id = areas[0].user_id
+        credentials = await credential_manager.aget(db, user_id, "gmail")
+        service = await asyncio.to_thread(_get_gmail_service, user_id, db)
+        if credentials is None or service is None:
+            return None
+
+        def watch() -> tuple[dict, dict]:
+            response = service.users().watch(
+                userId='me', body={"topicName": settings.gmail_pubsub_topic}
+            ).execute()
+            profile = service.users().getProfile(userId='me').execute()
+            return response, profile
+
+        response, profile = await asyncio.to_thread(watch)
+        # Pub/Sub messages only name the mailbox, so it identifies the channel
+        return PushChannel(
+            connection_id=credentials.connection_id,
+            channel_id=profile["emailAddress"].lower(),
+            expires_at=_from_millis(response.get("expiration")),
+        )
+
+    async def unsubscribe(self, db: Session, subscription: PushSubscription) -> None:
+        from app.integrations.simple_plugins.gmail_scheduler import _get_gmail_service
+
+        user_id = await asyncio.to_thread(_subscription_user_id, db, subscription)
+        service = await asyncio.to_thread(_get_gmail_service, user_id, db) if user_id else None
+        if service is not None:
+            await asyncio.to_thread(lambda: service.users().stop(userId='me').execute())
+
+
+class GoogleDrivePushProvider(PushProvider):
+    service = "google_drive"
+    name = "Google Drive"
+    webhook_path = "google-drive"
+
+    async def subscribe(self, db: Session, scope: str, areas: list[Area]) -> PushChannel | None:
+        from app.integrations.simple_plugins.google_drive_scheduler import (
+            DRIVE_CHANGES_CURSOR,
+            _get_drive_service,
+            _get_start_page_token,
+        )
+        from app.services.sync_cursors import get_sync_cursor
+
+        user_id = areas[0].user_id
+        credentials = await credential_manager.aget(db, user_id, "google_drive")
+        service = await asyncio.to_thread(_get_drive_service, user_id, db)
+        if credentials is None or service is None:
+            return None
+
+        cursor = get_sync_cursor(db, credentials.connection_id, DRIVE_CHANGES_CURSOR)
+        page_token = cursor.value if cursor is not None else await asyncio.to_thread(
+            _get_start_page_token, service
+        )
+        if not page_token:
+            return None
+
+        channel_id = str(uuid.uuid4())
+        secret = secrets.token_urlsafe(32)
+        expires_at = _requested_expiry(datetime.now(timezone.utc), _DRIVE_MAX_LIFETIME)
+        response = await asyncio.to_thread(
+            lambda: service.changes().watch(
+                pageToken=page_token,
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True,
+                body={
+                    "id": channel_id,
+                    "type": "web_hook",
+                    "address": self.callback_url(),
+                    "token": secret,
+                    "expiration": str(int(expires_at.timestamp() * 1000)),
+                },
+            ).execute()
+        )
+        return PushChannel(
+            connection_id=credentials.connection_id,
+            channel_id=channel_id,
+            secret=secret,
+            resource_id=response.get("resourceId"),
+            expires_at=_from_millis(response.get("expiration")) or expires_at,
+        )
+
+    async def unsubscribe(self, db: Session, subscription: PushSubscription) -> None:
+        from app.integrations.simple_plugins.google_drive_scheduler import _get_drive_service
+
+        user_id = await asyncio.to_thread(_subscription_user_id, db, subscription)
+        service = await asyncio.to_thread(_get_drive_service, user_id, db) if user_id else None
+        if service is not None and subscription.resource_id:
+            await asyncio.to_thread(
+                lambda: service.channels().stop(
+                    body={"id": subscription.channel_id, "resourceId": subscription.resource_id}
+                ).execute()
+            )
+
+
+class OutlookPushProvider(PushProvider):
+    service = "outlook"
+    name = "Outlook"
+    webhook_path = "microsoft-graph"
+
+    async def subscribe(self, db: Session, scope: str, areas: list[Area]) -> PushChannel | None:
+        from app.integrations.simple_plugins.outlook_scheduler import _get_outlook_client
+
+        user_id = areas[0].user_id
+        credentials = await credential_manager.aget(db, user_id, "outlook")
+        client = await _get_outlook_client(user_id, db)
+        if credentials is None or client is None:
+            return None
+
+        secret = secrets.token_urlsafe(32)
+        expires_at = _requested_expiry(datetime.now(timezone.utc), _GRAPH_MAX_LIFETIME)
+        try:
+            # Graph validates the notification URL before answering
+            response = await client.post(
+                "/subscriptions",
+                json={
+                    "changeType": "created,updated",
+                    "notificationUrl": self.callback_url(),
+                    "resource": "me/mailFolders('inbox')/messages",
+                    "expirationDateTime": expires_at.isoformat(),
+                    "clientState": secret,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+        finally:
+            await client.aclose()
+
+        return PushChannel(
+            connection_id=credentials.connection_id,
+            channel_id=data["id"],
+            secret=secret,
+            expires_at=datetime.fromisoformat(data["expirationDateTime"].replace("Z", "+00:00")),
+        )
+
+    async def renew(
+        self, db: Session, subscription: PushSubscription, areas: list[Area]
+    ) -> PushChannel | None:
+        from app.integrations.simple_plugins.outlook_scheduler import _get_outlook_client
+
+        client = await _get_outlook_client(areas[0].user_id, db)
+        if client is None:
+            return None
+
+        expires_at = _requested_expiry(datetime.now(timezone.utc), _GRAPH_MAX_LIFETIME)
+        try:
+            response = await client.patch(
+                f"/subscriptions/{subscription.channel_id}",
+                json={"expirationDateTime": expires_at.isoformat()},
+            )
+        finally:
+            await client.aclose()
+        if response.status_code == 404:
+            # Graph already removed it; the next scan subscribes again
+            return None
+        response.raise_for_status()
+
+        return PushChannel(
+            connection_id=subscription.connection_id,
+            channel_id=subscription.channel_id,
+            secret=subscription_secret(subscription),
+            expires_at=expires_at,
+        )
+
+    async def unsubscribe(self, db: Session, subscription: PushSubscription) -> None:
+        from app.integrations.simple_plugins.outlook_scheduler import _get_outlook_client
+
+        user_id = await asyncio.to_thread(_subscription_user_id, db, subscription)
+        client = await _get_outlook_client(user_id, db) if user_id else None
+        if client is None:
+            return
+        try:
+            response = await client.delete(f"/subscriptions/{subscription.channel_id}")
+        finally:
+            await client.aclose()
+        if response.status_code != 404:
+            response.raise_for_status()
+
+
+class GitHubPushProvider(PushProvider):
+    service = "github"
+    name = "GitHub"
+    webhook_path = "github"
+
+    async def subscribe(self, db: Session, scope: str, areas: list[Area]) -> PushChannel | None:
+        from app.integrations.simple_plugins.github_scheduler import _make_github_request
+
+        secret = secrets.token_urlsafe(32)
+        # Only repository admins may create hooks, so try each watching user
+        for user_id in dict.fromkeys(area.user_id for area in areas):
+            credentials = await credential_manager.aget(db, user_id, "github")
+            if credentials is None or not credentials.access_token:
+                continue
+            hook = await _make_github_request(
+                "POST",
+                f"/repos/{scope}/hooks",
+                credentials.access_token,
+                json={
+                    "name": "web",
+                    "active": True,
+                    "events": ["*"],
+                    "config": {
+                        "url": self.callback_url(),
+                        "content_type": "json",
+                        "secret": secret,
+                        "insecure_ssl": "0",
+                    },
+                },
+            )
+            if isinstance(hook, dict) and hook.get("id"):
+                return PushChannel(
+                    connection_id=credentials.connection_id,
+                    channel_id=str(hook["id"]),
+                    secret=secret,
+                )
+        return None
+
+    async def unsubscribe(self, db: Session, subscription: PushSubscription) -> None:
+        from app.integrations.simple_plugins.github_scheduler import _make_github_request
+
+        connection = await asyncio.to_thread(
+            get_service_connection_by_id, db, str(subscription.connection_id)
+        )
+        if connection is None:
+            return
+        credentials = credentials_from_connection(connection)
+        if credentials.access_token:
+            await _make_github_request(
+                "DELETE",
+                f"/repos/{subscription.scope}/hooks/{subscription.channel_id}",
+                credentials.access_token,
+            )
+
+
+def default_push_providers() -> list[PushProvider]:
+    """Instantiate the push provider of every service that can push."""
+    return [
+        GmailPushProvider(),
+        OutlookPushProvider(),
+        GitHubPushProvider(),
+        GoogleDrivePushProvider(),
+    ]
+
+
+__all__ = [
+    "GitHubPushProvider",
+    "GmailPushProvider",
+    "GoogleDrivePushProvider",
+    "OutlookPushProvider",
+    "PushChannel",
+    "PushProvider",
+    "default_push_providers",
+]
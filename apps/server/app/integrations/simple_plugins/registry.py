@@ -1,9 +1,23 @@
-"""Plugin registry for simple time-based triggers and debug reactions."""
+"""Plugin registry for simple time-based triggers and debug reactions.
+
+Reaction handlers are registered declaratively with a :class:`HandlerSpec`
+naming the handler's import path together with its call metadata (sync or
+async, whether it takes the ``db`` session, the variables it adds to the event
+and an optional timeout). Plugin modules are only imported on the first
+dispatch to one of their actions, so a worker never loads the SDKs of services
+none of its areas use, and the executor reads the call metadata from the
+registry instead of inspecting the handler on every call.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import importlib
+import inspect
 import logging
-from typing import TYPE_CHECKING, Awaitable, Callable
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable
 
 if TYPE_CHECKING:
     from app.models.area import Area
@@ -14,124 +28,219 @@ logger = logging.getLogger("area")
 # db parameter is optional for backward compatibility but recommended for all new handlers
 PluginHandler = Callable[..., None | Awaitable[None]]
 
+_PLUGINS_PACKAGE = "app.integrations.simple_plugins"
+
+
+@dataclass(frozen=True)
+class HandlerSpec:
+    """Declarative registration of a reaction handler.
+
+    Attributes:
+        service: Service slug (e.g. "gmail")
+        action: Action key (e.g. "send_email")
+        target: Import path of the handler, ``"package.module:function"``
+        is_async: Whether the handler is a coroutine function
+        needs_db: Whether the handler takes the database session as ``db``
+        timeout_seconds: Maximum duration of one call, None for no limit
+    """
+
+    service: str
+    action: str
+    target: str
+    is_async: bool = False
+    needs_db: bool = False
+    timeout_seconds: float | None = None
+
+    @property
+    def module(self) -> str:
+        """Module the handler is imported from."""
+        return self.target.partition(":")[0]
+
+
+@dataclass(frozen=True)
+class HandlerMetadata:
+    """A loaded handler with the metadata needed to call it.
+
+    Attributes:
+        handler: Handler function
+        is_async: Whether calling the handler returns a coroutine to await
+        needs_db: Whether the handler takes the database session as ``db``
+        timeout_seconds: Maximum duration of one call, None for no limit
+    """
+
+    handler: PluginHandler
+    is_async: bool
+    needs_db: bool
+    timeout_seconds: float | None = None
+
+    @classmethod
+    def inspect(
+        cls,
+        handler: PluginHandler,
+        timeout_seconds: float | None = None,
+    ) -> HandlerMetadata:
+        """Build the metadata of a handler from its signature.
+
+        Args:
+            handler: Handler function
+            timeout_seconds: Maximum duration of one call
+
+        Returns:
+            Metadata of the handler
+        """
+        try:
+            needs_db = "db" in inspect.signature(handler).parameters
+        except (TypeError, ValueError):
+            needs_db = False
+        return cls(
+            handler=handler,
+            is_async=inspect.iscoroutinefunction(handler) or asyncio.iscoroutinefunction(handler),
+            needs_db=needs_db,
+            timeout_seconds=timeout_seconds,
+        )
+
+
+def _specs(
+    service: str, module: str, *entries: tuple[str, str], is_async: bool = False, needs_db: bool = False
+) -> list[HandlerSpec]:
+    return [
+        HandlerSpec(
+            service=service,
+            action=action,
+            target=f"{_PLUGINS_PACKAGE}.{module}:{function}",
+            is_async=is_async,
+            needs_db=needs_db,
+        )
+        for action, function in entries
+    ]
+
+
+DEFAULT_HANDLER_SPECS: tuple[HandlerSpec, ...] = (
+    *_specs("delay", "delay_plugin", ("wait", "delay_handler"), is_async=True),
+    *_specs(
+        "gmail",
+        "gmail_plugin",
+        ("send_email", "send_email_handler"),
+        ("mark_as_read", "mark_as_read_handler"),
+        ("forward_email", "forward_email_handler"),
+    ),
+    *_specs(
+        "outlook",
+        "outlook_plugin",
+        ("send_email", "send_email_handler"),
+        ("mark_as_read", "mark_as_read_handler"),
+        ("forward_email", "forward_email_handler"),
+        is_async=True,
+    ),
+    *_specs(
+        "weather",
+        "weather_plugin",
+        ("get_current_weather", "get_current_weather_handler"),
+        ("get_forecast", "get_forecast_handler"),
+    ),
+    *_specs(
+        "openai",
+        "openai_plugin",
+        ("chat", "chat_completion_handler"),
+        ("complete_text", "text_completion_handler"),
+        ("generate_image", "image_generation_handler"),
+        ("analyze_text", "content_moderation_handler"),
+    ),
+    *_specs(
+        "discord",
+        "discord_plugin",
+        ("send_message", "send_message_handler"),
+        ("create_channel", "create_channel_handler"),
+        is_async=True,
+    ),
+    *_specs(
+        "github",
+        "github_plugin",
+        ("create_issue", "create_issue_handler"),
+        ("add_comment", "add_comment_handler"),
+        ("close_issue", "close_issue_handler"),
+        ("add_label", "add_label_handler"),
+        ("create_branch", "create_branch_handler"),
+        is_async=True,
+        needs_db=True,
+    ),
+    *_specs(
+        "google_calendar",
+        "calendar_plugin",
+        ("create_event", "create_event_handler"),
+        ("update_event", "update_event_handler"),
+        ("delete_event", "delete_event_handler"),
+        ("create_all_day_event", "create_all_day_event_handler"),
+        ("quick_add_event", "quick_add_event_handler"),
+    ),
+    *_specs(
+        "google_drive",
+        "google_drive_plugin",
+        ("upload_file", "upload_file_handler"),
+        ("create_folder", "create_folder_handler"),
+        ("copy_file", "copy_file_handler"),
+        ("move_file", "move_file_handler"),
+        ("delete_file", "delete_file_handler"),
+    ),
+    *_specs(
+        "deepl",
+        "deepl_plugin",
+        ("translate", "translate_text_handler"),
+        ("auto_translate", "auto_translate_handler"),
+        ("detect_language", "detect_language_handler"),
+        needs_db=True,
+    ),
+)
+
 
 class PluginsRegistry:
     """Registry mapping service/action pairs to handler functions."""
 
-    def __init__(self) -> None:
-        """Initialize the plugins registry with default handlers."""
-        self._handlers: dict[tuple[str, str], PluginHandler] = {}
-        self._register_default_handlers()
+    def __init__(self, specs: Iterable[HandlerSpec] | None = None) -> None:
+        """Initialize the plugins registry.
 
-    def _register_default_handlers(self) -> None:
-        """Register built-in handlers for time and debug services."""
+        Args:
+            specs: Handlers to register (defaults to the built-in handlers)
+        """
+        self._specs: dict[tuple[str, str], HandlerSpec] = {}
+        self._handlers: dict[tuple[str, str], HandlerMetadata] = {}
+        self._failed_modules: set[str] = set()
+        self._lock = threading.Lock()
         # Time trigger doesn't need a handler (scheduler handles it)
-        # Debug reaction handler
-        self._handlers[("debug", "log")] = self._debug_log_handler
-
-        # Delay handler
-        from app.integrations.simple_plugins.delay_plugin import delay_handler
-        self._handlers[("delay", "wait")] = delay_handler
-
-        # Gmail handlers
-        from app.integrations.simple_plugins.gmail_plugin import (
-            send_email_handler,
-            mark_as_read_handler,
-            forward_email_handler,
-        )
-        self._handlers[("gmail", "send_email")] = send_email_handler
-        self._handlers[("gmail", "mark_as_read")] = mark_as_read_handler
-        self._handlers[("gmail", "forward_email")] = forward_email_handler
-
-        # Outlook handlers
-        from app.integrations.simple_plugins.outlook_plugin import (
-            send_email_handler as outlook_send_email,
-            mark_as_read_handler as outlook_mark_as_read,
-            forward_email_handler as outlook_forward_email,
-        )
-        self._handlers[("outlook", "send_email")] = outlook_send_email
-        self._handlers[("outlook", "mark_as_read")] = outlook_mark_as_read
-        self._handlers[("outlook", "forward_email")] = outlook_forward_email
-
-        # Weather handlers
-        from app.integrations.simple_plugins.weather_plugin import (
-            get_current_weather_handler,
-            get_forecast_handler,
-        )
-        self._handlers[("weather", "get_current_weather")] = get_current_weather_handler
-        self._handlers[("weather", "get_forecast")] = get_forecast_handler
-
-        # OpenAI handlers
-        from app.integrations.simple_plugins.openai_plugin import (
-            chat_completion_handler,
-            text_completion_handler,
-            image_generation_handler,
-            content_moderation_handler,
-        )
-        self._handlers[("openai", "chat")] = chat_completion_handler
-        self._handlers[("openai", "complete_text")] = text_completion_handler
-        self._handlers[("openai", "generate_image")] = image_generation_handler
-        self._handlers[("openai", "analyze_text")] = content_moderation_handler
-
-        # Discord handlers
-        from app.integrations.simple_plugins.discord_plugin import (
-            send_message_handler,
-            create_channel_handler,
-        )
-        self._handlers[("discord", "send_message")] = send_message_handler
-        self._handlers[("discord", "create_channel")] = create_channel_handler
-
-        # GitHub handlers
-        from app.integrations.simple_plugins.github_plugin import (
-            create_issue_handler,
-            add_comment_handler,
-            close_issue_handler,
-            add_label_handler,
-            create_branch_handler,
-        )
-        self._handlers[("github", "create_issue")] = create_issue_handler
-        self._handlers[("github", "add_comment")] = add_comment_handler
-        self._handlers[("github", "close_issue")] = close_issue_handler
-        self._handlers[("github", "add_label")] = add_label_handler
-        self._handlers[("github", "create_branch")] = create_branch_handler
-
-        # Google Calendar handlers
-        from app.integrations.simple_plugins.calendar_plugin import (
-            create_event_handler,
-            update_event_handler,
-            delete_event_handler,
-            create_all_day_event_handler,
-            quick_add_event_handler,
-        )
-        self._handlers[("google_calendar", "create_event")] = create_event_handler
-        self._handlers[("google_calendar", "update_event")] = update_event_handler
-        self._handlers[("google_calendar", "delete_event")] = delete_event_handler
-        self._handlers[("google_calendar", "create_all_day_event")] = create_all_day_event_handler
-        self._handlers[("google_calendar", "quick_add_event")] = quick_add_event_handler
-
-        # Google Drive handlers
-        from app.integrations.simple_plugins.google_drive_plugin import (
-            upload_file_handler,
-            create_folder_handler,
-            copy_file_handler,
-            move_file_handler,
-            delete_file_handler,
-        )
-        self._handlers[("google_drive", "upload_file")] = upload_file_handler
-        self._handlers[("google_drive", "create_folder")] = create_folder_handler
-        self._handlers[("google_drive", "copy_file")] = copy_file_handler
-        self._handlers[("google_drive", "move_file")] = move_file_handler
-        self._handlers[("google_drive", "delete_file")] = delete_file_handler
-
-        # DeepL handlers
-        from app.integrations.simple_plugins.deepl_plugin import (
-            translate_text_handler,
-            auto_translate_handler,
-            detect_language_handler,
-        )
-        self._handlers[("deepl", "translate")] = translate_text_handler
-        self._handlers[("deepl", "auto_translate")] = auto_translate_handler
-        self._handlers[("deepl", "detect_language")] = detect_language_handler
+        self.register_handler("debug", "log", self._debug_log_handler)
+        for spec in DEFAULT_HANDLER_SPECS if specs is None else specs:
+            self.register(spec)
+
+    def register(self, spec: HandlerSpec) -> None:
+        """Register a handler to import on its first dispatch.
+
+        Args:
+            spec: Handler registration
+        """
+        key = (spec.service, spec.action)
+        with self._lock:
+            self._specs[key] = spec
+            self._handlers.pop(key, None)
+
+    def register_handler(
+        self,
+        service: str,
+        action: str,
+        handler: PluginHandler,
+        timeout_seconds: float | None = None,
+    ) -> None:
+        """Register an already imported handler.
+
+        Args:
+            service: Service slug
+            action: Action key
+            handler: Handler function
+            timeout_seconds: Maximum duration of one call
+        """
+        metadata = HandlerMetadata.inspect(handler, timeout_seconds)
+        with self._lock:
+            self._specs.pop((service, action), None)
+            self._handlers[(service, action)] = metadata
 
     @staticmethod
     def _debug_log_handler(area: Area, params: dict, event: dict) -> None:
@@ -181,6 +290,61 @@ class PluginsRegistry:
             f"now={event.get('now')} message=\"{message}\" event_data={event_summary}"
         )
 
+    def _load_module(self, module_name: str) -> None:
+        # Resolve every pending spec of the module at once; called with the lock held
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            self._failed_modules.add(module_name)
+            logger.error(
+                "Failed to load plugin module",
+                extra={"plugin_module": module_name, "error": str(e)},
+                exc_info=True,
+            )
+            return
+
+        for key, spec in list(self._specs.items()):
+            if spec.module != module_name:
+                continue
+            handler = getattr(module, spec.target.partition(":")[2], None)
+            if handler is None:
+                logger.error("Plugin handler not found", extra={"target": spec.target})
+                continue
+            metadata = HandlerMetadata.inspect(handler, spec.timeout_seconds)
+            if (metadata.is_async, metadata.needs_db) != (spec.is_async, spec.needs_db):
+                logger.warning(
+                    "Plugin handler signature does not match its registration",
+                    extra={
+                        "target": spec.target,
+                        "declared": {"is_async": spec.is_async, "needs_db": spec.needs_db},
+                        "actual": {"is_async": metadata.is_async, "needs_db": metadata.needs_db},
+                    },
+                )
+            del self._specs[key]
+            self._handlers[key] = metadata
+
+    def get_handler_metadata(self, service: str, action: str) -> HandlerMetadata | None:
+        """Get a handler with its call metadata, loading its plugin if needed.
+
+        Args:
+            service: Service slug (e.g., "gmail")
+            action: Action key (e.g., "send_email")
+
+        Returns:
+            Handler metadata or None if no handler is registered or its plugin
+            failed to load
+        """
+        key = (service, action)
+        metadata = self._handlers.get(key)
+        if metadata is not None:
+            return metadata
+
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None and spec.module not in self._failed_modules:
+                self._load_module(spec.module)
+            return self._handlers.get(key)
+
     def get_reaction_handler(
         self, service: str, action: str
     ) -> PluginHandler | None:
@@ -193,7 +357,32 @@ class PluginsRegistry:
         Returns:
             Handler function or None if not found
         """
-        return self._handlers.get((service, action))
+        metadata = self.get_handler_metadata(service, action)
+        return metadata.handler if metadata is not None else None
+
+    def has_reaction_handler(self, service: str, action: str) -> bool:
+        """Check whether a handler is registered without loading its plugin."""
+        key = (service, action)
+        return key in self._handlers or key in self._specs
+
+    def call_metadata(
+        self, service: str, action: str, handler: PluginHandler
+    ) -> HandlerMetadata:
+        """Get the metadata to call a handler dispatched for a service/action.
+
+        Args:
+            service: Service slug
+            action: Action key
+            handler: Handler about to be called
+
+        Returns:
+            The registered metadata, or metadata read from the handler's
+            signature when it is not the registered handler
+        """
+        metadata = self._handlers.get((service, action))
+        if metadata is not None and metadata.handler is handler:
+            return metadata
+        return HandlerMetadata.inspect(handler)
 
 
 # Global registry instance
@@ -208,4 +397,10 @@ def get_plugins_registry() -> PluginsRegistry:
     return _registry
 
 
-__all__ = ["PluginsRegistry", "get_plugins_registry"]
\ No newline at end of file
+__all__ = [
+    "DEFAULT_HANDLER_SPECS",
+    "HandlerMetadata",
+    "HandlerSpec",
+    "PluginsRegistry",
+    "get_plugins_registry",
+]
@@ -1,31 +1,172 @@
-"""Background scheduler for time-based Area triggers."""
+"""Background scheduler for time-based Area triggers.
+
+The source of truth for when an interval area fires is the persisted
+``Area.next_run_at`` column. Each scheduler replica claims due rows with
+``SELECT ... FOR UPDATE SKIP LOCKED`` and pushes their ``next_run_at`` forward in
+the same transaction, so several processes can share the work without
+duplicate executions and a restart does not re-fire every area.
+
+Within a process, areas are also kept in an in-memory min-heap keyed by their
+next fire time. The heap only decides when to wake up: the task sleeps until
+the earliest entry is due (or until the schedule changes) instead of querying
+the database every second. It is refreshed incrementally by
+``app.services.areas`` and reconciled with the database every
+``SCHEDULER_RESYNC_INTERVAL_SECONDS``.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
-from datetime import datetime, timezone
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Dict
 
+from sqlalchemy import or_
+
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.integrations.simple_plugins.registry import get_plugins_registry
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.step_executor import execute_area
+from app.services.execution_pool import ExecutionJob, submit_execution_job
 
 logger = logging.getLogger("area")
 
+DEFAULT_INTERVAL_SECONDS = 60
+# The heap never schedules faster than the previous one-second polling granularity
+MIN_INTERVAL_SECONDS = 1
+
 # In-memory storage for last run times
 _last_run_by_area_id: Dict[str, datetime] = {}
 _scheduler_task: asyncio.Task | None = None
 
 
+class IntervalScheduleQueue:
+    """Thread-safe min-heap of area IDs keyed by their next fire time.
+
+    Entries are invalidated lazily: rescheduling or removing an area only updates
+    the ``_due_at`` index, and stale heap entries are discarded when they reach
+    the top. Every operation is O(log N) amortized.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, str]] = []
+        self._due_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed: asyncio.Event | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> asyncio.Event:
+        """Attach the queue to the scheduler's event loop and return its wake-up event."""
+        with self._lock:
+            self._loop = loop
+            self._changed = asyncio.Event()
+            return self._changed
+
+    def unbind(self) -> None:
+        """Detach the queue from the scheduler's event loop."""
+        with self._lock:
+            self._loop = None
+            self._changed = None
+
+    def schedule(self, area_id: str, due_at: float) -> None:
+        """Insert or move an area to fire at ``due_at`` (epoch seconds)."""
+        with self._lock:
+            if self._due_at.get(area_id) == due_at:
+                return
+            head = self._peek_locked()
+            self._due_at[area_id] = due_at
+            heapq.heappush(self._heap, (due_at, area_id))
+            wake = head is None or due_at < head
+        if wake:
+            self._notify()
+
+    def remove(self, area_id: str) -> None:
+        """Drop an area from the schedule (no-op if it is not scheduled)."""
+        with self._lock:
+            self._due_at.pop(area_id, None)
+
+    def get(self, area_id: str) -> float | None:
+        """Return the scheduled fire time of an area, if any."""
+        with self._lock:
+            return self._due_at.get(area_id)
+
+    def pop_due(self, now: float) -> list[str]:
+        """Remove and return every area whose fire time is at or before ``now``."""
+        due: list[str] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due_at, area_id = heapq.heappop(self._heap)
+                if self._due_at.get(area_id) == due_at:
+                    del self._due_at[area_id]
+                    due.append(area_id)
+        return due
+
+    def next_due_at(self) -> float | None:
+        """Return the earliest fire time, or None if nothing is scheduled."""
+        with self._lock:
+            return self._peek_locked()
+
+    def retain(self, area_ids: set[str]) -> None:
+        """Drop every scheduled area that is not in ``area_ids``."""
+        with self._lock:
+            for area_id in [a for a in self._due_at if a not in area_ids]:
+                del self._due_at[area_id]
+
+    def clear(self) -> None:
+        """Remove every scheduled area."""
+        with self._lock:
+            self._heap.clear()
+            self._due_at.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._due_at)
+
+    def __contains__(self, area_id: object) -> bool:
+        with self._lock:
+            return area_id in self._due_at
+
+    def _peek_locked(self) -> float | None:
+        while self._heap:
+            due_at, area_id = self._heap[0]
+            if self._due_at.get(area_id) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _notify(self) -> None:
+        loop, event = self._loop, self._changed
+        if loop is None or event is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            event.set()
+        else:
+            loop.call_soon_threadsafe(event.set)
+
+
+_schedule = IntervalScheduleQueue()
+
+
+def get_interval_schedule() -> IntervalScheduleQueue:
+    """Return the process-wide interval schedule."""
+    return _schedule
+
+
 def _fetch_due_areas(db: Session) -> list[Area]:
     """Fetch all enabled areas with time-based triggers (sync function for thread pool).
 
+    Only used to (re)build the in-memory schedule, not on every tick.
+
     Args:
         db: Database session
 
@@ -43,6 +184,53 @@ def _fetch_due_areas(db: Session) -> list[Area]:
     )
 
 
+def _fetch_areas_by_ids(db: Session, area_ids: list[str]) -> list[Area]:
+    """Load the areas that just became due (sync function for thread pool).
+
+    Args:
+        db: Database session
+        area_ids: IDs popped from the schedule
+
+    Returns:
+        List of Area objects that still exist
+    """
+    return db.query(Area).filter(Area.id.in_([uuid.UUID(a) for a in area_ids])).all()
+
+
+def _claim_due_areas(db: Session, now: datetime, limit: int) -> list[Area]:
+    """Claim a batch of due interval areas (sync function for thread pool).
+
+    Rows locked by another replica are skipped, and the ``next_run_at`` of every
+    claimed row is moved one interval past ``now`` before the transaction
+    commits, so each tick is executed by exactly one scheduler.
+
+    Args:
+        db: Database session
+        now: Current datetime
+        limit: Maximum number of areas to claim
+
+    Returns:
+        List of claimed Area objects
+    """
+    areas = (
+        db.query(Area)
+        .filter(
+            Area.enabled == True,  # noqa: E712
+            Area.trigger_service == "time",
+            Area.trigger_action == "every_interval",
+            or_(Area.next_run_at.is_(None), Area.next_run_at <= now),
+        )
+        .order_by(Area.next_run_at.asc().nulls_first())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for area in areas:
+        area.next_run_at = now + timedelta(seconds=get_interval_seconds(area))
+    db.commit()
+    return areas
+
+
 def is_area_due(
     area: Area, now: datetime, last_run: datetime | None, default_interval: int = 60
 ) -> bool:
@@ -70,6 +258,106 @@ def is_area_due(
     return elapsed >= interval_seconds
 
 
+def get_interval_seconds(area: Area, default_interval: int = DEFAULT_INTERVAL_SECONDS) -> int:
+    """Return the sanitized firing interval of an area.
+
+    Invalid or negative values fall back to ``default_interval`` and the result
+    is never below ``MIN_INTERVAL_SECONDS``.
+    """
+    interval_seconds = default_interval
+    if area.trigger_params:
+        interval_seconds = area.trigger_params.get("interval_seconds", default_interval)
+    try:
+        interval_seconds = int(interval_seconds)
+    except (TypeError, ValueError):
+        interval_seconds = default_interval
+    if interval_seconds < 0:
+        interval_seconds = default_interval
+    return max(interval_seconds, MIN_INTERVAL_SECONDS)
+
+
+def _is_interval_area(area: Area) -> bool:
+    return (
+        bool(area.enabled)
+        and area.trigger_service == "time"
+        and area.trigger_action == "every_interval"
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (as returned by SQLite) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _initial_due_at(area: Area, now: float) -> float:
+    """Compute when an area that is not in the heap should fire next."""
+    next_run_at = getattr(area, "next_run_at", None)
+    if isinstance(next_run_at, datetime):
+        return _as_utc(next_run_at).timestamp()
+    last_run = _last_run_by_area_id.get(str(area.id))
+    if last_run is None:
+        return now
+    return last_run.timestamp() + get_interval_seconds(area)
+
+
+def refresh_area_schedule(area: Area) -> None:
+    """Bring the schedule in line with an area that was created or updated.
+
+    Enabled interval areas are (re)scheduled from their last run; any other area
+    is removed from the schedule.
+    """
+    area_id_str = str(area.id)
+    if not _is_interval_area(area):
+        _schedule.remove(area_id_str)
+        return
+    _schedule.schedule(area_id_str, _initial_due_at(area, time.time()))
+
+
+def rebase_next_run_at(area: Area, previous_interval_seconds: int) -> None:
+    """Shift a persisted next run so a changed interval counts from the same last run.
+
+    Args:
+        area: Area whose ``trigger_params`` were just updated
+        previous_interval_seconds: Interval the current ``next_run_at`` was based on
+    """
+    if area.next_run_at is None:
+        return
+    last_run = _as_utc(area.next_run_at) - timedelta(seconds=previous_interval_seconds)
+    area.next_run_at = last_run + timedelta(seconds=get_interval_seconds(area))
+
+
+def remove_area_schedule(area_id: str) -> None:
+    """Remove a deleted area from the schedule."""
+    _schedule.remove(str(area_id))
+    _last_run_by_area_id.pop(str(area_id), None)
+
+
+def _sync_schedule(areas: list[Area], now: float) -> None:
+    """Reconcile the heap with the full list of enabled interval areas.
+
+    Areas already scheduled keep their fire time; new ones are added and areas
+    that disappeared from the database are dropped.
+    """
+    area_ids = {str(area.id) for area in areas}
+    _schedule.retain(area_ids)
+    for area in areas:
+        if str(area.id) not in _schedule:
+            _schedule.schedule(str(area.id), _initial_due_at(area, now))
+
+
+async def _wait_for_next_due(changed: asyncio.Event, timeout: float) -> None:
+    """Sleep until the earliest area is due, the schedule changes, or ``timeout``."""
+    if timeout <= 0:
+        return
+    changed.clear()
+    try:
+        await asyncio.wait_for(changed.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
 async def scheduler_task() -> None:
     """Background task that checks and executes time-based areas."""
     # Import here to avoid circular imports
@@ -77,154 +365,124 @@ async def scheduler_task() -> None:
 
     logger.info("Starting area scheduler task")
     registry = get_plugins_registry()
+    changed = _schedule.bind(asyncio.get_running_loop())
+    next_resync = 0.0
 
-    while True:
-        try:
-            await asyncio.sleep(1)  # Check every second
-
-            now = datetime.now(timezone.utc)
-            db = SessionLocal()
-
+    try:
+        while True:
             try:
-                # Load all enabled areas with time/every_interval trigger (non-blocking)
-                areas = await asyncio.to_thread(_fetch_due_areas, db)
-
-                logger.info(
-                    "Scheduler tick",
-                    extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
-                )
-
-                for area in areas:
-                    area_id_str = str(area.id)
-                    last_run = _last_run_by_area_id.get(area_id_str)
-
-                    # Check if area is due to run
-                    if is_area_due(area, now, last_run):
-                        execution_log = None  # Initialize before try block
-                        try:
-                            # Create execution log entry for start of execution
-                            execution_log_start = ExecutionLogCreate(
-                                area_id=area.id,
-                                status="Started",
-                                output=None,
-                                error_message=None,
-                                step_details={
-                                    "event": {
-                                        "now": now.isoformat(),
-                                        "area_id": area_id_str,
-                                        "user_id": str(area.user_id),
-                                        "tick": True,
-                                    }
-                                }
-                            )
-                            execution_log = create_execution_log(db, execution_log_start)
-
-                            # Get configured interval for logging
-                            interval_seconds = 60
-                            if area.trigger_params:
-                                interval_seconds = area.trigger_params.get("interval_seconds", 60)
-
-                            # Assemble trigger event data with datetime context
-                            trigger_data = {
-                                "now": now.isoformat(),
-                                "timestamp": now.timestamp(),
-                                "year": now.year,
-                                "month": now.month,
-                                "day": now.day,
-                                "hour": now.hour,
-                                "minute": now.minute,
-                                "second": now.second,
-                                "weekday": now.weekday(),
-                                "area_id": area_id_str,
-                                "user_id": str(area.user_id),
-                                "tick": True,
-                            }
-
-                            # Execute area using step executor (supports conditional branching)
-                            try:
-                                result = execute_area(db, area, trigger_data)
-
-                                # Update last run time
-                                _last_run_by_area_id[area_id_str] = now
-
-                                # Update execution log based on result
-                                execution_log.status = "Success" if result["status"] == "success" else "Failed"
-                                execution_log.output = f"Executed {result['steps_executed']} step(s)"
-                                execution_log.error_message = result.get("error")
-                                execution_log.step_details = {
-                                    "execution_log": result.get("execution_log", []),
-                                    "steps_executed": result["steps_executed"],
-                                }
-                                db.commit()
-
-                                # Log execution with interval for troubleshooting
-                                logger.info(
-                                    "Area executed",
-                                    extra={
-                                        "area_id": area_id_str,
-                                        "area_name": area.name,
-                                        "interval_seconds": interval_seconds,
-                                        "status": result["status"],
-                                        "steps_executed": result["steps_executed"],
-                                    },
-                                )
-                            except Exception as execution_error:
-                                # Update execution log with failure status
-                                execution_log.status = "Failed"
-                                execution_log.error_message = str(execution_error)
-                                db.commit()
-
-                                logger.error(
-                                    "Error executing area",
-                                    extra={
-                                        "area_id": area_id_str,
-                                        "error": str(execution_error),
-                                    },
-                                    exc_info=True,
+                if time.monotonic() >= next_resync:
+                    db = SessionLocal()
+                    try:
+                        areas = await asyncio.to_thread(_fetch_due_areas, db)
+                    finally:
+                        db.close()
+                    _sync_schedule(areas, time.time())
+                    next_resync = time.monotonic() + settings.scheduler_resync_interval_seconds
+                    logger.info(
+                        "Scheduler resynced",
+                        extra={"areas_count": len(areas)},
+                    )
+
+                next_due = _schedule.next_due_at()
+                timeout = next_resync - time.monotonic()
+                if next_due is not None:
+                    timeout = min(timeout, next_due - time.time())
+                await _wait_for_next_due(changed, timeout)
+
+                due_ids = _schedule.pop_due(time.time())
+                if not due_ids:
+                    continue
+
+                now = datetime.now(timezone.utc)
+                db = SessionLocal()
+
+                try:
+                    batch_size = max(settings.scheduler_claim_batch_size, 1)
+                    while True:
+                        areas = await asyncio.to_thread(_claim_due_areas, db, now, batch_size)
+
+                        logger.info(
+                            "Scheduler tick",
+                            extra={
+                                "utc_now": now.isoformat(),
+                                "areas_count": len(areas),
+                            },
+                        )
+
+                        for area in areas:
+                            _schedule.schedule(str(area.id), _as_utc(area.next_run_at).timestamp())
+                            await _run_interval_area(area, now)
+
+                        if len(areas) < batch_size:
+                            break
+
+                    # Areas the heap expected but another replica claimed (or that
+                    # were disabled meanwhile) are re-read from the database
+                    unclaimed = [area_id for area_id in due_ids if area_id not in _schedule]
+                    if unclaimed:
+                        areas = await asyncio.to_thread(_fetch_areas_by_ids, db, unclaimed)
+                        floor = time.time() + MIN_INTERVAL_SECONDS
+                        for area in areas:
+                            if _is_interval_area(area):
+                                _schedule.schedule(
+                                    str(area.id), max(_initial_due_at(area, floor), floor)
                                 )
+                finally:
+                    db.close()
 
-                        except Exception as e:
-                            logger.error(
-                                "Error executing area",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "error": str(e),
-                                },
-                                exc_info=True,
-                            )
-                            # Try to update execution log with error status, but don't fail if db operations fail too
-                            try:
-                                # If execution_log exists, update it with error status
-                                if execution_log is not None:
-                                    execution_log.status = "Failed"
-                                    execution_log.error_message = str(e)
-                                    db.commit()
-                            except Exception as log_error:
-                                logger.error(
-                                    "Error updating execution log",
-                                    extra={
-                                        "area_id": area_id_str,
-                                        "error": str(log_error),
-                                    },
-                                    exc_info=True,
-                                )
+            except asyncio.CancelledError:
+                # Handle cancellation explicitly - let it propagate
+                logger.info("Scheduler task cancelled, shutting down gracefully")
+                break  # Exit the while loop
 
-            finally:
-                db.close()
+            except Exception as e:  # pragma: no cover
+                logger.error("Scheduler task error", extra={"error": str(e)}, exc_info=True)
+                await asyncio.sleep(5)  # Back off on error
+    finally:
+        _schedule.unbind()
 
-        except asyncio.CancelledError:
-            # Handle cancellation explicitly - let it propagate
-            logger.info("Scheduler task cancelled, shutting down gracefully")
-            break  # Exit the while loop
+    logger.info("Scheduler task stopped")
 
-        except Exception as e:  # pragma: no cover
-            logger.error("Scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(5)  # Back off on error
 
-    logger.info("Scheduler task stopped")
+async def _run_interval_area(area: Area, now: datetime) -> None:
+    """Hand one claimed interval area to the shared execution pool."""
+    area_id_str = str(area.id)
+
+    # The next run was already persisted when the area was claimed, so a failing
+    # area is retried on its interval rather than on every wake-up
+    _last_run_by_area_id[area_id_str] = now
+
+    # Assemble trigger event data with datetime context
+    trigger_data = {
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "year": now.year,
+        "month": now.month,
+        "day": now.day,
+        "hour": now.hour,
+        "minute": now.minute,
+        "second": now.second,
+        "weekday": now.weekday(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+        "tick": True,
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Time",
+            event={
+                "now": now.isoformat(),
+                "area_id": area_id_str,
+                "user_id": str(area.user_id),
+                "tick": True,
+            },
+            details={"interval_seconds": get_interval_seconds(area)},
+        )
+    )
 
 
 def start_scheduler() -> None:
@@ -256,15 +514,22 @@ def stop_scheduler() -> None:
 
 
 def clear_last_run_state() -> None:
-    """Clear the in-memory last run state (useful for testing)."""
+    """Clear the in-memory last run state and schedule (useful for testing)."""
     global _last_run_by_area_id
     _last_run_by_area_id.clear()
+    _schedule.clear()
 
 
 __all__ = [
+    "IntervalScheduleQueue",
     "scheduler_task",
     "start_scheduler",
     "stop_scheduler",
     "is_area_due",
+    "get_interval_seconds",
+    "get_interval_schedule",
+    "refresh_area_schedule",
+    "rebase_next_run_at",
+    "remove_area_schedule",
     "clear_last_run_state",
 ]
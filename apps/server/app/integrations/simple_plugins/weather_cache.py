@@ -0,0 +1,149 @@
+"""Location-keyed cache of OpenWeatherMap responses.
+
+The weather scheduler used to request the current weather once per area every
+poll and the weather actions once per execution, although many areas watch the
+same city. :data:`weather_cache` keys responses by endpoint, normalized
+location (case- and spacing-insensitive city name, or coordinates rounded to
+``WEATHER_CACHE_GRID_DEGREES``), units and remaining query parameters, and
+reuses them for ``WEATHER_CACHE_TTL_SECONDS``. Concurrent misses of the same key
+are coalesced into a single request, so API calls scale with distinct locations
+rather than areas and executions.
+
+Weather data is not user specific: a response fetched with one user's API key
+serves every user asking for the same location. Only successful responses are
+cached, so an invalid key keeps failing for its owner.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from app.core.config import settings
+
+# Query parameters that identify the location of a request
+_LOCATION_PARAMS = {"q", "lat", "lon"}
+
+
+@dataclass
+class _CachedWeather:
+    value: Any
+    expires_at: float
+
+
+def _snap(coordinate: Any, grid: float) -> float:
+    """Round a coordinate to the cache grid."""
+    if grid <= 0:
+        return float(coordinate)
+    return round(round(float(coordinate) / grid) * grid, 6)
+
+
+def normalize_weather_params(params: dict, grid_degrees: float | None = None) -> dict:
+    """Return the request parameters that identify a weather lookup.
+
+    Args:
+        params: OpenWeatherMap query parameters without ``appid``
+        grid_degrees: Grid coordinates are rounded to (defaults to the setting)
+
+    Returns:
+        Parameters with a normalized location and explicit units
+    """
+    grid = settings.weather_cache_grid_degrees if grid_degrees is None else grid_degrees
+    normalized = {
+        key: value for key, value in params.items()
+        if key not in _LOCATION_PARAMS and key != "appid" and value is not None
+    }
+    normalized["units"] = str(params.get("units") or "metric").lower()
+
+    if params.get("lat") is not None and params.get("lon") is not None:
+        normalized["lat"] = _snap(params["lat"], grid)
+        normalized["lon"] = _snap(params["lon"], grid)
+    elif params.get("q"):
+        normalized["q"] = ",".join(
+            " ".join(part.split()) for part in str(params["q"]).lower().split(",")
+        )
+    return normalized
+
+
+class WeatherCache:
+    """TTL cache of weather responses with single-flight fetching."""
+
+    def __init__(self, ttl_seconds: float | None = None, max_entries: int | None = None) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, _CachedWeather] = OrderedDict()
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> float:
+        return settings.weather_cache_ttl_seconds if self._ttl_seconds is None else self._ttl_seconds
+
+    @property
+    def max_entries(self) -> int:
+        return max(self._max_entries or settings.weather_cache_size, 1)
+
+    def get(self, endpoint: str, params: dict, fetch: Callable[[dict], Any]) -> Any:
+        """Return the cached response of a lookup, fetching it on a miss.
+
+        Args:
+            endpoint: OpenWeatherMap endpoint (e.g. "weather", "forecast")
+            params: Query parameters without ``appid``
+            fetch: Performs the request for the normalized parameters; its
+                exceptions propagate to every caller waiting on the same key
+
+        Returns:
+            Decoded response, shared between callers (do not mutate)
+        """
+        request_params = normalize_weather_params(params)
+        key = (endpoint, tuple(sorted(request_params.items())))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry.value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch(dict(request_params))
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = _CachedWeather(value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached response (useful for testing)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by the weather scheduler and the weather actions
+weather_cache = WeatherCache()
+
+
+__all__ = [
+    "WeatherCache",
+    "normalize_weather_params",
+    "weather_cache",
+]
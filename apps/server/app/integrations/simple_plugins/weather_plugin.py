@@ -17,8 +17,8 @@ import httpx
 
 from app.models.area import Area
 from app.db.session import SessionLocal
-from app.services.service_connections import get_service_connection_by_user_and_service
-from app.core.encryption import decrypt_token
+from app.services.credential_manager import credential_manager
+from app.integrations.simple_plugins.weather_cache import weather_cache
 from app.integrations.simple_plugins.exceptions import (
     WeatherAPIError,
     WeatherConfigError,
@@ -46,13 +46,12 @@ def _get_weather_api_key(area: Area, db: Session) -> str:
     Raises:
         WeatherConfigError: If service connection not found or API key unavailable
     """
-    # Get service connection for Weather
-    connection = get_service_connection_by_user_and_service(db, area.user_id, "weather")
-    if not connection:
+    # Get cached API key for Weather
+    credentials = credential_manager.get(db, area.user_id, "weather")
+    if credentials is None:
         raise WeatherConfigError("Weather service connection not found. Please add your OpenWeatherMap API key.")
 
-    # Decrypt API key
-    api_key = decrypt_token(connection.encrypted_access_token)
+    api_key = credentials.access_token
     if not api_key:
         raise WeatherConfigError("OpenWeatherMap API key not available or invalid.")
 
@@ -61,6 +60,9 @@ def _get_weather_api_key(area: Area, db: Session) -> str:
 
 def _make_weather_request(endpoint: str, params: dict, area: Area, db: Session) -> dict:
     """Make a request to OpenWeatherMap API.
+
+    Responses are shared with the weather scheduler through the location-keyed
+    weather cache, so repeated executions for a location reuse one response.
     
     Args:
         endpoint: API endpoint (e.g., "weather", "forecast")
@@ -78,28 +80,25 @@ def _make_weather_request(endpoint: str, params: dict, area: Area, db: Session)
     try:
         api_key = _get_weather_api_key(area, db)
         
-        # Add API key to params
-        params["appid"] = api_key
-        
-        # Default to metric units if not specified
-        if "units" not in params:
-            params["units"] = "metric"
-        
         url = f"{OPENWEATHER_BASE_URL}/{endpoint}"
-        
-        logger.debug(
-            f"Making Weather API request",
-            extra={
-                "endpoint": endpoint,
-                "params": {k: v for k, v in params.items() if k != "appid"},
-            }
-        )
-        
-        # Make synchronous HTTP request
-        response = httpx.get(url, params=params, timeout=10.0)
-        response.raise_for_status()
-        
-        return response.json()
+
+        def fetch(request_params: dict) -> dict:
+            logger.debug(
+                f"Making Weather API request",
+                extra={
+                    "endpoint": endpoint,
+                    "params": request_params,
+                }
+            )
+
+            # Make synchronous HTTP request
+            response = httpx.get(url, params={**request_params, "appid": api_key}, timeout=10.0)
+            response.raise_for_status()
+
+            return response.json()
+
+        # Units default to metric when not specified
+        return weather_cache.get(endpoint, params, fetch)
         
     except httpx.HTTPStatusError as e:
         error_msg = f"Weather API HTTP error: {e.response.status_code}"
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
@@ -12,18 +12,17 @@ if TYPE_CHECKING:
 
 import httpx
 
-from app.core.encryption import decrypt_token
+from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import TriggerEvent, TriggerSource
+from app.integrations.simple_plugins.weather_cache import weather_cache
 from app.models.area import Area
-from app.schemas.execution_log import ExecutionLogCreate
-from app.services.execution_logs import create_execution_log
-from app.services.service_connections import get_service_connection_by_user_and_service
-from app.services.step_executor import execute_area
+from app.services.credential_manager import credential_manager
+from app.services.execution_pool import ExecutionJob, submit_execution_job
 
 logger = logging.getLogger("area")
 
 # In-memory storage for last checked values per AREA
 _last_weather_state: Dict[str, dict] = {}
-_weather_scheduler_task: asyncio.Task | None = None
 
 # OpenWeatherMap API base URL
 OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
@@ -40,10 +39,10 @@ def _get_weather_api_key(user_id, db: Session) -> str | None:
         Decrypted API key or None if not found
     """
     try:
-        connection = get_service_connection_by_user_and_service(db, user_id, "weather")
-        if not connection:
+        credentials = credential_manager.get(db, user_id, "weather")
+        if credentials is None:
             return None
-        return decrypt_token(connection.encrypted_access_token)
+        return credentials.access_token
     except Exception as e:
         logger.error(f"Failed to get weather API key: {e}", exc_info=True)
         return None
@@ -51,6 +50,9 @@ def _get_weather_api_key(user_id, db: Session) -> str | None:
 
 def _fetch_weather_data(api_key: str, location: str = None, lat: float = None, lon: float = None) -> dict | None:
     """Fetch current weather data from OpenWeatherMap API.
+
+    Responses are shared through the location-keyed weather cache, so areas
+    watching the same location cost one request per cache TTL.
     
     Args:
         api_key: OpenWeatherMap API key
@@ -61,29 +63,32 @@ def _fetch_weather_data(api_key: str, location: str = None, lat: float = None, l
     Returns:
         Weather data dictionary or None on error
     """
-    try:
-        params = {
-            "appid": api_key,
-            "units": "metric"
-        }
-        
-        if lat is not None and lon is not None:
-            params["lat"] = lat
-            params["lon"] = lon
-        elif location:
-            params["q"] = location
-        else:
-            logger.error("Either location or lat/lon must be provided")
-            return None
-        
+    if not api_key:
+        logger.error("An OpenWeatherMap API key must be provided")
+        return None
+
+    params = {"units": "metric"}
+    if lat is not None and lon is not None:
+        params["lat"] = lat
+        params["lon"] = lon
+    elif location:
+        params["q"] = location
+    else:
+        logger.error("Either location or lat/lon must be provided")
+        return None
+
+    def fetch(request_params: dict) -> dict:
         with httpx.Client() as client:
             response = client.get(
                 f"{OPENWEATHER_BASE_URL}/weather",
-                params=params,
+                params={**request_params, "appid": api_key},
                 timeout=10.0
             )
             response.raise_for_status()
             return response.json()
+
+    try:
+        return weather_cache.get("weather", params, fetch)
     except httpx.HTTPError as e:
         logger.error(f"Failed to fetch weather data: {e}", exc_info=True)
         return None
@@ -138,114 +143,88 @@ def _fetch_due_weather_areas(db: Session) -> list[Area]:
     )
 
 
-async def weather_scheduler_task() -> None:
-    """Background task that polls weather data and checks for trigger conditions."""
-    from app.db.session import SessionLocal
+class WeatherTriggerSource(TriggerSource):
+    """Polls OpenWeatherMap and fires when an area's weather condition is met.
+
+    Weather triggers are state transitions rather than discrete provider events,
+    so the source keeps its own last observed state instead of engine dedupe.
+    """
 
-    logger.info("Starting Weather polling scheduler task")
+    service = "weather"
+    name = "Weather"
 
-    while True:
-        try:
-            # Poll every 5 minutes (weather doesn't change that frequently)
-            await asyncio.sleep(300)
+    @property
+    def poll_interval(self) -> float:
+        return settings.weather_poll_interval_seconds
 
-            now = datetime.now(timezone.utc)
+    def fetch_areas(self, db: Session) -> list[Area]:
+        return _fetch_due_weather_areas(db)
 
-            # Fetch all enabled weather areas using a scoped session
-            with SessionLocal() as db:
-                areas = await asyncio.to_thread(_fetch_due_weather_areas, db)
+    async def poll(self, db: Session, areas: list[Area], now: datetime) -> list[TriggerEvent]:
+        events: list[TriggerEvent] = []
+        for area in areas:
+            area_id_str = str(area.id)
 
+            # Initialize last state for this area if needed
+            if area_id_str not in _last_weather_state:
+                _last_weather_state[area_id_str] = {}
+
+            # Get weather API key for user
+            api_key = await asyncio.to_thread(_get_weather_api_key, area.user_id, db)
+            if not api_key:
+                logger.warning(
+                    f"Weather API key not configured for area {area_id_str}, skipping"
+                )
+                continue
+
+            # Get location from trigger params
+            params = area.trigger_params or {}
+            location = params.get("location")
+            lat = params.get("lat")
+            lon = params.get("lon")
+
+            if not location and (lat is None or lon is None):
+                logger.warning(
+                    f"No location configured for weather area {area_id_str}, skipping"
+                )
+                continue
+
+            # Fetch current weather data
+            weather_data = await asyncio.to_thread(
+                _fetch_weather_data, api_key, location, lat, lon
+            )
+
+            if not weather_data:
+                logger.warning(
+                    f"Failed to fetch weather data for area {area_id_str}"
+                )
+                continue
+
+            # Check if trigger condition is met based on trigger action
+            should_trigger = False
+
+            if area.trigger_action == "temperature_threshold":
+                should_trigger = await _check_temperature_threshold(
+                    area, weather_data, area_id_str
+                )
+            elif area.trigger_action == "weather_condition":
+                should_trigger = await _check_weather_condition(
+                    area, weather_data, area_id_str
+                )
+
+            if should_trigger:
                 logger.info(
-                    "Weather scheduler tick",
+                    f"Weather trigger condition met for area {area_id_str}",
                     extra={
-                        "utc_now": now.isoformat(),
-                        "areas_count": len(areas),
-                    },
+                        "area_id": area_id_str,
+                        "trigger_action": area.trigger_action,
+                    }
                 )
+                events.append(TriggerEvent(area, weather_data))
+        return events
 
-            # Process each area with its own scoped session
-            for area in areas:
-                area_id_str = str(area.id)
-
-                # Initialize last state for this area if needed
-                if area_id_str not in _last_weather_state:
-                    _last_weather_state[area_id_str] = {}
-
-                try:
-                    # Use scoped session for this area's processing
-                    with SessionLocal() as db:
-                        # Get weather API key for user
-                        api_key = await asyncio.to_thread(_get_weather_api_key, area.user_id, db)
-                        if not api_key:
-                            logger.warning(
-                                f"Weather API key not configured for area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Get location from trigger params
-                        params = area.trigger_params or {}
-                        location = params.get("location")
-                        lat = params.get("lat")
-                        lon = params.get("lon")
-                        
-                        if not location and (lat is None or lon is None):
-                            logger.warning(
-                                f"No location configured for weather area {area_id_str}, skipping"
-                            )
-                            continue
-
-                        # Fetch current weather data
-                        weather_data = await asyncio.to_thread(
-                            _fetch_weather_data, api_key, location, lat, lon
-                        )
-                        
-                        if not weather_data:
-                            logger.warning(
-                                f"Failed to fetch weather data for area {area_id_str}"
-                            )
-                            continue
-
-                        # Check if trigger condition is met based on trigger action
-                        should_trigger = False
-                        
-                        if area.trigger_action == "temperature_threshold":
-                            should_trigger = await _check_temperature_threshold(
-                                area, weather_data, area_id_str
-                            )
-                        elif area.trigger_action == "weather_condition":
-                            should_trigger = await _check_weather_condition(
-                                area, weather_data, area_id_str
-                            )
-
-                        if should_trigger:
-                            logger.info(
-                                f"Weather trigger condition met for area {area_id_str}",
-                                extra={
-                                    "area_id": area_id_str,
-                                    "trigger_action": area.trigger_action,
-                                }
-                            )
-                            await _process_weather_trigger(db, area, weather_data, now)
-
-                except Exception as e:
-                    logger.error(
-                        "Error processing weather area",
-                        extra={
-                            "area_id": area_id_str,
-                            "error": str(e),
-                        },
-                        exc_info=True,
-                    )
-
-        except asyncio.CancelledError:
-            logger.info("Weather scheduler task cancelled, shutting down gracefully")
-            break
-
-        except Exception as e:
-            logger.error("Weather scheduler task error", extra={"error": str(e)}, exc_info=True)
-            await asyncio.sleep(60)  # Back off on error
-
-    logger.info("Weather scheduler task stopped")
+    async def dispatch(self, db: Session, event: TriggerEvent, now: datetime) -> None:
+        await _process_weather_trigger(db, event.area, event.payload, now)
 
 
 async def _check_temperature_threshold(area: Area, weather_data: dict, area_id_str: str) -> bool:
@@ -328,7 +307,7 @@ async def _check_weather_condition(area: Area, weather_data: dict, area_id_str:
 
 
 async def _process_weather_trigger(db: Session, area: Area, weather_data: dict, now: datetime) -> None:
-    """Process a weather trigger event and execute the area.
+    """Process a weather trigger event and queue the area for execution.
     
     Args:
         db: Database session
@@ -339,119 +318,34 @@ async def _process_weather_trigger(db: Session, area: Area, weather_data: dict,
     # Re-attach the Area instance to the current session
     area = db.merge(area)
     area_id_str = str(area.id)
-    execution_log = None
 
-    try:
-        # Create execution log entry
-        execution_log_start = ExecutionLogCreate(
-            area_id=area.id,
-            status="Started",
-            output=None,
-            error_message=None,
-            step_details={
-                "event": {
-                    "now": now.isoformat(),
-                    "area_id": area_id_str,
-                    "user_id": str(area.user_id),
-                    "temperature": weather_data.get("main", {}).get("temp"),
-                    "condition": weather_data.get("weather", [{}])[0].get("main"),
-                }
-            }
-        )
-        execution_log = create_execution_log(db, execution_log_start)
-
-        # Extract weather variables
-        variables = _extract_weather_variables(weather_data)
-
-        # Build trigger_data with weather variables
-        trigger_data = {
-            **variables,
-            "now": now.isoformat(),
-            "timestamp": now.timestamp(),
-            "area_id": area_id_str,
-            "user_id": str(area.user_id),
-        }
-
-        # Execute area
-        result = execute_area(db, area, trigger_data)
-
-        # Update execution log
-        execution_log.status = "Success" if result["status"] == "success" else "Failed"
-        execution_log.output = f"Weather trigger executed: {result['steps_executed']} step(s)"
-        execution_log.error_message = result.get("error")
-        execution_log.step_details = {
-            "execution_log": result.get("execution_log", []),
-            "steps_executed": result["steps_executed"],
-            "weather_data": weather_data,
-        }
-        db.commit()
-
-        logger.info(
-            "Weather trigger executed",
-            extra={
-                "area_id": area_id_str,
-                "area_name": area.name,
-                "user_id": str(area.user_id),
-                "temperature": variables.get("weather.temperature"),
-                "condition": variables.get("weather.condition"),
-                "status": result["status"],
-                "steps_executed": result.get("steps_executed", 0),
-            },
-        )
+    # Extract weather variables
+    variables = _extract_weather_variables(weather_data)
 
-    except Exception as e:
-        # Update execution log with failure
-        if execution_log:
-            execution_log.status = "Failed"
-            execution_log.error_message = str(e)
-            db.commit()
-
-        logger.error(
-            "Error executing weather trigger",
-            extra={
+    # Build trigger_data with weather variables
+    trigger_data = {
+        **variables,
+        "now": now.isoformat(),
+        "timestamp": now.timestamp(),
+        "area_id": area_id_str,
+        "user_id": str(area.user_id),
+    }
+
+    await submit_execution_job(
+        ExecutionJob(
+            area_id=area_id_str,
+            trigger_data=trigger_data,
+            source="Weather",
+            event={
+                "now": now.isoformat(),
                 "area_id": area_id_str,
-                "error": str(e),
+                "user_id": str(area.user_id),
+                "temperature": weather_data.get("main", {}).get("temp"),
+                "condition": weather_data.get("weather", [{}])[0].get("main"),
             },
-            exc_info=True,
+            details={"weather_data": weather_data},
         )
-
-
-def start_weather_scheduler() -> None:
-    """Start the weather polling scheduler task."""
-    global _weather_scheduler_task
-
-    if _weather_scheduler_task is not None:
-        logger.warning("Weather scheduler task already running")
-        return
-
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        logger.error("No event loop running, cannot start weather scheduler")
-        return
-
-    _weather_scheduler_task = loop.create_task(weather_scheduler_task())
-    logger.info("Weather scheduler task started")
-
-
-def stop_weather_scheduler() -> None:
-    """Stop the weather polling scheduler task."""
-    global _weather_scheduler_task
-
-    if _weather_scheduler_task is not None:
-        _weather_scheduler_task.cancel()
-        _weather_scheduler_task = None
-        logger.info("Weather scheduler task stopped")
-
-
-def is_weather_scheduler_running() -> bool:
-    """Check if the weather scheduler task is running.
-    
-    Returns:
-        True if scheduler is running and not done/cancelled, False otherwise
-    """
-    global _weather_scheduler_task
-    return _weather_scheduler_task is not None and not _weather_scheduler_task.done()
+    )
 
 
 def clear_weather_state() -> None:
@@ -461,9 +355,6 @@ def clear_weather_state() -> None:
 
 
 __all__ = [
-    "weather_scheduler_task",
-    "start_weather_scheduler",
-    "is_weather_scheduler_running",
-    "stop_weather_scheduler",
+    "WeatherTriggerSource",
     "clear_weather_state",
 ]
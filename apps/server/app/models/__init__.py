@@ -4,16 +4,24 @@ from .area import Area
 from .area_step import AreaStep
 from .email_verification_token import EmailVerificationToken
 from .execution_log import ExecutionLog
+from .push_subscription import PushSubscription
+from .seen_event import SeenEvent
 from .service_connection import ServiceConnection
+from .sync_cursor import SyncCursor
 from .user import User
 from .user_activity_log import UserActivityLog
+from .workflow_timer import WorkflowTimer
 
 __all__ = [
 	"Area",
 	"AreaStep",
 	"EmailVerificationToken",
 	"ExecutionLog",
+	"PushSubscription",
+	"SeenEvent",
 	"ServiceConnection",
+	"SyncCursor",
 	"User",
 	"UserActivityLog",
+	"WorkflowTimer",
 ]
@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, List, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, UniqueConstraint, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,13 @@ class Area(Base):
     __tablename__ = "areas"
     __table_args__ = (
         Index("ix_areas_user_id", "user_id"),
+        Index(
+            "ix_areas_interval_next_run_at",
+            "next_run_at",
+            postgresql_where=text(
+                "enabled AND trigger_service = 'time' AND trigger_action = 'every_interval'"
+            ),
+        ),
         UniqueConstraint("user_id", "name", name="uq_areas_user_id_name"),
     )
 
@@ -60,6 +67,11 @@ class Area(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Next fire time of interval (time) triggers; NULL means due immediately
+    next_run_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     # Relationship to User
     user: Mapped["User"] = relationship("User", back_populates="areas")
@@ -0,0 +1,63 @@
+"""PushSubscription ORM model definition."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PushSubscription(Base):
+    """Provider push channel (webhook, watch, change subscription) covering a trigger scope."""
+
+    __tablename__ = "push_subscriptions"
+    __table_args__ = (
+        UniqueConstraint(
+            "service",
+            "channel_id",
+            name="uq_push_subscriptions_service_channel_id",
+        ),
+        UniqueConstraint(
+            "service",
+            "scope",
+            name="uq_push_subscriptions_service_scope",
+        ),
+        Index("ix_push_subscriptions_expires_at", "expires_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    service: Mapped[str] = mapped_column(String(64), nullable=False)
+    scope: Mapped[str] = mapped_column(String(255), nullable=False)
+    connection_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("service_connections.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    channel_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    resource_id: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    encrypted_secret: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+__all__ = ["PushSubscription"]
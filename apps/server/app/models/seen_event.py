@@ -0,0 +1,44 @@
+"""SeenEvent ORM model definition."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SeenEvent(Base):
+    """Provider event ID a trigger source already handled for an area or connection."""
+
+    __tablename__ = "seen_events"
+    __table_args__ = (
+        UniqueConstraint(
+            "service",
+            "scope",
+            "event_id",
+            name="uq_seen_events_service_scope_event_id",
+        ),
+        Index("ix_seen_events_seen_at", "seen_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    service: Mapped[str] = mapped_column(String(64), nullable=False)
+    scope: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_id: Mapped[str] = mapped_column(String(512), nullable=False)
+    seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+__all__ = ["SeenEvent"]
@@ -0,0 +1,47 @@
+"""SyncCursor ORM model definition."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, ForeignKey, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SyncCursor(Base):
+    """Provider incremental-sync position (history ID, delta link, sync token) of a connection."""
+
+    __tablename__ = "sync_cursors"
+    __table_args__ = (
+        UniqueConstraint(
+            "connection_id",
+            "cursor_key",
+            name="uq_sync_cursors_connection_id_cursor_key",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    connection_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("service_connections.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    cursor_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    value: Mapped[str] = mapped_column(String(4096), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+__all__ = ["SyncCursor"]
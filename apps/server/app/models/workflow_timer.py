@@ -0,0 +1,53 @@
+"""WorkflowTimer ORM model definition."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class WorkflowTimer(Base):
+    """Paused area run waiting for a delay step to elapse.
+
+    Holds everything needed to resume the run after the delay step: the steps
+    to execute next, the variables accumulated so far, the trigger data and
+    the steps already executed.
+    """
+
+    __tablename__ = "workflow_timers"
+    __table_args__ = (Index("ix_workflow_timers_due_at", "due_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    area_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("areas.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    delay_step_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    next_step_ids: Mapped[list[str]] = mapped_column(JSONB, nullable=False)
+    variables: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    trigger_data: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    executed_step_ids: Mapped[list[str]] = mapped_column(JSONB, nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+__all__ = ["WorkflowTimer"]
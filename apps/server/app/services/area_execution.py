@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Dict, List
 
 from sqlalchemy.orm import Session
 
+from app.integrations.simple_plugins.delay_plugin import delay_duration_seconds
 from app.integrations.simple_plugins.registry import get_plugins_registry
 from app.models.area import Area
 from app.models.area_step import AreaStep
@@ -172,28 +173,16 @@ class ExecutionEngine:
             return False
     
     async def _execute_delay_step(self, area: Area, step: AreaStep, event: dict) -> None:
-        """Execute a delay step."""
+        """Execute a delay step by sleeping for its duration.
+
+        Unlike :class:`~app.services.step_executor.StepExecutor`, which
+        persists the run on a workflow timer, this holds the execution for
+        the whole delay. No scheduler runs areas through this engine.
+        """
         if step.step_type != "delay":
             raise ValueError(f"Expected delay step, got {step.step_type}")
         
-        # Get delay configuration, defaulting to 1 second
-        config = step.config or {}
-        duration = config.get("duration", 1)
-        unit = config.get("unit", "seconds")
-        
-        # Convert to seconds based on unit
-        if unit == "seconds":
-            delay_seconds = duration
-        elif unit == "minutes":
-            delay_seconds = duration * 60
-        elif unit == "hours":
-            delay_seconds = duration * 60 * 60
-        elif unit == "days":
-            delay_seconds = duration * 60 * 60 * 24
-        else:
-            # Default to seconds if unit is not recognized
-            delay_seconds = duration
-            logger.warning(f"Unrecognized time unit '{unit}' for delay in area {area.id}, defaulting to seconds")
+        delay_seconds = delay_duration_seconds(step.config or {})
         
         logger.info(
             f"Delay step executing for Area {area.id}, pausing for {delay_seconds} seconds",
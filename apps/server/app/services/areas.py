@@ -132,6 +132,9 @@ def create_area(
         raise
 
     db.refresh(area)
+
+    from app.integrations.simple_plugins.scheduler import refresh_area_schedule
+    refresh_area_schedule(area)
     return area
 
 
@@ -168,7 +171,13 @@ def update_area(db: Session, area_id: str, area_in: AreaUpdate, *, user_id: Opti
         area.trigger_action = area_in.trigger_action
 
     if area_in.trigger_params is not None:
+        from app.integrations.simple_plugins.scheduler import (
+            get_interval_seconds,
+            rebase_next_run_at,
+        )
+        previous_interval = get_interval_seconds(area)
         area.trigger_params = area_in.trigger_params
+        rebase_next_run_at(area, previous_interval)
 
     if area_in.reaction_service is not None:
         area.reaction_service = area_in.reaction_service
@@ -184,6 +193,10 @@ def update_area(db: Session, area_id: str, area_in: AreaUpdate, *, user_id: Opti
 
     db.commit()
     db.refresh(area)
+
+    # Keep the interval scheduler's in-memory schedule in sync
+    from app.integrations.simple_plugins.scheduler import refresh_area_schedule
+    refresh_area_schedule(area)
     return area
 
 
@@ -196,9 +209,15 @@ def delete_area(db: Session, area_id: str) -> bool:
     # Import the clear_area_from_seen_state function to clean up Discord scheduler caches
     from app.integrations.simple_plugins.discord_scheduler import clear_area_from_seen_state
     clear_area_from_seen_state(area_id)
-    
+
+    from app.services.seen_events import delete_seen_events
+    delete_seen_events(db, area_id)
+
     db.delete(area)
     db.commit()
+
+    from app.integrations.simple_plugins.scheduler import remove_area_schedule
+    remove_area_schedule(area_id)
     return True
 
 
@@ -0,0 +1,61 @@
+"""Shared, bounded thread pool for the blocking work of async execution.
+
+The step executor awaits coroutine handlers directly on the caller's event
+loop. Synchronous handlers, and the database bookkeeping of the execution pool,
+are offloaded to this single pool of ``EXECUTION_THREAD_POOL_SIZE`` threads
+instead of spinning up a thread pool (and a fresh event loop) per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool, creating it on first use."""
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(settings.execution_thread_pool_size, 1),
+                thread_name_prefix="area-blocking",
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the shared pool and await its result.
+
+    Like :func:`asyncio.to_thread`, the caller's context variables are
+    propagated to the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_blocking_executor(), call)
+
+
+def shutdown_blocking_pool() -> None:
+    """Shut the shared pool down; the next call creates a new one."""
+    global _executor
+
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["get_blocking_executor", "run_blocking", "shutdown_blocking_pool"]
@@ -0,0 +1,342 @@
+"""In-process cache of decrypted service connection credentials.
+
+Schedulers and plugins used to look up their service connection, decrypt its
+tokens and refresh them on their own, so concurrent areas of the same user could
+refresh one token several times at once. :class:`CredentialManager` keeps the
+decrypted tokens in memory until shortly before they expire, coalesces concurrent
+refreshes of a connection into a single provider call and persists the refreshed
+tokens once. Entries are dropped whenever a connection is updated or deleted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+    from app.models.service_connection import ServiceConnection
+
+from app.core.config import settings
+from app.core.encryption import decrypt_token
+from app.integrations.oauth.base import OAuth2TokenSet
+from app.integrations.oauth.exceptions import OAuth2RefreshError
+from app.schemas.service_connection import ServiceConnectionUpdate
+from app.services.service_connections import (
+    get_service_connection_by_id,
+    get_service_connection_by_user_and_service,
+    update_service_connection,
+)
+
+logger = logging.getLogger("area")
+
+# Lifetime assumed for refreshed tokens whose provider omits ``expires_in``
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class ConnectionCredentials:
+    """Decrypted tokens of a service connection.
+
+    Attributes:
+        connection_id: ServiceConnection ID the tokens belong to
+        user_id: Owner of the connection
+        service_name: Service of the connection (e.g. "gmail", "outlook")
+        access_token: Decrypted access token or API key
+        refresh_token: Decrypted refresh token, if any
+        expires_at: Expiry of the access token, ``None`` if it does not expire
+    """
+
+    connection_id: uuid.UUID
+    user_id: uuid.UUID
+    service_name: str
+    access_token: Optional[str]
+    refresh_token: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+    def expires_within(self, seconds: float) -> bool:
+        """Return whether the access token expires in the next ``seconds``."""
+        if self.expires_at is None:
+            return False
+        return self.expires_at <= datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the access token is expired or about to expire."""
+        return self.expires_within(settings.credential_refresh_margin_seconds)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def credentials_from_connection(connection: ServiceConnection) -> ConnectionCredentials:
+    """Decrypt the tokens of a service connection."""
+    refresh_token = None
+    if connection.encrypted_refresh_token:
+        refresh_token = decrypt_token(connection.encrypted_refresh_token)
+    return ConnectionCredentials(
+        connection_id=connection.id,
+        user_id=connection.user_id,
+        service_name=connection.service_name,
+        access_token=decrypt_token(connection.encrypted_access_token),
+        refresh_token=refresh_token,
+        expires_at=_as_utc(connection.expires_at),
+    )
+
+
+def _run_coroutine(coroutine):
+    """Run a coroutine to completion from synchronous code without a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    coroutine.close()
+    raise RuntimeError("Cannot block on a coroutine from a running event loop, await it instead")
+
+
+async def refresh_with_provider_async(credentials: ConnectionCredentials) -> OAuth2TokenSet:
+    """Refresh tokens through the OAuth2 provider of the connection's service."""
+    # Import here to avoid circular imports
+    from app.integrations.oauth.factory import OAuth2ProviderFactory
+
+    provider = OAuth2ProviderFactory.create_provider(credentials.service_name)
+    return await provider.refresh_tokens(credentials.refresh_token)
+
+
+def refresh_with_provider(credentials: ConnectionCredentials) -> OAuth2TokenSet:
+    """Synchronous variant of :func:`refresh_with_provider_async` for threads without a loop."""
+    return _run_coroutine(refresh_with_provider_async(credentials))
+
+
+@dataclass
+class _CacheEntry:
+    credentials: ConnectionCredentials
+    cached_until: float
+
+
+class CredentialManager:
+    """Thread-safe cache of decrypted credentials with single-flight refresh.
+
+    Entries are keyed by ``(user_id, service_name)`` and expire after
+    ``CREDENTIAL_CACHE_TTL_SECONDS`` or when the access token enters its refresh
+    margin, whichever comes first. Refreshes hold a per-connection lock, so
+    concurrent callers wait for the first refresh and reuse its result. Code
+    running on the event loop uses :meth:`aget` and :meth:`arefresh`, which
+    keep database work and lock waits in worker threads.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[tuple[str, str], _CacheEntry] = {}
+        self._keys_by_connection: Dict[str, tuple[str, str]] = {}
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id, service_name: str) -> Optional[ConnectionCredentials]:
+        """Return the credentials of a user's connection to a service.
+
+        The returned credentials may be expired; callers check
+        :attr:`ConnectionCredentials.expired` and call :meth:`refresh`.
+
+        Args:
+            db: Database session used on cache misses
+            user_id: User UUID
+            service_name: Service of the connection
+
+        Returns:
+            Decrypted credentials or None if the user has no such connection
+        """
+        cached, version = self._cached(user_id, service_name)
+        if cached is not None:
+            return cached
+
+        connection = get_service_connection_by_user_and_service(db, user_id, service_name)
+        if connection is None:
+            return None
+        return self._store(credentials_from_connection(connection), version)
+
+    async def aget(self, db: Session, user_id, service_name: str) -> Optional[ConnectionCredentials]:
+        """Async variant of :meth:`get` that reads the database in a worker thread on cache misses."""
+        cached, _ = self._cached(user_id, service_name)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.get, db, user_id, service_name)
+
+    def refresh(
+        self,
+        db: Session,
+        credentials: ConnectionCredentials,
+        refresher: Callable[[ConnectionCredentials], OAuth2TokenSet] | None = None,
+    ) -> ConnectionCredentials:
+        """Refresh the access token of a connection once for all concurrent callers.
+
+        Args:
+            db: Database session used to reload and persist the connection
+            credentials: Stale credentials returned by :meth:`get`
+            refresher: Provider call returning new tokens, defaults to the
+                connection's OAuth2 provider
+
+        Returns:
+            Credentials holding a valid access token
+
+        Raises:
+            OAuth2RefreshError: If the connection cannot be refreshed
+        """
+        with self._refresh_lock(credentials.connection_id):
+            fresh, latest = self._reload(db, credentials)
+            if fresh is not None:
+                return fresh
+            token_set = (refresher or refresh_with_provider)(latest)
+            return self._save(db, latest, token_set)
+
+    async def arefresh(
+        self,
+        db: Session,
+        credentials: ConnectionCredentials,
+        refresher: Callable[[ConnectionCredentials], OAuth2TokenSet] | None = None,
+    ) -> ConnectionCredentials:
+        """Async variant of :meth:`refresh` that does not block the event loop.
+
+        The refresh runs in a worker thread holding the same per-connection lock
+        as :meth:`refresh`, so refreshes started from threads and from the loop
+        are coalesced together. The provider itself is awaited on the caller's
+        loop.
+        """
+        if refresher is None:
+            loop = asyncio.get_running_loop()
+
+            def refresher(latest: ConnectionCredentials) -> OAuth2TokenSet:
+                future = asyncio.run_coroutine_threadsafe(refresh_with_provider_async(latest), loop)
+                return future.result()
+
+        return await asyncio.to_thread(self.refresh, db, credentials, refresher)
+
+    def invalidate(self, connection_id) -> None:
+        """Drop the cached credentials of a connection."""
+        with self._lock:
+            self._version += 1
+            key = self._keys_by_connection.pop(str(connection_id), None)
+            if key is not None:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached credential (useful for testing)."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._keys_by_connection.clear()
+
+    def _refresh_lock(self, connection_id) -> threading.Lock:
+        with self._lock:
+            return self._refresh_locks.setdefault(str(connection_id), threading.Lock())
+
+    def _cached(self, user_id, service_name: str) -> tuple[Optional[ConnectionCredentials], int]:
+        """Return the live cache entry of a connection, if any, and the cache version."""
+        with self._lock:
+            entry = self._entries.get((str(user_id), service_name))
+            if entry is not None and entry.cached_until > time.monotonic():
+                return entry.credentials, self._version
+            return None, self._version
+
+    def _reload(
+        self, db: Session, credentials: ConnectionCredentials
+    ) -> tuple[Optional[ConnectionCredentials], ConnectionCredentials]:
+        """Reload stale credentials before refreshing them.
+
+        Returns:
+            Valid credentials if the token was refreshed meanwhile, otherwise
+            None and the latest stored credentials to refresh
+
+        Raises:
+            OAuth2RefreshError: If the connection cannot be refreshed
+        """
+        cached, version = self._cached(credentials.user_id, credentials.service_name)
+        if cached is not None and cached.access_token != credentials.access_token and not cached.expired:
+            return cached, cached
+
+        # Another worker or replica may have refreshed the token already
+        connection = get_service_connection_by_id(db, str(credentials.connection_id))
+        if connection is None:
+            self.invalidate(credentials.connection_id)
+            raise OAuth2RefreshError(f"Service connection {credentials.connection_id} no longer exists")
+        db.refresh(connection)
+        latest = credentials_from_connection(connection)
+        if latest.access_token != credentials.access_token and not latest.expired:
+            return self._store(latest, version), latest
+
+        if not latest.refresh_token:
+            raise OAuth2RefreshError("No refresh token available")
+
+        logger.info(
+            "Refreshing service connection token",
+            extra={
+                "connection_id": str(latest.connection_id),
+                "service_name": latest.service_name,
+            },
+        )
+        return None, latest
+
+    def _save(
+        self, db: Session, latest: ConnectionCredentials, token_set: OAuth2TokenSet
+    ) -> ConnectionCredentials:
+        """Persist and cache the tokens returned by a refresh."""
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            seconds=token_set.expires_in or DEFAULT_TOKEN_LIFETIME_SECONDS
+        )
+        refreshed = replace(
+            latest,
+            access_token=token_set.access_token,
+            refresh_token=token_set.refresh_token or latest.refresh_token,
+            expires_at=expires_at,
+        )
+        update_service_connection(
+            db,
+            str(latest.connection_id),
+            ServiceConnectionUpdate(
+                service_name=latest.service_name,
+                access_token=refreshed.access_token,
+                refresh_token=token_set.refresh_token,
+                expires_at=expires_at,
+            ),
+        )
+        with self._lock:
+            version = self._version
+        return self._store(refreshed, version)
+
+    def _store(self, credentials: ConnectionCredentials, version: int) -> ConnectionCredentials:
+        """Cache credentials unless the connection changed since they were read."""
+        ttl = float(settings.credential_cache_ttl_seconds)
+        if credentials.expires_at is not None:
+            remaining = (credentials.expires_at - datetime.now(timezone.utc)).total_seconds()
+            ttl = min(ttl, remaining - settings.credential_refresh_margin_seconds)
+        if ttl <= 0:
+            return credentials
+
+        key = (str(credentials.user_id), credentials.service_name)
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = _CacheEntry(credentials, time.monotonic() + ttl)
+                self._keys_by_connection[str(credentials.connection_id)] = key
+        return credentials
+
+
+credential_manager = CredentialManager()
+
+
+__all__ = [
+    "ConnectionCredentials",
+    "CredentialManager",
+    "credential_manager",
+    "credentials_from_connection",
+    "refresh_with_provider",
+    "refresh_with_provider_async",
+]
@@ -0,0 +1,268 @@
+"""Compiled, cached step graphs of multi-step areas.
+
+:class:`~app.services.step_executor.StepExecutor` used to resolve every edge
+with a linear scan of ``area.steps`` and to rebuild the list of executed step
+IDs from the execution log before each hop, so a run was quadratic in the
+number of steps and redone from scratch on every trigger.
+
+An :class:`ExecutionPlan` resolves the graph once per area version: step IDs
+map to positions in ``area.steps``, the ``targets`` and ``elseBranch`` edges
+become position lists, the entry step is pre-resolved and cycles are detected
+up front. Fan-outs whose branches can never reach a common step are marked
+independent so the executor may run them concurrently. Plans only hold
+positions and IDs, never ORM instances, so one :class:`ExecutionPlanCache` is
+shared by every scheduler and execution worker.
+A plan is recompiled as soon as the area or one of its steps is updated.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.models.area import Area
+    from app.models.area_step import AreaStep
+
+logger = logging.getLogger("area")
+
+# (target step ID, position of the target step or None if it does not exist)
+Edge = tuple[str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Step graph of one area version, resolved to step positions.
+
+    Positions index the area's ``steps`` list (ordered by ``AreaStep.order``).
+
+    Attributes:
+        version: Area and step versions the plan was compiled from
+        step_ids: ID of the step at each position
+        positions: Step ID -> position
+        targets: Edges followed after each step (``targets``)
+        else_targets: Edges followed when a condition is false (``elseBranch``)
+        entry: Position of the step a run starts from, None without steps
+        has_cycle: Whether an edge leads back to a step it was reached from
+        independent_targets: Whether the ``targets`` of each step start
+            branches that share no step
+        independent_else_targets: Same for the ``elseBranch`` edges
+    """
+
+    version: tuple[Any, ...]
+    step_ids: tuple[str, ...]
+    positions: dict[str, int]
+    targets: tuple[tuple[Edge, ...], ...]
+    else_targets: tuple[tuple[Edge, ...], ...]
+    entry: Optional[int]
+    has_cycle: bool
+    independent_targets: tuple[bool, ...]
+    independent_else_targets: tuple[bool, ...]
+
+    def edges(self, position: int, branch: Optional[str] = None) -> tuple[Edge, ...]:
+        """Return the edges followed from a step.
+
+        Args:
+            position: Position of the step
+            branch: "false" to follow a condition's ``elseBranch``, anything
+                else follows ``targets``
+        """
+        if branch == "false":
+            return self.else_targets[position]
+        return self.targets[position]
+
+    def is_independent(self, position: int, branch: Optional[str] = None) -> bool:
+        """Return whether the branches followed from a step share no step.
+
+        Such branches run the same steps whatever order they run in, so they
+        can be executed concurrently.
+        """
+        flags = self.independent_else_targets if branch == "false" else self.independent_targets
+        return flags[position]
+
+    def new_visited(self) -> bytearray:
+        """Return an empty visited set for one run, one byte per step."""
+        return bytearray(len(self.step_ids))
+
+
+def plan_version(area: Area, steps: Sequence[AreaStep]) -> tuple[Any, ...]:
+    """Return the key identifying the version of an area's step graph."""
+    return (
+        area.updated_at,
+        tuple((str(step.id), step.updated_at) for step in steps),
+    )
+
+
+def _edges(target_ids: Iterable[Any] | None, positions: dict[str, int]) -> tuple[Edge, ...]:
+    return tuple((str(target_id), positions.get(str(target_id))) for target_id in target_ids or ())
+
+
+def _has_cycle(targets: Sequence[tuple[Edge, ...]], else_targets: Sequence[tuple[Edge, ...]]) -> bool:
+    # Iterative three-colour depth-first search over both edge kinds
+    state = bytearray(len(targets))  # 0 = unvisited, 1 = on the current path, 2 = done
+    for root in range(len(targets)):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(targets[root] + else_targets[root]))]
+        while stack:
+            position, successors = stack[-1]
+            for _, successor in successors:
+                if successor is None:
+                    continue
+                if state[successor] == 1:
+                    return True
+                if state[successor] == 0:
+                    state[successor] = 1
+                    stack.append((successor, iter(targets[successor] + else_targets[successor])))
+                    break
+            else:
+                state[position] = 2
+                stack.pop()
+    return False
+
+
+def _reachable(targets: Sequence[tuple[Edge, ...]], else_targets: Sequence[tuple[Edge, ...]]) -> list[int]:
+    # Bitmask of the positions reachable from each step, the step included
+    reachable = []
+    for root in range(len(targets)):
+        mask = 1 << root
+        stack = [root]
+        while stack:
+            position = stack.pop()
+            for _, successor in targets[position] + else_targets[position]:
+                if successor is not None and not mask >> successor & 1:
+                    mask |= 1 << successor
+                    stack.append(successor)
+        reachable.append(mask)
+    return reachable
+
+
+def _independent(edges: tuple[Edge, ...], reachable: Sequence[int]) -> bool:
+    positions = [position for _, position in edges if position is not None]
+    if len(positions) < 2:
+        return False
+    covered = 0
+    for position in positions:
+        if reachable[position] & covered:
+            return False
+        covered |= reachable[position]
+    return True
+
+
+def compile_plan(area: Area, steps: Sequence[AreaStep] | None = None) -> ExecutionPlan:
+    """Compile the step graph of an area.
+
+    Args:
+        area: Area to compile
+        steps: Steps of the area (defaults to ``area.steps``)
+
+    Returns:
+        The execution plan of the area's current version
+    """
+    steps = list(area.steps if steps is None else steps)
+    step_ids = tuple(str(step.id) for step in steps)
+    positions: dict[str, int] = {}
+    for position, step_id in enumerate(step_ids):
+        positions.setdefault(step_id, position)
+
+    configs = [step.config or {} for step in steps]
+    targets = tuple(_edges(config.get("targets"), positions) for config in configs)
+    else_targets = tuple(_edges(config.get("elseBranch"), positions) for config in configs)
+
+    reachable = _reachable(targets, else_targets)
+
+    # The trigger step is the entry point; areas without one start at their first step
+    entry = next(
+        (position for position, step in enumerate(steps) if step.step_type == "trigger"),
+        0 if steps else None,
+    )
+
+    plan = ExecutionPlan(
+        version=plan_version(area, steps),
+        step_ids=step_ids,
+        positions=positions,
+        targets=targets,
+        else_targets=else_targets,
+        entry=entry,
+        has_cycle=_has_cycle(targets, else_targets),
+        independent_targets=tuple(_independent(edges, reachable) for edges in targets),
+        independent_else_targets=tuple(_independent(edges, reachable) for edges in else_targets),
+    )
+    if plan.has_cycle:
+        logger.warning(
+            "Area step graph contains a cycle, steps will run at most once per execution",
+            extra={"area_id": str(area.id)},
+        )
+    return plan
+
+
+class ExecutionPlanCache:
+    """Thread-safe LRU of compiled plans, one entry per area."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max(max_entries or settings.execution_plan_cache_size, 1)
+        self._plans: OrderedDict[str, ExecutionPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, area: Area) -> ExecutionPlan:
+        """Return the plan of an area, compiling it if the area changed.
+
+        Args:
+            area: Area to execute
+
+        Returns:
+            Plan matching the current version of the area and its steps
+        """
+        steps = list(area.steps)
+        key = str(area.id)
+        version = plan_version(area, steps)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None and plan.version == version:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = compile_plan(area, steps)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, area_id: Any) -> None:
+        """Drop the plan of an area."""
+        with self._lock:
+            self._plans.pop(str(area_id), None)
+
+    def clear(self) -> None:
+        """Drop every plan."""
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+execution_plan_cache = ExecutionPlanCache()
+
+
+def get_execution_plan(area: Area) -> ExecutionPlan:
+    """Return the plan of an area from the shared cache."""
+    return execution_plan_cache.get(area)
+
+
+__all__ = [
+    "ExecutionPlan",
+    "ExecutionPlanCache",
+    "compile_plan",
+    "execution_plan_cache",
+    "get_execution_plan",
+    "plan_version",
+]
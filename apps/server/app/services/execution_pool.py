@@ -0,0 +1,408 @@
+"""Bounded worker pool that executes triggered areas off the scheduler loops.
+
+Schedulers detect trigger events and enqueue an :class:`ExecutionJob`; a fixed
+number of worker tasks pick jobs from a bounded queue and execute them with
+their own database session. Async handlers are awaited on the event loop, while
+synchronous handlers and the execution log bookkeeping run on the shared
+blocking pool (see :mod:`app.services.blocking_pool`). A slow step (an OpenAI
+call, a large Drive upload, ...) therefore only occupies one worker instead of
+stalling every poller and the API event loop, and a full queue applies
+back-pressure to the producers instead of growing without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from sqlalchemy.orm import selectinload
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.area import Area
+from app.models.execution_log import ExecutionLog
+from app.models.workflow_timer import WorkflowTimer
+from app.schemas.execution_log import ExecutionLogCreate
+from app.services.blocking_pool import run_blocking, shutdown_blocking_pool
+from app.services.execution_logs import create_execution_log
+from app.services.workflow_timers import get_workflow_timer, take_workflow_timer
+
+logger = logging.getLogger("area")
+
+
+@dataclass
+class ExecutionJob:
+    """A triggered area waiting to be executed.
+
+    Attributes:
+        area_id: ID of the area to execute
+        trigger_data: Trigger variables passed to the step executor
+        source: Human readable trigger source used in logs (e.g. "Gmail")
+        event: Summary of the trigger event stored on the "Started" execution log
+        details: Extra fields merged into the final execution log step details
+        timer_id: Timer of a run paused on a delay step; the job resumes that
+            run instead of starting a new one from the trigger
+    """
+
+    area_id: str
+    trigger_data: Dict[str, Any]
+    source: str = "Time"
+    event: Dict[str, Any] = field(default_factory=dict)
+    details: Dict[str, Any] = field(default_factory=dict)
+    timer_id: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _start_job(
+    db: Session, job: ExecutionJob
+) -> tuple[Optional[Area], Optional[ExecutionLog], Optional[WorkflowTimer]]:
+    """Load the job's area and record its "Started" execution log.
+
+    The area is loaded with its steps, so the executor never lazy loads them
+    on the event loop. The timer of a resume job is deleted in the same
+    transaction as the "Started" log: a timer claimed again while queued or
+    running is only resumed by the job that deleted it.
+
+    Returns:
+        The area, its execution log and the taken timer, all None when the
+        job must not run
+    """
+    timer = None
+    if job.timer_id is not None:
+        timer = get_workflow_timer(db, job.timer_id)
+        if timer is None or not take_workflow_timer(db, timer):
+            db.rollback()
+            logger.info(
+                "Skipping delay timer already resumed by another job",
+                extra={"area_id": job.area_id, "timer_id": job.timer_id},
+            )
+            return None, None, None
+
+    area = db.get(Area, uuid.UUID(job.area_id), options=[selectinload(Area.steps)])
+    if area is None or not area.enabled:
+        # Commits the deletion of a taken timer along with the skip
+        db.commit()
+        logger.info(
+            "Skipping queued execution for missing or disabled area",
+            extra={"area_id": job.area_id, "source": job.source},
+        )
+        return None, None, None
+
+    execution_log = create_execution_log(
+        db,
+        ExecutionLogCreate(
+            area_id=area.id,
+            status="Started",
+            output=None,
+            error_message=None,
+            step_details={"event": job.event},
+        ),
+    )
+    return area, execution_log, timer
+
+
+def _finish_job(db: Session, execution_log: ExecutionLog, job: ExecutionJob, result: Dict[str, Any]) -> None:
+    """Store the step executor result on the execution log."""
+    execution_log.status = "Success" if result["status"] == "success" else "Failed"
+    execution_log.output = f"{job.source} trigger executed: {result['steps_executed']} step(s)"
+    execution_log.error_message = result.get("error")
+    execution_log.step_details = {
+        "execution_log": result.get("execution_log", []),
+        "steps_executed": result["steps_executed"],
+        **job.details,
+    }
+    db.commit()
+
+
+def _fail_job(db: Session, execution_log: Optional[ExecutionLog], job: ExecutionJob, error: Exception) -> None:
+    """Mark the execution log failed, without failing if the database fails too."""
+    try:
+        if execution_log is not None:
+            db.rollback()
+            execution_log.status = "Failed"
+            execution_log.error_message = str(error)
+            db.commit()
+    except Exception as log_error:
+        logger.error(
+            "Error updating execution log",
+            extra={"area_id": job.area_id, "error": str(log_error)},
+            exc_info=True,
+        )
+
+
+async def run_execution_job_async(job: ExecutionJob) -> None:
+    """Execute a job with its own database session on the running event loop.
+
+    Args:
+        job: The job to execute
+    """
+    # Import here to avoid circular imports
+    from app.db.session import SessionLocal
+    from app.services.step_executor import execute_area_async, resume_area_async
+
+    # Objects must stay loaded after commits: the run reads them on the event loop
+    db = SessionLocal(expire_on_commit=False)
+    execution_log = None
+    try:
+        area, execution_log, timer = await run_blocking(_start_job, db, job)
+        if area is None:
+            return
+
+        if timer is None:
+            result = await execute_area_async(db, area, job.trigger_data)
+        else:
+            result = await resume_area_async(db, area, timer)
+        await run_blocking(_finish_job, db, execution_log, job, result)
+
+        logger.info(
+            f"{job.source} trigger executed",
+            extra={
+                "area_id": job.area_id,
+                "area_name": area.name,
+                "user_id": str(area.user_id),
+                "event": job.event,
+                "status": result["status"],
+                "steps_executed": result.get("steps_executed", 0),
+            },
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Error executing {job.source} trigger",
+            extra={"area_id": job.area_id, "error": str(e)},
+            exc_info=True,
+        )
+        await run_blocking(_fail_job, db, execution_log, job, e)
+    finally:
+        db.close()
+
+
+def run_execution_job(job: ExecutionJob) -> None:
+    """Execute a job on a private event loop (synchronous wrapper).
+
+    Args:
+        job: The job to execute
+    """
+    asyncio.run(run_execution_job_async(job))
+
+
+class AreaExecutionPool:
+    """Fixed-size pool of workers draining a bounded queue of execution jobs."""
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = max(workers, 1)
+        self.queue_size = max(queue_size, 1)
+        self._queue: asyncio.Queue[ExecutionJob] | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._busy_workers = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_wait_seconds = 0.0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """Event loop the pool's workers run on."""
+        return self._loop
+
+    def is_running(self) -> bool:
+        """Return True while the workers are running on a live event loop."""
+        return bool(self._worker_tasks) and self._loop is not None and not self._loop.is_closed()
+
+    def start(self) -> None:
+        """Spawn the workers on the running event loop."""
+        if self.is_running():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [
+            self._loop.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(
+            "Execution pool started",
+            extra={"workers": self.workers, "queue_size": self.queue_size},
+        )
+
+    def stop(self) -> None:
+        """Cancel the workers; queued jobs that have not started are dropped."""
+        if self._loop is not None and not self._loop.is_closed():
+            for task in self._worker_tasks:
+                task.cancel()
+        self._worker_tasks = []
+        dropped = self._queue.qsize() if self._queue is not None else 0
+        self._queue = None
+        self._loop = None
+        self._busy_workers = 0
+        logger.info("Execution pool stopped", extra={"dropped_jobs": dropped})
+
+    async def submit(self, job: ExecutionJob) -> None:
+        """Enqueue a job, waiting for a free slot when the queue is full."""
+        if self._queue is None:
+            raise RuntimeError("Execution pool is not running")
+        if self._queue.full():
+            logger.warning(
+                "Execution queue full, waiting for a free slot",
+                extra={"area_id": job.area_id, "queue_size": self.queue_size},
+            )
+        job.enqueued_at = time.monotonic()
+        await self._queue.put(job)
+        self._submitted += 1
+
+    def try_submit(self, job: ExecutionJob) -> bool:
+        """Enqueue a job without waiting.
+
+        Returns:
+            False if the pool is not running or the queue is full
+        """
+        if self._queue is None:
+            self._rejected += 1
+            return False
+        try:
+            job.enqueued_at = time.monotonic()
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            logger.warning(
+                "Execution queue full, rejecting job",
+                extra={"area_id": job.area_id, "queue_size": self.queue_size},
+            )
+            return False
+        self._submitted += 1
+        return True
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and worker saturation for monitoring."""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        return {
+            "running": self.is_running(),
+            "workers": self.workers,
+            "busy_workers": self._busy_workers,
+            "saturation": self._busy_workers / self.workers,
+            "queue_depth": depth,
+            "queue_capacity": self.queue_size,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "max_wait_seconds": round(self._max_wait_seconds, 3),
+        }
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            self._busy_workers += 1
+            self._max_wait_seconds = max(self._max_wait_seconds, time.monotonic() - job.enqueued_at)
+            try:
+                await run_execution_job_async(job)
+                self._completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(
+                    "Execution worker error",
+                    extra={"worker": index, "area_id": job.area_id, "error": str(e)},
+                    exc_info=True,
+                )
+            finally:
+                self._busy_workers -= 1
+                queue.task_done()
+
+
+_execution_pool: AreaExecutionPool | None = None
+
+
+def start_execution_pool() -> None:
+    """Start the shared execution pool on the running event loop."""
+    global _execution_pool
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.error("No event loop running, cannot start execution pool")
+        return
+
+    if _execution_pool is not None and _execution_pool.is_running():
+        logger.warning("Execution pool already running")
+        return
+
+    _execution_pool = AreaExecutionPool(
+        workers=settings.execution_pool_workers,
+        queue_size=settings.execution_pool_queue_size,
+    )
+    _execution_pool.start()
+
+
+def stop_execution_pool() -> None:
+    """Stop the shared execution pool."""
+    global _execution_pool
+
+    if _execution_pool is not None:
+        _execution_pool.stop()
+        _execution_pool = None
+    shutdown_blocking_pool()
+
+
+def get_execution_pool() -> AreaExecutionPool | None:
+    """Return the shared execution pool, if started."""
+    return _execution_pool
+
+
+def is_execution_pool_running() -> bool:
+    """Check if the shared execution pool is running."""
+    return _execution_pool is not None and _execution_pool.is_running()
+
+
+async def submit_execution_job(job: ExecutionJob) -> None:
+    """Enqueue a job on the shared pool, starting the pool if needed.
+
+    Args:
+        job: The job to execute
+    """
+    pool = _execution_pool
+    if pool is None or not pool.is_running() or pool.loop is not asyncio.get_running_loop():
+        if pool is not None:
+            pool.stop()
+        start_execution_pool()
+        pool = _execution_pool
+    assert pool is not None
+    await pool.submit(job)
+
+
+def get_execution_pool_stats() -> Dict[str, Any]:
+    """Return monitoring stats of the shared pool (zeros when not started)."""
+    if _execution_pool is None:
+        return AreaExecutionPool(
+            workers=settings.execution_pool_workers,
+            queue_size=settings.execution_pool_queue_size,
+        ).stats()
+    return _execution_pool.stats()
+
+
+__all__ = [
+    "AreaExecutionPool",
+    "ExecutionJob",
+    "get_execution_pool",
+    "get_execution_pool_stats",
+    "is_execution_pool_running",
+    "run_execution_job",
+    "run_execution_job_async",
+    "start_execution_pool",
+    "stop_execution_pool",
+    "submit_execution_job",
+]
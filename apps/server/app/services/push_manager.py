@@ -0,0 +1,256 @@
+"""Background lifecycle management of provider push subscriptions.
+
+The :class:`PushSubscriptionManager` periodically compares the push scopes of
+enabled areas with the stored :class:`~app.models.push_subscription.PushSubscription`
+rows. It subscribes scopes that have none, renews subscriptions expiring within
+``PUSH_RENEW_WINDOW_SECONDS``, and expires subscriptions whose scope has no area
+left or whose provider resource already expired. Scopes a provider refused are
+retried after ``PUSH_RETRY_SECONDS`` and keep being polled normally meanwhile.
+
+Push is only enabled when ``WEBHOOK_BASE_URL`` is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import TriggerSource, default_trigger_sources
+from app.integrations.simple_plugins.push_providers import (
+    PushChannel,
+    PushProvider,
+    default_push_providers,
+)
+from app.models.area import Area
+from app.models.push_subscription import PushSubscription
+from app.services.push_subscriptions import (
+    delete_push_subscription,
+    is_live,
+    list_push_subscriptions,
+    save_push_subscription,
+)
+
+logger = logging.getLogger("area")
+
+
+class PushSubscriptionManager:
+    """Creates, renews and expires the push subscriptions of every provider."""
+
+    def __init__(
+        self,
+        providers: Iterable[PushProvider] | None = None,
+        sources: Iterable[TriggerSource] | None = None,
+        interval_seconds: float | None = None,
+        jitter_ratio: float | None = None,
+    ) -> None:
+        self.providers = list(default_push_providers() if providers is None else providers)
+        self.sources = {
+            source.service: source
+            for source in (default_trigger_sources() if sources is None else sources)
+        }
+        self.interval_seconds = (
+            settings.push_manager_interval_seconds if interval_seconds is None else interval_seconds
+        )
+        self.jitter_ratio = (
+            settings.polling_jitter_ratio if jitter_ratio is None else jitter_ratio
+        )
+        self._task: asyncio.Task | None = None
+        self._retry_after: Dict[tuple[str, str], float] = {}
+
+    def is_running(self) -> bool:
+        """Return True while the manager task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the manager task on the running event loop."""
+        if self.is_running():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the manager task."""
+        if self._task is not None and not self._task.done() and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = None
+
+    def _jittered(self, interval: float) -> float:
+        spread = interval * self.jitter_ratio
+        return max(interval + random.uniform(-spread, spread), 0.0)
+
+    def _wanted_scopes(self, db: Session, provider: PushProvider) -> Dict[str, list[Area]]:
+        source = self.sources.get(provider.service)
+        if source is None:
+            return {}
+        wanted: Dict[str, list[Area]] = {}
+        for area in source.fetch_areas(db):
+            scope = source.push_scope(area)
+            if scope is not None:
+                wanted.setdefault(scope, []).append(area)
+        return wanted
+
+    def _save(self, db: Session, provider: PushProvider, scope: str, channel: PushChannel) -> None:
+        save_push_subscription(
+            db,
+            provider.service,
+            scope,
+            channel.connection_id,
+            channel.channel_id,
+            secret=channel.secret,
+            resource_id=channel.resource_id,
+            expires_at=channel.expires_at,
+        )
+
+    async def _expire(self, db: Session, provider: PushProvider, subscription: PushSubscription) -> None:
+        try:
+            await provider.unsubscribe(db, subscription)
+        except Exception as e:
+            logger.warning(
+                f"Failed to remove {provider.name} push subscription",
+                extra={"service": provider.service, "scope": subscription.scope, "error": str(e)},
+            )
+        await asyncio.to_thread(delete_push_subscription, db, subscription)
+
+    async def sync_provider(self, db: Session, provider: PushProvider, now: datetime) -> None:
+        """Bring the subscriptions of one provider in line with its areas.
+
+        Args:
+            db: Database session
+            provider: Provider to synchronize
+            now: Scan timestamp
+        """
+        wanted = await asyncio.to_thread(self._wanted_scopes, db, provider)
+        subscriptions = {
+            subscription.scope: subscription
+            for subscription in await asyncio.to_thread(list_push_subscriptions, db, provider.service)
+        }
+
+        for scope, subscription in list(subscriptions.items()):
+            if scope not in wanted or not is_live(subscription, now):
+                await self._expire(db, provider, subscription)
+                del subscriptions[scope]
+
+        renew_before = now + timedelta(seconds=settings.push_renew_window_seconds)
+        for scope, areas in wanted.items():
+            key = (provider.service, scope)
+            if self._retry_after.get(key, 0.0) > time.monotonic():
+                continue
+
+            subscription = subscriptions.get(scope)
+            try:
+                if subscription is None:
+                    channel = await provider.subscribe(db, scope, areas)
+                elif subscription.expires_at is not None and not is_live(subscription, renew_before):
+                    channel = await provider.renew(db, subscription, areas)
+                    if channel is None:
+                        await asyncio.to_thread(delete_push_subscription, db, subscription)
+                else:
+                    continue
+            except Exception as e:
+                channel = None
+                logger.warning(
+                    f"Failed to subscribe {provider.name} push notifications",
+                    extra={"service": provider.service, "scope": scope, "error": str(e)},
+                )
+
+            if channel is None:
+                self._retry_after[key] = time.monotonic() + settings.push_retry_seconds
+                continue
+            self._retry_after.pop(key, None)
+            await asyncio.to_thread(self._save, db, provider, scope, channel)
+
+    async def run_once(self, now: datetime | None = None) -> None:
+        """Synchronize the subscriptions of every enabled provider once.
+
+        Args:
+            now: Scan timestamp (defaults to the current UTC time)
+        """
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+
+        now = now or datetime.now(timezone.utc)
+        for provider in self.providers:
+            if not provider.enabled:
+                continue
+            with SessionLocal() as db:
+                try:
+                    await self.sync_provider(db, provider, now)
+                except Exception as e:
+                    db.rollback()
+                    logger.error(
+                        f"Error managing {provider.name} push subscriptions",
+                        extra={"service": provider.service, "error": str(e)},
+                        exc_info=True,
+                    )
+
+    async def _run(self) -> None:
+        logger.info("Starting push subscription manager")
+        try:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(
+                        "Error in push subscription manager loop",
+                        extra={"error": str(e)},
+                        exc_info=True,
+                    )
+                await asyncio.sleep(self._jittered(self.interval_seconds))
+        except asyncio.CancelledError:
+            logger.info("Push subscription manager cancelled, shutting down gracefully")
+
+
+_push_manager: PushSubscriptionManager | None = None
+
+
+def start_push_manager() -> None:
+    """Start the shared push subscription manager."""
+    global _push_manager
+
+    if not settings.webhook_base_url:
+        logger.info("Push subscriptions disabled (WEBHOOK_BASE_URL not set)")
+        return
+
+    if _push_manager is not None and _push_manager.is_running():
+        logger.warning("Push subscription manager already running")
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.error("No event loop running, cannot start push subscription manager")
+        return
+
+    _push_manager = PushSubscriptionManager()
+    _push_manager.start()
+    logger.info("Push subscription manager started")
+
+
+def stop_push_manager() -> None:
+    """Stop the shared push subscription manager."""
+    global _push_manager
+
+    if _push_manager is not None:
+        _push_manager.stop()
+        _push_manager = None
+        logger.info("Push subscription manager stopped")
+
+
+def is_push_manager_running() -> bool:
+    """Check if the shared push subscription manager is running."""
+    return _push_manager is not None and _push_manager.is_running()
+
+
+__all__ = [
+    "PushSubscriptionManager",
+    "is_push_manager_running",
+    "start_push_manager",
+    "stop_push_manager",
+]
@@ -0,0 +1,112 @@
+"""Repository helpers for provider push subscriptions."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.encryption import decrypt_token, encrypt_token
+from app.models.push_subscription import PushSubscription
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_live(subscription: PushSubscription, now: datetime | None = None) -> bool:
+    """Return True while a subscription has not expired (``expires_at`` NULL never expires)."""
+    expires_at = _as_utc(subscription.expires_at)
+    return expires_at is None or expires_at > (now or datetime.now(timezone.utc))
+
+
+def subscription_secret(subscription: PushSubscription) -> Optional[str]:
+    """Return the decrypted secret that notifications of a subscription carry."""
+    return decrypt_token(subscription.encrypted_secret)
+
+
+def get_push_subscription(db: Session, service: str, channel_id: str) -> Optional[PushSubscription]:
+    """Fetch a subscription by the ID the provider delivers its notifications with."""
+    statement = select(PushSubscription).where(
+        PushSubscription.service == service,
+        PushSubscription.channel_id == channel_id,
+    )
+    return db.execute(statement).scalar_one_or_none()
+
+
+def get_scope_subscription(db: Session, service: str, scope: str) -> Optional[PushSubscription]:
+    """Fetch the subscription covering a trigger scope of a service."""
+    statement = select(PushSubscription).where(
+        PushSubscription.service == service,
+        PushSubscription.scope == scope,
+    )
+    return db.execute(statement).scalar_one_or_none()
+
+
+def list_push_subscriptions(db: Session, service: str) -> list[PushSubscription]:
+    """List every subscription of a service."""
+    statement = select(PushSubscription).where(PushSubscription.service == service)
+    return list(db.execute(statement).scalars())
+
+
+def live_push_scopes(db: Session, service: str, now: datetime | None = None) -> set[str]:
+    """Return the scopes of a service covered by a subscription that has not expired."""
+    now = now or datetime.now(timezone.utc)
+    statement = select(PushSubscription.scope).where(
+        PushSubscription.service == service,
+        or_(PushSubscription.expires_at.is_(None), PushSubscription.expires_at > now),
+    )
+    return set(db.execute(statement).scalars())
+
+
+def save_push_subscription(
+    db: Session,
+    service: str,
+    scope: str,
+    connection_id,
+    channel_id: str,
+    secret: str | None = None,
+    resource_id: str | None = None,
+    expires_at: datetime | None = None,
+) -> PushSubscription:
+    """Create or replace the subscription covering a trigger scope."""
+    subscription = get_scope_subscription(db, service, scope)
+    if subscription is None:
+        subscription = PushSubscription(service=service, scope=scope)
+        db.add(subscription)
+    subscription.connection_id = _as_uuid(connection_id)
+    subscription.channel_id = channel_id
+    subscription.encrypted_secret = encrypt_token(secret)
+    subscription.resource_id = resource_id
+    subscription.expires_at = expires_at
+    subscription.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(subscription)
+    return subscription
+
+
+def delete_push_subscription(db: Session, subscription: PushSubscription) -> None:
+    """Delete a subscription; its scope falls back to regular polling."""
+    db.delete(subscription)
+    db.commit()
+
+
+__all__ = [
+    "delete_push_subscription",
+    "get_push_subscription",
+    "get_scope_subscription",
+    "is_live",
+    "list_push_subscriptions",
+    "live_push_scopes",
+    "save_push_subscription",
+    "subscription_secret",
+]
@@ -0,0 +1,223 @@
+"""Persistent, bounded dedupe of provider event IDs for trigger sources.
+
+Trigger sources used to keep the event IDs they had handled in per-module
+``Dict[str, set[str]]`` that grew for the life of the process and were lost on
+restart, so every area was primed again and events arriving meanwhile were
+dropped. :class:`SeenEventStore` records seen IDs in the ``seen_events`` table,
+keyed by service, scope (area or connection ID) and provider event ID, and
+fronts it with a bounded in-process LRU so steady-state polls rarely hit the
+database.
+
+Rows are pruned once they were not observed for ``SEEN_EVENTS_TTL_SECONDS``.
+IDs still returned by the provider are touched at most once per half TTL, so a
+long-lived event (e.g. an upcoming calendar event) is never pruned and replayed.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.seen_event import SeenEvent
+
+logger = logging.getLogger("area")
+
+# Event ID of the row recording that a scope was polled (primed) once
+PRIMED_MARKER = ""
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _upsert(db: Session):
+    """Return an INSERT of seen events that bumps ``seen_at`` on conflict."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(SeenEvent)
+    return statement.on_conflict_do_update(
+        index_elements=[SeenEvent.service, SeenEvent.scope, SeenEvent.event_id],
+        set_={"seen_at": statement.excluded.seen_at},
+    )
+
+
+class SeenEventStore:
+    """Seen event IDs of one trigger source, persisted with an LRU front cache.
+
+    Attributes:
+        service: Trigger service the IDs belong to (e.g. "gmail")
+    """
+
+    def __init__(
+        self,
+        service: str,
+        cache_size: int | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self.service = service
+        self.cache_size = max(cache_size or settings.seen_events_cache_size, 1)
+        self.ttl_seconds = settings.seen_events_ttl_seconds if ttl_seconds is None else ttl_seconds
+        # (scope, event_id) -> seen_at persisted for the ID
+        self._cache: OrderedDict[tuple[str, str], datetime] = OrderedDict()
+        self._last_prune: float | None = None
+        self._lock = threading.Lock()
+
+    def is_primed(self, db: Session, scope: str) -> bool:
+        """Return whether the scope was polled before."""
+        return not self.unseen(db, scope, [PRIMED_MARKER])
+
+    def prime(self, db: Session, scope: str, event_ids: Iterable[str]) -> None:
+        """Record the first poll of a scope and the events that already existed."""
+        self.add(db, scope, [PRIMED_MARKER, *event_ids])
+
+    def unseen(self, db: Session, scope: str, event_ids: Iterable[str]) -> set[str]:
+        """Return the IDs among ``event_ids`` that were not seen yet for a scope.
+
+        Args:
+            db: Database session used on cache misses
+            scope: Area or connection ID the events belong to
+            event_ids: Provider event IDs returned by the latest poll
+
+        Returns:
+            IDs never recorded with :meth:`add`
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=self.ttl_seconds / 2)
+        pending: set[str] = set()
+        stale: set[str] = set()
+        with self._lock:
+            for event_id in set(event_ids):
+                seen_at = self._cache.get((scope, event_id))
+                if seen_at is None:
+                    pending.add(event_id)
+                    continue
+                self._cache.move_to_end((scope, event_id))
+                if seen_at < stale_before:
+                    stale.add(event_id)
+
+        if pending:
+            rows = db.execute(
+                select(SeenEvent.event_id, SeenEvent.seen_at).where(
+                    SeenEvent.service == self.service,
+                    SeenEvent.scope == scope,
+                    SeenEvent.event_id.in_(pending),
+                )
+            ).all()
+            found = {}
+            for event_id, seen_at in rows:
+                found[event_id] = _as_utc(seen_at)
+                pending.discard(event_id)
+                if found[event_id] < stale_before:
+                    stale.add(event_id)
+            self._remember(scope, found)
+
+        if stale:
+            # Keep IDs the provider still returns from being pruned and replayed
+            db.execute(
+                update(SeenEvent)
+                .where(
+                    SeenEvent.service == self.service,
+                    SeenEvent.scope == scope,
+                    SeenEvent.event_id.in_(stale),
+                )
+                .values(seen_at=now)
+            )
+            db.commit()
+            self._remember(scope, dict.fromkeys(stale, now))
+        return pending
+
+    def add(self, db: Session, scope: str, event_ids: Iterable[str]) -> None:
+        """Record event IDs as seen for a scope."""
+        now = datetime.now(timezone.utc)
+        event_ids = set(event_ids)
+        if not event_ids:
+            return
+        db.execute(
+            _upsert(db),
+            [
+                {"service": self.service, "scope": scope, "event_id": event_id, "seen_at": now}
+                for event_id in event_ids
+            ],
+        )
+        db.commit()
+        self._remember(scope, dict.fromkeys(event_ids, now))
+
+    def forget(self, db: Session, scope: str) -> None:
+        """Drop every seen ID of a scope, so its next poll primes it again."""
+        db.execute(
+            delete(SeenEvent).where(SeenEvent.service == self.service, SeenEvent.scope == scope)
+        )
+        db.commit()
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == scope]:
+                del self._cache[key]
+
+    def prune(self, db: Session, now: datetime | None = None) -> int:
+        """Delete the IDs not observed for longer than the TTL.
+
+        Returns:
+            Number of deleted rows
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        result = db.execute(
+            delete(SeenEvent).where(SeenEvent.service == self.service, SeenEvent.seen_at < cutoff)
+        )
+        db.commit()
+        with self._lock:
+            for key in [key for key, seen_at in self._cache.items() if seen_at < cutoff]:
+                del self._cache[key]
+            self._last_prune = time.monotonic()
+        if result.rowcount:
+            logger.info(
+                "Pruned expired seen events",
+                extra={"service": self.service, "count": result.rowcount},
+            )
+        return result.rowcount
+
+    def maybe_prune(self, db: Session) -> int:
+        """Prune at most once per ``SEEN_EVENTS_PRUNE_INTERVAL_SECONDS``."""
+        with self._lock:
+            last_prune = self._last_prune
+        if last_prune is not None and time.monotonic() - last_prune < settings.seen_events_prune_interval_seconds:
+            return 0
+        return self.prune(db)
+
+    def clear(self) -> None:
+        """Drop the in-memory front cache (useful for testing)."""
+        with self._lock:
+            self._cache.clear()
+            self._last_prune = None
+
+    def _remember(self, scope: str, seen: dict[str, datetime]) -> None:
+        with self._lock:
+            for event_id, seen_at in seen.items():
+                self._cache[(scope, event_id)] = seen_at
+                self._cache.move_to_end((scope, event_id))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+def delete_seen_events(db: Session, scope: str) -> None:
+    """Delete the seen IDs of a scope for every service (without committing)."""
+    db.execute(delete(SeenEvent).where(SeenEvent.scope == scope))
+
+
+__all__ = [
+    "PRIMED_MARKER",
+    "SeenEventStore",
+    "delete_seen_events",
+]
@@ -29,6 +29,16 @@ class DuplicateServiceConnectionError(Exception):
         self.service_name = service_name
 
 
+def _invalidate_connection_caches(connection_id) -> None:
+    """Drop in-process credentials and clients built from a connection's previous tokens."""
+    # Import here to avoid circular imports
+    from app.integrations.simple_plugins.google_clients import invalidate_google_clients
+    from app.services.credential_manager import credential_manager
+
+    credential_manager.invalidate(connection_id)
+    invalidate_google_clients(connection_id)
+
+
 def get_service_connection_by_id(db: Session, connection_id: str) -> Optional[ServiceConnection]:
     """Fetch a service connection by its ID."""
     import uuid as uuid_module
@@ -123,6 +133,7 @@ def update_service_connection(db: Session, connection_id: str, service_connectio
 
     db.commit()
     db.refresh(service_connection)
+    _invalidate_connection_caches(service_connection.id)
     return service_connection
 
 
@@ -134,6 +145,7 @@ def delete_service_connection(db: Session, connection_id: str) -> bool:
 
     db.delete(service_connection)
     db.commit()
+    _invalidate_connection_caches(service_connection.id)
     return True
 
 
@@ -1,35 +1,75 @@
 """Step-by-step execution engine for multi-step AREA workflows.
 
 This module provides the core execution engine that:
-- Traverses multi-step workflow graphs
+- Traverses multi-step workflow graphs (compiled once per area version)
 - Evaluates conditional branches
+- Runs independent sibling branches concurrently
 - Executes actions/reactions via plugin registry
 - Maintains execution context across steps
+
+Execution is natively async: coroutine handlers are awaited on the caller's
+event loop and synchronous handlers are offloaded to the shared blocking pool
+(see :mod:`app.services.blocking_pool`). :func:`execute_area` remains as a
+synchronous wrapper for callers without an event loop.
 """
 
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import inspect
 import logging
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+from sqlalchemy.orm import selectinload
+
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
-from app.integrations.simple_plugins.registry import get_plugins_registry
+from app.core.config import settings
+from app.integrations.simple_plugins.delay_plugin import delay_duration_seconds
+from app.integrations.simple_plugins.registry import HandlerMetadata, get_plugins_registry
 from app.models.area import Area
 from app.models.area_step import AreaStep
+from app.models.workflow_timer import WorkflowTimer
+from app.services.blocking_pool import run_blocking
 from app.services.condition_evaluator import (
     ConditionEvaluationError,
     evaluate_condition,
 )
+from app.services.execution_plan import ExecutionPlan, get_execution_plan
+from app.services.timer_service import wake_timer_service
+from app.services.workflow_timers import create_workflow_timer
 
 logger = logging.getLogger("area")
 
 
+def _changes(base: Dict[str, Any], scope: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the entries a branch wrote to its copy of a scope."""
+    return {key: value for key, value in scope.items() if key not in base or base[key] is not value}
+
+
+class _BranchSlots:
+    """Extra branches one area run may execute concurrently.
+
+    Shared by the nested fan-outs of a run. Branches that get no slot run
+    inline instead of waiting for one, so nested fan-outs cannot deadlock.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.available = max(concurrency - 1, 0)
+
+    def take(self, wanted: int) -> int:
+        taken = min(max(wanted, 0), self.available)
+        self.available -= taken
+        return taken
+
+    def release(self, count: int) -> None:
+        self.available += count
+
+
 class StepExecutionError(Exception):
     """Raised when step execution fails."""
 
@@ -53,8 +93,28 @@ class StepExecutor:
         self.execution_log: List[Dict[str, Any]] = []
         # Accumulated variables from all previous steps (propagation cascade)
         self.accumulated_variables: Dict[str, Any] = {}
+        # Compiled step graph and the steps already executed in this run
+        self.plan: Optional[ExecutionPlan] = None
+        self._steps: List[AreaStep] = []
+        self._visited = bytearray()
+        self._branch_slots = _BranchSlots(settings.execution_branch_concurrency)
 
     def execute(self, trigger_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Synchronous wrapper around :meth:`execute_async`.
+
+        Runs the workflow on a private event loop, in a helper thread when the
+        caller already runs one. Async callers should await
+        :meth:`execute_async` instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.execute_async(trigger_data))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.execute_async(trigger_data)).result()
+
+    async def execute_async(self, trigger_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the area workflow starting from trigger.
 
         Args:
@@ -83,50 +143,107 @@ class StepExecutor:
 
             # Check if area has steps (multi-step workflow)
             if self.area.steps and len(self.area.steps) > 0:
-                return self._execute_multi_step_workflow()
+                return await self._execute_multi_step_workflow()
             else:
                 # Legacy single-step area (backward compatibility)
-                return self._execute_legacy_workflow()
+                return await self._execute_legacy_workflow()
 
         except Exception as e:
-            logger.error(
-                "Area execution failed",
+            return self._failed_result(e)
+
+    async def resume_async(self, timer: WorkflowTimer) -> Dict[str, Any]:
+        """Resume a run paused on a delay step.
+
+        Restores the trigger data, accumulated variables and executed steps
+        persisted by the delay step, then executes the steps that followed it.
+        Steps deleted from the area since the run was paused are skipped.
+
+        Args:
+            timer: Timer of the paused run
+
+        Returns:
+            Dictionary with execution results, as returned by :meth:`execute_async`
+        """
+        try:
+            self.execution_context = {
+                "trigger": dict(timer.trigger_data or {}),
+                "area_id": str(self.area.id),
+                "user_id": str(self.area.user_id),
+                "executed_steps": [],
+            }
+            self.accumulated_variables = dict(timer.variables or {})
+
+            self.plan = get_execution_plan(self.area)
+            self._steps = list(self.area.steps)
+            self._visited = self.plan.new_visited()
+            for step_id in timer.executed_step_ids or ():
+                position = self.plan.positions.get(step_id)
+                if position is not None:
+                    self._visited[position] = 1
+
+            logger.info(
+                "Resuming area execution after delay",
                 extra={
                     "area_id": str(self.area.id),
-                    "error": str(e),
+                    "timer_id": str(timer.id),
+                    "delay_step_id": timer.delay_step_id,
+                    "next_step_ids": timer.next_step_ids,
                 },
-                exc_info=True,
             )
-            return {
-                "status": "failed",
-                "steps_executed": len(self.execution_log),
-                "execution_log": self.execution_log,
-                "error": str(e),
-            }
 
-    def _execute_multi_step_workflow(self) -> Dict[str, Any]:
+            edges = tuple(
+                (step_id, self.plan.positions.get(step_id)) for step_id in timer.next_step_ids or ()
+            )
+            # Branches run concurrently only if the delay step still leads to the same steps
+            position = self.plan.positions.get(timer.delay_step_id)
+            independent = (
+                position is not None
+                and tuple(target_id for target_id, _ in self.plan.edges(position)) == tuple(
+                    target_id for target_id, _ in edges
+                )
+                and self.plan.is_independent(position)
+            )
+            await self._follow_edges(edges, independent)
+            return self._workflow_result()
+
+        except Exception as e:
+            return self._failed_result(e)
+
+    def _failed_result(self, error: Exception) -> Dict[str, Any]:
+        logger.error(
+            "Area execution failed",
+            extra={
+                "area_id": str(self.area.id),
+                "error": str(error),
+            },
+            exc_info=True,
+        )
+        return {
+            "status": "failed",
+            "steps_executed": len(self.execution_log),
+            "execution_log": self.execution_log,
+            "error": str(error),
+        }
+
+    async def _execute_multi_step_workflow(self) -> Dict[str, Any]:
         """Execute multi-step workflow by traversing the step graph.
 
         Returns:
             Execution result dictionary
         """
-        # Find the trigger step (should be first step with order=0)
-        trigger_step = next(
-            (step for step in self.area.steps if step.step_type == "trigger"),
-            None,
-        )
+        self.plan = get_execution_plan(self.area)
+        self._steps = list(self.area.steps)
+        self._visited = self.plan.new_visited()
 
-        if not trigger_step:
-            # No trigger step, start with first step in order
-            if self.area.steps:
-                trigger_step = self.area.steps[0]
-            else:
-                return {
-                    "status": "failed",
-                    "steps_executed": 0,
-                    "execution_log": self.execution_log,
-                    "error": "No steps found in area",
-                }
+        # The plan resolves the trigger step, or the first step in order without one
+        if self.plan.entry is None:
+            return {
+                "status": "failed",
+                "steps_executed": 0,
+                "execution_log": self.execution_log,
+                "error": "No steps found in area",
+            }
+        trigger_step = self._steps[self.plan.entry]
 
         # Initialize accumulated variables with trigger data
         # Extract variables from trigger using service-specific extractor
@@ -149,8 +266,11 @@ class StepExecutor:
             )
 
         # Execute starting from trigger step
-        self._execute_step(trigger_step)
+        await self._execute_step(trigger_step)
+        return self._workflow_result()
 
+    def _workflow_result(self) -> Dict[str, Any]:
+        """Summarize a multi-step run from its execution log."""
         # Determine overall status
         has_errors = any(
             log.get("status") == "failed" for log in self.execution_log
@@ -178,7 +298,7 @@ class StepExecutor:
             "error": None,
         }
 
-    def _execute_step(self, step: AreaStep) -> bool:
+    async def _execute_step(self, step: AreaStep) -> bool:
         """Execute a single step and follow its connections.
 
         Args:
@@ -188,6 +308,10 @@ class StepExecutor:
             True if step executed successfully, False otherwise
         """
         step_id = str(step.id)
+        position = self.plan.positions.get(step_id) if self.plan is not None else None
+        if position is not None:
+            self._visited[position] = 1
+
         step_log = {
             "step_id": step_id,
             "step_type": step.step_type,
@@ -226,39 +350,26 @@ class StepExecutor:
                 )
 
                 # Follow connections to next steps
-                self._follow_step_connections(step)
+                await self._follow_step_connections(step)
                 return True
 
             elif step.step_type == "condition":
                 # Condition step - evaluate and branch
-                result = self._execute_condition_step(step, step_log)
+                result = await self._execute_condition_step(step, step_log)
                 return result
 
+            elif step.step_type == "delay" or (step.service, step.action) == ("delay", "wait"):
+                # Delay step - persist the run and resume it when the delay elapsed
+                return await self._execute_delay_step(step, step_log)
+
             elif step.step_type in ["action", "reaction"]:
                 # Action/Reaction step - execute handler
-                result = self._execute_action_step(step, step_log)
+                result = await self._execute_action_step(step, step_log)
                 if result:
                     # Continue to next steps
-                    self._follow_step_connections(step)
+                    await self._follow_step_connections(step)
                 return result
 
-            elif step.step_type == "delay":
-                # Delay step - log for now (full async delay requires job queue)
-                step_log["status"] = "success"
-                step_log["output"] = f"Delay step (not implemented yet): {step.config}"
-                self.execution_log.append(step_log)
-                logger.warning(
-                    "Delay step not yet implemented, skipping",
-                    extra={
-                        "area_id": str(self.area.id),
-                        "step_id": step_id,
-                        "step_type": step.step_type,
-                    },
-                )
-                # Continue to next steps
-                self._follow_step_connections(step)
-                return True
-
             else:
                 step_log["status"] = "failed"
                 step_log["error"] = f"Unknown step type: {step.step_type}"
@@ -288,7 +399,116 @@ class StepExecutor:
             )
             return False
 
-    def _execute_condition_step(
+    async def _call_handler(
+        self, metadata: HandlerMetadata, params: Dict[str, Any], trigger_data: Dict[str, Any]
+    ) -> Any:
+        """Call a reaction handler without blocking the event loop.
+
+        Coroutine handlers are awaited on the running loop; synchronous ones run
+        on the shared blocking pool. Handlers declaring a ``db`` parameter get
+        the executor's session. Both are known from the handler's registration,
+        so nothing is inspected per call.
+
+        Args:
+            metadata: Handler and call metadata from the plugins registry
+            params: Handler parameters with variables substituted
+            trigger_data: Trigger data the handler may enrich in place
+
+        Returns:
+            The handler's return value
+
+        Raises:
+            TimeoutError: If the handler outlived its registered timeout
+        """
+        handler = metadata.handler
+        kwargs = {"db": self.db} if metadata.needs_db else {}
+        if metadata.is_async:
+            call = handler(self.area, params, trigger_data, **kwargs)
+        else:
+            call = run_blocking(handler, self.area, params, trigger_data, **kwargs)
+
+        if metadata.timeout_seconds is None:
+            result = await call
+        else:
+            # A synchronous handler keeps its pool thread until it returns,
+            # but the step no longer waits for it
+            try:
+                result = await asyncio.wait_for(call, metadata.timeout_seconds)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"Handler timed out after {metadata.timeout_seconds:g} seconds"
+                ) from None
+
+        # Synchronous wrappers may still hand back a coroutine
+        if inspect.iscoroutine(result):
+            result = await result
+        return result
+
+    async def _execute_delay_step(
+        self, step: AreaStep, step_log: Dict[str, Any]
+    ) -> bool:
+        """Pause the run on a delay step.
+
+        Instead of sleeping, the steps following the delay, the accumulated
+        variables, the trigger data and the steps executed so far are stored on
+        a :class:`~app.models.workflow_timer.WorkflowTimer`. The timer service
+        resumes the run once the delay elapsed, so a pending delay holds no
+        worker, thread or session and survives restarts.
+
+        Args:
+            step: Delay step
+            step_log: Log entry for this step
+
+        Returns:
+            True once the run is persisted
+        """
+        delay_seconds = delay_duration_seconds(step.config or {})
+        due_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+
+        position = self.plan.positions.get(str(step.id)) if self.plan is not None else None
+        edges = self.plan.edges(position) if position is not None else ()
+        next_step_ids = [target_id for target_id, target_position in edges if target_position is not None]
+
+        step_log["status"] = "success"
+        if not next_step_ids:
+            step_log["output"] = "Delay step has no following step"
+            self.execution_log.append(step_log)
+            return True
+
+        executed_step_ids = [
+            step_id for step_id, executed in zip(self.plan.step_ids, self._visited) if executed
+        ]
+        timer = await run_blocking(
+            create_workflow_timer,
+            self.db,
+            self.area.id,
+            str(step.id),
+            next_step_ids,
+            self.accumulated_variables,
+            self.execution_context.get("trigger", {}),
+            executed_step_ids,
+            due_at,
+        )
+        wake_timer_service()
+
+        step_log["output"] = f"Paused for {delay_seconds:g} seconds, resumes at {due_at.isoformat()}"
+        step_log["timer_id"] = str(timer.id)
+        step_log["resume_at"] = due_at.isoformat()
+        self.execution_log.append(step_log)
+
+        logger.info(
+            "Area execution paused on delay step",
+            extra={
+                "area_id": str(self.area.id),
+                "step_id": str(step.id),
+                "timer_id": str(timer.id),
+                "delay_duration": delay_seconds,
+                "resume_at": due_at.isoformat(),
+            },
+        )
+        return True
+
+    async def _execute_condition_step(
         self, step: AreaStep, step_log: Dict[str, Any]
     ) -> bool:
         """Execute a condition step and branch based on result.
@@ -324,10 +544,10 @@ class StepExecutor:
             # Follow appropriate branch based on result
             if result:
                 # Follow TRUE branch (targets)
-                self._follow_step_connections(step, branch="true")
+                await self._follow_step_connections(step, branch="true")
             else:
                 # Follow FALSE branch (elseBranch)
-                self._follow_step_connections(step, branch="false")
+                await self._follow_step_connections(step, branch="false")
 
             return True
 
@@ -346,7 +566,7 @@ class StepExecutor:
             )
             return False
 
-    def _execute_action_step(
+    async def _execute_action_step(
         self, step: AreaStep, step_log: Dict[str, Any]
     ) -> bool:
         """Execute an action or reaction step.
@@ -419,32 +639,8 @@ class StepExecutor:
             )
 
             # Execute handler - it may modify trigger_data (e.g., weather adds weather_data)
-            # Check if handler accepts db parameter and pass it
-            sig = inspect.signature(handler)
-            handler_accepts_db = 'db' in sig.parameters
-
-            if handler_accepts_db:
-                result = handler(self.area, params, trigger_data, db=self.db)
-            else:
-                result = handler(self.area, params, trigger_data)
-
-            # If handler is async, we need to run it synchronously
-            # Since execute_area is called from both sync and async contexts,
-            # we use asyncio.get_event_loop().run_until_complete() when in sync context
-            # or run in a separate thread when in async context
-            if inspect.iscoroutine(result):
-                try:
-                    # Try to get the running loop
-                    asyncio.get_running_loop()
-                    # We're in an async context, but execute_area is sync
-                    # We need to run the coroutine in a thread pool
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, result)
-                        result = future.result()
-                except RuntimeError:
-                    # No running loop, we can use asyncio.run()
-                    result = asyncio.run(result)
+            metadata = self.registry.call_metadata(step.service, step.action, handler)
+            await self._call_handler(metadata, params, trigger_data)
 
             step_log["status"] = "success"
             step_log["output"] = f"Executed {step.service}.{step.action}"
@@ -576,7 +772,7 @@ class StepExecutor:
             )
             return False
 
-    def _follow_step_connections(
+    async def _follow_step_connections(
         self, step: AreaStep, branch: Optional[str] = None
     ) -> None:
         """Follow connections from a step to execute next steps.
@@ -585,17 +781,10 @@ class StepExecutor:
             step: Current step
             branch: Branch to follow ("true", "false", or None for default)
         """
-        config = step.config or {}
-
-        # Get target step IDs based on branch
-        if branch == "false":
-            # Follow else branch for conditions
-            target_ids = config.get("elseBranch", [])
-        else:
-            # Default: follow targets
-            target_ids = config.get("targets", [])
+        position = self.plan.positions.get(str(step.id)) if self.plan is not None else None
+        edges = self.plan.edges(position, branch) if position is not None else ()
 
-        if not target_ids:
+        if not edges:
             logger.debug(
                 "No target steps to follow",
                 extra={
@@ -606,32 +795,95 @@ class StepExecutor:
             )
             return
 
+        await self._follow_edges(edges, self.plan.is_independent(position, branch))
+
+    async def _follow_edges(self, edges: tuple, independent: bool) -> None:
+        """Execute the target steps of a set of edges.
+
+        Args:
+            edges: Edges to follow, in order
+            independent: Whether the targets start branches that share no step
+        """
+        if independent and settings.execution_branch_concurrency > 1:
+            await self._execute_branches(edges)
+            return
+
         # Execute each target step
-        for target_id in target_ids:
-            # Find target step by ID
-            target_step = next(
-                (s for s in self.area.steps if str(s.id) == str(target_id)),
-                None,
-            )
+        for target_id, target_position in edges:
+            if target_position is None:
+                logger.warning(
+                    "Target step not found",
+                    extra={
+                        "area_id": str(self.area.id),
+                        "target_id": target_id,
+                    },
+                )
+                continue
 
-            if target_step:
-                # Check if we've already executed this step (prevent infinite loops)
-                executed_ids = [
-                    log["step_id"] for log in self.execution_log
-                ]
-                if str(target_step.id) in executed_ids:
-                    logger.warning(
-                        "Step already executed, skipping to prevent loop",
-                        extra={
-                            "area_id": str(self.area.id),
-                            "step_id": str(target_step.id),
-                        },
-                    )
-                    continue
-
-                # Execute the target step
-                self._execute_step(target_step)
-            else:
+            # Check if we've already executed this step (prevent infinite loops)
+            if self._visited[target_position]:
+                logger.warning(
+                    "Step already executed, skipping to prevent loop",
+                    extra={
+                        "area_id": str(self.area.id),
+                        "step_id": target_id,
+                    },
+                )
+                continue
+
+            # Execute the target step
+            await self._execute_step(self._steps[target_position])
+
+    def _fork(self) -> StepExecutor:
+        """Create the executor of one branch, with its own copy of the variable scope."""
+        branch = StepExecutor(self.db, self.area)
+        branch.plan = self.plan
+        branch._steps = self._steps
+        # Independent branches never mark the same step, so they share the visited set
+        branch._visited = self._visited
+        branch._branch_slots = self._branch_slots
+        branch.execution_context = {
+            **self.execution_context,
+            "trigger": dict(self.execution_context.get("trigger", {})),
+        }
+        branch.accumulated_variables = dict(self.accumulated_variables)
+        return branch
+
+    @staticmethod
+    async def _run_branch(branch: StepExecutor, position: int) -> None:
+        # Concurrent branches must not share a session: each opens its own
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            # The run's area and steps belong to the parent session: load this branch's own
+            area = await run_blocking(db.get, Area, branch.area.id, options=[selectinload(Area.steps)])
+            if area is None:
+                logger.warning("Area deleted before its branch ran", extra={"area_id": str(branch.area.id)})
+                return
+            steps = {step.id: step for step in area.steps}
+            branch.db = db
+            branch.area = area
+            # Plan positions index the run's step list, so keep its order
+            branch._steps = [steps.get(step.id, step) for step in branch._steps]
+            await branch._execute_step(branch._steps[position])
+
+    async def _execute_branches(self, edges: tuple) -> None:
+        """Execute independent sibling branches concurrently, then merge them.
+
+        Up to ``EXECUTION_BRANCH_CONCURRENCY`` branches of a run execute at
+        once, each with its own database session; the first branch, and those
+        that get no slot, run one after another on this executor's session.
+        Each branch works on a copy of the trigger data and of the accumulated
+        variables; once all branches finished, their execution logs and the
+        variables they wrote are merged in target order, so the result matches
+        running the branches one after another.
+
+        Args:
+            edges: Edges of a fan-out flagged independent by the plan
+        """
+        positions = []
+        for target_id, target_position in edges:
+            if target_position is None:
                 logger.warning(
                     "Target step not found",
                     extra={
@@ -639,8 +891,52 @@ class StepExecutor:
                         "target_id": target_id,
                     },
                 )
+            else:
+                positions.append(target_position)
+
+        branches = [self._fork() for _ in positions]
+        slots = self._branch_slots.take(len(branches) - 1)
+
+        logger.info(
+            "Executing independent branches",
+            extra={
+                "area_id": str(self.area.id),
+                "branches": len(branches),
+                "concurrent": slots + 1,
+            },
+        )
+
+        async def run_inline() -> None:
+            await branches[0]._execute_step(self._steps[positions[0]])
+            for branch, position in zip(branches[slots + 1:], positions[slots + 1:]):
+                await branch._execute_step(self._steps[position])
 
-    def _execute_legacy_workflow(self) -> Dict[str, Any]:
+        try:
+            await asyncio.gather(
+                run_inline(),
+                *(
+                    self._run_branch(branch, position)
+                    for branch, position in zip(branches[1:slots + 1], positions[1:slots + 1])
+                ),
+            )
+        finally:
+            self._branch_slots.release(slots)
+
+        # Diff every branch against the scope it forked from before merging any
+        trigger_data = self.execution_context.setdefault("trigger", {})
+        changes = [
+            (
+                _changes(trigger_data, branch.execution_context["trigger"]),
+                _changes(self.accumulated_variables, branch.accumulated_variables),
+            )
+            for branch in branches
+        ]
+        for branch, (trigger_changes, variable_changes) in zip(branches, changes):
+            trigger_data.update(trigger_changes)
+            self.accumulated_variables.update(variable_changes)
+            self.execution_log.extend(branch.execution_log)
+
+    async def _execute_legacy_workflow(self) -> Dict[str, Any]:
         """Execute legacy single-step workflow (backward compatibility).
 
         Returns:
@@ -656,6 +952,18 @@ class StepExecutor:
         }
 
         try:
+            if (self.area.reaction_service, self.area.reaction_action) == ("delay", "wait"):
+                # Nothing follows the reaction, so there is no run to resume
+                step_log["status"] = "success"
+                step_log["output"] = "Delay step has no following step"
+                self.execution_log.append(step_log)
+                return {
+                    "status": "success",
+                    "steps_executed": 1,
+                    "execution_log": self.execution_log,
+                    "error": None,
+                }
+
             # Get reaction handler
             handler = self.registry.get_reaction_handler(
                 self.area.reaction_service, self.area.reaction_action
@@ -688,29 +996,10 @@ class StepExecutor:
             reaction_params = substitute_variables_in_params(reaction_params, self.accumulated_variables)
 
             # Execute reaction with params
-            # Check if handler accepts db parameter and pass it
-            sig = inspect.signature(handler)
-            handler_accepts_db = 'db' in sig.parameters
-
-            if handler_accepts_db:
-                result = handler(self.area, reaction_params, trigger_data, db=self.db)
-            else:
-                result = handler(self.area, reaction_params, trigger_data)
-
-            # If handler is async, we need to run it synchronously
-            if inspect.iscoroutine(result):
-                try:
-                    # Try to get the running loop
-                    asyncio.get_running_loop()
-                    # We're in an async context, but execute_area is sync
-                    # We need to run the coroutine in a thread pool
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, result)
-                        result = future.result()
-                except RuntimeError:
-                    # No running loop, we can use asyncio.run()
-                    result = asyncio.run(result)
+            metadata = self.registry.call_metadata(
+                self.area.reaction_service, self.area.reaction_action, handler
+            )
+            await self._call_handler(metadata, reaction_params, trigger_data)
 
             step_log["status"] = "success"
             step_log[
@@ -737,8 +1026,38 @@ class StepExecutor:
             }
 
 
+async def execute_area_async(db: Session, area: Area, trigger_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute an area workflow with the given trigger data on the running loop.
+
+    Args:
+        db: Database session
+        area: Area to execute
+        trigger_data: Data from trigger event
+
+    Returns:
+        Execution result dictionary
+    """
+    executor = StepExecutor(db, area)
+    return await executor.execute_async(trigger_data)
+
+
+async def resume_area_async(db: Session, area: Area, timer: WorkflowTimer) -> Dict[str, Any]:
+    """Resume an area run paused on a delay step on the running loop.
+
+    Args:
+        db: Database session
+        area: Area of the paused run
+        timer: Timer of the paused run
+
+    Returns:
+        Execution result dictionary
+    """
+    executor = StepExecutor(db, area)
+    return await executor.resume_async(timer)
+
+
 def execute_area(db: Session, area: Area, trigger_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute an area workflow with the given trigger data.
+    """Execute an area workflow with the given trigger data (synchronous wrapper).
 
     Args:
         db: Database session
@@ -756,4 +1075,6 @@ __all__ = [
     "StepExecutor",
     "StepExecutionError",
     "execute_area",
+    "execute_area_async",
+    "resume_area_async",
 ]
@@ -0,0 +1,64 @@
+"""Repository helpers for provider incremental-sync cursors."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.sync_cursor import SyncCursor
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def get_sync_cursor(db: Session, connection_id, cursor_key: str) -> Optional[SyncCursor]:
+    """Fetch the sync cursor stored for a connection under a key."""
+    statement = select(SyncCursor).where(
+        SyncCursor.connection_id == _as_uuid(connection_id),
+        SyncCursor.cursor_key == cursor_key,
+    )
+    return db.execute(statement).scalar_one_or_none()
+
+
+def set_sync_cursor(db: Session, connection_id, cursor_key: str, value: str) -> SyncCursor:
+    """Create or move the sync cursor of a connection.
+
+    ``updated_at`` is bumped even when the value is unchanged so it always holds
+    the time of the last successful sync.
+    """
+    cursor = get_sync_cursor(db, connection_id, cursor_key)
+    if cursor is None:
+        cursor = SyncCursor(
+            connection_id=_as_uuid(connection_id),
+            cursor_key=cursor_key,
+            value=value,
+        )
+        db.add(cursor)
+    else:
+        cursor.value = value
+    cursor.updated_at = datetime.now(timezone.utc)
+    db.commit()
+    db.refresh(cursor)
+    return cursor
+
+
+def delete_sync_cursor(db: Session, connection_id, cursor_key: str) -> bool:
+    """Delete a sync cursor, forcing the next poll to start a full sync."""
+    cursor = get_sync_cursor(db, connection_id, cursor_key)
+    if cursor is None:
+        return False
+    db.delete(cursor)
+    db.commit()
+    return True
+
+
+__all__ = [
+    "delete_sync_cursor",
+    "get_sync_cursor",
+    "set_sync_cursor",
+]
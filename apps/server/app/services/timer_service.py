@@ -0,0 +1,237 @@
+"""Background service resuming area runs paused on delay steps.
+
+When the step executor reaches a delay step it stores the paused run on a
+:class:`~app.models.workflow_timer.WorkflowTimer` and returns. The
+:class:`WorkflowTimerService` sleeps until the earliest timer comes due (or at
+most ``WORKFLOW_TIMER_POLL_SECONDS``), claims due timers and enqueues their
+continuation on the shared execution pool. A pending delay therefore costs one
+database row, whatever its duration, and is resumed after a restart.
+
+Claimed timers are leased for ``WORKFLOW_TIMER_LEASE_SECONDS``. The job that
+resumes a timer deletes it in the same transaction as its "Started" execution
+log, so a timer claimed again after its lease expired is resumed only once. A
+timer whose job was lost before starting (e.g. in a crash) is claimed again
+when the lease expires, up to ``WORKFLOW_TIMER_MAX_ATTEMPTS`` times.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.blocking_pool import run_blocking
+from app.services.execution_pool import ExecutionJob, submit_execution_job
+from app.services.workflow_timers import (
+    claim_due_timers,
+    delete_workflow_timer,
+    next_timer_due_at,
+)
+
+logger = logging.getLogger("area")
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class WorkflowTimerService:
+    """Resumes paused area runs when their delay elapsed."""
+
+    def __init__(
+        self,
+        poll_seconds: float | None = None,
+        batch_size: int | None = None,
+        lease_seconds: float | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self.poll_seconds = (
+            settings.workflow_timer_poll_seconds if poll_seconds is None else poll_seconds
+        )
+        self.batch_size = max(
+            settings.workflow_timer_batch_size if batch_size is None else batch_size, 1
+        )
+        self.lease_seconds = (
+            settings.workflow_timer_lease_seconds if lease_seconds is None else lease_seconds
+        )
+        self.max_attempts = (
+            settings.workflow_timer_max_attempts if max_attempts is None else max_attempts
+        )
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    def is_running(self) -> bool:
+        """Return True while the service task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the service task on the running event loop."""
+        if self.is_running():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the service task; pending timers stay in the database."""
+        if self._task is not None and not self._task.done() and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = None
+        self._loop = None
+        self._wakeup = None
+
+    def wake(self) -> None:
+        """Rescan the timers now, e.g. after a run was paused (thread-safe)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _claim(self, db: Session, now: datetime) -> list[ExecutionJob]:
+        jobs = []
+        for timer in claim_due_timers(db, now, self.batch_size, self.lease_seconds):
+            if timer.attempts > self.max_attempts:
+                logger.error(
+                    "Dropping delay timer that never completed",
+                    extra={
+                        "area_id": str(timer.area_id),
+                        "timer_id": str(timer.id),
+                        "attempts": timer.attempts,
+                    },
+                )
+                delete_workflow_timer(db, timer)
+                continue
+            jobs.append(
+                ExecutionJob(
+                    area_id=str(timer.area_id),
+                    trigger_data={},
+                    source="Delay",
+                    event={"timer_id": str(timer.id), "delay_step_id": timer.delay_step_id},
+                    details={"resumed_from": timer.delay_step_id},
+                    timer_id=str(timer.id),
+                )
+            )
+        return jobs
+
+    def _next_due(self, db: Session, now: datetime) -> datetime | None:
+        due_at = next_timer_due_at(db, now)
+        return _as_utc(due_at) if due_at is not None else None
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Enqueue the continuation of every due timer.
+
+        Args:
+            now: Scan timestamp (defaults to the current UTC time)
+
+        Returns:
+            Number of continuations enqueued
+        """
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+
+        now = now or datetime.now(timezone.utc)
+        enqueued = 0
+        while True:
+            with SessionLocal() as db:
+                jobs = await run_blocking(self._claim, db, now)
+            for job in jobs:
+                # Waits for a free slot when the execution queue is full
+                await submit_execution_job(job)
+            enqueued += len(jobs)
+            if len(jobs) < self.batch_size:
+                return enqueued
+
+    async def _seconds_until_next_due(self) -> float:
+        from app.db.session import SessionLocal
+
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            due_at = await run_blocking(self._next_due, db, now)
+        if due_at is None:
+            return self.poll_seconds
+        return min(max((due_at - now).total_seconds(), 0.0), self.poll_seconds)
+
+    async def _run(self) -> None:
+        logger.info("Starting workflow timer service")
+        assert self._wakeup is not None
+        wakeup = self._wakeup
+        try:
+            while True:
+                timeout = self.poll_seconds
+                try:
+                    wakeup.clear()
+                    enqueued = await self.run_once()
+                    if enqueued:
+                        logger.info("Resuming delayed area runs", extra={"count": enqueued})
+                    timeout = await self._seconds_until_next_due()
+                except Exception as e:
+                    logger.error(
+                        "Error in workflow timer service loop",
+                        extra={"error": str(e)},
+                        exc_info=True,
+                    )
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            logger.info("Workflow timer service cancelled, shutting down gracefully")
+
+
+_timer_service: WorkflowTimerService | None = None
+
+
+def start_timer_service() -> None:
+    """Start the shared workflow timer service."""
+    global _timer_service
+
+    if _timer_service is not None and _timer_service.is_running():
+        logger.warning("Workflow timer service already running")
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.error("No event loop running, cannot start workflow timer service")
+        return
+
+    _timer_service = WorkflowTimerService()
+    _timer_service.start()
+    logger.info("Workflow timer service started")
+
+
+def stop_timer_service() -> None:
+    """Stop the shared workflow timer service."""
+    global _timer_service
+
+    if _timer_service is not None:
+        _timer_service.stop()
+        _timer_service = None
+        logger.info("Workflow timer service stopped")
+
+
+def is_timer_service_running() -> bool:
+    """Check if the shared workflow timer service is running."""
+    return _timer_service is not None and _timer_service.is_running()
+
+
+def wake_timer_service() -> None:
+    """Ask the shared timer service to rescan the timers (no-op when not running)."""
+    if _timer_service is not None:
+        _timer_service.wake()
+
+
+__all__ = [
+    "WorkflowTimerService",
+    "is_timer_service_running",
+    "start_timer_service",
+    "stop_timer_service",
+    "wake_timer_service",
+]
@@ -0,0 +1,250 @@
+"""Background refresher for expiring service connection tokens.
+
+Access tokens used to be refreshed lazily by the first execution that found them
+expired, so that execution paid the provider round-trip. The
+:class:`TokenRefresher` periodically scans for connections whose token expires
+within ``TOKEN_REFRESH_WINDOW_SECONDS`` and refreshes them ahead of time through
+the :mod:`credential manager <app.services.credential_manager>`. Each connection
+gets a stable refresh point inside the window so a wave of tokens issued together
+is spread over several scans, and refreshes run in rate-limited batches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.service_connection import ServiceConnection
+from app.services.credential_manager import credential_manager, credentials_from_connection
+
+logger = logging.getLogger("area")
+
+
+class TokenRefresher:
+    """Refreshes tokens that are about to expire in jittered, rate-limited batches."""
+
+    def __init__(
+        self,
+        interval_seconds: float | None = None,
+        window_seconds: float | None = None,
+        batch_size: int | None = None,
+        batch_interval_seconds: float | None = None,
+        jitter_ratio: float | None = None,
+    ) -> None:
+        self.interval_seconds = (
+            settings.token_refresh_interval_seconds if interval_seconds is None else interval_seconds
+        )
+        self.window_seconds = (
+            settings.token_refresh_window_seconds if window_seconds is None else window_seconds
+        )
+        self.batch_size = max(batch_size or settings.token_refresh_batch_size, 1)
+        self.batch_interval_seconds = (
+            settings.token_refresh_batch_interval_seconds
+            if batch_interval_seconds is None
+            else batch_interval_seconds
+        )
+        self.jitter_ratio = (
+            settings.polling_jitter_ratio if jitter_ratio is None else jitter_ratio
+        )
+        self._task: asyncio.Task | None = None
+
+    def is_running(self) -> bool:
+        """Return True while the refresher task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the refresher task on the running event loop."""
+        if self.is_running():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the refresher task."""
+        if self._task is not None and not self._task.done() and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = None
+
+    def _jittered(self, interval: float) -> float:
+        spread = interval * self.jitter_ratio
+        return max(interval + random.uniform(-spread, spread), 0.0)
+
+    def refresh_lead(self, connection_id: uuid.UUID) -> float:
+        """Return how many seconds before expiry a connection should be refreshed.
+
+        The lead is derived from the connection ID, so it is stable across scans
+        and replicas, and lies between the latest safe point (one scan interval
+        before executions would refresh the token themselves) and the window.
+        """
+        earliest = settings.credential_refresh_margin_seconds + self.interval_seconds
+        spread = max(self.window_seconds - earliest, 0.0)
+        return earliest + spread * ((connection_id.int % 1000) / 1000)
+
+    def due_connections(self, db: Session, now: datetime | None = None) -> list[ServiceConnection]:
+        """List connections whose token reached its refresh point.
+
+        Args:
+            db: Database session
+            now: Scan timestamp (defaults to the current UTC time)
+
+        Returns:
+            Connections to refresh, soonest expiry first
+        """
+        # Import here to avoid circular imports
+        from app.integrations.oauth.factory import OAuth2ProviderFactory
+
+        now = now or datetime.now(timezone.utc)
+        statement = (
+            select(ServiceConnection)
+            .where(
+                ServiceConnection.expires_at.is_not(None),
+                ServiceConnection.expires_at <= now + timedelta(seconds=self.window_seconds),
+                ServiceConnection.encrypted_refresh_token.is_not(None),
+                ServiceConnection.service_name.in_(OAuth2ProviderFactory.get_supported_providers()),
+            )
+            .order_by(ServiceConnection.expires_at)
+        )
+        due = []
+        for connection in db.execute(statement).scalars():
+            expires_at = connection.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if (expires_at - now).total_seconds() <= self.refresh_lead(connection.id):
+                due.append(connection)
+        return due
+
+    def refresh_connection(self, connection_id: uuid.UUID) -> bool:
+        """Refresh one connection in its own session.
+
+        Returns:
+            True if the connection holds a fresh token afterwards
+        """
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+        from app.services.service_connections import get_service_connection_by_id
+
+        with SessionLocal() as db:
+            connection = get_service_connection_by_id(db, str(connection_id))
+            if connection is None:
+                return False
+            credentials = credentials_from_connection(connection)
+            try:
+                credential_manager.refresh(db, credentials)
+            except Exception as exc:
+                logger.warning(
+                    "Background token refresh failed",
+                    extra={
+                        "connection_id": str(connection_id),
+                        "service_name": credentials.service_name,
+                        "error": str(exc),
+                    },
+                )
+                return False
+        return True
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Refresh every due connection once.
+
+        Args:
+            now: Scan timestamp (defaults to the current UTC time)
+
+        Returns:
+            Number of connections refreshed successfully
+        """
+        # Import here to avoid circular imports
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            due = await asyncio.to_thread(self.due_connections, db, now)
+            connection_ids = [connection.id for connection in due]
+
+        if connection_ids:
+            logger.info(
+                "Refreshing expiring service connection tokens",
+                extra={"connections_count": len(connection_ids)},
+            )
+
+        refreshed = 0
+        for start in range(0, len(connection_ids), self.batch_size):
+            if start:
+                await asyncio.sleep(self._jittered(self.batch_interval_seconds))
+            batch = connection_ids[start:start + self.batch_size]
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self.refresh_connection, connection_id) for connection_id in batch)
+            )
+            refreshed += sum(results)
+        return refreshed
+
+    async def _run(self) -> None:
+        logger.info("Starting token refresher")
+        try:
+            while True:
+                await asyncio.sleep(self._jittered(self.interval_seconds))
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(
+                        "Error in token refresher loop",
+                        extra={"error": str(e)},
+                        exc_info=True,
+                    )
+        except asyncio.CancelledError:
+            logger.info("Token refresher cancelled, shutting down gracefully")
+
+
+_token_refresher: TokenRefresher | None = None
+
+
+def start_token_refresher() -> None:
+    """Start the shared background token refresher."""
+    global _token_refresher
+
+    if not settings.token_refresh_enabled:
+        logger.info("Background token refresh disabled")
+        return
+
+    if _token_refresher is not None and _token_refresher.is_running():
+        logger.warning("Token refresher already running")
+        return
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        logger.error("No event loop running, cannot start token refresher")
+        return
+
+    _token_refresher = TokenRefresher()
+    _token_refresher.start()
+    logger.info("Token refresher started")
+
+
+def stop_token_refresher() -> None:
+    """Stop the shared background token refresher."""
+    global _token_refresher
+
+    if _token_refresher is not None:
+        _token_refresher.stop()
+        _token_refresher = None
+        logger.info("Token refresher stopped")
+
+
+def is_token_refresher_running() -> bool:
+    """Check if the shared token refresher is running."""
+    return _token_refresher is not None and _token_refresher.is_running()
+
+
+__all__ = [
+    "TokenRefresher",
+    "is_token_refresher_running",
+    "start_token_refresher",
+    "stop_token_refresher",
+]
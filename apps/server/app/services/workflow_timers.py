@@ -0,0 +1,133 @@
+"""Repository helpers for the timers of paused area runs."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.workflow_timer import WorkflowTimer
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _jsonable(value: Any) -> Any:
+    # Handlers may leave datetimes or other objects in the variables
+    return json.loads(json.dumps(value, default=str))
+
+
+def _claimable(now: datetime):
+    return or_(WorkflowTimer.locked_until.is_(None), WorkflowTimer.locked_until <= now)
+
+
+def create_workflow_timer(
+    db: Session,
+    area_id,
+    delay_step_id: str,
+    next_step_ids: Iterable[str],
+    variables: dict[str, Any],
+    trigger_data: dict[str, Any],
+    executed_step_ids: Iterable[str],
+    due_at: datetime,
+) -> WorkflowTimer:
+    """Persist the state of a run paused on a delay step."""
+    timer = WorkflowTimer(
+        area_id=_as_uuid(area_id),
+        delay_step_id=delay_step_id,
+        next_step_ids=list(next_step_ids),
+        variables=_jsonable(variables),
+        trigger_data=_jsonable(trigger_data),
+        executed_step_ids=list(executed_step_ids),
+        due_at=due_at,
+        attempts=0,
+    )
+    db.add(timer)
+    db.commit()
+    db.refresh(timer)
+    return timer
+
+
+def get_workflow_timer(db: Session, timer_id) -> Optional[WorkflowTimer]:
+    """Fetch a timer by ID."""
+    return db.get(WorkflowTimer, _as_uuid(timer_id))
+
+
+def claim_due_timers(
+    db: Session, now: datetime, limit: int, lease_seconds: float
+) -> list[WorkflowTimer]:
+    """Lease the earliest due timers that no worker is resuming.
+
+    A claimed timer is hidden from other claims until its lease expires, so a
+    run interrupted by a crash is resumed again once the lease runs out.
+
+    Args:
+        db: Database session
+        now: Claim timestamp
+        limit: Maximum number of timers to claim
+        lease_seconds: Lease duration
+
+    Returns:
+        Claimed timers, earliest due first
+    """
+    statement = (
+        select(WorkflowTimer)
+        .where(WorkflowTimer.due_at <= now, _claimable(now))
+        .order_by(WorkflowTimer.due_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    timers = list(db.execute(statement).scalars())
+    locked_until = now + timedelta(seconds=lease_seconds)
+    for timer in timers:
+        timer.locked_until = locked_until
+        timer.attempts += 1
+    db.commit()
+    return timers
+
+
+def next_timer_due_at(db: Session, now: datetime) -> Optional[datetime]:
+    """Return when the earliest unclaimed timer comes due, None without timers."""
+    statement = select(func.min(WorkflowTimer.due_at)).where(_claimable(now))
+    return db.execute(statement).scalar_one_or_none()
+
+
+def take_workflow_timer(db: Session, timer: WorkflowTimer) -> bool:
+    """Delete a timer about to be resumed, without committing.
+
+    The caller commits the deletion together with the start of the resumed
+    run. The timer stays readable, detached from the session.
+
+    Returns:
+        False if another job already took the timer
+    """
+    statement = (
+        delete(WorkflowTimer)
+        .where(WorkflowTimer.id == timer.id)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(statement).rowcount != 1:
+        return False
+    db.expunge(timer)
+    return True
+
+
+def delete_workflow_timer(db: Session, timer: WorkflowTimer) -> None:
+    """Delete a timer that will not be resumed."""
+    db.delete(timer)
+    db.commit()
+
+
+__all__ = [
+    "claim_due_timers",
+    "create_workflow_timer",
+    "delete_workflow_timer",
+    "get_workflow_timer",
+    "next_timer_due_at",
+    "take_workflow_timer",
+]
@@ -23,46 +23,21 @@ from app.api.routes.marketplace import router as marketplace_router
 from app.api import areas_router, execution_logs_router
 from app.api.routes.admin import router as admin_router
 from app.api.routes.user_activity_logs import router as user_activity_log_router
+from app.api.routes.webhooks import router as webhooks_router
 from app.core.config import settings
 from app.db.migrations import run_migrations
 from app.db.session import verify_connection
 from app.integrations.catalog import service_catalog_payload
 from app.integrations.simple_plugins.scheduler import start_scheduler, stop_scheduler
+from app.services.execution_pool import start_execution_pool, stop_execution_pool
+from app.services.token_refresher import start_token_refresher, stop_token_refresher
+from app.services.push_manager import start_push_manager, stop_push_manager
+from app.services.timer_service import start_timer_service, stop_timer_service
 from slowapi.util import get_remote_address
-from app.integrations.simple_plugins.gmail_scheduler import (
-    start_gmail_scheduler,
-    stop_gmail_scheduler,
-    is_gmail_scheduler_running,
-)
-from app.integrations.simple_plugins.discord_scheduler import (
-    start_discord_scheduler,
-    stop_discord_scheduler,
-    is_discord_scheduler_running,
-)
-from app.integrations.simple_plugins.weather_scheduler import (
-    start_weather_scheduler,
-    stop_weather_scheduler,
-    is_weather_scheduler_running,
-)
-from app.integrations.simple_plugins.outlook_scheduler import (
-    start_outlook_scheduler,
-    stop_outlook_scheduler,
-    is_outlook_scheduler_running,
-)
-from app.integrations.simple_plugins.github_scheduler import (
-    start_github_scheduler,
-    stop_github_scheduler,
-    is_github_scheduler_running,
-)
-from app.integrations.simple_plugins.calendar_scheduler import (
-    start_calendar_scheduler,
-    stop_calendar_scheduler,
-    is_calendar_scheduler_running,
-)
-from app.integrations.simple_plugins.google_drive_scheduler import (
-    start_google_drive_scheduler,
-    stop_google_drive_scheduler,
-    is_google_drive_scheduler_running,
+from app.integrations.simple_plugins.polling_engine import (
+    start_polling_engine,
+    stop_polling_engine,
+    is_polling_engine_running,
 )
 
 
@@ -100,23 +75,20 @@ async def lifespan(app: FastAPI):
             logger.warning("Startup: marketplace seeding failed (non-fatal): %s", seed_exc)
             # Don't fail startup if seeding fails - it's not critical
 
+        # Start the shared worker pool that executes areas queued by the schedulers
+        logger.info("Startup: starting execution pool")
+        start_execution_pool()
+        logger.info("Startup: execution pool started")
+
         # Start the background scheduler for time-based areas
         logger.info("Startup: starting scheduler")
         start_scheduler()
         logger.info("Startup: scheduler started")
 
-        # Start the Gmail polling scheduler (non-blocking)
-        logger.info("Startup: starting Gmail scheduler")
-        start_gmail_scheduler()
-        # Do not hard-fail app startup if Gmail scheduler validation is inconclusive
-        try:
-            await asyncio.sleep(0.1)
-            if not is_gmail_scheduler_running():
-                logger.warning("Startup: Gmail scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: Gmail scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify Gmail scheduler status; continuing")
+        # Resume area runs paused on delay steps, including those pending before a restart
+        logger.info("Startup: starting workflow timer service")
+        start_timer_service()
+        logger.info("Startup: workflow timer service started")
 
         # Validate Discord bot token if Discord features are enabled
         from app.core.encryption import get_discord_bot_token
@@ -129,78 +101,28 @@ async def lifespan(app: FastAPI):
             else:
                 logger.info("Startup: Discord bot token validated successfully")
         
-        # Start the Discord polling scheduler (non-blocking)
-        logger.info("Startup: starting Discord scheduler")
-        start_discord_scheduler()
-        try:
-            await asyncio.sleep(0.1)
-            if not is_discord_scheduler_running():
-                logger.warning("Startup: Discord scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: Discord scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify Discord scheduler status; continuing")
-
-        # Start the Weather polling scheduler (non-blocking)
-        logger.info("Startup: starting Weather scheduler")
-        start_weather_scheduler()
-        try:
-            await asyncio.sleep(0.1)
-            if not is_weather_scheduler_running():
-                logger.warning("Startup: Weather scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: Weather scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify Weather scheduler status; continuing")
-
-        # Start the Outlook polling scheduler (non-blocking)
-        logger.info("Startup: starting Outlook scheduler")
-        start_outlook_scheduler()
-        # Do not hard-fail app startup if Outlook scheduler validation is inconclusive
+        # Start the polling engine driving every provider trigger source (non-blocking)
+        logger.info("Startup: starting polling engine")
+        start_polling_engine()
+        # Do not hard-fail app startup if polling engine validation is inconclusive
         try:
             await asyncio.sleep(0.1)
-            if not is_outlook_scheduler_running():
-                logger.warning("Startup: Outlook scheduler not running yet; continuing")
+            if not is_polling_engine_running():
+                logger.warning("Startup: polling engine not running yet; continuing")
             else:
-                logger.info("Startup: Outlook scheduler started successfully")
+                logger.info("Startup: polling engine started successfully")
         except Exception:
-            logger.warning("Startup: Unable to verify Outlook scheduler status; continuing")
+            logger.warning("Startup: Unable to verify polling engine status; continuing")
 
-        # Start the GitHub polling scheduler (non-blocking)
-        logger.info("Startup: starting GitHub scheduler")
-        start_github_scheduler()
-        try:
-            await asyncio.sleep(0.1)
-            if not is_github_scheduler_running():
-                logger.warning("Startup: GitHub scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: GitHub scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify GitHub scheduler status; continuing")
-
-        # Start the Google Calendar polling scheduler (non-blocking)
-        logger.info("Startup: starting Calendar scheduler")
-        start_calendar_scheduler()
-        try:
-            await asyncio.sleep(0.1)
-            if not is_calendar_scheduler_running():
-                logger.warning("Startup: Calendar scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: Calendar scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify Calendar scheduler status; continuing")
+        # Refresh expiring OAuth tokens before executions need them
+        logger.info("Startup: starting token refresher")
+        start_token_refresher()
+        logger.info("Startup: token refresher started")
 
-        # Start the Google Drive polling scheduler (non-blocking)
-        logger.info("Startup: starting Google Drive scheduler")
-        start_google_drive_scheduler()
-        try:
-            await asyncio.sleep(0.1)
-            if not is_google_drive_scheduler_running():
-                logger.warning("Startup: Google Drive scheduler not running yet; continuing")
-            else:
-                logger.info("Startup: Google Drive scheduler started successfully")
-        except Exception:
-            logger.warning("Startup: Unable to verify Google Drive scheduler status; continuing")
+        # Keep provider push subscriptions in place (no-op without WEBHOOK_BASE_URL)
+        logger.info("Startup: starting push subscription manager")
+        start_push_manager()
+        logger.info("Startup: push subscription manager started")
     except Exception as exc:  # pragma: no cover - defensive logging only
         logger.error("Startup failure", exc_info=True)
         raise
@@ -212,33 +134,25 @@ async def lifespan(app: FastAPI):
     stop_scheduler()
     logger.info("Shutdown: scheduler stopped")
 
-    logger.info("Shutdown: stopping Gmail scheduler")
-    stop_gmail_scheduler()
-    logger.info("Shutdown: Gmail scheduler stopped")
-
-    logger.info("Shutdown: stopping Discord scheduler")
-    stop_discord_scheduler()
-    logger.info("Shutdown: Discord scheduler stopped")
-
-    logger.info("Shutdown: stopping Weather scheduler")
-    stop_weather_scheduler()
-    logger.info("Shutdown: Weather scheduler stopped")
+    logger.info("Shutdown: stopping polling engine")
+    stop_polling_engine()
+    logger.info("Shutdown: polling engine stopped")
 
-    logger.info("Shutdown: stopping Outlook scheduler")
-    stop_outlook_scheduler()
-    logger.info("Shutdown: Outlook scheduler stopped")
+    logger.info("Shutdown: stopping token refresher")
+    stop_token_refresher()
+    logger.info("Shutdown: token refresher stopped")
 
-    logger.info("Shutdown: stopping GitHub scheduler")
-    stop_github_scheduler()
-    logger.info("Shutdown: GitHub scheduler stopped")
+    logger.info("Shutdown: stopping push subscription manager")
+    stop_push_manager()
+    logger.info("Shutdown: push subscription manager stopped")
 
-    logger.info("Shutdown: stopping Calendar scheduler")
-    stop_calendar_scheduler()
-    logger.info("Shutdown: Calendar scheduler stopped")
+    logger.info("Shutdown: stopping workflow timer service")
+    stop_timer_service()
+    logger.info("Shutdown: workflow timer service stopped")
 
-    logger.info("Shutdown: stopping Google Drive scheduler")
-    stop_google_drive_scheduler()
-    logger.info("Shutdown: Google Drive scheduler stopped")
+    logger.info("Shutdown: stopping execution pool")
+    stop_execution_pool()
+    logger.info("Shutdown: execution pool stopped")
 
 
 
@@ -321,4 +235,5 @@ app.include_router(areas_router, prefix="/api/v1")
 app.include_router(execution_logs_router, prefix="/api/v1")
 app.include_router(admin_router, prefix="/api/v1")
 app.include_router(user_activity_log_router, prefix="/api/v1")
+app.include_router(webhooks_router, prefix="/api/v1/webhooks")
 logger.info("Routers registered; application ready to accept requests")
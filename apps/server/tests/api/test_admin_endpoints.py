@@ -27,6 +27,26 @@ def test_admin_status_endpoint_with_admin_token(
     assert "message" in data
 
 
+def test_execution_pool_endpoint_with_admin_token(
+    client: SyncASGITestClient,
+    admin_token: str,
+) -> None:
+    """Test the execution pool monitoring endpoint exposes queue and worker stats."""
+    response = client.get("/api/v1/admin/execution-pool", headers=_auth_headers(admin_token))
+    assert response.status_code == 200
+    data = response.json()
+    assert {"queue_depth", "queue_capacity", "busy_workers", "workers", "saturation"} <= data.keys()
+
+
+def test_execution_pool_endpoint_with_regular_user_token(
+    client: SyncASGITestClient,
+    auth_token: str,
+) -> None:
+    """Test the execution pool monitoring endpoint is admin only."""
+    response = client.get("/api/v1/admin/execution-pool", headers=_auth_headers(auth_token))
+    assert response.status_code == 403
+
+
 def test_admin_status_endpoint_with_regular_user_token(
     client: SyncASGITestClient,
     auth_token: str,
@@ -0,0 +1,223 @@
+"""Integration tests for the push notification webhook endpoints."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api.routes.webhooks import verify_github_signature
+from app.core.config import settings
+from app.core.encryption import encrypt_token
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.push_subscriptions import save_push_subscription
+from tests.conftest import SyncASGITestClient
+
+
+@pytest.fixture
+def notify():
+    with patch("app.api.routes.webhooks.notify_polling_engine", return_value=True) as mock_notify:
+        yield mock_notify
+
+
+def _subscription(db_session: Session, service: str, scope: str, channel_id: str, secret: str | None, **kwargs):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(
+        user_id=user.id,
+        service_name=service,
+        encrypted_access_token=encrypt_token("access"),
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return save_push_subscription(db_session, service, scope, connection.id, channel_id, secret=secret, **kwargs)
+
+
+def _github_signature(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class TestGitHubSignature:
+    """Test GitHub delivery signature verification."""
+
+    def test_valid_signature(self):
+        assert verify_github_signature("s3cret", b"{}", _github_signature("s3cret", b"{}"))
+
+    def test_rejects_wrong_secret_missing_header_or_secret(self):
+        assert not verify_github_signature("s3cret", b"{}", _github_signature("other", b"{}"))
+        assert not verify_github_signature("s3cret", b"{}", None)
+        assert not verify_github_signature(None, b"{}", _github_signature("s3cret", b"{}"))
+
+
+class TestGitHubWebhook:
+    """Test the GitHub webhook endpoint."""
+
+    def test_signed_delivery_notifies_repository_scope(self, client: SyncASGITestClient, db_session: Session, notify):
+        _subscription(db_session, "github", "octo/repo", "42", "s3cret")
+        body = json.dumps({"action": "opened"}).encode()
+
+        response = client.post(
+            "/api/v1/webhooks/github",
+            content=body,
+            headers={
+                "X-GitHub-Hook-ID": "42",
+                "X-GitHub-Event": "issues",
+                "X-Hub-Signature-256": _github_signature("s3cret", body),
+            },
+        )
+
+        assert response.status_code == 202
+        notify.assert_called_once_with("github", "octo/repo")
+
+    def test_bad_signature_is_rejected(self, client: SyncASGITestClient, db_session: Session, notify):
+        _subscription(db_session, "github", "octo/repo", "42", "s3cret")
+
+        response = client.post(
+            "/api/v1/webhooks/github",
+            content=b"{}",
+            headers={"X-GitHub-Hook-ID": "42", "X-Hub-Signature-256": _github_signature("other", b"{}")},
+        )
+
+        assert response.status_code == 401
+        notify.assert_not_called()
+
+    def test_unknown_hook_and_ping(self, client: SyncASGITestClient, db_session: Session, notify):
+        _subscription(db_session, "github", "octo/repo", "42", "s3cret")
+
+        unknown = client.post("/api/v1/webhooks/github", content=b"{}", headers={"X-GitHub-Hook-ID": "7"})
+        ping = client.post(
+            "/api/v1/webhooks/github",
+            content=b"{}",
+            headers={
+                "X-GitHub-Hook-ID": "42",
+                "X-GitHub-Event": "ping",
+                "X-Hub-Signature-256": _github_signature("s3cret", b"{}"),
+            },
+        )
+
+        assert unknown.status_code == 404
+        assert ping.status_code == 202
+        notify.assert_not_called()
+
+
+class TestMicrosoftGraphWebhook:
+    """Test the Microsoft Graph notification endpoint."""
+
+    def test_validation_token_is_echoed(self, client: SyncASGITestClient):
+        response = client.post("/api/v1/webhooks/microsoft-graph?validationToken=abc%20123")
+
+        assert response.status_code == 200
+        assert response.text == "abc 123"
+        assert response.headers["content-type"].startswith("text/plain")
+
+    def test_notifications_are_checked_against_client_state(
+        self, client: SyncASGITestClient, db_session: Session, notify
+    ):
+        _subscription(db_session, "outlook", "user-1", "sub-1", "state")
+
+        response = client.post(
+            "/api/v1/webhooks/microsoft-graph",
+            json={
+                "value": [
+                    {"subscriptionId": "sub-1", "clientState": "state"},
+                    {"subscriptionId": "sub-1", "clientState": "state"},
+                    {"subscriptionId": "sub-1", "clientState": "forged"},
+                    {"subscriptionId": "sub-2", "clientState": "state"},
+                ]
+            },
+        )
+
+        assert response.status_code == 202
+        notify.assert_called_once_with("outlook", "user-1")
+
+
+class TestGmailWebhook:
+    """Test the Gmail Pub/Sub push endpoint."""
+
+    @staticmethod
+    def _message(email: str) -> dict:
+        data = json.dumps({"emailAddress": email, "historyId": "9"}).encode()
+        return {"message": {"data": base64.b64encode(data).decode(), "messageId": "1"}}
+
+    def test_push_for_known_mailbox_notifies_user_scope(
+        self, client: SyncASGITestClient, db_session: Session, notify, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "gmail_push_token", "push-token")
+        _subscription(db_session, "gmail", "user-1", "me@example.com", None)
+
+        response = client.post(
+            "/api/v1/webhooks/gmail?token=push-token", json=self._message("Me@Example.com")
+        )
+
+        assert response.status_code == 204
+        notify.assert_called_once_with("gmail", "user-1")
+
+    def test_push_requires_configured_token(self, client: SyncASGITestClient, notify, monkeypatch):
+        monkeypatch.setattr(settings, "gmail_push_token", "")
+        unset = client.post("/api/v1/webhooks/gmail?token=", json=self._message("me@example.com"))
+        monkeypatch.setattr(settings, "gmail_push_token", "push-token")
+        wrong = client.post("/api/v1/webhooks/gmail?token=nope", json=self._message("me@example.com"))
+
+        assert unset.status_code == 401
+        assert wrong.status_code == 401
+        notify.assert_not_called()
+
+    def test_unknown_expired_or_malformed_messages(
+        self, client: SyncASGITestClient, db_session: Session, notify, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "gmail_push_token", "push-token")
+        _subscription(
+            db_session, "gmail", "user-1", "old@example.com", None,
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+
+        unknown = client.post("/api/v1/webhooks/gmail?token=push-token", json=self._message("x@example.com"))
+        expired = client.post("/api/v1/webhooks/gmail?token=push-token", json=self._message("old@example.com"))
+        malformed = client.post("/api/v1/webhooks/gmail?token=push-token", json={"message": {"data": "%%"}})
+
+        assert unknown.status_code == 204
+        assert expired.status_code == 204
+        assert malformed.status_code == 400
+        notify.assert_not_called()
+
+
+class TestGoogleDriveWebhook:
+    """Test the Google Drive channel notification endpoint."""
+
+    def test_change_notifies_user_scope(self, client: SyncASGITestClient, db_session: Session, notify):
+        _subscription(db_session, "google_drive", "user-1", "chan-1", "tok")
+
+        sync = client.post(
+            "/api/v1/webhooks/google-drive",
+            headers={"X-Goog-Channel-ID": "chan-1", "X-Goog-Channel-Token": "tok", "X-Goog-Resource-State": "sync"},
+        )
+        change = client.post(
+            "/api/v1/webhooks/google-drive",
+            headers={"X-Goog-Channel-ID": "chan-1", "X-Goog-Channel-Token": "tok", "X-Goog-Resource-State": "change"},
+        )
+
+        assert sync.status_code == 204
+        assert change.status_code == 204
+        notify.assert_called_once_with("google_drive", "user-1")
+
+    def test_unknown_channel_or_token_is_rejected(self, client: SyncASGITestClient, db_session: Session, notify):
+        _subscription(db_session, "google_drive", "user-1", "chan-1", "tok")
+
+        unknown = client.post("/api/v1/webhooks/google-drive", headers={"X-Goog-Channel-ID": "chan-2"})
+        forged = client.post(
+            "/api/v1/webhooks/google-drive",
+            headers={"X-Goog-Channel-ID": "chan-1", "X-Goog-Channel-Token": "bad", "X-Goog-Resource-State": "change"},
+        )
+
+        assert unknown.status_code == 404
+        assert forged.status_code == 401
+        notify.assert_not_called()
@@ -124,21 +124,92 @@ def verify_connection_tracker(monkeypatch: pytest.MonkeyPatch) -> Generator[dict
     def fake_stop_scheduler() -> None:
         pass
 
-    def fake_start_gmail_scheduler() -> None:
+    def fake_start_polling_engine() -> None:
         pass
 
-    def fake_stop_gmail_scheduler() -> None:
+    def fake_stop_polling_engine() -> None:
+        pass
+
+    def fake_start_token_refresher() -> None:
+        pass
+
+    def fake_stop_token_refresher() -> None:
+        pass
+
+    def fake_start_push_manager() -> None:
+        pass
+
+    def fake_stop_push_manager() -> None:
+        pass
+
+    def fake_start_timer_service() -> None:
+        pass
+
+    def fake_stop_timer_service() -> None:
         pass
 
     monkeypatch.setattr(main, "verify_connection", fake_verify_connection)
     monkeypatch.setattr(main, "run_migrations", fake_run_migrations)
     monkeypatch.setattr(main, "start_scheduler", fake_start_scheduler)
     monkeypatch.setattr(main, "stop_scheduler", fake_stop_scheduler)
-    monkeypatch.setattr(main, "start_gmail_scheduler", fake_start_gmail_scheduler)
-    monkeypatch.setattr(main, "stop_gmail_scheduler", fake_stop_gmail_scheduler)
+    monkeypatch.setattr(main, "start_polling_engine", fake_start_polling_engine)
+    monkeypatch.setattr(main, "stop_polling_engine", fake_stop_polling_engine)
+    monkeypatch.setattr(main, "start_token_refresher", fake_start_token_refresher)
+    monkeypatch.setattr(main, "stop_token_refresher", fake_stop_token_refresher)
+    monkeypatch.setattr(main, "start_push_manager", fake_start_push_manager)
+    monkeypatch.setattr(main, "stop_push_manager", fake_stop_push_manager)
+    monkeypatch.setattr(main, "start_timer_service", fake_start_timer_service)
+    monkeypatch.setattr(main, "stop_timer_service", fake_stop_timer_service)
     yield tracker
 
 
+@pytest.fixture(autouse=True)
+def clear_execution_plans() -> Generator[None, None, None]:
+    """Keep compiled step graphs from leaking between tests."""
+
+    from app.services.execution_plan import execution_plan_cache
+
+    execution_plan_cache.clear()
+    yield
+    execution_plan_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_credential_cache() -> Generator[None, None, None]:
+    """Keep decrypted credentials from leaking between tests."""
+
+    from app.services.credential_manager import credential_manager
+
+    credential_manager.clear()
+    yield
+    credential_manager.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_weather_cache() -> Generator[None, None, None]:
+    """Keep cached weather responses from leaking between tests."""
+
+    from app.integrations.simple_plugins.weather_cache import weather_cache
+
+    weather_cache.clear()
+    yield
+    weather_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_discord_state() -> Generator[None, None, None]:
+    """Keep Discord rate limits and channel cursors from leaking between tests."""
+
+    from app.integrations.simple_plugins.discord_client import discord_rate_limiter
+    from app.integrations.simple_plugins.discord_scheduler import clear_discord_seen_state
+
+    discord_rate_limiter.clear()
+    clear_discord_seen_state()
+    yield
+    discord_rate_limiter.clear()
+    clear_discord_seen_state()
+
+
 @pytest.fixture()
 def db_session() -> Generator[Session, None, None]:
     """Provide a clean database session for each test."""
@@ -1,83 +1,89 @@
 """Tests for Google Calendar scheduler."""
 
+import uuid
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone, timedelta
 from typing import Dict
 from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
 
+from app.core.config import settings
+from app.core.encryption import encrypt_token
 from app.integrations.simple_plugins.calendar_scheduler import (
+    CALENDAR_SYNC_CURSOR,
     _get_calendar_service,
     _fetch_events,
     _extract_event_data,
     _fetch_due_calendar_areas,
-    calendar_scheduler_task,
-    _fetch_events_for_trigger,
     _process_calendar_trigger,
-    start_calendar_scheduler,
-    stop_calendar_scheduler,
-    is_calendar_scheduler_running,
+    _sync_calendar,
+    CalendarTriggerSource,
     clear_calendar_seen_state,
-    cleanup_old_seen_events
 )
 from app.models.area import Area
 from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.credential_manager import ConnectionCredentials
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 
 class TestCalendarScheduler:
     """Test Google Calendar scheduler functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _list_sync(self):
+        with patch.object(settings, "calendar_sync_tokens", False):
+            yield
+
     @pytest.fixture
     def mock_db(self):
         """Create a mock database session."""
         return MagicMock()
 
     @pytest.fixture
-    def mock_service_connection(self):
-        """Create a mock service connection."""
-        connection = MagicMock(spec=ServiceConnection)
-        connection.id = "test_connection_id"
-        connection.user_id = "test_user_id"
-        connection.service_name = "google_calendar"
-        connection.encrypted_access_token = "encrypted_access_token"
-        connection.encrypted_refresh_token = "encrypted_refresh_token"
-        return connection
+    def mock_credentials(self):
+        """Create cached credentials of a Google Calendar connection."""
+        return ConnectionCredentials(
+            connection_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            service_name="google_calendar",
+            access_token="decrypted_access",
+            refresh_token="decrypted_refresh",
+        )
 
-    def test_get_calendar_service_success(self, mock_db, mock_service_connection):
+    def test_get_calendar_service_success(self, mock_db, mock_credentials):
         """Test getting authenticated Google Calendar service."""
-        from unittest.mock import ANY
-        from google.oauth2.credentials import Credentials
-        with patch("app.integrations.simple_plugins.calendar_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            with patch("app.integrations.simple_plugins.calendar_scheduler.decrypt_token") as mock_decrypt:
-                with patch("app.integrations.simple_plugins.calendar_scheduler.Request") as mock_request:
-                    with patch("app.integrations.simple_plugins.calendar_scheduler.build") as mock_build:
-                        from app.core.config import settings
-                        mock_get_conn.return_value = mock_service_connection
-                        mock_decrypt.side_effect = ["decrypted_access", "decrypted_refresh"]
-                        # Create a real Credentials object instead of mocking it to avoid the super() error
-                        mock_creds = MagicMock(spec=Credentials)
-                        mock_creds.token = "decrypted_access"
-                        mock_creds.refresh_token = "decrypted_refresh"
-                        mock_creds.expired = False
-                        mock_creds.expiry = None
-                        type(mock_creds).valid = True
-                        # Set up the expected attributes
-                        mock_request.return_value = MagicMock()
-                        with patch("app.integrations.simple_plugins.calendar_scheduler.Credentials") as mock_creds_class:
-                            mock_creds_class.return_value = mock_creds
-                            mock_service = MagicMock()
-                            mock_build.return_value = mock_service
-                            service = _get_calendar_service("test_user_id", mock_db)
-                            # Verify that the service was properly built
-                            mock_get_conn.assert_called_once_with(mock_db, "test_user_id", "google_calendar")
-                            assert mock_decrypt.call_count == 2
-                            # Check that build was called with the expected parameters
-                            mock_build.assert_called_once_with('calendar', 'v3', credentials=mock_creds)
+        with patch("app.integrations.simple_plugins.calendar_scheduler.get_google_credentials") as mock_get_creds:
+            with patch("app.integrations.simple_plugins.calendar_scheduler.get_google_client") as mock_build:
+                mock_get_creds.return_value = mock_credentials
+                mock_service = MagicMock()
+                mock_build.return_value = mock_service
+
+                service = _get_calendar_service("test_user_id", mock_db)
+
+                assert service is mock_service
+                mock_get_creds.assert_called_once_with(mock_db, "test_user_id", "google_calendar")
+                # Check that the client was requested for the connection
+                connection_id, api, version, creds = mock_build.call_args[0]
+                assert (connection_id, api, version) == (mock_credentials.connection_id, 'calendar', 'v3')
+                assert creds.token == "decrypted_access"
+                assert creds.refresh_token == "decrypted_refresh"
+
+    def test_get_calendar_service_refresh_error(self, mock_db):
+        """Test getting calendar service when the token was revoked."""
+        with patch("app.integrations.simple_plugins.calendar_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.side_effect = RefreshError("Token expired")
+
+            service = _get_calendar_service("test_user_id", mock_db)
+
+            assert service is None
 
     def test_get_calendar_service_no_connection(self, mock_db):
         """Test getting calendar service when no connection exists."""
-        with patch("app.integrations.simple_plugins.calendar_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.calendar_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             service = _get_calendar_service("test_user_id", mock_db)
 
@@ -205,52 +211,9 @@ class TestCalendarScheduler:
         mock_query.filter.assert_called_once()
         # The filter should check for enabled=True and trigger_service='google_calendar'
 
-    @pytest.mark.asyncio
-    async def test_fetch_events_for_trigger_event_created(self):
-        """Test fetching events for 'event_created' trigger."""
-        mock_service = MagicMock()
-        mock_area = MagicMock(spec=Area)
-        mock_area.trigger_action = "event_created"
-        mock_area.trigger_params = {}
-        now = datetime.now(timezone.utc)
-
-        with patch("app.integrations.simple_plugins.calendar_scheduler._fetch_events") as mock_fetch:
-            mock_fetch.return_value = []
-            events = await _fetch_events_for_trigger(mock_service, mock_area, now)
-
-            assert events == []
-            # Should fetch with time range of now to 30 days later
-            mock_fetch.assert_called_once()
-            args, kwargs = mock_fetch.call_args
-            assert args[1] == now.isoformat()  # time_min
-            expected_time_max = (now + timedelta(days=30)).isoformat()
-            assert args[2] == expected_time_max  # time_max
-
-    @pytest.mark.asyncio
-    async def test_fetch_events_for_trigger_event_starting_soon(self):
-        """Test fetching events for 'event_starting_soon' trigger."""
-        mock_service = MagicMock()
-        mock_area = MagicMock(spec=Area)
-        mock_area.trigger_action = "event_starting_soon"
-        mock_area.trigger_params = {"minutes_before": 30}
-        now = datetime.now(timezone.utc)
-
-        with patch("app.integrations.simple_plugins.calendar_scheduler._fetch_events") as mock_fetch:
-            mock_fetch.return_value = []
-            events = await _fetch_events_for_trigger(mock_service, mock_area, now)
-
-            assert events == []
-            # Should fetch with time range of now to now + minutes_before + 1
-            mock_fetch.assert_called_once()
-            args, kwargs = mock_fetch.call_args
-            assert args[1] == now.isoformat()  # time_min
-            expected_time_max = (now + timedelta(minutes=31)).isoformat()  # 30 + 1
-            assert args[2] == expected_time_max  # time_max
-
     @pytest.mark.asyncio
     async def test_process_calendar_trigger_success(self, mock_db):
-        """Test processing a calendar trigger successfully."""
-        from uuid import UUID
+        """Test processing a calendar trigger queues an execution job."""
         import uuid
         
         # Generate a proper UUID for the area
@@ -267,28 +230,24 @@ class TestCalendarScheduler:
         }
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.calendar_scheduler.create_execution_log") as mock_create_log:
-            with patch("app.integrations.simple_plugins.calendar_scheduler.execute_area") as mock_execute:
-                mock_log = MagicMock()
-                mock_create_log.return_value = mock_log
-                mock_execute.return_value = {"status": "success", "steps_executed": 2}
-                mock_db.merge.return_value = mock_area  # Mock the merge method
-
-                await _process_calendar_trigger(mock_db, mock_area, mock_cal_event, now)
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
+            mock_db.merge.return_value = mock_area  # Mock the merge method
 
-                # Verify execution log was created and updated
-                mock_create_log.assert_called_once()
-                assert mock_log.status == "Success"
-                assert mock_log.output == "Calendar trigger executed: 2 step(s)"
-                assert mock_log.error_message is None
-                mock_db.commit.assert_called()
+            await _process_calendar_trigger(mock_db, mock_area, mock_cal_event, now)
 
-                # Verify area execution was called
-                mock_execute.assert_called_once()
+            mock_submit.assert_awaited_once()
+            job = mock_submit.call_args[0][0]
+            assert job.area_id == str(area_uuid)
+            assert job.source == "Calendar"
+            assert job.trigger_data["area_id"] == str(area_uuid)
+            assert job.trigger_data["now"] == now.isoformat()
 
     @pytest.mark.asyncio
-    async def test_process_calendar_trigger_failure(self, mock_db):
-        """Test processing a calendar trigger when execution fails."""
+    async def test_process_calendar_trigger_job_details(self, mock_db):
+        """Test the queued job records the calendar event for the execution log."""
         import uuid
         
         # Generate proper UUIDs
@@ -305,75 +264,325 @@ class TestCalendarScheduler:
         }
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.calendar_scheduler.create_execution_log") as mock_create_log:
-            with patch("app.integrations.simple_plugins.calendar_scheduler.execute_area") as mock_execute:
-                mock_log = MagicMock()
-                mock_create_log.return_value = mock_log
-                mock_execute.side_effect = Exception("Execution failed")
-                mock_db.merge.return_value = mock_area  # Mock the merge method
-
-                await _process_calendar_trigger(mock_db, mock_area, mock_cal_event, now)
-
-                # Verify execution log was created and updated with failure
-                mock_create_log.assert_called_once()
-                assert mock_log.status == "Failed"
-                assert "Execution failed" in mock_log.error_message
-                mock_db.commit.assert_called()
-
-    def test_scheduler_start_stop_functions(self):
-        """Test scheduler start, stop, and status functions."""
-        # Initially, scheduler should not be running
-        assert not is_calendar_scheduler_running()
-
-        # Start should work
-        start_calendar_scheduler()
-        # This test doesn't actually start a task since there would be no event loop,
-        # but we're testing the logic path
-
-        # Stop should work
-        stop_calendar_scheduler()
-
-        # After stopping, status should show not running
-        assert not is_calendar_scheduler_running()
-
-    def test_clear_calendar_seen_state(self):
-        """Test clearing the in-memory seen events state."""
-        from app.integrations.simple_plugins.calendar_scheduler import _last_seen_events
-        # Add some dummy data to the global state
-        _last_seen_events["test_area"] = {"event1", "event2"}
-        
-        # Clear the state
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
+            mock_db.merge.return_value = mock_area  # Mock the merge method
+
+            await _process_calendar_trigger(mock_db, mock_area, mock_cal_event, now)
+
+            job = mock_submit.call_args[0][0]
+            assert job.event["event_id"] == "event123"
+            assert job.event["summary"] == "Test Event"
+            assert job.details == {"event_id": "event123"}
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_poll_returns_events(self, mock_db):
+        """Test Calendar trigger source turns fetched events into dedupe-able events."""
+        mock_area = MagicMock()
+        mock_area.id = "area-id"
+        mock_area.user_id = "user-id"
+        mock_area.trigger_action = "event_created"
+        mock_area.trigger_params = {}
+        start = {"dateTime": "2030-01-01T10:00:00Z"}
+
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler._get_calendar_service",
+            return_value=MagicMock(),
+        ), patch(
+            "app.integrations.simple_plugins.calendar_scheduler._fetch_events",
+            return_value=[{"id": "evt1", "start": start}, {"id": "evt2", "start": start}],
+        ):
+            events = await CalendarTriggerSource().poll(
+                mock_db, [mock_area], datetime(2029, 12, 31, tzinfo=timezone.utc)
+            )
+
+        assert [event.event_id for event in events] == ["evt1", "evt2"]
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_fetches_once_per_user(self, mock_db):
+        """Test a user's Calendar areas share one service and one events listing."""
+        now = datetime(2030, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+        def _area(area_id, action, params=None):
+            area = MagicMock()
+            area.id = area_id
+            area.user_id = "user-id"
+            area.trigger_action = action
+            area.trigger_params = params or {}
+            return area
+
+        areas = [
+            _area("created", "event_created"),
+            _area("soon", "event_starting_soon", {"minutes_before": 10}),
+        ]
+        cal_events = [
+            {"id": "in-5-min", "start": {"dateTime": "2030-01-01T10:05:00Z"}},
+            {"id": "tomorrow", "start": {"date": "2030-01-02"}},
+        ]
+        source = CalendarTriggerSource()
+        assert source.group_key(areas[0]) == source.group_key(areas[1]) == "user-id"
+
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler._get_calendar_service",
+            return_value=MagicMock(),
+        ) as mock_get_service, patch(
+            "app.integrations.simple_plugins.calendar_scheduler._fetch_events",
+            return_value=cal_events,
+        ) as mock_fetch:
+            events = await source.poll(mock_db, areas, now)
+
+        mock_get_service.assert_called_once()
+        mock_fetch.assert_called_once()
+        args = mock_fetch.call_args[0]
+        assert args[2] == (now + timedelta(days=30)).isoformat()
+        assert args[3] == 100
+        assert [(event.area.id, event.event_id) for event in events] == [
+            ("created", "in-5-min"),
+            ("created", "tomorrow"),
+            ("soon", "in-5-min"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_poll_skips_revoked_token(self, mock_db):
+        """Test Calendar trigger source skips areas whose token was revoked."""
+        mock_area = MagicMock()
+        mock_area.trigger_action = "event_created"
+        mock_area.trigger_params = {}
+
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler._get_calendar_service",
+            side_effect=RefreshError("revoked"),
+        ):
+            events = await CalendarTriggerSource().poll(mock_db, [mock_area], datetime.now(timezone.utc))
+
+        assert events == []
+
+    def test_clear_calendar_seen_state(self, db_session):
+        """Test clearing the in-memory seen events cache keeps persisted IDs."""
+        from app.integrations.simple_plugins.calendar_scheduler import _seen_events
+        _seen_events.add(db_session, "test_area", ["event1", "event2"])
+
         clear_calendar_seen_state()
-        
-        # Verify it's empty
-        assert _last_seen_events == {}
-
-    def test_cleanup_old_seen_events(self):
-        """Test cleaning up old event IDs from memory."""
-        from app.integrations.simple_plugins.calendar_scheduler import _last_seen_events
-        # Add some dummy data to the global state with a large set
-        _last_seen_events.clear()
-        area_id = "test_area_1"
-        _last_seen_events[area_id] = {f"event{i}" for i in range(150)}  # More than 10 * max_age_hours (default 24)
-
-        # Run cleanup with max_age_hours=10, which means max_events_per_area = 100
-        removed_count = cleanup_old_seen_events(max_age_hours=10)
-
-        # Verify that events for that area were cleared
-        assert removed_count == 150
-        assert _last_seen_events[area_id] == set()  # Should be empty after cleanup
-
-    def test_cleanup_old_seen_events_no_cleanup_needed(self):
-        """Test that cleanup doesn't remove events when not needed."""
-        from app.integrations.simple_plugins.calendar_scheduler import _last_seen_events
-        # Add some dummy data to the global state with a small set
-        _last_seen_events.clear()
-        area_id = "test_area_2"
-        _last_seen_events[area_id] = {"event1", "event2", "event3"}  # Less than 10 * max_age_hours
-
-        # Run cleanup
-        removed_count = cleanup_old_seen_events(max_age_hours=10)
-
-        # Verify that nothing was removed
-        assert removed_count == 0
-        assert len(_last_seen_events[area_id]) == 3
\ No newline at end of file
+
+        assert _seen_events.unseen(db_session, "test_area", ["event1", "event3"]) == {"event3"}
+
+
+def _calendar_service(*pages):
+    """Build a Calendar service mock whose events.list returns pages in order."""
+    service = MagicMock()
+    service.events.return_value.list.return_value.execute.side_effect = list(pages)
+    return service
+
+
+def _list_calls(service) -> list[dict]:
+    return [call.kwargs for call in service.events.return_value.list.call_args_list]
+
+
+def _event(event_id, start, created="2030-01-01T09:00:00Z", status="confirmed"):
+    return {
+        "id": event_id,
+        "status": status,
+        "created": created,
+        "start": {"dateTime": start},
+    }
+
+
+class TestCalendarSyncTokens:
+    """Test incremental Google Calendar sync through sync tokens."""
+
+    NOW = datetime(2030, 1, 1, 10, 0, tzinfo=timezone.utc)
+    HORIZON = timedelta(hours=24)
+
+    @pytest.fixture(autouse=True)
+    def _clear_indexes(self):
+        clear_calendar_seen_state()
+        yield
+        clear_calendar_seen_state()
+
+    @pytest.fixture
+    def connection(self, db_session):
+        user = User(email="calendar-sync@example.com", hashed_password="test", is_confirmed=True)
+        db_session.add(user)
+        db_session.commit()
+        connection = ServiceConnection(
+            user_id=user.id,
+            service_name="google_calendar",
+            encrypted_access_token=encrypt_token("token"),
+        )
+        db_session.add(connection)
+        db_session.commit()
+        return connection
+
+    def _last_sync(self, db_session, connection, value, updated_at):
+        cursor = set_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR, value)
+        cursor.updated_at = updated_at
+        db_session.commit()
+
+    def test_first_sync_lists_index_and_records_token(self, db_session, connection):
+        service = _calendar_service(
+            {"items": [_event("soon", "2030-01-01T10:05:00Z")], "nextPageToken": "p2"},
+            {"items": [_event("later", "2030-01-01T18:00:00Z")], "nextSyncToken": "sync-1"},
+        )
+
+        created, upcoming = _sync_calendar(service, db_session, connection.user_id, self.NOW, self.HORIZON)
+
+        assert created == []
+        assert [cal_event["id"] for cal_event in upcoming] == ["soon", "later"]
+        calls = _list_calls(service)
+        assert calls[0]["timeMin"] == self.NOW.isoformat()
+        assert calls[0]["timeMax"] == (self.NOW + self.HORIZON).isoformat()
+        assert calls[1]["pageToken"] == "p2"
+        assert get_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR).value == "sync-1"
+
+    def test_incremental_sync_updates_index_and_reports_created(self, db_session, connection):
+        _sync_calendar(
+            _calendar_service({
+                "items": [
+                    _event("moved", "2030-01-01T10:05:00Z"),
+                    _event("cancelled", "2030-01-01T11:00:00Z"),
+                ],
+                "nextSyncToken": "sync-1",
+            }),
+            db_session, connection.user_id, self.NOW, self.HORIZON,
+        )
+        self._last_sync(db_session, connection, "sync-1", self.NOW)
+        service = _calendar_service({
+            "items": [
+                _event("moved", "2030-01-01T12:00:00Z", created="2029-06-01T00:00:00Z"),
+                {"id": "cancelled", "status": "cancelled"},
+                _event("new", "2030-01-01T10:10:00Z", created="2030-01-01T10:00:30Z"),
+            ],
+            "nextSyncToken": "sync-2",
+        })
+
+        created, upcoming = _sync_calendar(
+            service, db_session, connection.user_id, self.NOW + timedelta(minutes=1), self.HORIZON
+        )
+
+        assert [cal_event["id"] for cal_event in created] == ["new"]
+        assert [cal_event["id"] for cal_event in upcoming] == ["new", "moved"]
+        assert _list_calls(service) == [
+            {
+                "calendarId": "primary",
+                "singleEvents": True,
+                "maxResults": 250,
+                "pageToken": None,
+                "syncToken": "sync-1",
+            }
+        ]
+        assert get_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR).value == "sync-2"
+
+    def test_expired_sync_token_runs_full_resync(self, db_session, connection):
+        self._last_sync(db_session, connection, "sync-1", self.NOW - timedelta(minutes=1))
+        service = _calendar_service(
+            HttpError(resp=MagicMock(status=410), content=b"Sync token is no longer valid"),
+            {
+                "items": [
+                    _event("old", "2030-01-01T11:00:00Z", created="2029-12-01T00:00:00Z"),
+                    _event("new", "2030-01-01T12:00:00Z", created="2030-01-01T09:59:00Z"),
+                ],
+                "nextSyncToken": "sync-9",
+            },
+        )
+
+        created, upcoming = _sync_calendar(service, db_session, connection.user_id, self.NOW, self.HORIZON)
+
+        assert [cal_event["id"] for cal_event in created] == ["new"]
+        assert [cal_event["id"] for cal_event in upcoming] == ["old", "new"]
+        assert "timeMin" in _list_calls(service)[1]
+        assert get_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR).value == "sync-9"
+
+    def test_other_errors_propagate(self, db_session, connection):
+        self._last_sync(db_session, connection, "sync-1", self.NOW)
+        service = _calendar_service(HttpError(resp=MagicMock(status=503), content=b"unavailable"))
+
+        with pytest.raises(HttpError):
+            _sync_calendar(service, db_session, connection.user_id, self.NOW, self.HORIZON)
+
+        assert get_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR).value == "sync-1"
+
+    def test_index_is_relisted_when_half_the_horizon_passed(self, db_session, connection):
+        _sync_calendar(
+            _calendar_service({"items": [], "nextSyncToken": "sync-1"}),
+            db_session, connection.user_id, self.NOW, self.HORIZON,
+        )
+        later = self.NOW + timedelta(hours=13)
+        service = _calendar_service(
+            {"items": [], "nextSyncToken": "sync-2"},
+            {"items": [_event("next-day", "2030-01-02T08:00:00Z")], "nextSyncToken": "sync-3"},
+        )
+
+        _, upcoming = _sync_calendar(service, db_session, connection.user_id, later, self.HORIZON)
+
+        assert [cal_event["id"] for cal_event in upcoming] == ["next-day"]
+        assert _list_calls(service)[1]["timeMax"] == (later + self.HORIZON).isoformat()
+        assert get_sync_cursor(db_session, connection.id, CALENDAR_SYNC_CURSOR).value == "sync-3"
+
+    def test_sync_without_connection_returns_nothing(self, db_session):
+        service = _calendar_service()
+
+        assert _sync_calendar(service, db_session, uuid.uuid4(), self.NOW, self.HORIZON) == ([], [])
+        service.events.assert_not_called()
+
+    def test_events_that_started_leave_the_index(self, db_session, connection):
+        _sync_calendar(
+            _calendar_service({
+                "items": [
+                    _event("soon", "2030-01-01T10:05:00Z"),
+                    _event("later", "2030-01-01T18:00:00Z"),
+                ],
+                "nextSyncToken": "sync-1",
+            }),
+            db_session, connection.user_id, self.NOW, self.HORIZON,
+        )
+        self._last_sync(db_session, connection, "sync-1", self.NOW)
+
+        _, upcoming = _sync_calendar(
+            _calendar_service({"items": [], "nextSyncToken": "sync-2"}),
+            db_session, connection.user_id, self.NOW + timedelta(minutes=10), self.HORIZON,
+        )
+
+        assert [cal_event["id"] for cal_event in upcoming] == ["later"]
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_uses_sync_for_both_triggers(self, db_session):
+        def _area(area_id, action, params=None):
+            area = MagicMock()
+            area.id = area_id
+            area.user_id = "user-id"
+            area.trigger_action = action
+            area.trigger_params = params or {}
+            return area
+
+        areas = [
+            _area("created", "event_created"),
+            _area("soon", "event_starting_soon", {"minutes_before": 10}),
+        ]
+        created = [_event("new", "2030-01-03T10:00:00Z")]
+        upcoming = [
+            _event("in-5-min", "2030-01-01T10:05:00Z"),
+            _event("in-1-hour", "2030-01-01T11:00:00Z"),
+        ]
+
+        with patch(
+            "app.integrations.simple_plugins.calendar_scheduler._get_calendar_service",
+            return_value=MagicMock(),
+        ), patch.object(settings, "calendar_sync_tokens", True), patch(
+            "app.integrations.simple_plugins.calendar_scheduler._sync_calendar",
+            return_value=(created, upcoming),
+        ) as mock_sync, patch(
+            "app.integrations.simple_plugins.calendar_scheduler._fetch_events",
+        ) as mock_fetch:
+            source = CalendarTriggerSource()
+            events = await source.poll(db_session, areas, self.NOW)
+
+        mock_sync.assert_called_once()
+        mock_fetch.assert_not_called()
+        assert [(event.area.id, event.event_id) for event in events] == [
+            ("created", "new"),
+            ("soon", "in-5-min"),
+        ]
+        # The sync token marks where event_created areas start
+        assert source.seen.is_primed(db_session, "created")
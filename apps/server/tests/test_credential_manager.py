@@ -0,0 +1,214 @@
+"""Tests for the shared credential manager."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.encryption import decrypt_token, encrypt_token
+from app.integrations.oauth.base import OAuth2TokenSet
+from app.integrations.oauth.exceptions import OAuth2RefreshError
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.schemas.service_connection import ServiceConnectionUpdate
+from app.services.credential_manager import CredentialManager, credential_manager, refresh_with_provider
+from app.services.service_connections import (
+    delete_service_connection,
+    update_service_connection,
+)
+
+
+def _create_connection(db_session, expires_at=None, refresh_token="refresh") -> ServiceConnection:
+    user = User(email="credentials@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(
+        user_id=user.id,
+        service_name="outlook",
+        encrypted_access_token=encrypt_token("access"),
+        encrypted_refresh_token=encrypt_token(refresh_token) if refresh_token else None,
+        expires_at=expires_at,
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection
+
+
+def test_get_decrypts_once_and_caches(db_session):
+    connection = _create_connection(db_session)
+    manager = CredentialManager()
+
+    with patch(
+        "app.services.credential_manager.get_service_connection_by_user_and_service",
+        wraps=lambda db, user_id, service: connection,
+    ) as mock_lookup:
+        first = manager.get(db_session, connection.user_id, "outlook")
+        second = manager.get(db_session, connection.user_id, "outlook")
+
+    assert first is second
+    assert first.access_token == "access"
+    assert first.refresh_token == "refresh"
+    assert mock_lookup.call_count == 1
+
+
+def test_get_returns_none_without_connection(db_session):
+    assert CredentialManager().get(db_session, "00000000-0000-0000-0000-000000000000", "outlook") is None
+
+
+def test_expiring_tokens_are_not_cached(db_session):
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.credential_refresh_margin_seconds / 2)
+    connection = _create_connection(db_session, expires_at=expires_at)
+    manager = CredentialManager()
+
+    credentials = manager.get(db_session, connection.user_id, "outlook")
+
+    assert credentials.expired
+    assert manager.get(db_session, connection.user_id, "outlook") is not credentials
+
+
+def test_refresh_persists_new_tokens_once(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    manager = CredentialManager()
+    stale = manager.get(db_session, connection.user_id, "outlook")
+
+    refresher = lambda credentials: OAuth2TokenSet(
+        access_token="new-access", refresh_token="new-refresh", expires_in=3600
+    )
+    refreshed = manager.refresh(db_session, stale, refresher)
+
+    assert refreshed.access_token == "new-access"
+    assert not refreshed.expired
+    db_session.refresh(connection)
+    assert decrypt_token(connection.encrypted_access_token) == "new-access"
+    assert decrypt_token(connection.encrypted_refresh_token) == "new-refresh"
+    assert manager.get(db_session, connection.user_id, "outlook") is refreshed
+
+
+def test_concurrent_refreshes_are_coalesced(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    manager = CredentialManager()
+    stale = manager.get(db_session, connection.user_id, "outlook")
+    calls = []
+
+    def refresher(credentials):
+        calls.append(credentials)
+        time.sleep(0.05)
+        return OAuth2TokenSet(access_token="new-access", expires_in=3600)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.refresh(db_session, stale, refresher)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [result.access_token for result in results] == ["new-access"] * 5
+
+
+@pytest.mark.asyncio
+async def test_async_refreshes_await_the_provider_once(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    manager = CredentialManager()
+    stale = await manager.aget(db_session, connection.user_id, "outlook")
+    calls = []
+
+    async def refresh(credentials):
+        calls.append(credentials)
+        await asyncio.sleep(0.01)
+        return OAuth2TokenSet(access_token="new-access", expires_in=3600)
+
+    with patch("app.services.credential_manager.refresh_with_provider_async", side_effect=refresh), \
+         patch("app.services.credential_manager.refresh_with_provider", side_effect=AssertionError):
+        results = await asyncio.gather(*(manager.arefresh(db_session, stale) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert [result.access_token for result in results] == ["new-access"] * 5
+    assert await manager.aget(db_session, connection.user_id, "outlook") is results[0]
+
+
+@pytest.mark.asyncio
+async def test_thread_and_async_refreshes_are_coalesced(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    manager = CredentialManager()
+    stale = manager.get(db_session, connection.user_id, "outlook")
+    calls = []
+
+    def refresh(credentials):
+        calls.append("thread")
+        time.sleep(0.05)
+        return OAuth2TokenSet(access_token="new-access", expires_in=3600)
+
+    async def refresh_async(credentials):
+        calls.append("loop")
+        return OAuth2TokenSet(access_token="other-access", expires_in=3600)
+
+    with patch("app.services.credential_manager.refresh_with_provider", side_effect=refresh), \
+         patch("app.services.credential_manager.refresh_with_provider_async", side_effect=refresh_async):
+        thread = threading.Thread(target=manager.refresh, args=(db_session, stale))
+        thread.start()
+        await asyncio.sleep(0.01)
+        refreshed = await manager.arefresh(db_session, stale)
+        thread.join()
+
+    assert calls == ["thread"]
+    assert refreshed.access_token == "new-access"
+
+
+@pytest.mark.asyncio
+async def test_sync_provider_refresh_refuses_a_running_loop(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    stale = CredentialManager().get(db_session, connection.user_id, "outlook")
+
+    with pytest.raises(RuntimeError):
+        refresh_with_provider(stale)
+
+
+def test_refresh_adopts_token_refreshed_elsewhere(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc))
+    manager = CredentialManager()
+    stale = manager.get(db_session, connection.user_id, "outlook")
+
+    # Another replica refreshed and persisted the token in the meantime
+    connection.encrypted_access_token = encrypt_token("other-access")
+    connection.expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    db_session.commit()
+
+    refreshed = manager.refresh(db_session, stale, lambda credentials: pytest.fail("refreshed twice"))
+
+    assert refreshed.access_token == "other-access"
+
+
+def test_refresh_without_refresh_token_fails(db_session):
+    connection = _create_connection(db_session, expires_at=datetime.now(timezone.utc), refresh_token=None)
+    manager = CredentialManager()
+    stale = manager.get(db_session, connection.user_id, "outlook")
+
+    with pytest.raises(OAuth2RefreshError):
+        manager.refresh(db_session, stale, lambda credentials: pytest.fail("no refresh token"))
+
+
+def test_update_and_delete_invalidate_cache(db_session):
+    connection = _create_connection(db_session)
+    cached = credential_manager.get(db_session, connection.user_id, "outlook")
+
+    update_service_connection(
+        db_session,
+        str(connection.id),
+        ServiceConnectionUpdate(service_name="outlook", access_token="updated"),
+    )
+    updated = credential_manager.get(db_session, connection.user_id, "outlook")
+    assert updated is not cached
+    assert updated.access_token == "updated"
+
+    delete_service_connection(db_session, str(connection.id))
+    assert credential_manager.get(db_session, connection.user_id, "outlook") is None
@@ -0,0 +1,113 @@
+"""Tests for the shared Discord client and rate limiter."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from app.integrations.simple_plugins.discord_client import (
+    DiscordRateLimiter,
+    discord_request,
+    route_key,
+)
+
+CHANNEL = "123456789012345678"
+OTHER_CHANNEL = "223456789012345678"
+MESSAGE = "323456789012345678"
+
+
+def _response(status_code: int = 200, headers: dict | None = None, json: object = None) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers or {}, json=json if json is not None else [])
+
+
+class TestRouteKey:
+    def test_keeps_major_parameter_and_masks_other_ids(self):
+        assert route_key("get", f"/channels/{CHANNEL}/messages/{MESSAGE}") == (
+            f"GET /channels/{CHANNEL}/messages/:id"
+        )
+
+    def test_routes_without_major_parameter(self):
+        assert route_key("GET", f"/users/{MESSAGE}") == "GET /users/:id"
+
+
+class TestDiscordRateLimiter:
+    def test_bucket_is_shared_by_routes_reporting_it(self):
+        limiter = DiscordRateLimiter(global_limit=100)
+        send = route_key("POST", f"/channels/{CHANNEL}/messages")
+        read = route_key("GET", f"/channels/{CHANNEL}/messages")
+        headers = {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": "1",
+            "X-RateLimit-Reset-After": "2.5",
+        }
+        with patch("app.integrations.simple_plugins.discord_client.time.monotonic", return_value=10.0):
+            limiter.update(send, _response(headers=headers))
+            limiter.update(read, _response(headers=headers))
+
+        assert limiter.reserve(send, now=10.0) == 0.0
+        assert limiter.reserve(read, now=10.1) == pytest.approx(2.4)
+        assert limiter.reserve(read, now=12.5) == 0.0
+
+    def test_bucket_is_scoped_to_major_parameter(self):
+        limiter = DiscordRateLimiter(global_limit=100)
+        route = route_key("GET", f"/channels/{CHANNEL}/messages")
+        other = route_key("GET", f"/channels/{OTHER_CHANNEL}/messages")
+        headers = {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "5",
+        }
+        with patch("app.integrations.simple_plugins.discord_client.time.monotonic", return_value=0.0):
+            limiter.update(route, _response(headers=headers))
+
+        assert limiter.reserve(route, now=1.0) == pytest.approx(4.0)
+        assert limiter.reserve(other, now=1.0) == 0.0
+
+    def test_global_429_blocks_every_route(self):
+        limiter = DiscordRateLimiter(global_limit=100)
+        route = route_key("GET", f"/channels/{CHANNEL}/messages")
+        with patch("app.integrations.simple_plugins.discord_client.time.monotonic", return_value=0.0):
+            limiter.update(route, _response(429, json={"retry_after": 3.0, "global": True}))
+
+        assert limiter.reserve(route_key("POST", f"/guilds/{CHANNEL}/channels"), now=1.0) == pytest.approx(2.0)
+
+    def test_global_limit_caps_requests_per_second(self):
+        limiter = DiscordRateLimiter(global_limit=2)
+        route = route_key("GET", f"/channels/{CHANNEL}/messages")
+
+        assert limiter.reserve(route, now=0.0) == 0.0
+        assert limiter.reserve(route, now=0.1) == 0.0
+        assert limiter.reserve(route, now=0.5) == pytest.approx(0.5)
+        assert limiter.reserve(route, now=1.0) == 0.0
+
+
+class TestDiscordRequest:
+    @pytest.mark.asyncio
+    async def test_retries_rate_limited_request_after_reset(self):
+        client = Mock()
+        client.request.side_effect = [
+            _response(429, headers={"X-RateLimit-Bucket": "abc"}, json={"retry_after": 0.01, "global": False}),
+            _response(200, json=[{"id": MESSAGE}]),
+        ]
+        with patch(
+            "app.integrations.simple_plugins.discord_client.get_discord_client", return_value=client
+        ):
+            response = await discord_request("GET", f"/channels/{CHANNEL}/messages", "token")
+
+        assert response.status_code == 200
+        assert client.request.call_count == 2
+        assert client.request.call_args.kwargs["headers"]["Authorization"] == "Bot token"
+
+    @pytest.mark.asyncio
+    async def test_returns_last_429_once_retries_are_exhausted(self):
+        client = Mock()
+        client.request.return_value = _response(429, json={"retry_after": 0.0})
+        with patch(
+            "app.integrations.simple_plugins.discord_client.get_discord_client", return_value=client
+        ):
+            response = await discord_request("GET", f"/channels/{CHANNEL}/messages", "token", max_retries=0)
+
+        assert response.status_code == 429
+        client.request.assert_called_once()
@@ -44,7 +44,7 @@ class TestDiscordSendMessageHandler:
     async def test_send_message_success(self, mock_area, base_params, event_data):
         """Test successful message sending."""
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -52,14 +52,14 @@ class TestDiscordSendMessageHandler:
             
             mock_response = Mock()
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             # Should not raise any exception
             await send_message_handler(mock_area, base_params, event_data)
 
             # Verify the API call was made correctly
-            mock_client.return_value.__enter__.return_value.post.assert_called_once()
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            mock_client.return_value.request.assert_called_once()
+            call_args = mock_client.return_value.request.call_args
             
             assert "https://discord.com/api/v10/channels/123456789012345678/messages" in call_args[0]
             assert call_args[1]["headers"]["Authorization"] == "Bot test_bot_token"
@@ -71,7 +71,7 @@ class TestDiscordSendMessageHandler:
         base_params["message"] = "Hello {{data.value}}!"
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -79,13 +79,13 @@ class TestDiscordSendMessageHandler:
             
             mock_response = Mock()
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await send_message_handler(mock_area, base_params, event_data)
 
             # Verify variable resolution was called
             mock_resolve.assert_called()
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             assert call_args[1]["json"]["content"] == "Hello test_value!"
 
     @pytest.mark.asyncio
@@ -94,7 +94,7 @@ class TestDiscordSendMessageHandler:
         base_params["attachment_url"] = "https://example.com/image.png"
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -102,11 +102,11 @@ class TestDiscordSendMessageHandler:
             
             mock_response = Mock()
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await send_message_handler(mock_area, base_params, event_data)
 
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             payload = call_args[1]["json"]
             
             assert "embeds" in payload
@@ -118,7 +118,7 @@ class TestDiscordSendMessageHandler:
         base_params["attachment_url"] = "https://example.com/video.mp4"
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -126,11 +126,11 @@ class TestDiscordSendMessageHandler:
             
             mock_response = Mock()
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await send_message_handler(mock_area, base_params, event_data)
 
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             payload = call_args[1]["json"]
             
             assert "embeds" in payload
@@ -142,7 +142,7 @@ class TestDiscordSendMessageHandler:
         base_params["attachment_url"] = "https://example.com/document.pdf"
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -150,11 +150,11 @@ class TestDiscordSendMessageHandler:
             
             mock_response = Mock()
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await send_message_handler(mock_area, base_params, event_data)
 
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             payload = call_args[1]["json"]
             
             # Should include URL in message content instead of embed
@@ -216,7 +216,7 @@ class TestDiscordSendMessageHandler:
     async def test_send_message_http_error(self, mock_area, base_params, event_data):
         """Test send_message with HTTP error from Discord API."""
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -229,7 +229,7 @@ class TestDiscordSendMessageHandler:
                 response=Mock(text="Missing Access", status_code=403)
             )
             mock_response.text = "Missing Access"
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             with pytest.raises(httpx.HTTPStatusError):
                 await send_message_handler(mock_area, base_params, event_data)
@@ -266,7 +266,7 @@ class TestDiscordCreateChannelHandler:
     async def test_create_channel_success(self, mock_area, base_params, event_data):
         """Test successful channel creation."""
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -275,14 +275,14 @@ class TestDiscordCreateChannelHandler:
             mock_response = Mock()
             mock_response.json.return_value = {"id": "111111111", "name": "new-channel"}
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             # Should not raise any exception
             await create_channel_handler(mock_area, base_params, event_data)
 
             # Verify the API call was made correctly
-            mock_client.return_value.__enter__.return_value.post.assert_called_once()
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            mock_client.return_value.request.assert_called_once()
+            call_args = mock_client.return_value.request.call_args
             
             assert "https://discord.com/api/v10/guilds/123456789012345678/channels" in call_args[0]
             assert call_args[1]["headers"]["Authorization"] == "Bot test_bot_token"
@@ -295,7 +295,7 @@ class TestDiscordCreateChannelHandler:
         base_params["name"] = "{{data.channel_name}}"
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -304,13 +304,13 @@ class TestDiscordCreateChannelHandler:
             mock_response = Mock()
             mock_response.json.return_value = {"id": "111111111", "name": "dynamic-channel"}
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await create_channel_handler(mock_area, base_params, event_data)
 
             # Verify variable resolution was called
             mock_resolve.assert_called_once()
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             assert call_args[1]["json"]["name"] == "dynamic-channel"
 
     @pytest.mark.asyncio
@@ -319,7 +319,7 @@ class TestDiscordCreateChannelHandler:
         base_params["type"] = 2  # Voice channel
         
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -328,11 +328,11 @@ class TestDiscordCreateChannelHandler:
             mock_response = Mock()
             mock_response.json.return_value = {"id": "111111111", "name": "new-channel", "type": 2}
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             await create_channel_handler(mock_area, base_params, event_data)
 
-            call_args = mock_client.return_value.__enter__.return_value.post.call_args
+            call_args = mock_client.return_value.request.call_args
             assert call_args[1]["json"]["type"] == 2
 
     @pytest.mark.asyncio
@@ -390,7 +390,7 @@ class TestDiscordCreateChannelHandler:
     async def test_create_channel_http_error(self, mock_area, base_params, event_data):
         """Test create_channel with HTTP error from Discord API."""
         with patch("app.core.encryption.get_discord_bot_token") as mock_get_token, \
-             patch("app.integrations.simple_plugins.discord_plugin.httpx.Client") as mock_client, \
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client, \
              patch("app.services.variable_resolver.resolve_variables") as mock_resolve:
             
             mock_get_token.return_value = "test_bot_token"
@@ -403,7 +403,7 @@ class TestDiscordCreateChannelHandler:
                 response=Mock(text="Missing Permissions", status_code=403)
             )
             mock_response.text = "Missing Permissions"
-            mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             with pytest.raises(httpx.HTTPStatusError):
                 await create_channel_handler(mock_area, base_params, event_data)
@@ -12,15 +12,51 @@ from app.integrations.simple_plugins.discord_scheduler import (
     _extract_message_data,
     _fetch_due_discord_areas,
     _process_discord_trigger,
-    discord_scheduler_task,
-    start_discord_scheduler,
-    stop_discord_scheduler,
-    is_discord_scheduler_running,
+    _process_discord_reaction_trigger,
+    DiscordTriggerSource,
+    TTLCache,
     clear_discord_seen_state,
 )
+from app.integrations.simple_plugins.polling_engine import PollingEngine, default_trigger_sources
 from app.models.area import Area
 
 
+class TestTTLCache:
+    """Test the seen messages/reactions TTL cache."""
+
+    def test_expired_entries_are_dropped_from_the_head(self):
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        with patch("app.integrations.simple_plugins.discord_scheduler.time.monotonic", return_value=0.0):
+            cache.add("area-1:m1")
+            cache.add("area-1:m2")
+        with patch("app.integrations.simple_plugins.discord_scheduler.time.monotonic", return_value=30.0):
+            cache.add("area-1:m1")
+        with patch("app.integrations.simple_plugins.discord_scheduler.time.monotonic", return_value=70.0):
+            cache.add("area-2:m3")
+
+            assert list(cache.cache) == ["area-1:m1", "area-2:m3"]
+            assert cache.contains("area-1:m1")
+            assert not cache.contains("area-1:m2")
+
+    def test_size_bound_evicts_oldest(self):
+        cache = TTLCache(max_size=2)
+        for key in ("area-1:m1", "area-1:m2", "area-1:m3"):
+            cache.add(key)
+
+        assert not cache.contains("area-1:m1")
+        assert cache.get_cache_size() == 2
+
+    def test_remove_area_cache_only_touches_that_area(self):
+        cache = TTLCache(max_size=10)
+        cache.set_area_entries("area-1", {"m1", "m2"})
+        cache.add("area-10:m1")
+
+        cache.remove_area_cache("area-1")
+
+        assert list(cache.cache) == ["area-10:m1"]
+        assert cache._keys_by_area == {"area-10": {"area-10:m1"}}
+
+
 class TestFetchChannelMessages:
     """Test _fetch_channel_messages function."""
 
@@ -28,7 +64,7 @@ class TestFetchChannelMessages:
     async def test_fetch_messages_success(self):
         """Test successful message fetching from Discord."""
         with patch("app.core.config.settings") as mock_settings, \
-             patch("app.integrations.simple_plugins.discord_scheduler.httpx.Client") as mock_client:
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client:
             
             mock_settings.discord_bot_token = "test_bot_token"
             
@@ -43,7 +79,7 @@ class TestFetchChannelMessages:
                 }
             ]
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             messages = await _fetch_channel_messages("123456789012345678")
 
@@ -65,13 +101,13 @@ class TestFetchChannelMessages:
     async def test_fetch_messages_http_error(self):
         """Test handling HTTP error when fetching messages."""
         with patch("app.core.config.settings") as mock_settings, \
-             patch("app.integrations.simple_plugins.discord_scheduler.httpx.Client") as mock_client:
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client:
             
             mock_settings.discord_bot_token = "test_bot_token"
             
             # Make the get method raise an HTTPError
             import httpx
-            mock_client.return_value.__enter__.return_value.get.side_effect = \
+            mock_client.return_value.request.side_effect = \
                 httpx.HTTPError("Network error")
 
             messages = await _fetch_channel_messages("123456789012345678")
@@ -184,7 +220,7 @@ class TestProcessDiscordTrigger:
 
     @pytest.mark.asyncio
     async def test_process_trigger_success(self):
-        """Test successful processing of Discord trigger."""
+        """Test successful processing of Discord trigger queues an execution job."""
         from uuid import uuid4
         
         mock_db = Mock()
@@ -214,28 +250,24 @@ class TestProcessDiscordTrigger:
 
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.discord_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.discord_scheduler.execute_area") as mock_execute:
-            
-            mock_execution_log = Mock()
-            mock_create_log.return_value = mock_execution_log
-            
-            mock_execute.return_value = {
-                "status": "success",
-                "steps_executed": 2,
-                "execution_log": []
-            }
-
+        with patch(
+            "app.integrations.simple_plugins.discord_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
             await _process_discord_trigger(mock_db, mock_area, message, now)
 
-            # Verify execution log was created and updated
-            mock_create_log.assert_called_once()
-            assert mock_execution_log.status == "Success"
-            mock_db.commit.assert_called()
+            mock_submit.assert_awaited_once()
+            job = mock_submit.call_args[0][0]
+            assert job.area_id == str(mock_area.id)
+            assert job.source == "Discord"
+            assert job.trigger_data["discord.message.content"] == "Test message"
+            assert job.trigger_data["discord.author.username"] == "testuser"
+            assert job.event["content_preview"] == "Test message"
+            assert job.details == {"message_id": "msg123"}
 
     @pytest.mark.asyncio
-    async def test_process_trigger_execution_failure(self):
-        """Test processing trigger when area execution fails."""
+    async def test_process_reaction_trigger_success(self):
+        """Test processing of a Discord reaction trigger queues an execution job."""
         from uuid import uuid4
         
         mock_db = Mock()
@@ -246,48 +278,43 @@ class TestProcessDiscordTrigger:
         
         mock_db.merge.return_value = mock_area
         
-        message = {
-            "id": "msg123",
-            "channel_id": "channel456",
-            "content": "Test",
-            "timestamp": "2023-01-01T00:00:00.000000+00:00",
-            "author": {"id": "user789", "username": "testuser", "bot": False},
-            "mentions": [],
-            "attachments": [],
-            "embeds": []
-        }
-
+        reaction = {"emoji": {"name": "👍", "id": None}, "count": 2}
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.discord_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.discord_scheduler.execute_area") as mock_execute:
-            
-            mock_execution_log = Mock()
-            mock_create_log.return_value = mock_execution_log
-            
-            mock_execute.side_effect = Exception("Execution failed")
-
-            # Should not raise exception
-            await _process_discord_trigger(mock_db, mock_area, message, now)
+        with patch(
+            "app.integrations.simple_plugins.discord_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
+            await _process_discord_reaction_trigger(
+                mock_db, mock_area, reaction, "msg123", "channel456", now
+            )
 
-            # Verify execution log was updated with failure
-            assert mock_execution_log.status == "Failed"
-            assert "Execution failed" in mock_execution_log.error_message
+            job = mock_submit.call_args[0][0]
+            assert job.source == "Discord reaction"
+            assert job.trigger_data["discord.reaction.message_id"] == "msg123"
+            assert job.trigger_data["discord.reaction.emoji_name"] == "👍"
+            assert job.details == {"message_id": "msg123", "emoji": "👍"}
 
 
 class TestDiscordSchedulerLifecycle:
     """Test Discord scheduler lifecycle functions."""
 
-    def test_start_discord_scheduler(self):
-        """Test starting the Discord scheduler."""
-        clear_discord_seen_state()
-        stop_discord_scheduler()  # Ensure stopped first
-        
-        # We can't easily test the actual scheduler in unit tests without a running event loop
-        # So we just verify the functions exist and don't crash
-        assert callable(start_discord_scheduler)
-        assert callable(stop_discord_scheduler)
-        assert callable(is_discord_scheduler_running)
+    def test_trigger_source_is_registered(self):
+        """Test the Discord trigger source is polled by the default engine."""
+        sources = default_trigger_sources()
+        assert any(isinstance(source, DiscordTriggerSource) for source in sources)
+
+    def test_after_tick_cleans_caches_periodically(self):
+        """Test the source prunes expired cache entries every cleanup period."""
+        source = DiscordTriggerSource()
+        with patch(
+            "app.integrations.simple_plugins.discord_scheduler.cleanup_discord_scheduler_caches"
+        ) as mock_cleanup:
+            for _ in range(source.cleanup_every_ticks - 1):
+                source.after_tick()
+            mock_cleanup.assert_not_called()
+            source.after_tick()
+            mock_cleanup.assert_called_once()
 
     def test_clear_discord_seen_state(self):
         """Test clearing Discord seen state."""
@@ -296,50 +323,12 @@ class TestDiscordSchedulerLifecycle:
 
 
 class TestDiscordSchedulerTask:
-    """Test discord_scheduler_task main loop."""
+    """Test Discord polling through the polling engine."""
 
-    @pytest.mark.asyncio
-    async def test_scheduler_task_cancellation(self):
-        """Test that scheduler task handles cancellation gracefully."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-            
-            # Make sleep raise CancelledError after first call
-            mock_sleep.side_effect = asyncio.CancelledError()
-
-            # Should not raise exception, but exit gracefully
-            await discord_scheduler_task()
-
-            # Verify sleep was called
-            mock_sleep.assert_called()
-
-    @pytest.mark.asyncio
-    async def test_scheduler_task_handles_errors(self):
-        """Test that scheduler task handles errors and continues."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-            
-            # Setup sleep side effects: first for regular polling, second for error backoff, third to cancel
-            mock_sleep.side_effect = [
-                None,  # First sleep (regular polling interval)
-                None,  # Second sleep (error backoff)
-                asyncio.CancelledError()  # Third sleep stops the loop
-            ]
-            
-            mock_db = Mock()
-            mock_db.__enter__ = Mock(return_value=mock_db)
-            mock_db.__exit__ = Mock(return_value=None)
-            mock_session.return_value = mock_db
-            
-            # Make _fetch_due_discord_areas raise error
-            with patch("app.integrations.simple_plugins.discord_scheduler._fetch_due_discord_areas") as mock_fetch:
-                mock_fetch.side_effect = Exception("Database error")
-
-                # Should not raise exception
-                await discord_scheduler_task()
-
-                # Verify error was handled and backoff was called
-                assert mock_sleep.call_count == 3
+    @staticmethod
+    async def _run_tick() -> None:
+        source = DiscordTriggerSource()
+        await PollingEngine([source]).run_source(source)
 
     @pytest.mark.asyncio
     async def test_scheduler_processes_areas_with_new_message(self):
@@ -374,14 +363,10 @@ class TestDiscordSchedulerTask:
         area_id_str = str(area_id)
 
         with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_due_discord_areas") as mock_fetch, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_channel_messages") as mock_messages, \
              patch("app.integrations.simple_plugins.discord_scheduler._process_discord_trigger") as mock_process:
             
-            # First sleep returns immediately, second sleep cancels
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            
             mock_db = Mock()
             mock_db.__enter__ = Mock(return_value=mock_db)
             mock_db.__exit__ = Mock(return_value=None)
@@ -408,7 +393,7 @@ class TestDiscordSchedulerTask:
             
             mock_messages.return_value = [existing_message_in_cache, message]
 
-            await discord_scheduler_task()
+            await self._run_tick()
 
             # Verify that the new message (not in cache) was processed
             # Since existing_message_in_cache is in cache, only the new message should be processed
@@ -429,13 +414,10 @@ class TestDiscordSchedulerTask:
         mock_area.trigger_params = {}  # Missing channel_id
 
         with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_due_discord_areas") as mock_fetch, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_channel_messages") as mock_messages, \
              patch("app.integrations.simple_plugins.discord_scheduler._process_discord_trigger") as mock_process:
             
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            
             mock_db = Mock()
             mock_db.__enter__ = Mock(return_value=mock_db)
             mock_db.__exit__ = Mock(return_value=None)
@@ -443,7 +425,7 @@ class TestDiscordSchedulerTask:
             
             mock_fetch.return_value = [mock_area]
 
-            await discord_scheduler_task()
+            await self._run_tick()
 
             # Verify messages were not fetched and area was not processed
             mock_messages.assert_not_called()
@@ -496,14 +478,10 @@ class TestDiscordSchedulerTask:
         area_id_str = str(area_id)
         
         with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_due_discord_areas") as mock_fetch, \
              patch("app.integrations.simple_plugins.discord_scheduler._fetch_channel_messages") as mock_messages, \
              patch("app.integrations.simple_plugins.discord_scheduler._process_discord_trigger") as mock_process:
             
-            # First sleep returns immediately, second sleep cancels
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            
             mock_db = Mock()
             mock_db.__enter__ = Mock(return_value=mock_db)
             mock_db.__exit__ = Mock(return_value=None)
@@ -529,7 +507,7 @@ class TestDiscordSchedulerTask:
             # Return the existing cached message, plus the bot and human messages
             mock_messages.return_value = [existing_message_in_cache, bot_message, human_message]
 
-            await discord_scheduler_task()
+            await self._run_tick()
 
             # Verify only the human message was processed (bot message filtered out)
             assert mock_process.call_count == 1
@@ -645,7 +623,7 @@ class TestFetchMessageReactions:
         from app.integrations.simple_plugins.discord_scheduler import _fetch_message_reactions
         
         with patch("app.core.config.settings") as mock_settings, \
-             patch("app.integrations.simple_plugins.discord_scheduler.httpx.Client") as mock_client:
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client:
             
             mock_settings.discord_bot_token = "test_bot_token"
             
@@ -666,7 +644,7 @@ class TestFetchMessageReactions:
                 ]
             }
             mock_response.raise_for_status = Mock()
-            mock_client.return_value.__enter__.return_value.get.return_value = mock_response
+            mock_client.return_value.request.return_value = mock_response
 
             reactions = await _fetch_message_reactions("123456789012345678", "123456789012345678")
 
@@ -695,10 +673,10 @@ class TestFetchMessageReactions:
         import httpx
         
         with patch("app.core.config.settings") as mock_settings, \
-             patch("app.integrations.simple_plugins.discord_scheduler.httpx.Client") as mock_client:
+             patch("app.integrations.simple_plugins.discord_client.get_discord_client") as mock_client:
             
             mock_settings.discord_bot_token = "test_bot_token"
-            mock_client.return_value.__enter__.return_value.get.side_effect = httpx.HTTPError("Network error")
+            mock_client.return_value.request.side_effect = httpx.HTTPError("Network error")
             
             reactions = await _fetch_message_reactions("123456789012345678", "123456789012345678")
             
@@ -747,3 +725,90 @@ class TestExtractReactionData:
         assert result["emoji_animated"] == True
         assert result["count"] == 3
         assert result["me"] == True
+
+
+class TestDiscordChannelCursors:
+    """Test per-channel cursors and fan-out of channel polls."""
+
+    CHANNEL = "123456789012345678"
+
+    @classmethod
+    def _area(cls, trigger_action: str = "new_message_in_channel", **params) -> Mock:
+        from uuid import uuid4
+
+        area = Mock(spec=Area)
+        area.id = uuid4()
+        area.user_id = uuid4()
+        area.trigger_action = trigger_action
+        area.trigger_params = {"channel_id": cls.CHANNEL, **params}
+        return area
+
+    @staticmethod
+    def _message(message_id: int, bot: bool = False) -> dict:
+        return {"id": str(message_id), "content": f"m{message_id}", "author": {"id": "u", "bot": bot}}
+
+    def test_areas_of_a_channel_share_a_group(self):
+        source = DiscordTriggerSource()
+        first, second = self._area(), self._area()
+        reaction = self._area("reaction_added", message_id="223456789012345678")
+
+        assert source.group_key(first) == source.group_key(second) == self.CHANNEL
+        assert source.group_key(reaction) == f"{self.CHANNEL}:223456789012345678"
+
+    @pytest.mark.asyncio
+    async def test_channel_is_read_once_from_its_cursor_and_fanned_out(self):
+        source = DiscordTriggerSource()
+        first, second = self._area(), self._area()
+        fetched = [
+            [self._message(100000000000000002), self._message(100000000000000001)],
+            [self._message(100000000000000004, bot=True), self._message(100000000000000003)],
+        ]
+
+        with patch(
+            "app.integrations.simple_plugins.discord_scheduler._fetch_channel_messages",
+            side_effect=fetched,
+        ) as mock_fetch:
+            assert await source.poll(Mock(), [first, second], datetime.now(timezone.utc)) == []
+            events = await source.poll(Mock(), [first, second], datetime.now(timezone.utc))
+
+        assert mock_fetch.call_count == 2
+        assert mock_fetch.call_args_list[0].kwargs == {"after": None}
+        assert mock_fetch.call_args_list[1].kwargs == {"after": "100000000000000002"}
+        assert [(event.area, event.payload["message"]["id"]) for event in events] == [
+            (first, "100000000000000003"),
+            (second, "100000000000000003"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_area_joining_a_polled_channel_is_primed(self):
+        source = DiscordTriggerSource()
+        first, late = self._area(), self._area()
+        fetched = [[self._message(100000000000000001)], [self._message(100000000000000002)]]
+
+        with patch(
+            "app.integrations.simple_plugins.discord_scheduler._fetch_channel_messages",
+            side_effect=fetched,
+        ):
+            await source.poll(Mock(), [first], datetime.now(timezone.utc))
+            events = await source.poll(Mock(), [first, late], datetime.now(timezone.utc))
+
+        assert [event.area for event in events] == [first]
+
+    @pytest.mark.asyncio
+    async def test_fetch_after_cursor_pages_until_caught_up(self):
+        from app.integrations.simple_plugins import discord_scheduler
+
+        full_page = [self._message(100000000000000100 + i) for i in range(100)]
+        last_page = [self._message(100000000000000300)]
+        responses = [Mock(json=Mock(return_value=full_page)), Mock(json=Mock(return_value=last_page))]
+
+        with patch("app.core.encryption.get_discord_bot_token", return_value="token"), \
+             patch.object(discord_scheduler, "discord_request", AsyncMock(side_effect=responses)) as mock_request:
+            messages = await _fetch_channel_messages(self.CHANNEL, after="100000000000000099")
+
+        assert [call.kwargs["params"]["after"] for call in mock_request.call_args_list] == [
+            "100000000000000099",
+            "100000000000000199",
+        ]
+        assert len(messages) == 101
+        assert messages[0]["id"] == "100000000000000300"
@@ -0,0 +1,141 @@
+"""Tests for compiled area execution plans."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.execution_plan import ExecutionPlanCache, compile_plan
+
+_T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _step(step_type="action", targets=None, else_branch=None, step_id=None):
+    config = {}
+    if targets is not None:
+        config["targets"] = targets
+    if else_branch is not None:
+        config["elseBranch"] = else_branch
+    return SimpleNamespace(id=step_id or uuid.uuid4(), step_type=step_type, config=config, updated_at=_T0)
+
+
+def _area(steps):
+    return SimpleNamespace(id=uuid.uuid4(), steps=steps, updated_at=_T0)
+
+
+class TestCompilePlan:
+    """Test step graph compilation."""
+
+    def test_edges_are_resolved_to_positions(self):
+        action, other = _step(), _step()
+        condition = _step("condition", targets=[str(action.id)], else_branch=[other.id, "missing"])
+        trigger = _step("trigger", targets=[str(condition.id)])
+
+        plan = compile_plan(_area([action, other, condition, trigger]))
+
+        assert plan.entry == 3
+        assert plan.edges(3) == ((str(condition.id), 2),)
+        assert plan.edges(2, "true") == ((str(action.id), 0),)
+        assert plan.edges(2, "false") == ((str(other.id), 1), ("missing", None))
+        assert plan.edges(0) == ()
+        assert not plan.has_cycle
+
+    def test_entry_defaults_to_first_step(self):
+        assert compile_plan(_area([_step(), _step()])).entry == 0
+        assert compile_plan(_area([])).entry is None
+
+    def test_cycles_are_detected(self):
+        first, second = _step(step_id="a"), _step(step_id="b")
+        first.config["targets"] = ["b"]
+        second.config["elseBranch"] = ["a"]
+        diamond_end = _step()
+        diamond = [
+            _step("trigger", targets=["l", "r"]),
+            _step(step_id="l", targets=[str(diamond_end.id)]),
+            _step(step_id="r", targets=[str(diamond_end.id)]),
+            diamond_end,
+        ]
+
+        assert compile_plan(_area([first, second])).has_cycle
+        assert compile_plan(_area([_step(step_id="s", targets=["s"])])).has_cycle
+        assert not compile_plan(_area(diamond)).has_cycle
+
+
+class TestExecutionPlanCache:
+    """Test the shared plan LRU."""
+
+    def test_plan_is_reused_until_area_or_step_changes(self):
+        step = _step("trigger")
+        area = _area([step])
+        cache = ExecutionPlanCache(max_entries=10)
+
+        plan = cache.get(area)
+        assert cache.get(area) is plan
+
+        step.updated_at = _T0 + timedelta(seconds=1)
+        step.config["targets"] = ["x"]
+        changed = cache.get(area)
+        assert changed is not plan
+        assert changed.edges(0) == (("x", None),)
+
+        area.updated_at = _T0 + timedelta(seconds=2)
+        assert cache.get(area) is not changed
+        assert len(cache) == 1
+
+    def test_least_recently_used_plans_are_evicted(self):
+        cache = ExecutionPlanCache(max_entries=2)
+        first, second, third = (_area([_step()]) for _ in range(3))
+
+        plan = cache.get(first)
+        cache.get(second)
+        cache.get(first)
+        cache.get(third)
+
+        assert len(cache) == 2
+        assert cache.get(first) is plan
+        cache.invalidate(first.id)
+        assert cache.get(first) is not plan
+
+
+class TestIndependentBranches:
+    """Test detection of fan-outs that can run concurrently."""
+
+    def test_disjoint_branches_are_independent(self):
+        leaf = _step(step_id="leaf")
+        steps = [
+            _step("trigger", targets=["a", "b", "missing"]),
+            _step(step_id="a", targets=["leaf"]),
+            _step(step_id="b"),
+            leaf,
+        ]
+
+        plan = compile_plan(_area(steps))
+
+        assert plan.is_independent(0)
+        assert not plan.is_independent(1)
+
+    def test_branches_reaching_a_common_step_are_not_independent(self):
+        steps = [
+            _step("trigger", targets=["a", "b"]),
+            _step(step_id="a", targets=["join"]),
+            _step("condition", step_id="b", targets=[], else_branch=["join"]),
+            _step(step_id="join"),
+        ]
+        duplicate = [_step("trigger", targets=["a", "a"]), _step(step_id="a")]
+
+        assert not compile_plan(_area(steps)).is_independent(0)
+        assert not compile_plan(_area(duplicate)).is_independent(0)
+
+    def test_else_branch_is_checked_separately(self):
+        steps = [
+            _step("condition", targets=["a"], else_branch=["b", "c"]),
+            _step(step_id="a"),
+            _step(step_id="b"),
+            _step(step_id="c"),
+        ]
+
+        plan = compile_plan(_area(steps))
+
+        assert not plan.is_independent(0, "true")
+        assert plan.is_independent(0, "false")
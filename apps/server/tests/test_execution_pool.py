@@ -0,0 +1,212 @@
+"""Tests for the shared area execution pool."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.orm import Session
+
+from app.models.area import Area
+from app.models.execution_log import ExecutionLog
+from app.models.user import User
+from app.services.execution_pool import (
+    AreaExecutionPool,
+    ExecutionJob,
+    get_execution_pool,
+    is_execution_pool_running,
+    run_execution_job,
+    stop_execution_pool,
+    submit_execution_job,
+)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _stop_execution_pool():
+    yield
+    stop_execution_pool()
+    await asyncio.sleep(0)
+
+
+def _create_area(db_session: Session, enabled: bool = True) -> Area:
+    user = User(email=f"{uuid.uuid4()}@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    area = Area(
+        user_id=user.id,
+        name="Pool Area",
+        enabled=enabled,
+        trigger_service="time",
+        trigger_action="every_interval",
+        reaction_service="debug",
+        reaction_action="log",
+    )
+    db_session.add(area)
+    db_session.commit()
+    return area
+
+
+def _job(area_id: str) -> ExecutionJob:
+    return ExecutionJob(
+        area_id=area_id,
+        trigger_data={"area_id": area_id},
+        source="Gmail",
+        event={"message_id": "msg123"},
+        details={"message_id": "msg123"},
+    )
+
+
+class TestRunExecutionJob:
+    """Test the per-job runner."""
+
+    def test_success_updates_execution_log(self, db_session: Session):
+        area_id = _create_area(db_session).id
+
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.step_executor.execute_area_async") as mock_execute:
+            mock_execute.return_value = {"status": "success", "steps_executed": 2, "execution_log": []}
+            run_execution_job(_job(str(area_id)))
+
+        log = db_session.query(ExecutionLog).filter(ExecutionLog.area_id == area_id).one()
+        assert log.status == "Success"
+        assert log.output == "Gmail trigger executed: 2 step(s)"
+        assert log.step_details["message_id"] == "msg123"
+        assert mock_execute.call_args[0][2] == {"area_id": str(area_id)}
+
+    def test_failure_marks_execution_log_failed(self, db_session: Session):
+        area_id = _create_area(db_session).id
+
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.step_executor.execute_area_async", side_effect=Exception("boom")):
+            run_execution_job(_job(str(area_id)))
+
+        log = db_session.query(ExecutionLog).filter(ExecutionLog.area_id == area_id).one()
+        assert log.status == "Failed"
+        assert log.error_message == "boom"
+
+    def test_area_and_steps_stay_loaded_for_the_event_loop(self, db_session: Session):
+        """The executor gets an area it can read without querying on the loop."""
+        from sqlalchemy import inspect as sa_inspect
+
+        area_id = _create_area(db_session).id
+        db_session.expire_all()
+        loaded = {}
+
+        def session_factory(**kwargs):
+            db_session.expire_on_commit = kwargs.get("expire_on_commit", True)
+            return db_session
+
+        async def execute(db, area, trigger_data):
+            state = sa_inspect(area)
+            loaded["expired"] = set(state.expired_attributes)
+            loaded["unloaded"] = set(state.unloaded)
+            return {"status": "success", "steps_executed": 0, "execution_log": []}
+
+        with patch("app.db.session.SessionLocal", side_effect=session_factory), \
+             patch("app.services.step_executor.execute_area_async", side_effect=execute):
+            run_execution_job(_job(str(area_id)))
+
+        assert loaded["expired"] == set()
+        assert "steps" not in loaded["unloaded"]
+
+    def test_disabled_area_is_skipped(self, db_session: Session):
+        area_id = _create_area(db_session, enabled=False).id
+
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.step_executor.execute_area_async") as mock_execute:
+            run_execution_job(_job(str(area_id)))
+
+        mock_execute.assert_not_called()
+        assert db_session.query(ExecutionLog).count() == 0
+
+
+class TestAreaExecutionPool:
+    """Test queueing, concurrency and stats."""
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_concurrently_up_to_worker_count(self):
+        pool = AreaExecutionPool(workers=2, queue_size=10)
+        pool.start()
+
+        release = asyncio.Event()
+        running = []
+        peak = []
+
+        async def _slow_job(job):
+            running.append(job.area_id)
+            peak.append(len(running))
+            await asyncio.wait_for(release.wait(), timeout=2)
+            running.remove(job.area_id)
+
+        with patch("app.services.execution_pool.run_execution_job_async", side_effect=_slow_job):
+            for i in range(4):
+                await pool.submit(_job(f"area-{i}"))
+
+            await asyncio.sleep(0.1)
+            stats = pool.stats()
+            assert stats["busy_workers"] == 2
+            assert stats["saturation"] == 1.0
+            assert stats["queue_depth"] == 2
+
+            release.set()
+            await asyncio.wait_for(pool.join(), timeout=2)
+
+        assert max(peak) == 2
+        stats = pool.stats()
+        assert stats["completed"] == 4
+        assert stats["queue_depth"] == 0
+        pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_try_submit_rejects_when_queue_full(self):
+        pool = AreaExecutionPool(workers=1, queue_size=1)
+        release = asyncio.Event()
+
+        async def _blocked_job(job):
+            await asyncio.wait_for(release.wait(), timeout=2)
+
+        with patch("app.services.execution_pool.run_execution_job_async", side_effect=_blocked_job):
+            pool.start()
+            assert pool.try_submit(_job("a")) is True
+            await asyncio.sleep(0.05)  # Worker picks up the first job
+            assert pool.try_submit(_job("b")) is True
+            assert pool.try_submit(_job("c")) is False
+            assert pool.stats()["rejected"] == 1
+            release.set()
+            await asyncio.wait_for(pool.join(), timeout=2)
+        pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_job_errors(self):
+        pool = AreaExecutionPool(workers=1, queue_size=5)
+        pool.start()
+
+        with patch("app.services.execution_pool.run_execution_job_async", side_effect=[RuntimeError("x"), None]):
+            await pool.submit(_job("a"))
+            await pool.submit(_job("b"))
+            await asyncio.wait_for(pool.join(), timeout=2)
+
+        stats = pool.stats()
+        assert stats["failed"] == 1
+        assert stats["completed"] == 1
+        pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_execution_job_starts_pool_lazily(self):
+        stop_execution_pool()
+        assert not is_execution_pool_running()
+
+        with patch("app.services.execution_pool.run_execution_job_async") as mock_run:
+            await submit_execution_job(_job("a"))
+            await asyncio.wait_for(get_execution_pool().join(), timeout=2)
+
+        assert is_execution_pool_running()
+        mock_run.assert_called_once()
+
+    def test_submit_requires_running_pool(self):
+        pool = AreaExecutionPool(workers=1, queue_size=1)
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.submit(_job("a")))
@@ -0,0 +1,181 @@
+"""Tests for GitHub scheduler conditional polling and per-repository fan-out."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.integrations.simple_plugins import github_scheduler
+from app.integrations.simple_plugins.github_scheduler import (
+    GitHubTriggerSource,
+    _can_read_repo,
+    _make_github_request,
+    clear_github_seen_state,
+)
+
+
+@pytest.fixture
+def github_api(monkeypatch):
+    """Route the scheduler's HTTP clients to queued fake GitHub responses."""
+    clear_github_seen_state()
+    requests: list[httpx.Request] = []
+    responses: list[httpx.Response] = []
+    clients: list[httpx.AsyncClient] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses.pop(0)
+
+    real_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(github_scheduler.httpx, "AsyncClient", client_factory)
+    yield requests, responses, clients
+    clear_github_seen_state()
+
+
+def _response(status_code=200, json=None, **headers) -> httpx.Response:
+    return httpx.Response(status_code, json=json, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_not_modified_returns_cached_body(github_api):
+    requests, responses, _ = github_api
+    responses.extend([
+        _response(json=[{"id": 1}], ETag='"v1"', **{"Last-Modified": "Mon, 03 Nov 2025 09:00:00 GMT"}),
+        _response(304),
+    ])
+
+    first = await _make_github_request("GET", "/repos/o/r/issues", "token", params={"per_page": 10})
+    second = await _make_github_request("GET", "/repos/o/r/issues", "token", params={"per_page": 10})
+
+    assert first == second == [{"id": 1}]
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert requests[1].headers["If-Modified-Since"] == "Mon, 03 Nov 2025 09:00:00 GMT"
+    assert requests[1].headers["Authorization"] == "Bearer token"
+
+
+@pytest.mark.asyncio
+async def test_validators_are_kept_per_token(github_api):
+    requests, responses, clients = github_api
+    responses.extend([
+        _response(json=[{"id": 1}], ETag='"v1"'),
+        _response(json=[{"id": 2}], ETag='"v2"'),
+        _response(304),
+    ])
+
+    await _make_github_request("GET", "/repos/o/r/pulls", "token-a")
+    assert await _make_github_request("GET", "/repos/o/r/pulls", "token-b") == [{"id": 2}]
+    await _make_github_request("GET", "/repos/o/r/pulls", "token-a")
+
+    assert "If-None-Match" not in requests[1].headers
+    assert requests[2].headers["If-None-Match"] == '"v1"'
+    # One long-lived client per token
+    assert len(clients) == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_is_honoured(github_api):
+    requests, responses, _ = github_api
+    responses.append(_response(json=[{"id": "e1"}], ETag='"v1"', **{"X-Poll-Interval": "60"}))
+
+    await _make_github_request("GET", "/repos/o/r/events", "token")
+    assert await _make_github_request("GET", "/repos/o/r/events", "token") == [{"id": "e1"}]
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_pauses_when_rate_limit_runs_low(github_api):
+    requests, responses, _ = github_api
+    reset = str(int(time.time()) + 600)
+    responses.append(_response(
+        json=[{"id": 1}],
+        ETag='"v1"',
+        **{"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": reset},
+    ))
+
+    with patch.object(settings, "github_rate_limit_reserve", 10):
+        await _make_github_request("GET", "/repos/o/r/issues", "token")
+        cached = await _make_github_request("GET", "/repos/o/r/issues", "token")
+        uncached = await _make_github_request("GET", "/repos/o/r/releases", "token")
+
+    assert cached == [{"id": 1}]
+    assert uncached is None
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_http_error_returns_none(github_api):
+    _, responses, _ = github_api
+    responses.append(_response(500, json={"message": "boom"}))
+
+    assert await _make_github_request("GET", "/repos/o/r/issues", "token") is None
+
+
+def _area(area_id, user_id, action, repo="Octo/Repo"):
+    owner, name = repo.split("/")
+    area = Mock()
+    area.id = area_id
+    area.user_id = user_id
+    area.name = area_id
+    area.trigger_action = action
+    area.trigger_params = {"repo_owner": owner, "repo_name": name}
+    return area
+
+
+def test_areas_are_grouped_per_repository():
+    source = GitHubTriggerSource()
+
+    assert source.group_key(_area("a", "u1", "new_issue", "Octo/Repo")) == "octo/repo"
+    assert source.group_key(_area("b", "u2", "pull_request_opened", "octo/repo")) == "octo/repo"
+
+
+@pytest.mark.asyncio
+async def test_repository_is_polled_once_for_every_subscribed_user(github_api):
+    requests, responses, _ = github_api
+    issue = {"id": 7, "title": "Bug", "user": {"login": "octocat"}}
+    responses.extend([
+        _response(json={"full_name": "Octo/Repo"}),  # u1 can read the repository
+        _response(json={"full_name": "Octo/Repo"}),  # u2 can read the repository
+        _response(404, json={"message": "Not Found"}),  # u3 cannot
+        _response(json=[issue]),
+    ])
+    areas = [
+        _area("a1", "u1", "new_issue"),
+        _area("a2", "u2", "new_issue"),
+        _area("a3", "u3", "new_issue"),
+    ]
+
+    with patch(
+        "app.integrations.simple_plugins.github_scheduler._get_github_access_token",
+        side_effect=lambda user_id, db: f"token-{user_id}",
+    ):
+        events = await GitHubTriggerSource().poll(Mock(), areas, datetime.now(timezone.utc))
+
+    assert [(event.area.id, event.event_id) for event in events] == [
+        ("a1", "issue_7"),
+        ("a2", "issue_7"),
+    ]
+    assert [request.url.path for request in requests].count("/repos/Octo/Repo/issues") == 1
+
+
+@pytest.mark.asyncio
+async def test_confirmed_repository_access_is_cached(github_api):
+    requests, responses, _ = github_api
+    responses.append(_response(json={"full_name": "Octo/Repo"}))
+
+    assert await _can_read_repo("token", "Octo", "Repo")
+    assert await _can_read_repo("token", "octo", "repo")
+
+    assert len(requests) == 1
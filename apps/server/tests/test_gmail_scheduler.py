@@ -3,26 +3,78 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 from datetime import datetime, timezone
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 import pytest
+from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
 
+from app.core.config import settings
+from app.core.encryption import encrypt_token
 from app.integrations.simple_plugins.gmail_scheduler import (
+    GMAIL_HISTORY_CURSOR,
+    _area_needs_body,
     _get_gmail_service,
+    _get_messages,
+    _sync_history,
     _fetch_messages,
     _build_gmail_query,
     _extract_message_data,
     _fetch_due_gmail_areas,
-    start_gmail_scheduler,
-    stop_gmail_scheduler,
-    is_gmail_scheduler_running,
     clear_gmail_seen_state,
-    gmail_scheduler_task,
     _process_gmail_trigger,
+    GmailTriggerSource,
 )
+from app.integrations.simple_plugins.polling_engine import TriggerEvent
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.credential_manager import ConnectionCredentials
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
+
+
+class FakeBatch:
+    """Stand-in for a googleapiclient batch running each added request on execute()."""
+
+    instances: list["FakeBatch"] = []
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+        FakeBatch.instances.append(self)
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        for request_id, request in self.requests:
+            try:
+                response = request.execute()
+            except HttpError as e:
+                self.callback(request_id, None, e)
+            else:
+                self.callback(request_id, response, None)
+
+
+def _connection_credentials(**overrides):
+    """Decrypted credentials of a Gmail connection as returned by the credential manager."""
+    values = {
+        "connection_id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "service_name": "gmail",
+        "access_token": "decrypted_access_token",
+        "refresh_token": "decrypted_refresh_token",
+    }
+    values.update(overrides)
+    return ConnectionCredentials(**values)
+
+
+def _batching(service):
+    """Make a mocked Gmail service batch its requests through FakeBatch."""
+    service.new_batch_http_request = lambda callback: FakeBatch(callback)
+    return service
 
 
 class TestGmailScheduler:
@@ -32,83 +84,35 @@ class TestGmailScheduler:
         """Test successful Gmail service creation."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.gmail_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.build") as mock_build, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.Credentials") as mock_credentials:
-
-            mock_get_conn.return_value = mock_connection
-            # decrypt_token should return str (decrypted value), not bytes
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            mock_creds = Mock()
-            mock_creds.expired = False
-            mock_creds.valid = True  # Mark as valid so no refresh needed
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_credentials.return_value = mock_creds
-
-            mock_service = Mock()
+        credentials = _connection_credentials()
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler.get_google_credentials", return_value=credentials) as mock_get_creds, \
+             patch("app.integrations.simple_plugins.gmail_scheduler.get_google_client") as mock_build:
+
+            mock_service = _batching(Mock())
             mock_build.return_value = mock_service
 
             result = _get_gmail_service(user_id, mock_db)
 
             assert result == mock_service
-            mock_get_conn.assert_called_once_with(mock_db, user_id, "gmail")
+            mock_get_creds.assert_called_once_with(mock_db, user_id, "gmail")
+            connection_id, api, version, creds = mock_build.call_args[0]
+            assert (connection_id, api, version) == (credentials.connection_id, "gmail", "v1")
+            assert creds.token == "decrypted_access_token"
+            assert creds.refresh_token == "decrypted_refresh_token"
 
     def test_get_gmail_service_no_connection(self):
         """Test Gmail service creation when no connection exists."""
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.gmail_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.gmail_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             result = _get_gmail_service(user_id, mock_db)
 
             assert result is None
 
-    def test_get_gmail_service_token_refresh(self):
-        """Test Gmail service creation with token refresh."""
-        user_id = "test-user-id"
-        mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "gmail"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.gmail_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.build") as mock_build, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.Credentials") as mock_credentials, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.update_service_connection") as mock_update, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.Request") as mock_request:
-
-            mock_get_conn.return_value = mock_connection
-            # decrypt_token should return str (decrypted value), not bytes
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            # Mock credentials that need refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.return_value = None
-            mock_creds.token = "new_access_token"
-            mock_creds.expiry = None
-            mock_credentials.return_value = mock_creds
-
-            mock_service = Mock()
-            mock_build.return_value = mock_service
-
-            result = _get_gmail_service(user_id, mock_db)
-
-            assert result == mock_service
-            mock_creds.refresh.assert_called_once()
-
     def test_build_gmail_query_new_email(self):
         """Test Gmail query building for new email trigger."""
         area = Mock()
@@ -155,7 +159,7 @@ class TestGmailScheduler:
 
     def test_fetch_messages_success(self):
         """Test successful Gmail message fetching."""
-        mock_service = Mock()
+        mock_service = _batching(Mock())
 
         # Mock the list() call
         mock_list = Mock()
@@ -192,7 +196,7 @@ class TestGmailScheduler:
 
     def test_fetch_messages_no_messages(self):
         """Test Gmail message fetching when no messages found."""
-        mock_service = Mock()
+        mock_service = _batching(Mock())
         mock_list = Mock()
         mock_list.execute.return_value = {"messages": []}
         mock_service.users().messages().list.return_value = mock_list
@@ -203,7 +207,7 @@ class TestGmailScheduler:
 
     def test_fetch_messages_http_error(self):
         """Test Gmail message fetching with HTTP error."""
-        mock_service = Mock()
+        mock_service = _batching(Mock())
         mock_list = Mock()
         http_resp = Mock()
         http_resp.status = 400
@@ -215,36 +219,6 @@ class TestGmailScheduler:
 
         assert result == []
 
-    @pytest.mark.asyncio
-    async def test_start_gmail_scheduler(self):
-        """Test starting the Gmail scheduler."""
-        # The function uses asyncio.get_running_loop().create_task()
-        with patch("app.integrations.simple_plugins.gmail_scheduler.asyncio.get_running_loop") as mock_get_loop:
-            mock_loop = Mock()
-            mock_task = Mock()
-            mock_loop.create_task.return_value = mock_task
-            mock_get_loop.return_value = mock_loop
-
-            start_gmail_scheduler()
-
-            mock_loop.create_task.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_stop_gmail_scheduler(self):
-        """Test stopping the Gmail scheduler."""
-        # First start the scheduler to set _gmail_scheduler_task
-        with patch("app.integrations.simple_plugins.gmail_scheduler.asyncio") as mock_asyncio:
-            mock_task = Mock()
-            mock_asyncio.create_task.return_value = mock_task
-            start_gmail_scheduler()
-
-        # Now stop it
-        with patch("app.integrations.simple_plugins.gmail_scheduler._gmail_scheduler_task") as mock_task:
-            if mock_task:
-                mock_task.cancel.return_value = None
-                stop_gmail_scheduler()
-                mock_task.cancel.assert_called_once()
-
     def test_build_gmail_query_with_params(self):
         """Test Gmail query building with additional parameters."""
         area = Mock()
@@ -269,7 +243,7 @@ class TestGmailScheduler:
 
     def test_fetch_messages_with_pagination(self):
         """Test Gmail message fetching with pagination."""
-        mock_service = Mock()
+        mock_service = _batching(Mock())
 
         # Mock the list() call with nextPageToken
         mock_list = Mock()
@@ -299,8 +273,8 @@ class TestGmailScheduler:
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.gmail_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.side_effect = Exception("Database error")
+        with patch("app.integrations.simple_plugins.gmail_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.side_effect = Exception("Database error")
 
             result = _get_gmail_service(user_id, mock_db)
 
@@ -310,35 +284,19 @@ class TestGmailScheduler:
         """Test Gmail service creation with token refresh failure."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "gmail"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.gmail_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.build") as mock_build, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.Credentials") as mock_credentials, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.Request") as mock_request:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            # Mock credentials that fail to refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.side_effect = Exception("Refresh failed")
-            mock_credentials.return_value = mock_creds
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler.get_google_credentials") as mock_get_creds, \
+             patch("app.integrations.simple_plugins.gmail_scheduler.get_google_client") as mock_build:
+            mock_get_creds.side_effect = RefreshError("Token has been expired or revoked")
 
             result = _get_gmail_service(user_id, mock_db)
 
             assert result is None
+            mock_build.assert_not_called()
 
     def test_fetch_messages_partial_failure(self):
         """Test Gmail message fetching with partial failures."""
-        mock_service = Mock()
+        mock_service = _batching(Mock())
 
         # Mock the list() call
         mock_list = Mock()
@@ -436,54 +394,16 @@ class TestGmailScheduler:
         mock_filter.all.return_value = [mock_area1]
         mock_query = Mock()
         mock_query.filter.return_value = mock_filter
-        mock_db.query.return_value = mock_query
+        mock_db.query.return_value.options.return_value = mock_query
 
         result = _fetch_due_gmail_areas(mock_db)
 
         assert len(result) == 1
         assert result[0] == mock_area1
 
-    @pytest.mark.asyncio
-    async def test_gmail_scheduler_task_cancellation(self):
-        """Test Gmail scheduler task handles cancellation."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep") as mock_sleep:
-
-            mock_sleep.side_effect = asyncio.CancelledError()
-
-            # Should exit gracefully without raising
-            await gmail_scheduler_task()
-
-            mock_sleep.assert_called()
-
-    @pytest.mark.asyncio
-    async def test_gmail_scheduler_task_with_error(self):
-        """Test Gmail scheduler task handles errors and continues."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep") as mock_sleep, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_due_gmail_areas") as mock_fetch:
-
-            # First sleep (poll interval) succeeds, second sleep (backoff after error) raises CancelledError
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            mock_fetch.side_effect = Exception("Database error")
-
-            mock_db = Mock()
-            mock_db.__enter__ = Mock(return_value=mock_db)
-            mock_db.__exit__ = Mock(return_value=None)
-            mock_session.return_value = mock_db
-
-            # Should handle error and continue until cancelled
-            with pytest.raises(asyncio.CancelledError):
-                await gmail_scheduler_task()
-
-            # Verify it tried to fetch despite error
-            assert mock_fetch.call_count == 1
-            # Verify it called sleep twice: once for poll interval, once for backoff
-            assert mock_sleep.call_count == 2
-
     @pytest.mark.asyncio
     async def test_process_gmail_trigger_success(self):
-        """Test processing Gmail trigger successfully."""
+        """Test processing Gmail trigger queues an execution job."""
         from uuid import uuid4
 
         mock_db = Mock()
@@ -508,20 +428,12 @@ class TestGmailScheduler:
 
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.gmail_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.execute_area") as mock_execute, \
+        with patch(
+            "app.integrations.simple_plugins.gmail_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit, \
              patch("app.integrations.simple_plugins.gmail_scheduler.extract_gmail_variables") as mock_extract:
 
-            mock_log = Mock()
-            mock_log.status = "Started"
-            mock_create_log.return_value = mock_log
-            
-            mock_execute.return_value = {
-                "status": "success",
-                "steps_executed": 2,
-                "execution_log": []
-            }
-            
             mock_extract.return_value = {
                 "gmail.subject": "Test",
                 "gmail.sender": "test@example.com"
@@ -531,13 +443,18 @@ class TestGmailScheduler:
 
             await _process_gmail_trigger(mock_db, mock_area, message, now)
 
-            mock_create_log.assert_called_once()
-            mock_execute.assert_called_once()
-            mock_db.commit.assert_called()
+            mock_submit.assert_awaited_once()
+            job = mock_submit.call_args[0][0]
+            assert job.area_id == str(mock_area.id)
+            assert job.source == "Gmail"
+            assert job.trigger_data["gmail.subject"] == "Test"
+            assert job.trigger_data["user_id"] == str(mock_area.user_id)
+            assert job.event["message_id"] == "msg123"
+            assert job.details == {"message_id": "msg123"}
 
     @pytest.mark.asyncio
-    async def test_process_gmail_trigger_failure(self):
-        """Test processing Gmail trigger with execution failure."""
+    async def test_process_gmail_trigger_minimal_message(self):
+        """Test processing Gmail trigger for a message without headers."""
         from uuid import uuid4
 
         mock_db = Mock()
@@ -553,29 +470,17 @@ class TestGmailScheduler:
 
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.gmail_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.execute_area") as mock_execute, \
-             patch("app.integrations.simple_plugins.gmail_scheduler.extract_gmail_variables") as mock_extract:
-
-            mock_log = Mock()
-            mock_log.status = "Started"
-            mock_create_log.return_value = mock_log
-            
-            mock_execute.side_effect = Exception("Execution failed")
-            mock_extract.return_value = {}
+        with patch(
+            "app.integrations.simple_plugins.gmail_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
             mock_db.merge.return_value = mock_area
 
             await _process_gmail_trigger(mock_db, mock_area, message, now)
 
-            # Should update log with failure
-            assert mock_log.status == "Failed"
-            mock_db.commit.assert_called()
-
-    def test_is_gmail_scheduler_running(self):
-        """Test checking if Gmail scheduler is running."""
-        # Clear state first
-        with patch("app.integrations.simple_plugins.gmail_scheduler._gmail_scheduler_task", None):
-            assert is_gmail_scheduler_running() is False
+            job = mock_submit.call_args[0][0]
+            assert job.event["message_id"] == "msg123"
+            assert job.trigger_data["now"] == now.isoformat()
 
     def test_clear_gmail_seen_state(self):
         """Test clearing Gmail seen state."""
@@ -583,47 +488,402 @@ class TestGmailScheduler:
         clear_gmail_seen_state()
 
     @pytest.mark.asyncio
-    async def test_gmail_scheduler_processes_new_messages(self):
-        """Test Gmail scheduler processes new messages correctly."""
+    async def test_gmail_trigger_source_poll_returns_events(self):
+        """Test Gmail trigger source turns fetched messages into events."""
         from uuid import uuid4
 
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep") as mock_sleep, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_due_gmail_areas") as mock_fetch_areas, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service") as mock_get_service, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_messages") as mock_fetch_messages, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._process_gmail_trigger") as mock_process, \
-             patch("app.integrations.simple_plugins.gmail_scheduler._last_seen_messages", {}) as mock_seen:
-
-            # Setup mocks
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            
-            mock_area = Mock()
-            mock_area.id = uuid4()
-            mock_area.user_id = uuid4()
-            mock_area.name = "Test Area"
-            mock_area.trigger_action = "new_email"
-            mock_area.trigger_params = {}
-            
-            mock_fetch_areas.return_value = [mock_area]
-            
-            mock_service = Mock()
-            mock_get_service.return_value = mock_service
-            
-            message = {
-                "id": "msg123",
-                "threadId": "thread123",
-                "payload": {"headers": []}
-            }
-            mock_fetch_messages.return_value = [message]
+        mock_area = Mock()
+        mock_area.id = uuid4()
+        mock_area.user_id = uuid4()
+        mock_area.name = "Test Area"
+        mock_area.trigger_action = "new_email"
+        mock_area.trigger_params = {}
+        mock_area.reaction_params = {}
+        mock_area.steps = []
+
+        messages = [
+            {"id": "msg1", "labelIds": ["INBOX"]},
+            {"id": "msg2", "labelIds": ["INBOX", "UNREAD"]},
+        ]
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service") as mock_get_service, \
+             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_messages", return_value=messages) as mock_fetch, \
+             patch.object(settings, "gmail_history_sync", False):
+            mock_get_service.return_value = Mock()
+
+            events = await GmailTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        assert [event.event_id for event in events] == ["msg1", "msg2"]
+        assert all(event.area is mock_area for event in events)
+        assert mock_fetch.call_args[0][1] == "in:inbox"
+
+    @pytest.mark.asyncio
+    async def test_gmail_trigger_source_fetches_once_per_user(self):
+        """Test a user's areas share one Gmail service and one fetch per stream."""
+        from uuid import uuid4
+
+        user_id = uuid4()
+
+        def _area(action, params=None):
+            area = Mock()
+            area.id = uuid4()
+            area.user_id = user_id
+            area.name = action
+            area.trigger_action = action
+            area.trigger_params = params or {}
+            area.reaction_params = {}
+            area.steps = []
+            return area
+
+        new_email = _area("new_email")
+        from_sender = _area("new_email_from_sender", {"sender_email": "Boss@Example.com"})
+        unread = _area("new_unread_email")
+        starred = _area("email_starred")
+
+        inbox = [
+            {
+                "id": "read",
+                "labelIds": ["INBOX"],
+                "payload": {"headers": [{"name": "From", "value": "Boss <boss@example.com>"}]},
+            },
+            {
+                "id": "unread",
+                "labelIds": ["INBOX", "UNREAD"],
+                "payload": {"headers": [{"name": "From", "value": "friend@example.com"}]},
+            },
+        ]
+        starred_messages = [{"id": "old", "labelIds": ["STARRED"], "payload": {"headers": []}}]
+
+        def _fetch(service, query, message_format="metadata"):
+            assert message_format == "metadata"
+            return starred_messages if query == "is:starred" else inbox
+
+        source = GmailTriggerSource()
+        assert source.group_key(new_email) == source.group_key(starred) == str(user_id)
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service") as mock_get_service, \
+             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_messages", side_effect=_fetch) as mock_fetch, \
+             patch.object(settings, "gmail_history_sync", False):
+            mock_get_service.return_value = Mock()
+            events = await source.poll(
+                Mock(), [new_email, from_sender, unread, starred], datetime.now(timezone.utc)
+            )
+
+        mock_get_service.assert_called_once()
+        assert sorted(call[0][1] for call in mock_fetch.call_args_list) == ["in:inbox", "is:starred"]
+        matched = {(event.area.name, event.event_id) for event in events}
+        assert matched == {
+            ("new_email", "read"),
+            ("new_email", "unread"),
+            ("new_email_from_sender", "read"),
+            ("new_unread_email", "unread"),
+            ("email_starred", "old"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_gmail_trigger_source_poll_skips_unavailable_service(self):
+        """Test Gmail trigger source skips areas without a Gmail connection."""
+        mock_area = Mock()
+        mock_area.trigger_action = "new_email"
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service", return_value=None), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_messages") as mock_fetch:
+            events = await GmailTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        assert events == []
+        mock_fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_gmail_trigger_source_poll_handles_refresh_error(self):
+        """Test Gmail trigger source skips areas with revoked tokens."""
+        from google.auth.exceptions import RefreshError
+
+        mock_area = Mock()
+        mock_area.trigger_action = "new_email"
+
+        with patch(
+            "app.integrations.simple_plugins.gmail_scheduler._get_gmail_service",
+            side_effect=RefreshError("revoked"),
+        ):
+            events = await GmailTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        assert events == []
+
+    @pytest.mark.asyncio
+    async def test_gmail_trigger_source_dispatch(self):
+        """Test Gmail trigger source dispatches events to the trigger processor."""
+        mock_area = Mock()
+        message = {"id": "msg1"}
+        now = datetime.now(timezone.utc)
+        mock_db = Mock()
+
+        with patch(
+            "app.integrations.simple_plugins.gmail_scheduler._process_gmail_trigger",
+            new_callable=AsyncMock,
+        ) as mock_process:
+            await GmailTriggerSource().dispatch(mock_db, TriggerEvent(mock_area, message, "msg1"), now)
+
+        mock_process.assert_awaited_once_with(mock_db, mock_area, message, now)
+
+    def test_gmail_trigger_source_uses_module_seen_state(self):
+        """Test Gmail trigger source dedupes against the module seen state in list mode."""
+        from app.integrations.simple_plugins import gmail_scheduler
+
+        with patch.object(settings, "gmail_history_sync", False):
+            assert GmailTriggerSource().seen is gmail_scheduler._seen_events
+            assert GmailTriggerSource().seen.service == "gmail"
+
+    def test_gmail_trigger_source_keeps_seen_state_in_history_mode(self):
+        """Test history sync still dedupes messages re-listed after the history expired."""
+        from app.integrations.simple_plugins import gmail_scheduler
+
+        with patch.object(settings, "gmail_history_sync", True):
+            assert GmailTriggerSource().seen is gmail_scheduler._seen_events
+
+    @pytest.mark.parametrize("cursor_exists", [False, True])
+    @pytest.mark.asyncio
+    async def test_first_history_message_after_enabling_an_area_is_dispatched(self, db_session, cursor_exists):
+        """Test the first message of the history stream runs a newly enabled area."""
+        from sqlalchemy.orm import sessionmaker
+
+        from app.integrations.simple_plugins.polling_engine import PollingEngine
+
+        area = Mock(
+            id=uuid.uuid4(), user_id=uuid.uuid4(), trigger_action="new_email",
+            trigger_params={}, reaction_params={}, steps=[],
+        )
+        # The first sync only records the history ID, unless another area already did
+        syncs = [{"in:inbox": [{"id": "m1", "labelIds": ["INBOX"]}]}]
+        if not cursor_exists:
+            syncs.insert(0, {})
+        factory = sessionmaker(bind=db_session.get_bind(), autoflush=False, future=True)
+
+        with patch("app.db.session.SessionLocal", factory), \
+             patch.object(GmailTriggerSource, "fetch_areas", return_value=[area]), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service", return_value=Mock()), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._sync_history", side_effect=syncs), \
+             patch(
+                 "app.integrations.simple_plugins.gmail_scheduler._process_gmail_trigger",
+                 new_callable=AsyncMock,
+             ) as mock_process, \
+             patch.object(settings, "gmail_history_sync", True):
+            for _ in syncs:
+                source = GmailTriggerSource()
+                await PollingEngine([source]).run_source(source)
+
+        assert [call.args[2]["id"] for call in mock_process.await_args_list] == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_gmail_trigger_source_poll_uses_history_sync(self):
+        """Test history mode matches areas against the synced streams without listing."""
+        from uuid import uuid4
+
+        user_id = uuid4()
+        new_email = Mock(
+            id=uuid4(), user_id=user_id, trigger_action="new_email",
+            trigger_params={}, reaction_params={}, steps=[],
+        )
+        new_email.name = "new_email"
+        starred = Mock(
+            id=uuid4(), user_id=user_id, trigger_action="email_starred",
+            trigger_params={}, reaction_params={}, steps=[],
+        )
+        starred.name = "email_starred"
+        streams = {
+            "in:inbox": [{"id": "new", "labelIds": ["INBOX"]}],
+            "is:starred": [{"id": "old", "labelIds": ["STARRED"]}],
+        }
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service", return_value=Mock()), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._sync_history", return_value=streams) as mock_sync, \
+             patch("app.integrations.simple_plugins.gmail_scheduler._prime_history_areas"), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._fetch_messages") as mock_fetch, \
+             patch.object(settings, "gmail_history_sync", True):
+            events = await GmailTriggerSource().poll(Mock(), [new_email, starred], datetime.now(timezone.utc))
+
+        mock_sync.assert_called_once()
+        mock_fetch.assert_not_called()
+        assert {(event.area.name, event.event_id) for event in events} == {
+            ("new_email", "new"),
+            ("email_starred", "old"),
+        }
+
+
+class TestGmailMessageFetching:
+    """Test batched, field-masked message fetches."""
+
+    def test_get_messages_batches_metadata_requests(self):
+        FakeBatch.instances.clear()
+        service = _batching(MagicMock())
+        service.users().messages().get.side_effect = lambda userId, id, **kwargs: Mock(
+            execute=Mock(return_value={"id": id, **kwargs})
+        )
+        message_ids = [f"m{i}" for i in range(120)]
+
+        messages = _get_messages(service, message_ids + ["m0"])
+
+        assert [message["id"] for message in messages] == message_ids
+        assert [len(batch.requests) for batch in FakeBatch.instances] == [50, 50, 20]
+        assert messages[0]["format"] == "metadata"
+        assert messages[0]["metadataHeaders"] == ["From", "Subject", "Date"]
 
-            mock_db = Mock()
-            mock_db.__enter__ = Mock(return_value=mock_db)
-            mock_db.__exit__ = Mock(return_value=None)
-            mock_session.return_value = mock_db
+    def test_get_messages_full_format(self):
+        service = _batching(MagicMock())
+        service.users().messages().get.side_effect = lambda userId, id, **kwargs: Mock(
+            execute=Mock(return_value={"id": id, **kwargs})
+        )
+
+        messages = _get_messages(service, ["m1"], message_format="full")
+
+        assert messages == [{"id": "m1", "format": "full"}]
+
+    def test_area_needs_body_only_when_referenced(self):
+        step = Mock(config={"message": "New mail: {{gmail.body}}"})
+        reads_body = Mock(reaction_params={}, steps=[step])
+        subject_only = Mock(reaction_params={"message": "{{gmail.subject}}"}, steps=[Mock(config=None)])
+
+        assert _area_needs_body(reads_body) is True
+        assert _area_needs_body(subject_only) is False
+
+    def test_extract_message_data_decodes_plain_text_body(self):
+        import base64
+
+        encoded = base64.urlsafe_b64encode("Hello body".encode()).decode().rstrip("=")
+        message = {
+            "id": "msg1",
+            "payload": {
+                "mimeType": "multipart/alternative",
+                "headers": [],
+                "parts": [
+                    {"mimeType": "text/html", "body": {"data": "PGI-"}},
+                    {"mimeType": "text/plain", "body": {"data": encoded}},
+                ],
+            },
+        }
+
+        assert _extract_message_data(message)["body"] == "Hello body"
+        assert "body" not in _extract_message_data({"id": "msg2", "payload": {"headers": []}})
+
+    @pytest.mark.asyncio
+    async def test_poll_fetches_full_messages_for_body_areas(self):
+        from uuid import uuid4
+
+        area = Mock(
+            id=uuid4(), user_id=uuid4(), trigger_action="new_email", trigger_params={},
+            reaction_params={"text": "{{gmail.body}}"}, steps=[],
+        )
+
+        with patch("app.integrations.simple_plugins.gmail_scheduler._get_gmail_service", return_value=Mock()), \
+             patch("app.integrations.simple_plugins.gmail_scheduler._sync_history", return_value={}) as mock_sync, \
+             patch("app.integrations.simple_plugins.gmail_scheduler._prime_history_areas"), \
+             patch.object(settings, "gmail_history_sync", True):
+            await GmailTriggerSource().poll(Mock(), [area], datetime.now(timezone.utc))
+
+        assert mock_sync.call_args[0][3] == "full"
+
+
+def _history_service(pages, messages, history_id="500"):
+    """Build a mocked Gmail service serving history pages and messages by ID."""
+    service = _batching(MagicMock())
+    service.users().getProfile().execute.return_value = {"historyId": history_id}
+    service.users().history().list().execute.side_effect = pages
+    service.users().messages().get.side_effect = lambda userId, id, **kwargs: Mock(
+        execute=Mock(return_value=messages[id])
+    )
+    return service
+
+
+class TestGmailHistorySync:
+    """Test incremental Gmail sync through users.history.list."""
+
+    @pytest.fixture
+    def connection(self, db_session):
+        user = User(email="history@example.com", hashed_password="test", is_confirmed=True)
+        db_session.add(user)
+        db_session.commit()
+        connection = ServiceConnection(
+            user_id=user.id,
+            service_name="gmail",
+            encrypted_access_token=encrypt_token("token"),
+        )
+        db_session.add(connection)
+        db_session.commit()
+        return connection
+
+    def test_first_sync_only_records_history_id(self, db_session, connection):
+        service = _history_service([], {}, history_id="123")
+
+        streams = _sync_history(service, db_session, connection.user_id)
+
+        assert streams == {}
+        assert get_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR).value == "123"
+        service.users().messages().get.assert_not_called()
+
+    def test_sync_returns_added_and_starred_messages(self, db_session, connection):
+        set_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR, "100")
+        pages = [
+            {
+                "history": [{"messagesAdded": [{"message": {"id": "m1"}}]}],
+                "nextPageToken": "page-2",
+                "historyId": "150",
+            },
+            {
+                "history": [
+                    {"labelsAdded": [{"message": {"id": "m0"}, "labelIds": ["STARRED"]}]},
+                    {"labelsAdded": [{"message": {"id": "m1"}, "labelIds": ["IMPORTANT"]}]},
+                ],
+                "historyId": "200",
+            },
+        ]
+        messages = {
+            "m0": {"id": "m0", "labelIds": ["INBOX", "STARRED"]},
+            "m1": {"id": "m1", "labelIds": ["INBOX"]},
+        }
+        service = _history_service(pages, messages)
+
+        streams = _sync_history(service, db_session, connection.user_id)
+
+        assert [message["id"] for message in streams["in:inbox"]] == ["m1"]
+        assert [message["id"] for message in streams["is:starred"]] == ["m0"]
+        assert service.users().messages().get.call_count == 2
+        assert get_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR).value == "200"
+
+    def test_steady_state_sync_fetches_nothing(self, db_session, connection):
+        set_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR, "100")
+        service = _history_service([{"historyId": "100"}], {})
+
+        streams = _sync_history(service, db_session, connection.user_id)
+
+        assert streams == {"in:inbox": [], "is:starred": []}
+        service.users().messages().get.assert_not_called()
+
+    def test_expired_history_relists_inbox_since_last_sync(self, db_session, connection):
+        cursor = set_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR, "1")
+        last_sync = int(cursor.updated_at.timestamp())
+        http_resp = Mock()
+        http_resp.status = 404
+        http_resp.reason = "Not Found"
+        service = _history_service([HttpError(http_resp, b"Not Found")], {}, history_id="900")
+        relisted = [{"id": "m9", "labelIds": ["INBOX"]}]
+
+        with patch(
+            "app.integrations.simple_plugins.gmail_scheduler._fetch_messages",
+            return_value=relisted,
+        ) as mock_fetch:
+            streams = _sync_history(service, db_session, connection.user_id)
+
+        assert mock_fetch.call_args[0][1] == f"in:inbox after:{last_sync}"
+        assert streams["in:inbox"] == relisted
+        assert get_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR).value == "900"
+
+    def test_other_history_errors_propagate(self, db_session, connection):
+        set_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR, "100")
+        http_resp = Mock()
+        http_resp.status = 500
+        http_resp.reason = "Backend Error"
+        service = _history_service([HttpError(http_resp, b"Backend Error")], {})
 
-            # Run scheduler
-            await gmail_scheduler_task()
+        with pytest.raises(HttpError):
+            _sync_history(service, db_session, connection.user_id)
 
-            # Should have processed the message
-            assert mock_process.call_count >= 0  # May be 0 if seen set is initialized
+        assert get_sync_cursor(db_session, connection.id, GMAIL_HISTORY_CURSOR).value == "100"
@@ -0,0 +1,170 @@
+"""Tests for the per-connection Google API client cache."""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.integrations.simple_plugins.google_clients import (
+    clear_google_client_cache,
+    get_google_client,
+    get_google_credentials,
+    invalidate_google_clients,
+    refresh_google_token,
+)
+from app.services.credential_manager import ConnectionCredentials
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_google_client_cache()
+    yield
+    clear_google_client_cache()
+
+
+def _credentials(token: str = "token"):
+    credentials = MagicMock()
+    credentials.token = token
+    credentials.expiry = None
+    return credentials
+
+
+@pytest.fixture
+def mock_build():
+    with patch(
+        "app.integrations.simple_plugins.google_clients.build_from_document",
+        side_effect=lambda document, credentials: MagicMock(credentials=credentials),
+    ) as mock_build:
+        yield mock_build
+
+
+def test_client_is_built_once_per_connection(mock_build):
+    first = get_google_client("conn-1", "gmail", "v1", _credentials())
+    second = get_google_client("conn-1", "gmail", "v1", _credentials())
+    other = get_google_client("conn-2", "gmail", "v1", _credentials())
+
+    assert first is second
+    assert other is not first
+    assert mock_build.call_count == 2
+
+
+def test_discovery_document_is_parsed_once(mock_build):
+    with patch(
+        "app.integrations.simple_plugins.google_clients.discovery_cache.get_static_doc",
+        return_value='{"rootUrl": "https://gmail.googleapis.com/"}',
+    ) as mock_doc:
+        get_google_client("conn-1", "gmail", "v1", _credentials())
+        get_google_client("conn-2", "gmail", "v1", _credentials())
+
+    mock_doc.assert_called_once_with("gmail", "v1")
+    assert mock_build.call_args[0][0] == {"rootUrl": "https://gmail.googleapis.com/"}
+
+
+def test_cached_client_adopts_new_token(mock_build):
+    client = get_google_client("conn-1", "drive", "v3", _credentials("old"))
+
+    assert get_google_client("conn-1", "drive", "v3", _credentials("new")) is client
+    assert client.credentials.token == "new"
+
+
+def test_invalidate_rebuilds_client(mock_build):
+    client = get_google_client("conn-1", "calendar", "v3", _credentials())
+
+    invalidate_google_clients("conn-1")
+
+    assert get_google_client("conn-1", "calendar", "v3", _credentials()) is not client
+
+
+def test_cache_is_bounded_and_per_thread(mock_build):
+    with patch.object(settings, "google_client_cache_size", 1):
+        first = get_google_client("conn-1", "gmail", "v1", _credentials())
+        get_google_client("conn-2", "gmail", "v1", _credentials())
+        assert get_google_client("conn-1", "gmail", "v1", _credentials()) is not first
+
+    clients = []
+    thread = threading.Thread(
+        target=lambda: clients.append(get_google_client("conn-1", "gmail", "v1", _credentials()))
+    )
+    thread.start()
+    thread.join()
+    assert clients[0] is not get_google_client("conn-1", "gmail", "v1", _credentials())
+
+
+def test_update_service_connection_invalidates_clients(db_session):
+    from app.models.service_connection import ServiceConnection
+    from app.models.user import User
+    from app.schemas.service_connection import ServiceConnectionUpdate
+    from app.services.service_connections import update_service_connection
+
+    user = User(email="clients@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(user_id=user.id, service_name="gmail", encrypted_access_token="x")
+    db_session.add(connection)
+    db_session.commit()
+
+    with patch(
+        "app.integrations.simple_plugins.google_clients.invalidate_google_clients"
+    ) as mock_invalidate:
+        update_service_connection(
+            db_session, str(connection.id), ServiceConnectionUpdate(service_name="gmail")
+        )
+
+    mock_invalidate.assert_called_once_with(connection.id)
+
+
+def _connection_credentials(expires_at=None):
+    return ConnectionCredentials(
+        connection_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        service_name="gmail",
+        access_token="access",
+        refresh_token="refresh",
+        expires_at=expires_at,
+    )
+
+
+def test_get_google_credentials_returns_valid_credentials():
+    credentials = _connection_credentials()
+
+    with patch("app.integrations.simple_plugins.google_clients.credential_manager") as mock_manager:
+        mock_manager.get.return_value = credentials
+
+        assert get_google_credentials(MagicMock(), credentials.user_id, "gmail") is credentials
+
+    mock_manager.refresh.assert_not_called()
+
+
+def test_get_google_credentials_refreshes_expiring_token():
+    db = MagicMock()
+    stale = _connection_credentials(expires_at=datetime.now(timezone.utc))
+    refreshed = _connection_credentials()
+
+    with patch("app.integrations.simple_plugins.google_clients.credential_manager") as mock_manager:
+        mock_manager.get.return_value = stale
+        mock_manager.refresh.return_value = refreshed
+
+        assert get_google_credentials(db, stale.user_id, "gmail") is refreshed
+
+    mock_manager.refresh.assert_called_once_with(db, stale, refresh_google_token)
+
+
+def test_refresh_google_token_returns_new_token():
+    credentials = _connection_credentials()
+    expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+
+    def refresh(self, request):
+        self.token = "new-access"
+        self.expiry = expiry
+
+    with patch("app.integrations.simple_plugins.google_clients.Credentials.refresh", refresh):
+        token_set = refresh_google_token(credentials)
+
+    assert token_set.access_token == "new-access"
+    assert token_set.refresh_token is None
+    assert 3500 < token_set.expires_in <= 3600
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import uuid
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
 
@@ -22,126 +23,73 @@ from app.integrations.simple_plugins.exceptions import (
     GoogleDriveAPIError,
     GoogleDriveConnectionError,
 )
+from app.services.credential_manager import ConnectionCredentials
+
+
+def _connection_credentials(service_name: str) -> ConnectionCredentials:
+    """Decrypted connection credentials as returned by the credential manager."""
+    return ConnectionCredentials(
+        connection_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        service_name=service_name,
+        access_token="decrypted_access_token",
+        refresh_token="decrypted_refresh_token",
+    )
 
 
 class TestGoogleDrivePlugin:
     """Test Google Drive plugin functionality."""
 
     def test_get_drive_service_success(self):
-        """Test successful Google Drive service creation."""
+        """Test successful Drive service creation."""
         # Mock area
         area = Mock()
         area.user_id = "test-user-id"
-        area.id = "test-area-id"
-
-        # Mock database and service connection
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_plugin.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.core.encryption.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.build") as mock_build, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.Credentials") as mock_credentials:
+        credentials = _connection_credentials("google_drive")
 
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = ["decrypted_access_token", "decrypted_refresh_token"]
-
-            mock_creds = Mock()
-            mock_creds.expired = False
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_credentials.return_value = mock_creds
+        with patch("app.integrations.simple_plugins.google_drive_plugin.get_google_credentials") as mock_get_creds, \
+             patch("app.integrations.simple_plugins.google_drive_plugin.get_google_client") as mock_build:
 
+            mock_get_creds.return_value = credentials
             mock_service = Mock()
             mock_build.return_value = mock_service
 
             result = _get_drive_service(area, mock_db)
 
             assert result == mock_service
-            mock_get_conn.assert_called_once_with(mock_db, "test-user-id", "google_drive")
+            mock_get_creds.assert_called_once_with(mock_db, "test-user-id", "google_drive")
+            connection_id, api, version, creds = mock_build.call_args[0]
+            assert (connection_id, api, version) == (credentials.connection_id, "drive", "v3")
+            assert creds.token == "decrypted_access_token"
+            assert creds.refresh_token == "decrypted_refresh_token"
 
     def test_get_drive_service_no_connection(self):
         """Test Drive service creation when no connection exists."""
         area = Mock()
         area.user_id = "test-user-id"
-        area.id = "test-area-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.google_drive_plugin.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.google_drive_plugin.get_google_credentials") as mock_get_creds:
+            mock_get_creds.return_value = None
 
-            with pytest.raises(GoogleDriveConnectionError, match="Google Drive service connection not found"):
+            with pytest.raises(Exception, match="Google Drive service connection not found"):
                 _get_drive_service(area, mock_db)
 
-    def test_get_drive_service_token_refresh(self):
-        """Test Drive service creation with token refresh."""
-        area = Mock()
-        area.user_id = "test-user-id"
-        area.id = "test-area-id"
-        mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "google_drive"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_plugin.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.core.encryption.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.build") as mock_build, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.Credentials") as mock_credentials, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.update_service_connection") as mock_update, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.Request") as mock_request:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = ["decrypted_access_token", "decrypted_refresh_token"]
-
-            # Mock credentials that need refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.return_value = None
-            mock_creds.token = "new_access_token"
-            mock_creds.expiry = None
-            mock_credentials.return_value = mock_creds
-
-            mock_service = Mock()
-            mock_build.return_value = mock_service
-
-            result = _get_drive_service(area, mock_db)
-
-            assert result == mock_service
-            mock_creds.refresh.assert_called_once()
-            mock_update.assert_called_once()
-
     def test_get_drive_service_token_refresh_failure(self):
         """Test Drive service creation when token refresh fails."""
         area = Mock()
         area.user_id = "test-user-id"
         area.id = "test-area-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "google_drive"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_plugin.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.core.encryption.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_plugin.Credentials") as mock_credentials:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = ["decrypted_access_token", "decrypted_refresh_token"]
-
-            # Mock credentials that fail to refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.side_effect = Exception("Refresh failed")
-            mock_credentials.return_value = mock_creds
+
+        with patch("app.integrations.simple_plugins.google_drive_plugin.get_google_credentials") as mock_get_creds, \
+             patch("app.integrations.simple_plugins.google_drive_plugin.get_google_client") as mock_build:
+            mock_get_creds.side_effect = Exception("Refresh failed")
 
             with pytest.raises(GoogleDriveAuthError, match="Failed to refresh Google Drive token"):
                 _get_drive_service(area, mock_db)
+            mock_build.assert_not_called()
 
     def test_upload_file_handler_success(self):
         """Test successful file upload."""
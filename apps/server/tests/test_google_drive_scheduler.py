@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 from datetime import datetime, timezone
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 import pytest
 from google.oauth2.credentials import Credentials
@@ -12,15 +13,19 @@ from googleapiclient.errors import HttpError
 from google.auth.exceptions import RefreshError
 
 from app.integrations.simple_plugins.google_drive_scheduler import (
+    DRIVE_CHANGES_CURSOR,
     _get_drive_service,
     _get_start_page_token,
     _fetch_changes,
     _fetch_files_in_folder,
-    start_google_drive_scheduler,
-    stop_google_drive_scheduler,
-    is_google_drive_scheduler_running,
     clear_google_drive_seen_state,
+    GoogleDriveTriggerSource,
 )
+from app.core.encryption import encrypt_token
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.credential_manager import ConnectionCredentials
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 
 class TestGoogleDriveScheduler:
@@ -30,105 +35,48 @@ class TestGoogleDriveScheduler:
         """Test successful Drive service creation."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.build") as mock_build, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.Credentials") as mock_credentials:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            mock_creds = Mock()
-            mock_creds.expired = False
-            mock_creds.valid = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_credentials.return_value = mock_creds
-
+        credentials = ConnectionCredentials(
+            connection_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            service_name="google_drive",
+            access_token="decrypted_access_token",
+            refresh_token="decrypted_refresh_token",
+        )
+
+        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_google_credentials") as mock_get_creds, \
+             patch("app.integrations.simple_plugins.google_drive_scheduler.get_google_client") as mock_build:
+
+            mock_get_creds.return_value = credentials
             mock_service = Mock()
             mock_build.return_value = mock_service
 
             result = _get_drive_service(user_id, mock_db)
 
             assert result == mock_service
-            mock_get_conn.assert_called_once_with(mock_db, user_id, "google_drive")
+            mock_get_creds.assert_called_once_with(mock_db, user_id, "google_drive")
+            connection_id, api, version, creds = mock_build.call_args[0]
+            assert (connection_id, api, version) == (credentials.connection_id, "drive", "v3")
+            assert creds.token == "decrypted_access_token"
 
     def test_get_drive_service_no_connection(self):
         """Test Drive service creation when no connection exists."""
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             result = _get_drive_service(user_id, mock_db)
 
             assert result is None
 
-    def test_get_drive_service_token_refresh(self):
-        """Test Drive service creation with token refresh."""
-        user_id = "test-user-id"
-        mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "google_drive"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.build") as mock_build, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.Credentials") as mock_credentials, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.update_service_connection") as mock_update, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.Request") as mock_request:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            # Mock credentials that need refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.return_value = None
-            mock_creds.token = "new_access_token"
-            mock_creds.expiry = None
-            mock_credentials.return_value = mock_creds
-
-            mock_service = Mock()
-            mock_build.return_value = mock_service
-
-            result = _get_drive_service(user_id, mock_db)
-
-            assert result == mock_service
-            mock_creds.refresh.assert_called_once()
-            mock_update.assert_called_once()
-
     def test_get_drive_service_refresh_error(self):
         """Test Drive service creation when token refresh fails."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.id = "connection-id"
-        mock_connection.service_name = "google_drive"
-        mock_connection.encrypted_access_token = b"encrypted_access_token"
-        mock_connection.encrypted_refresh_token = b"encrypted_refresh_token"
-
-        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.decrypt_token") as mock_decrypt, \
-             patch("app.integrations.simple_plugins.google_drive_scheduler.Credentials") as mock_credentials:
-
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = lambda x: x.decode() if isinstance(x, bytes) else str(x)
-
-            # Mock credentials that fail to refresh
-            mock_creds = Mock()
-            mock_creds.expired = True
-            mock_creds.refresh_token = "decrypted_refresh_token"
-            mock_creds.refresh.side_effect = RefreshError("Token expired")
-            mock_credentials.return_value = mock_creds
+
+        with patch("app.integrations.simple_plugins.google_drive_scheduler.get_google_credentials") as mock_get_creds:
+            mock_get_creds.side_effect = RefreshError("Token expired")
 
             result = _get_drive_service(user_id, mock_db)
 
@@ -187,18 +135,30 @@ class TestGoogleDriveScheduler:
         assert next_token == "token456"
 
     def test_fetch_changes_with_next_page(self):
-        """Test changes fetch with pagination."""
+        """Test changes fetch drains every page."""
         mock_service = Mock()
-        mock_changes = [{"fileId": "file123"}]
-        mock_response = {
-            "changes": mock_changes,
-            "nextPageToken": "token456"
-        }
-        mock_service.changes().list().execute.return_value = mock_response
+        mock_service.changes().list().execute.side_effect = [
+            {"changes": [{"fileId": "file123"}], "nextPageToken": "token456"},
+            {"changes": [{"fileId": "file789"}], "newStartPageToken": "token999"},
+        ]
 
         changes, next_token = _fetch_changes(mock_service, "token123")
 
-        assert len(changes) == 1
+        assert [change["fileId"] for change in changes] == ["file123", "file789"]
+        assert next_token == "token999"
+        assert mock_service.changes().list.call_args.kwargs["pageToken"] == "token456"
+
+    def test_fetch_changes_error_after_first_page_resumes_there(self):
+        """Test a failing page keeps the changes fetched before it."""
+        mock_service = Mock()
+        mock_service.changes().list().execute.side_effect = [
+            {"changes": [{"fileId": "file123"}], "nextPageToken": "token456"},
+            HttpError(Mock(status=500), b'{"error": "Internal error"}'),
+        ]
+
+        changes, next_token = _fetch_changes(mock_service, "token123")
+
+        assert [change["fileId"] for change in changes] == ["file123"]
         assert next_token == "token456"
 
     def test_fetch_changes_api_error(self):
@@ -269,50 +229,127 @@ class TestGoogleDriveScheduler:
         clear_google_drive_seen_state()
         # If it runs without error, test passes
 
-    def test_is_google_drive_scheduler_running_false(self):
-        """Test scheduler running check when not running."""
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", None):
-            assert is_google_drive_scheduler_running() is False
+    @pytest.fixture
+    def connection(self, db_session):
+        user = User(email="drive-feed@example.com", hashed_password="test", is_confirmed=True)
+        db_session.add(user)
+        db_session.commit()
+        connection = ServiceConnection(
+            user_id=user.id,
+            service_name="google_drive",
+            encrypted_access_token=encrypt_token("token"),
+        )
+        db_session.add(connection)
+        db_session.commit()
+        return connection
+
+    @staticmethod
+    def _area(area_id, user_id, action, params=None):
+        area = Mock()
+        area.id = area_id
+        area.user_id = user_id
+        area.trigger_action = action
+        area.trigger_params = params or {}
+        return area
 
-    def test_is_google_drive_scheduler_running_true(self):
-        """Test scheduler running check when running."""
-        mock_task = Mock()
-        mock_task.done.return_value = False
-
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", mock_task):
-            assert is_google_drive_scheduler_running() is True
+    @pytest.mark.asyncio
+    async def test_trigger_source_new_file_initializes_then_emits(self, db_session, connection):
+        """Test new_file polls initialize the page token, then emit unseen files."""
+        clear_google_drive_seen_state()
+        mock_area = self._area("area-1", connection.user_id, "new_file")
+        source = GoogleDriveTriggerSource()
+        now = datetime.now(timezone.utc)
 
-    def test_is_google_drive_scheduler_running_done_task(self):
-        """Test scheduler running check with done task."""
-        mock_task = Mock()
-        mock_task.done.return_value = True
+        changes = [
+            {"file": {"id": "file1", "name": "a.txt"}, "removed": False},
+            {"file": {"id": "file2", "name": "b.txt", "trashed": True}, "removed": False},
+        ]
+        with patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._get_drive_service",
+            return_value=Mock(),
+        ), patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._get_start_page_token",
+            return_value="token-1",
+        ), patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._fetch_changes",
+            return_value=(changes, "token-2"),
+        ) as mock_fetch_changes:
+            assert await source.poll(db_session, [mock_area], now) == []
+            events = await source.poll(db_session, [mock_area], now)
+
+        assert mock_fetch_changes.call_args[0][1] == "token-1"
+        assert get_sync_cursor(db_session, connection.id, DRIVE_CHANGES_CURSOR).value == "token-2"
+        assert [event.payload["id"] for event in events] == ["file1"]
+        assert events[0].event_id is None
+
+        with patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._execute_drive_trigger",
+            new_callable=AsyncMock,
+        ) as mock_execute:
+            await source.dispatch(db_session, events[0], now)
+
+        mock_execute.assert_awaited_once()
+        from app.integrations.simple_plugins.google_drive_scheduler import _seen_files
+        assert _seen_files.unseen(db_session, "area-1", ["file1", "file2"]) == {"file2"}
+        clear_google_drive_seen_state()
 
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", mock_task):
-            assert is_google_drive_scheduler_running() is False
+    @pytest.mark.asyncio
+    async def test_trigger_source_fans_changes_out_to_user_areas(self, db_session, connection):
+        """Test a user's areas share one change feed drain and one listing per kind."""
+        clear_google_drive_seen_state()
+        set_sync_cursor(db_session, connection.id, DRIVE_CHANGES_CURSOR, "token-1")
+        areas = [
+            self._area("new", connection.user_id, "new_file"),
+            self._area("modified", connection.user_id, "file_modified"),
+            self._area("trashed", connection.user_id, "file_trashed"),
+            self._area("folder-a", connection.user_id, "file_in_folder", {"folder_id": "f1"}),
+            self._area("folder-b", connection.user_id, "file_in_folder", {"folder_id": "f1"}),
+        ]
+        changes = [
+            {"file": {"id": "created", "createdTime": "t1", "modifiedTime": "t1"}},
+            {"file": {"id": "edited", "createdTime": "t0", "modifiedTime": "t1"}},
+            {"file": {"id": "binned", "trashed": True}},
+            {"fileId": "deleted", "removed": True},
+        ]
+        source = GoogleDriveTriggerSource()
+        assert source.group_key(areas[0]) == source.group_key(areas[1])
+
+        with patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._get_drive_service",
+            return_value=Mock(),
+        ) as mock_get_service, patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._fetch_changes",
+            return_value=(changes, "token-2"),
+        ) as mock_fetch_changes, patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._fetch_files_in_folder",
+            return_value=[{"id": "in-folder"}],
+        ) as mock_fetch_folder:
+            events = await source.poll(db_session, areas, datetime.now(timezone.utc))
+
+        mock_get_service.assert_called_once()
+        mock_fetch_changes.assert_called_once()
+        mock_fetch_folder.assert_called_once()
+        assert [(event.area.id, event.payload["id"]) for event in events] == [
+            ("new", "created"),
+            ("new", "edited"),
+            ("modified", "edited"),
+            ("trashed", "binned"),
+            ("folder-a", "in-folder"),
+            ("folder-b", "in-folder"),
+        ]
+        clear_google_drive_seen_state()
 
     @pytest.mark.asyncio
-    async def test_start_google_drive_scheduler(self):
-        """Test starting the scheduler."""
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", None):
-            # Mock the task creation
-            mock_task = Mock()
-            with patch("asyncio.create_task", return_value=mock_task):
-                start_google_drive_scheduler()
-                # Scheduler should be started
-                # This is a simple test - full async testing would require more setup
-
-    def test_stop_google_drive_scheduler_not_running(self):
-        """Test stopping scheduler when not running."""
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", None):
-            stop_google_drive_scheduler()
-            # Should complete without error
-
-    def test_stop_google_drive_scheduler_running(self):
-        """Test stopping running scheduler."""
-        mock_task = Mock()
-        mock_task.done.return_value = False
-        mock_task.cancel = Mock()
-
-        with patch("app.integrations.simple_plugins.google_drive_scheduler._google_drive_scheduler_task", mock_task):
-            stop_google_drive_scheduler()
-            mock_task.cancel.assert_called_once()
+    async def test_trigger_source_skips_unavailable_service(self):
+        """Test areas without a Drive connection produce no events."""
+        mock_area = Mock()
+        mock_area.id = "area-2"
+        mock_area.trigger_action = "new_file"
+
+        with patch(
+            "app.integrations.simple_plugins.google_drive_scheduler._get_drive_service",
+            return_value=None,
+        ):
+            events = await GoogleDriveTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        assert events == []
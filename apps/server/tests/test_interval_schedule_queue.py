@@ -0,0 +1,240 @@
+"""Tests for the interval scheduler's due-time priority queue."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from app.integrations.simple_plugins import scheduler
+from app.integrations.simple_plugins.scheduler import (
+    IntervalScheduleQueue,
+    _claim_due_areas,
+    clear_last_run_state,
+    get_interval_schedule,
+    get_interval_seconds,
+    rebase_next_run_at,
+    refresh_area_schedule,
+    remove_area_schedule,
+)
+from app.models.area import Area
+from app.models.user import User
+
+
+def _make_area(interval=60, enabled=True, service="time", action="every_interval"):
+    area = Mock()
+    area.id = uuid.uuid4()
+    area.enabled = enabled
+    area.trigger_service = service
+    area.trigger_action = action
+    area.trigger_params = {"interval_seconds": interval}
+    area.next_run_at = None
+    return area
+
+
+def _create_interval_area(db_session, user, name, interval=60, next_run_at=None, enabled=True):
+    area = Area(
+        user_id=user.id,
+        name=name,
+        enabled=enabled,
+        trigger_service="time",
+        trigger_action="every_interval",
+        reaction_service="debug",
+        reaction_action="log",
+        trigger_params={"interval_seconds": interval},
+        next_run_at=next_run_at,
+    )
+    db_session.add(area)
+    db_session.commit()
+    return area
+
+
+@pytest.fixture(autouse=True)
+def _clean_schedule():
+    clear_last_run_state()
+    yield
+    clear_last_run_state()
+
+
+class TestIntervalScheduleQueue:
+    """Test heap ordering and lazy invalidation."""
+
+    def test_pop_due_returns_only_due_in_order(self):
+        queue = IntervalScheduleQueue()
+        queue.schedule("b", 20.0)
+        queue.schedule("a", 10.0)
+        queue.schedule("c", 30.0)
+
+        assert queue.next_due_at() == 10.0
+        assert queue.pop_due(25.0) == ["a", "b"]
+        assert queue.next_due_at() == 30.0
+        assert len(queue) == 1
+
+    def test_reschedule_invalidates_previous_entry(self):
+        queue = IntervalScheduleQueue()
+        queue.schedule("a", 10.0)
+        queue.schedule("a", 50.0)
+
+        assert queue.pop_due(20.0) == []
+        assert queue.get("a") == 50.0
+        assert queue.pop_due(50.0) == ["a"]
+
+    def test_remove_and_retain(self):
+        queue = IntervalScheduleQueue()
+        queue.schedule("a", 10.0)
+        queue.schedule("b", 20.0)
+        queue.schedule("c", 30.0)
+
+        queue.remove("a")
+        queue.retain({"c"})
+
+        assert "a" not in queue
+        assert "b" not in queue
+        assert queue.next_due_at() == 30.0
+
+    def test_empty_queue(self):
+        queue = IntervalScheduleQueue()
+        assert queue.next_due_at() is None
+        assert queue.pop_due(100.0) == []
+
+    @pytest.mark.asyncio
+    async def test_earlier_entry_wakes_bound_loop(self):
+        queue = IntervalScheduleQueue()
+        changed = queue.bind(asyncio.get_running_loop())
+        queue.schedule("a", 100.0)
+        changed.clear()
+
+        # Later entries do not change the wake-up time
+        queue.schedule("b", 200.0)
+        assert not changed.is_set()
+
+        # Scheduling from another thread sets the event via the loop
+        await asyncio.to_thread(queue.schedule, "c", 50.0)
+        await asyncio.wait_for(changed.wait(), timeout=1)
+        queue.unbind()
+
+
+class TestScheduleHooks:
+    """Test the hooks called by the area service."""
+
+    def test_get_interval_seconds_sanitizes(self):
+        assert get_interval_seconds(_make_area(interval=30)) == 30
+        assert get_interval_seconds(_make_area(interval="bad")) == 60
+        assert get_interval_seconds(_make_area(interval=-5)) == 60
+        assert get_interval_seconds(_make_area(interval=0)) == 1
+
+    def test_refresh_schedules_new_area_immediately(self):
+        area = _make_area()
+        refresh_area_schedule(area)
+
+        due_at = get_interval_schedule().get(str(area.id))
+        assert due_at is not None
+        assert due_at <= datetime.now(timezone.utc).timestamp()
+
+    def test_refresh_uses_last_run(self):
+        area = _make_area(interval=120)
+        last_run = datetime.now(timezone.utc) - timedelta(seconds=20)
+        scheduler._last_run_by_area_id[str(area.id)] = last_run
+
+        refresh_area_schedule(area)
+
+        assert get_interval_schedule().get(str(area.id)) == pytest.approx(
+            last_run.timestamp() + 120
+        )
+
+    def test_refresh_removes_disabled_or_non_interval_area(self):
+        area = _make_area()
+        refresh_area_schedule(area)
+
+        area.enabled = False
+        refresh_area_schedule(area)
+        assert str(area.id) not in get_interval_schedule()
+
+        other = _make_area(service="gmail", action="new_email")
+        refresh_area_schedule(other)
+        assert str(other.id) not in get_interval_schedule()
+
+    def test_remove_area_schedule(self):
+        area = _make_area()
+        refresh_area_schedule(area)
+        scheduler._last_run_by_area_id[str(area.id)] = datetime.now(timezone.utc)
+
+        remove_area_schedule(str(area.id))
+
+        assert str(area.id) not in get_interval_schedule()
+        assert str(area.id) not in scheduler._last_run_by_area_id
+
+    def test_sync_schedule_keeps_existing_due_times(self):
+        kept = _make_area()
+        dropped = _make_area()
+        get_interval_schedule().schedule(str(kept.id), 500.0)
+        get_interval_schedule().schedule(str(dropped.id), 600.0)
+        new = _make_area()
+
+        scheduler._sync_schedule([kept, new], now=1000.0)
+
+        schedule = get_interval_schedule()
+        assert schedule.get(str(kept.id)) == 500.0
+        assert schedule.get(str(new.id)) == 1000.0
+        assert str(dropped.id) not in schedule
+
+
+class TestClaimDueAreas:
+    """Test persisted next_run_at leasing."""
+
+    @pytest.fixture
+    def user(self, db_session):
+        user = User(email="claim@example.com", hashed_password="test", is_confirmed=True)
+        db_session.add(user)
+        db_session.commit()
+        return user
+
+    def test_claims_due_areas_and_advances_next_run(self, db_session, user):
+        now = datetime.now(timezone.utc)
+        never_run = _create_interval_area(db_session, user, "never", interval=30)
+        overdue = _create_interval_area(
+            db_session, user, "overdue", interval=60, next_run_at=now - timedelta(seconds=5)
+        )
+        _create_interval_area(
+            db_session, user, "future", next_run_at=now + timedelta(minutes=5)
+        )
+        _create_interval_area(db_session, user, "disabled", enabled=False)
+
+        claimed = _claim_due_areas(db_session, now, limit=10)
+
+        assert {a.id for a in claimed} == {never_run.id, overdue.id}
+        db_session.refresh(never_run)
+        db_session.refresh(overdue)
+        assert scheduler._as_utc(never_run.next_run_at) == now + timedelta(seconds=30)
+        assert scheduler._as_utc(overdue.next_run_at) == now + timedelta(seconds=60)
+
+        # A second claim at the same instant finds nothing left to run
+        assert _claim_due_areas(db_session, now, limit=10) == []
+
+    def test_claim_respects_batch_limit(self, db_session, user):
+        now = datetime.now(timezone.utc)
+        for i in range(3):
+            _create_interval_area(db_session, user, f"area-{i}")
+
+        assert len(_claim_due_areas(db_session, now, limit=2)) == 2
+        assert len(_claim_due_areas(db_session, now, limit=2)) == 1
+
+    def test_rebase_next_run_at_keeps_last_run(self):
+        area = _make_area(interval=300)
+        last_run = datetime.now(timezone.utc)
+        area.next_run_at = last_run + timedelta(seconds=60)
+
+        rebase_next_run_at(area, previous_interval_seconds=60)
+
+        assert area.next_run_at == last_run + timedelta(seconds=300)
+
+    def test_refresh_prefers_persisted_next_run(self):
+        area = _make_area()
+        area.next_run_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+        refresh_area_schedule(area)
+
+        assert get_interval_schedule().get(str(area.id)) == area.next_run_at.timestamp()
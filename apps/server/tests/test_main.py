@@ -57,7 +57,7 @@ class TestMainApplication:
         with patch("main.verify_connection") as mock_verify, \
              patch("main.run_migrations") as mock_migrations, \
              patch("main.start_scheduler") as mock_start_scheduler, \
-             patch("main.start_gmail_scheduler") as mock_start_gmail_scheduler, \
+             patch("main.start_polling_engine") as mock_start_polling_engine, \
              patch("main.logger") as mock_logger:
 
             # Use a new event loop for the test
@@ -70,7 +70,7 @@ class TestMainApplication:
                 mock_verify.assert_called_once()
                 mock_migrations.assert_called_once()
                 mock_start_scheduler.assert_called_once()
-                mock_start_gmail_scheduler.assert_called_once()
+                mock_start_polling_engine.assert_called_once()
                 assert mock_app.state.database_url is not None
             finally:
                 loop.close()
@@ -116,7 +116,7 @@ class TestMainApplication:
         with patch("main.verify_connection") as mock_verify, \
              patch("main.run_migrations") as mock_migrations, \
              patch("main.start_scheduler") as mock_start_scheduler, \
-             patch("main.start_gmail_scheduler") as mock_start_gmail_scheduler, \
+             patch("main.start_polling_engine") as mock_start_polling_engine, \
              patch("main.logger") as mock_logger:
             
             mock_verify.return_value = None
@@ -134,21 +134,21 @@ class TestMainApplication:
         mock_app.state = Mock()
         
         with patch("main.stop_scheduler") as mock_stop_scheduler, \
-             patch("main.stop_gmail_scheduler") as mock_stop_gmail_scheduler, \
+             patch("main.stop_polling_engine") as mock_stop_polling_engine, \
              patch("main.logger") as mock_logger:
             
             # Simulate startup first
             with patch("main.verify_connection"), \
                  patch("main.run_migrations"), \
                  patch("main.start_scheduler"), \
-                 patch("main.start_gmail_scheduler"):
+                 patch("main.start_polling_engine"):
                 
                 async with lifespan(mock_app):
                     pass
             
             # Shutdown should be called automatically
             mock_stop_scheduler.assert_called_once()
-            mock_stop_gmail_scheduler.assert_called_once()
+            mock_stop_polling_engine.assert_called_once()
 
     def test_about_endpoint(self):
         """Test the about.json endpoint."""
@@ -241,7 +241,7 @@ class TestMainApplication:
         with patch("main.verify_connection") as mock_verify, \
              patch("main.run_migrations") as mock_migrations, \
              patch("main.start_scheduler") as mock_start_scheduler, \
-             patch("main.start_gmail_scheduler") as mock_start_gmail_scheduler, \
+             patch("main.start_polling_engine") as mock_start_polling_engine, \
              patch("main.logger") as mock_logger:
             
             mock_verify.side_effect = Exception("Startup failed")
@@ -260,9 +260,9 @@ class TestMainApplication:
         with patch("main.verify_connection") as mock_verify, \
              patch("main.run_migrations") as mock_migrations, \
              patch("main.start_scheduler") as mock_start_scheduler, \
-             patch("main.start_gmail_scheduler") as mock_start_gmail_scheduler, \
+             patch("main.start_polling_engine") as mock_start_polling_engine, \
              patch("main.stop_scheduler") as mock_stop_scheduler, \
-             patch("main.stop_gmail_scheduler") as mock_stop_gmail_scheduler, \
+             patch("main.stop_polling_engine") as mock_stop_polling_engine, \
              patch("main.logger") as mock_logger:
             
             # Successful startup
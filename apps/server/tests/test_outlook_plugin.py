@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import uuid
 from unittest.mock import Mock, patch, AsyncMock
 
 import pytest
@@ -13,6 +14,7 @@ from app.integrations.simple_plugins.outlook_plugin import (
     mark_as_read_handler,
     forward_email_handler,
 )
+from app.services.credential_manager import ConnectionCredentials
 
 
 class TestOutlookPlugin:
@@ -26,24 +28,24 @@ class TestOutlookPlugin:
         area.user_id = "test-user-id"
         area.id = "test-area-id"
 
-        # Mock database and service connection
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = "encrypted_access_token"
-        mock_connection.encrypted_refresh_token = "encrypted_refresh_token"
-        mock_connection.expires_at = None
+        credentials = ConnectionCredentials(
+            connection_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            service_name="outlook",
+            access_token="decrypted_access_token",
+            refresh_token="decrypted_refresh_token",
+        )
 
-        with patch("app.integrations.simple_plugins.outlook_plugin.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.outlook_utils.decrypt_token") as mock_decrypt, \
+        with patch("app.integrations.simple_plugins.outlook_plugin.credential_manager.get") as mock_get_creds, \
              patch("app.integrations.simple_plugins.outlook_plugin.SessionLocal"):
 
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = ["decrypted_access_token", "decrypted_refresh_token"]
+            mock_get_creds.return_value = credentials
 
             result = await _get_outlook_client(area, mock_db)
 
             assert isinstance(result, httpx.AsyncClient)
-            mock_get_conn.assert_called_once_with(mock_db, "test-user-id", "outlook")
+            mock_get_creds.assert_called_once_with(mock_db, "test-user-id", "outlook")
 
     @pytest.mark.asyncio
     async def test_get_outlook_client_no_connection(self):
@@ -52,8 +54,8 @@ class TestOutlookPlugin:
         area.user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.outlook_plugin.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.outlook_plugin.credential_manager.get") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             with pytest.raises(Exception, match="Outlook service connection not found"):
                 await _get_outlook_client(area, mock_db)
@@ -3,45 +3,60 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch, AsyncMock
 
 import pytest
 import httpx
 
+from app.core.config import settings
+from app.core.encryption import encrypt_token
 from app.integrations.simple_plugins.outlook_scheduler import (
+    OUTLOOK_DELTA_CURSOR,
     _get_outlook_client,
+    _fetch_delta,
     _fetch_messages,
     _build_outlook_filter,
-    start_outlook_scheduler,
-    stop_outlook_scheduler,
+    _sync_delta,
+    OutlookTriggerSource,
 )
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.credential_manager import ConnectionCredentials
+from app.services.sync_cursors import get_sync_cursor, set_sync_cursor
 
 
 class TestOutlookScheduler:
     """Test Outlook scheduler functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _list_sync(self):
+        with patch.object(settings, "outlook_delta_sync", False):
+            yield
+
     @pytest.mark.asyncio
     async def test_get_outlook_client_success(self):
         """Test successful Outlook client creation."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = "encrypted_access_token"
-        mock_connection.encrypted_refresh_token = "encrypted_refresh_token"
-        mock_connection.expires_at = None
-
-        with patch("app.integrations.simple_plugins.outlook_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.outlook_utils.decrypt_token") as mock_decrypt:
+        credentials = ConnectionCredentials(
+            connection_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            service_name="outlook",
+            access_token="decrypted_access_token",
+            refresh_token="decrypted_refresh_token",
+        )
 
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.side_effect = ["decrypted_access_token", "decrypted_refresh_token"]
+        with patch("app.integrations.simple_plugins.outlook_scheduler.credential_manager.get") as mock_get_creds:
+            mock_get_creds.return_value = credentials
 
             result = await _get_outlook_client(user_id, mock_db)
 
             assert result is not None
             assert isinstance(result, httpx.AsyncClient)
-            mock_get_conn.assert_called_once_with(mock_db, user_id, "outlook")
+            assert result.headers["Authorization"] == "Bearer decrypted_access_token"
+            mock_get_creds.assert_called_once_with(mock_db, user_id, "outlook")
 
     @pytest.mark.asyncio
     async def test_get_outlook_client_no_connection(self):
@@ -49,8 +64,8 @@ class TestOutlookScheduler:
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.outlook_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.outlook_scheduler.credential_manager.get") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             result = await _get_outlook_client(user_id, mock_db)
 
@@ -299,3 +314,290 @@ class TestOutlookScheduler:
         assert params["$filter"] == "isRead eq false"
         assert "$top" in params
         assert "$orderby" in params
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_poll_returns_events_and_closes_client(self):
+        """Test Outlook trigger source emits one event per message and closes its client."""
+        mock_area = Mock()
+        mock_area.id = "area-id"
+        mock_area.user_id = "user-id"
+        mock_area.name = "Test Area"
+        mock_area.trigger_action = "new_unread_email"
+        mock_area.trigger_params = {}
+
+        mock_client = AsyncMock()
+        messages = [{"id": "m1"}, {"id": "m2"}]
+
+        with patch(
+            "app.integrations.simple_plugins.outlook_scheduler._get_outlook_client",
+            new_callable=AsyncMock,
+            return_value=mock_client,
+        ), patch(
+            "app.integrations.simple_plugins.outlook_scheduler._fetch_messages",
+            new_callable=AsyncMock,
+            return_value=messages,
+        ) as mock_fetch:
+            events = await OutlookTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        assert [event.event_id for event in events] == ["m1", "m2"]
+        assert mock_fetch.call_args[0][1] == "receivedDateTime ge 1900-01-01"
+        mock_client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_fetches_once_per_user(self):
+        """Test a user's Outlook areas share one client and one fetch per message stream."""
+
+        def _area(area_id, action, params=None):
+            area = Mock()
+            area.id = area_id
+            area.user_id = "user-id"
+            area.name = area_id
+            area.trigger_action = action
+            area.trigger_params = params or {}
+            return area
+
+        areas = [
+            _area("new", "new_email"),
+            _area("sender", "new_email_from_sender", {"sender_email": "Boss@Example.com"}),
+            _area("unread", "new_unread_email"),
+            _area("flagged", "email_flagged"),
+        ]
+        recent = [
+            {"id": "m1", "isRead": True, "from": {"emailAddress": {"address": "boss@example.com"}}},
+            {"id": "m2", "isRead": False, "from": {"emailAddress": {"address": "other@example.com"}}},
+        ]
+        flagged = [{"id": "m3", "flag": {"flagStatus": "flagged"}}]
+        mock_client = AsyncMock()
+
+        async def _fetch(client, filter_query):
+            return flagged if "flagStatus" in filter_query else recent
+
+        source = OutlookTriggerSource()
+        assert source.group_key(areas[0]) == source.group_key(areas[3]) == "user-id"
+
+        with patch(
+            "app.integrations.simple_plugins.outlook_scheduler._get_outlook_client",
+            new_callable=AsyncMock,
+            return_value=mock_client,
+        ) as mock_get_client, patch(
+            "app.integrations.simple_plugins.outlook_scheduler._fetch_messages",
+            side_effect=_fetch,
+        ) as mock_fetch:
+            events = await source.poll(Mock(), areas, datetime.now(timezone.utc))
+
+        mock_get_client.assert_awaited_once()
+        assert mock_fetch.call_count == 2
+        assert [(event.area.id, event.event_id) for event in events] == [
+            ("new", "m1"),
+            ("new", "m2"),
+            ("sender", "m1"),
+            ("unread", "m2"),
+            ("flagged", "m3"),
+        ]
+        mock_client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_poll_closes_client_on_error(self):
+        """Test Outlook trigger source closes its client when fetching fails."""
+        mock_area = Mock()
+        mock_area.trigger_action = "new_email"
+        mock_area.trigger_params = {}
+        mock_client = AsyncMock()
+
+        with patch(
+            "app.integrations.simple_plugins.outlook_scheduler._get_outlook_client",
+            new_callable=AsyncMock,
+            return_value=mock_client,
+        ), patch(
+            "app.integrations.simple_plugins.outlook_scheduler._fetch_messages",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("boom"),
+        ):
+            with pytest.raises(RuntimeError):
+                await OutlookTriggerSource().poll(Mock(), [mock_area], datetime.now(timezone.utc))
+
+        mock_client.aclose.assert_awaited_once()
+
+
+def _graph_response(url: str, payload: dict | None = None, status_code: int = 200) -> httpx.Response:
+    return httpx.Response(status_code, json=payload or {}, request=httpx.Request("GET", url))
+
+
+class TestOutlookDeltaSync:
+    """Test incremental Outlook sync through Microsoft Graph delta queries."""
+
+    @pytest.fixture
+    def connection(self, db_session):
+        user = User(email="delta@example.com", hashed_password="test", is_confirmed=True)
+        db_session.add(user)
+        db_session.commit()
+        connection = ServiceConnection(
+            user_id=user.id,
+            service_name="outlook",
+            encrypted_access_token=encrypt_token("token"),
+        )
+        db_session.add(connection)
+        db_session.commit()
+        return connection
+
+    @pytest.mark.asyncio
+    async def test_fetch_delta_follows_next_links(self):
+        client = AsyncMock()
+        client.get.side_effect = [
+            _graph_response("delta", {
+                "value": [{"id": "m1"}, {"id": "m0", "@removed": {"reason": "deleted"}}],
+                "@odata.nextLink": "https://graph/next",
+            }),
+            _graph_response("https://graph/next", {
+                "value": [{"id": "m2"}],
+                "@odata.deltaLink": "https://graph/delta?token=2",
+            }),
+        ]
+
+        messages, delta_link = await _fetch_delta(client, "delta", {"$select": "id"})
+
+        assert [message["id"] for message in messages] == ["m1", "m2"]
+        assert delta_link == "https://graph/delta?token=2"
+        assert client.get.call_args_list[0].kwargs["params"] == {"$select": "id"}
+        assert client.get.call_args_list[1].args[0] == "https://graph/next"
+        assert client.get.call_args_list[1].kwargs["params"] is None
+
+    @pytest.mark.asyncio
+    async def test_first_sync_only_records_delta_link(self, db_session, connection):
+        client = AsyncMock()
+        client.get.return_value = _graph_response("delta", {
+            "value": [{"id": "m1"}],
+            "@odata.deltaLink": "https://graph/delta?token=1",
+        })
+
+        messages = await _sync_delta(client, db_session, connection.user_id)
+
+        assert messages == []
+        assert client.get.call_args.args[0] == "/me/mailFolders/inbox/messages/delta"
+        assert client.get.call_args.kwargs["params"]["$filter"].startswith("receivedDateTime ge ")
+        cursor = get_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR)
+        assert cursor.value == "https://graph/delta?token=1"
+
+    @pytest.mark.asyncio
+    async def test_sync_returns_changes_and_moves_cursor(self, db_session, connection):
+        set_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR, "https://graph/delta?token=1")
+        client = AsyncMock()
+        client.get.return_value = _graph_response("delta", {
+            "value": [
+                {"id": "m2", "receivedDateTime": "2025-11-03T10:00:00Z"},
+                {"id": "m1", "receivedDateTime": "2025-11-03T09:00:00Z"},
+            ],
+            "@odata.deltaLink": "https://graph/delta?token=2",
+        })
+
+        messages = await _sync_delta(client, db_session, connection.user_id)
+
+        assert [message["id"] for message in messages] == ["m1", "m2"]
+        assert client.get.call_args.args[0] == "https://graph/delta?token=1"
+        cursor = get_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR)
+        assert cursor.value == "https://graph/delta?token=2"
+
+    @pytest.mark.asyncio
+    async def test_expired_delta_token_resyncs_since_last_sync(self, db_session, connection):
+        cursor = set_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR, "https://graph/delta?token=1")
+        last_sync = cursor.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+        client = AsyncMock()
+        client.get.side_effect = [
+            _graph_response("https://graph/delta?token=1", status_code=410),
+            _graph_response("delta", {
+                "value": [{"id": "m9"}],
+                "@odata.deltaLink": "https://graph/delta?token=9",
+            }),
+        ]
+
+        messages = await _sync_delta(client, db_session, connection.user_id)
+
+        assert [message["id"] for message in messages] == ["m9"]
+        assert client.get.call_args.kwargs["params"]["$filter"] == f"receivedDateTime ge {last_sync}"
+        cursor = get_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR)
+        assert cursor.value == "https://graph/delta?token=9"
+
+    @pytest.mark.asyncio
+    async def test_other_delta_errors_propagate(self, db_session, connection):
+        set_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR, "https://graph/delta?token=1")
+        client = AsyncMock()
+        client.get.return_value = _graph_response("delta", status_code=503)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await _sync_delta(client, db_session, connection.user_id)
+
+        cursor = get_sync_cursor(db_session, connection.id, OUTLOOK_DELTA_CURSOR)
+        assert cursor.value == "https://graph/delta?token=1"
+
+    @pytest.mark.asyncio
+    async def test_trigger_source_uses_delta_for_recent_stream(self, db_session):
+        def _area(area_id, action):
+            area = Mock()
+            area.id = area_id
+            area.user_id = "user-id"
+            area.name = area_id
+            area.trigger_action = action
+            area.trigger_params = {}
+            return area
+
+        areas = [_area("new", "new_email"), _area("flagged", "email_flagged")]
+        mock_client = AsyncMock()
+        flagged = [{"id": "m3", "flag": {"flagStatus": "flagged"}}]
+
+        with patch(
+            "app.integrations.simple_plugins.outlook_scheduler._get_outlook_client",
+            new_callable=AsyncMock,
+            return_value=mock_client,
+        ), patch.object(settings, "outlook_delta_sync", True), patch(
+            "app.integrations.simple_plugins.outlook_scheduler._sync_delta",
+            new_callable=AsyncMock,
+            return_value=[{"id": "m1"}],
+        ) as mock_sync, patch(
+            "app.integrations.simple_plugins.outlook_scheduler._fetch_messages",
+            new_callable=AsyncMock,
+            return_value=flagged,
+        ) as mock_fetch:
+            source = OutlookTriggerSource()
+            events = await source.poll(db_session, areas, datetime.now(timezone.utc))
+
+        mock_sync.assert_awaited_once()
+        mock_fetch.assert_awaited_once()
+        assert mock_fetch.call_args[0][1] == "flag/flagStatus eq 'flagged'"
+        assert [(event.area.id, event.event_id) for event in events] == [("new", "m1"), ("flagged", "m3")]
+        # The delta cursor marks where the areas start, so their first changes are dispatched
+        assert source.seen.is_primed(db_session, "new")
+
+    @pytest.mark.asyncio
+    async def test_delta_sync_keeps_first_poll_priming_for_flagged_areas(self, db_session):
+        from app.integrations.simple_plugins.polling_engine import PollingEngine
+
+        area = Mock()
+        area.id = "flagged"
+        area.user_id = "user-id"
+        area.name = "flagged"
+        area.trigger_action = "email_flagged"
+        area.trigger_params = {}
+        flagged = [
+            {"id": "old1", "flag": {"flagStatus": "flagged"}},
+            {"id": "old2", "flag": {"flagStatus": "flagged"}},
+        ]
+
+        with patch(
+            "app.integrations.simple_plugins.outlook_scheduler._get_outlook_client",
+            new_callable=AsyncMock,
+            return_value=AsyncMock(),
+        ), patch.object(settings, "outlook_delta_sync", True), patch(
+            "app.integrations.simple_plugins.outlook_scheduler._sync_delta",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "app.integrations.simple_plugins.outlook_scheduler._fetch_messages",
+            new_callable=AsyncMock,
+            return_value=flagged,
+        ):
+            source = OutlookTriggerSource()
+            events = await source.poll(db_session, [area], datetime.now(timezone.utc))
+
+        # Already flagged messages only prime the area, they are not dispatched
+        assert PollingEngine._unseen_events(db_session, source, [area], events) == []
+        assert source.seen.is_primed(db_session, "flagged")
@@ -0,0 +1,327 @@
+"""Tests for the shared trigger polling engine."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.integrations.simple_plugins.polling_engine import (
+    PollingEngine,
+    TriggerEvent,
+    TriggerSource,
+    get_polling_engine,
+    is_polling_engine_running,
+    notify_polling_engine,
+    start_polling_engine,
+    stop_polling_engine,
+)
+from app.services.seen_events import SeenEventStore
+
+
+def _area(area_id: str, user_id: str = "user-1"):
+    return SimpleNamespace(id=area_id, user_id=user_id)
+
+
+class FakeSource(TriggerSource):
+    """Trigger source returning canned events."""
+
+    service = "fake"
+    name = "Fake"
+
+    def __init__(self, areas, events_by_area=None, interval: float = 60.0, dedupe: bool = True):
+        self.areas = areas
+        self.events_by_area = events_by_area or {}
+        self.interval = interval
+        self.seen = SeenEventStore("fake") if dedupe else None
+        self.polled: list[list[str]] = []
+        self.dispatched: list[str] = []
+        self.error: Exception | None = None
+
+    @property
+    def poll_interval(self) -> float:
+        return self.interval
+
+    def fetch_areas(self, db):
+        return self.areas
+
+    async def poll(self, db, areas, now):
+        self.polled.append([area.id for area in areas])
+        if self.error is not None:
+            raise self.error
+        return [
+            TriggerEvent(area, payload, event_id)
+            for area in areas
+            for payload, event_id in self.events_by_area.get(area.id, [])
+        ]
+
+    async def dispatch(self, db, event, now):
+        self.dispatched.append(event.payload)
+
+
+@pytest.fixture(autouse=True)
+def _session_local(db_session):
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False, future=True)
+    with patch("app.db.session.SessionLocal", factory):
+        yield
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _stop_engine():
+    yield
+    stop_polling_engine()
+    await asyncio.sleep(0)
+
+
+class TestDedupe:
+    """Test engine-managed seen state."""
+
+    @pytest.mark.asyncio
+    async def test_first_poll_primes_seen_set_without_dispatching(self, db_session):
+        source = FakeSource([_area("a")], {"a": [("m1", "m1"), ("m2", "m2")]})
+        engine = PollingEngine([source])
+
+        await engine.run_source(source)
+
+        assert source.dispatched == []
+        assert source.seen.is_primed(db_session, "a")
+        assert source.seen.unseen(db_session, "a", ["m1", "m2", "m3"]) == {"m3"}
+
+    @pytest.mark.asyncio
+    async def test_empty_first_poll_primes_so_the_next_event_dispatches(self, db_session):
+        source = FakeSource([_area("a")])
+        engine = PollingEngine([source])
+        await engine.run_source(source)
+        assert source.seen.is_primed(db_session, "a")
+
+        source.events_by_area["a"] = [("m1", "m1")]
+        await engine.run_source(source)
+
+        assert source.dispatched == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_sources_can_keep_empty_polls_from_priming(self, db_session):
+        class ListingSource(FakeSource):
+            def primes_when_empty(self, area):
+                return False
+
+        source = ListingSource([_area("a")])
+        engine = PollingEngine([source])
+        await engine.run_source(source)
+        assert not source.seen.is_primed(db_session, "a")
+
+        source.events_by_area["a"] = [("m1", "m1")]
+        await engine.run_source(source)
+
+        assert source.dispatched == []
+        assert source.seen.is_primed(db_session, "a")
+
+    @pytest.mark.asyncio
+    async def test_only_unseen_events_are_dispatched(self, db_session):
+        source = FakeSource([_area("a")], {"a": [("m1", "m1")]})
+        engine = PollingEngine([source])
+        await engine.run_source(source)
+
+        source.events_by_area["a"] = [("m2", "m2"), ("m1", "m1"), ("m2", "m2")]
+        await engine.run_source(source)
+
+        assert source.dispatched == ["m2"]
+        assert source.seen.unseen(db_session, "a", ["m1", "m2"]) == set()
+
+    @pytest.mark.asyncio
+    async def test_events_dispatched_before_a_failure_stay_seen(self, db_session):
+        class FailingSource(FakeSource):
+            async def dispatch(self, db, event, now):
+                if event.payload == "m3":
+                    raise RuntimeError("dispatch failed")
+                await super().dispatch(db, event, now)
+
+        source = FailingSource([_area("a")], {"a": [("m1", "m1")]})
+        engine = PollingEngine([source])
+        await engine.run_source(source)
+
+        source.events_by_area["a"] = [("m2", "m2"), ("m3", "m3")]
+        await engine.run_source(source)
+
+        assert source.dispatched == ["m2"]
+        assert source.seen.unseen(db_session, "a", ["m2", "m3"]) == {"m3"}
+
+    @pytest.mark.asyncio
+    async def test_seen_state_survives_restart(self):
+        source = FakeSource([_area("a")], {"a": [("m1", "m1")]})
+        await PollingEngine([source]).run_source(source)
+
+        # A new process starts with an empty front cache but the same table
+        restarted = FakeSource([_area("a")], {"a": [("m1", "m1"), ("m2", "m2")]})
+        await PollingEngine([restarted]).run_source(restarted)
+
+        assert restarted.dispatched == ["m2"]
+
+    @pytest.mark.asyncio
+    async def test_events_without_id_bypass_dedupe(self):
+        source = FakeSource([_area("a")], {"a": [("sunny", None)]}, dedupe=False)
+        engine = PollingEngine([source])
+
+        await engine.run_source(source)
+        await engine.run_source(source)
+
+        assert source.dispatched == ["sunny", "sunny"]
+
+
+class TestBackoff:
+    """Test per-group error backoff."""
+
+    @pytest.mark.asyncio
+    async def test_failing_group_is_skipped_until_backoff_expires(self):
+        source = FakeSource([_area("a"), _area("b", user_id="user-2")])
+        source.error = RuntimeError("provider down")
+        engine = PollingEngine([source])
+
+        await engine.run_source(source)
+        assert engine.is_backing_off(source, "a")
+        assert engine.is_backing_off(source, "b")
+
+        source.polled.clear()
+        await engine.run_source(source)
+        assert source.polled == []
+
+    @pytest.mark.asyncio
+    async def test_backoff_grows_and_is_capped(self):
+        source = FakeSource([], interval=10)
+        engine = PollingEngine([source], max_backoff_seconds=35)
+
+        assert engine._record_failure(source, "a") == 20
+        assert engine._record_failure(source, "a") == 35
+        engine._record_success(source, "a")
+        assert not engine.is_backing_off(source, "a")
+        assert engine._record_failure(source, "a") == 20
+
+
+class TestConcurrency:
+    """Test per-user concurrency caps."""
+
+    @pytest.mark.asyncio
+    async def test_per_user_cap_limits_parallel_polls(self):
+        running = 0
+        peak = 0
+
+        class SlowSource(FakeSource):
+            async def poll(self, db, areas, now):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return []
+
+        same_user = SlowSource([_area("a"), _area("b"), _area("c")])
+        await PollingEngine([same_user], per_user_concurrency=1).run_source(same_user)
+        assert peak == 1
+
+        peak = 0
+        other_users = SlowSource([_area("a", "u1"), _area("b", "u2"), _area("c", "u3")])
+        await PollingEngine([other_users], per_user_concurrency=1).run_source(other_users)
+        assert peak == 3
+
+
+class TestEngineLifecycle:
+    """Test the engine task and module-level helpers."""
+
+    @pytest.mark.asyncio
+    async def test_engine_polls_sources_on_their_interval(self):
+        source = FakeSource([_area("a")], {"a": [("m1", None)]}, interval=0.01, dedupe=False)
+        start_polling_engine([source])
+        assert is_polling_engine_running()
+
+        for _ in range(100):
+            if len(source.dispatched) >= 2:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(source.dispatched) >= 2
+        stop_polling_engine()
+        assert not is_polling_engine_running()
+        assert get_polling_engine() is None
+
+    @pytest.mark.asyncio
+    async def test_tick_failure_delays_next_run(self):
+        source = FakeSource([], interval=0.01)
+        engine = PollingEngine([source], max_backoff_seconds=5)
+
+        with patch.object(engine, "run_source", side_effect=RuntimeError("db down")):
+            await engine._tick(source)
+
+        assert engine.is_backing_off(source)
+        assert engine._next_run["fake"] > asyncio.get_running_loop().time()
+
+    def test_start_without_event_loop(self):
+        start_polling_engine([FakeSource([])])
+        assert not is_polling_engine_running()
+
+
+class PushFakeSource(FakeSource):
+    """Fake source whose areas are covered by a per-user push subscription."""
+
+    def push_scope(self, area):
+        return area.user_id
+
+
+class TestPushNotifications:
+    """Test push-triggered polls and reconcile polling of covered groups."""
+
+    @pytest.mark.asyncio
+    async def test_notified_scopes_only_poll_their_groups(self):
+        source = PushFakeSource([_area("a", "u1"), _area("b", "u2")], dedupe=False)
+        engine = PollingEngine([source])
+
+        await engine.run_source(source, scopes={"u2"})
+
+        assert source.polled == [["b"]]
+
+    def test_covered_groups_wait_for_reconcile_poll(self):
+        source = PushFakeSource([])
+        engine = PollingEngine([source])
+        groups = {"a": [_area("a", "u1")], "b": [_area("b", "u2")], "c": [_area("c", "u1")]}
+        engine._polled_at[("fake", "a")] = time.monotonic()
+        engine._polled_at[("fake", "b")] = time.monotonic()
+
+        due = engine._due_groups(source, groups, live_scopes={"u1"})
+
+        # "a" is covered and fresh, "b" has no live subscription, "c" was never polled
+        assert sorted(due) == ["b", "c"]
+
+    def test_covered_groups_are_polled_once_reconcile_is_due(self):
+        source = PushFakeSource([])
+        engine = PollingEngine([source])
+        engine._polled_at[("fake", "a")] = time.monotonic() - settings.push_reconcile_interval_seconds - 1
+
+        due = engine._due_groups(source, {"a": [_area("a", "u1")]}, live_scopes={"u1"})
+
+        assert list(due) == ["a"]
+
+    def test_notify_requires_running_engine(self):
+        source = PushFakeSource([_area("a", "u1")])
+
+        assert not PollingEngine([source]).notify("fake", "u1")
+        assert not notify_polling_engine("fake", "u1")
+
+    @pytest.mark.asyncio
+    async def test_notify_polls_scope_immediately(self):
+        source = PushFakeSource([_area("a", "u1"), _area("b", "u2")], {"a": [("m1", None)]}, interval=3600)
+        start_polling_engine([source])
+
+        assert notify_polling_engine("fake", "u1")
+        assert not notify_polling_engine("unknown", "u1")
+        for _ in range(100):
+            if source.dispatched:
+                break
+            await asyncio.sleep(0.01)
+
+        assert source.polled == [["a"]]
+        assert source.dispatched == ["m1"]
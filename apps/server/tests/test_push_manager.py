@@ -0,0 +1,170 @@
+"""Tests for the push subscription manager."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.encryption import encrypt_token
+from app.integrations.simple_plugins.polling_engine import TriggerSource
+from app.integrations.simple_plugins.push_providers import PushChannel, PushProvider
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.push_manager import PushSubscriptionManager, is_push_manager_running, start_push_manager
+from app.services.push_subscriptions import list_push_subscriptions, subscription_secret
+
+
+class FakeSource(TriggerSource):
+    """Trigger source whose areas are covered by a per-user push scope."""
+
+    service = "fake"
+    name = "Fake"
+
+    def __init__(self, areas):
+        self.areas = areas
+
+    @property
+    def poll_interval(self) -> float:
+        return 60.0
+
+    def fetch_areas(self, db):
+        return self.areas
+
+    def push_scope(self, area):
+        return str(area.user_id)
+
+    async def poll(self, db, areas, now):
+        return []
+
+    async def dispatch(self, db, event, now):
+        pass
+
+
+class FakeProvider(PushProvider):
+    """Push provider recording its calls."""
+
+    service = "fake"
+    name = "Fake"
+    webhook_path = "fake"
+
+    def __init__(self, connection_id):
+        self.connection_id = connection_id
+        self.subscribed: list[str] = []
+        self.renewed: list[str] = []
+        self.unsubscribed: list[str] = []
+        self.error: Exception | None = None
+        self.lifetime = timedelta(days=2)
+
+    async def subscribe(self, db, scope, areas):
+        self.subscribed.append(scope)
+        if self.error is not None:
+            raise self.error
+        return PushChannel(
+            connection_id=self.connection_id,
+            channel_id=f"chan-{scope}-{len(self.subscribed)}",
+            secret="s3cret",
+            expires_at=datetime.now(timezone.utc) + self.lifetime,
+        )
+
+    async def renew(self, db, subscription, areas):
+        self.renewed.append(subscription.scope)
+        return await self.subscribe(db, subscription.scope, areas)
+
+    async def unsubscribe(self, db, subscription):
+        self.unsubscribed.append(subscription.channel_id)
+
+
+@pytest.fixture
+def connection(db_session):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(
+        user_id=user.id, service_name="fake", encrypted_access_token=encrypt_token("access")
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection
+
+
+def _manager(provider, areas):
+    return PushSubscriptionManager(providers=[provider], sources=[FakeSource(areas)], jitter_ratio=0)
+
+
+class TestSyncProvider:
+    """Test subscription lifecycle management."""
+
+    @pytest.mark.asyncio
+    async def test_missing_scopes_are_subscribed_once(self, db_session, connection):
+        provider = FakeProvider(connection.id)
+        manager = _manager(provider, [SimpleNamespace(id="a", user_id="u1"), SimpleNamespace(id="b", user_id="u1")])
+
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        subscriptions = list_push_subscriptions(db_session, "fake")
+        assert provider.subscribed == ["u1"]
+        assert [(sub.scope, sub.channel_id) for sub in subscriptions] == [("u1", "chan-u1-1")]
+        assert subscription_secret(subscriptions[0]) == "s3cret"
+
+    @pytest.mark.asyncio
+    async def test_expiring_subscriptions_are_renewed(self, db_session, connection):
+        provider = FakeProvider(connection.id)
+        provider.lifetime = timedelta(seconds=settings.push_renew_window_seconds / 2)
+        manager = _manager(provider, [SimpleNamespace(id="a", user_id="u1")])
+
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        assert provider.renewed == ["u1"]
+        assert [sub.channel_id for sub in list_push_subscriptions(db_session, "fake")] == ["chan-u1-2"]
+
+    @pytest.mark.asyncio
+    async def test_unwanted_and_dead_subscriptions_are_removed(self, db_session, connection):
+        provider = FakeProvider(connection.id)
+        manager = _manager(provider, [SimpleNamespace(id="a", user_id="u1")])
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        manager.sources["fake"].areas = []
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        assert provider.unsubscribed == ["chan-u1-1"]
+        assert list_push_subscriptions(db_session, "fake") == []
+
+        manager.sources["fake"].areas = [SimpleNamespace(id="a", user_id="u1")]
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc) + timedelta(days=3))
+
+        assert provider.unsubscribed == ["chan-u1-1", "chan-u1-2"]
+        assert [sub.channel_id for sub in list_push_subscriptions(db_session, "fake")] == ["chan-u1-3"]
+
+    @pytest.mark.asyncio
+    async def test_refused_scopes_are_retried_after_backoff(self, db_session, connection):
+        provider = FakeProvider(connection.id)
+        provider.error = RuntimeError("forbidden")
+        manager = _manager(provider, [SimpleNamespace(id="a", user_id="u1")])
+
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+        provider.error = None
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        assert provider.subscribed == ["u1"]
+        assert list_push_subscriptions(db_session, "fake") == []
+
+        manager._retry_after.clear()
+        await manager.sync_provider(db_session, provider, datetime.now(timezone.utc))
+
+        assert len(list_push_subscriptions(db_session, "fake")) == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_is_disabled_without_webhook_base_url(monkeypatch):
+    monkeypatch.setattr(settings, "webhook_base_url", "")
+
+    start_push_manager()
+
+    assert not is_push_manager_running()
@@ -6,6 +6,7 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import pytest
+import pytest_asyncio
 from sqlalchemy.orm import Session
 
 from app.integrations.simple_plugins.scheduler import (
@@ -18,6 +19,15 @@ from app.integrations.simple_plugins.scheduler import (
 )
 from app.models.area import Area
 from app.models.user import User
+from app.services.execution_pool import stop_execution_pool
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _stop_execution_pool():
+    """Stop the execution pool started lazily by the scheduler inside each test loop."""
+    yield
+    stop_execution_pool()
+    await asyncio.sleep(0)
 
 
 class TestSchedulerTask:
@@ -53,7 +63,7 @@ class TestSchedulerTask:
             mock_session_local.return_value = db_session
             
             # Mock execute_area to avoid actual execution
-            with patch("app.integrations.simple_plugins.scheduler.execute_area") as mock_execute:
+            with patch("app.services.step_executor.execute_area_async") as mock_execute:
                 mock_execute.return_value = {
                     "status": "success",
                     "steps_executed": 1,
@@ -61,7 +71,7 @@ class TestSchedulerTask:
                 }
                 
                 # Mock create_execution_log
-                with patch("app.integrations.simple_plugins.scheduler.create_execution_log") as mock_create_log:
+                with patch("app.services.execution_pool.create_execution_log") as mock_create_log:
                     mock_log = Mock()
                     mock_log.status = "Started"
                     mock_log.output = None
@@ -116,11 +126,11 @@ class TestSchedulerTask:
             mock_session_local.return_value = db_session
             
             # Mock execute_area to raise an error
-            with patch("app.integrations.simple_plugins.scheduler.execute_area") as mock_execute:
+            with patch("app.services.step_executor.execute_area_async") as mock_execute:
                 mock_execute.side_effect = Exception("Test error")
                 
                 # Mock create_execution_log
-                with patch("app.integrations.simple_plugins.scheduler.create_execution_log") as mock_create_log:
+                with patch("app.services.execution_pool.create_execution_log") as mock_create_log:
                     mock_log = Mock()
                     mock_log.status = "Started"
                     mock_log.output = None
@@ -176,7 +186,7 @@ class TestSchedulerTask:
             mock_session_local.return_value = db_session
             
             # Mock create_execution_log to raise an error
-            with patch("app.integrations.simple_plugins.scheduler.create_execution_log") as mock_create_log:
+            with patch("app.services.execution_pool.create_execution_log") as mock_create_log:
                 mock_create_log.side_effect = Exception("Log creation error")
                 
                 # Run scheduler task for a short time
@@ -250,7 +260,7 @@ class TestSchedulerTask:
             mock_session_local.return_value = db_session
             
             # Mock execute_area to return success
-            with patch("app.integrations.simple_plugins.scheduler.execute_area") as mock_execute:
+            with patch("app.services.step_executor.execute_area_async") as mock_execute:
                 mock_execute.return_value = {
                     "status": "success",
                     "steps_executed": 1,
@@ -258,7 +268,7 @@ class TestSchedulerTask:
                 }
                 
                 # Mock create_execution_log
-                with patch("app.integrations.simple_plugins.scheduler.create_execution_log") as mock_create_log:
+                with patch("app.services.execution_pool.create_execution_log") as mock_create_log:
                     mock_log = Mock()
                     mock_log.status = "Started"
                     mock_log.output = None
@@ -0,0 +1,83 @@
+"""Tests for the persistent seen trigger events store."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.seen_event import SeenEvent
+from app.services.seen_events import SeenEventStore, delete_seen_events
+
+
+def _seen_at(db_session: Session, event_id: str) -> datetime:
+    seen_at = db_session.execute(
+        select(SeenEvent.seen_at).where(SeenEvent.event_id == event_id)
+    ).scalar_one()
+    return seen_at.replace(tzinfo=timezone.utc) if seen_at.tzinfo is None else seen_at
+
+
+def test_unseen_returns_ids_not_added(db_session: Session) -> None:
+    store = SeenEventStore("gmail")
+    store.add(db_session, "area-1", ["m1", "m2"])
+
+    assert store.unseen(db_session, "area-1", ["m1", "m2", "m3"]) == {"m3"}
+    assert store.unseen(db_session, "area-2", ["m1"]) == {"m1"}
+    assert SeenEventStore("outlook").unseen(db_session, "area-1", ["m1"]) == {"m1"}
+
+
+def test_adding_twice_keeps_one_row(db_session: Session) -> None:
+    store = SeenEventStore("gmail")
+    store.add(db_session, "area-1", ["m1"])
+    store.add(db_session, "area-1", ["m1"])
+
+    assert len(db_session.execute(select(SeenEvent)).scalars().all()) == 1
+
+
+def test_priming_is_persisted(db_session: Session) -> None:
+    SeenEventStore("gmail").prime(db_session, "area-1", ["m1"])
+
+    restarted = SeenEventStore("gmail")
+    assert restarted.is_primed(db_session, "area-1")
+    assert not restarted.is_primed(db_session, "area-2")
+    assert restarted.unseen(db_session, "area-1", ["m1", "m2"]) == {"m2"}
+
+
+def test_front_cache_is_bounded(db_session: Session) -> None:
+    store = SeenEventStore("gmail", cache_size=2)
+    store.add(db_session, "area-1", ["m1", "m2", "m3"])
+
+    assert len(store._cache) == 2
+    assert store.unseen(db_session, "area-1", ["m1", "m2", "m3"]) == set()
+
+
+def test_observed_ids_are_touched_and_survive_prune(db_session: Session) -> None:
+    store = SeenEventStore("google_calendar", ttl_seconds=3600)
+    store.add(db_session, "area-1", ["old", "gone"])
+    two_hours_ago = datetime.now(timezone.utc) - timedelta(hours=2)
+    for row in db_session.execute(select(SeenEvent)).scalars():
+        row.seen_at = two_hours_ago
+    db_session.commit()
+    store.clear()
+
+    # "old" is still returned by the provider, "gone" is not
+    assert store.unseen(db_session, "area-1", ["old"]) == set()
+    assert _seen_at(db_session, "old") > two_hours_ago
+
+    assert store.prune(db_session) == 1
+    assert store.unseen(db_session, "area-1", ["old", "gone"]) == {"gone"}
+
+
+def test_forget_and_delete_seen_events(db_session: Session) -> None:
+    store = SeenEventStore("github")
+    store.prime(db_session, "area-1", ["e1"])
+    store.add(db_session, "area-2", ["e1"])
+
+    store.forget(db_session, "area-1")
+    assert not store.is_primed(db_session, "area-1")
+
+    delete_seen_events(db_session, "area-2")
+    db_session.commit()
+    store.clear()
+    assert store.unseen(db_session, "area-2", ["e1"]) == {"e1"}
@@ -143,6 +143,97 @@ class TestPluginsRegistry:
         assert "Area triggered at 2025-09-29T12:00:00Z" in area_run_logs[0].message
 
 
+class TestHandlerRegistration:
+    """Test declarative handler registration and lazy plugin loading."""
+
+    def test_default_specs_match_handler_signatures(self, caplog):
+        """Declared call metadata of every built-in handler matches its signature."""
+        import logging
+
+        from app.integrations.simple_plugins.registry import DEFAULT_HANDLER_SPECS, HandlerMetadata
+
+        caplog.set_level(logging.WARNING, logger="area")
+        registry = PluginsRegistry()
+
+        for spec in DEFAULT_HANDLER_SPECS:
+            metadata = registry.get_handler_metadata(spec.service, spec.action)
+            assert metadata is not None, spec.target
+            inspected = HandlerMetadata.inspect(metadata.handler)
+            assert (inspected.is_async, inspected.needs_db) == (spec.is_async, spec.needs_db), spec.target
+
+        assert not [r for r in caplog.records if "does not match" in r.message]
+
+    def test_plugin_module_loads_on_first_dispatch(self):
+        """A plugin module is imported once, on the first dispatch to one of its actions."""
+        import importlib
+        from unittest.mock import patch
+
+        from app.integrations.simple_plugins.registry import HandlerSpec
+
+        target = "app.integrations.simple_plugins.weather_plugin"
+        registry = PluginsRegistry(
+            specs=[
+                HandlerSpec("weather", "get_current_weather", f"{target}:get_current_weather_handler"),
+                HandlerSpec("weather", "get_forecast", f"{target}:get_forecast_handler"),
+            ]
+        )
+
+        with patch(
+            "app.integrations.simple_plugins.registry.importlib.import_module",
+            wraps=importlib.import_module,
+        ) as import_module:
+            assert registry.has_reaction_handler("weather", "get_forecast")
+            assert not registry.has_reaction_handler("weather", "unknown")
+            import_module.assert_not_called()
+
+            current = registry.get_reaction_handler("weather", "get_current_weather")
+            forecast = registry.get_reaction_handler("weather", "get_forecast")
+
+        import_module.assert_called_once_with(target)
+        assert current.__name__ == "get_current_weather_handler"
+        assert forecast.__name__ == "get_forecast_handler"
+
+    def test_failed_plugin_module_is_not_retried(self):
+        """Handlers of a plugin that fails to import are reported missing."""
+        import importlib
+        from unittest.mock import patch
+
+        from app.integrations.simple_plugins.registry import HandlerSpec
+
+        registry = PluginsRegistry(
+            specs=[HandlerSpec("broken", "run", "app.integrations.simple_plugins.missing_plugin:run")]
+        )
+
+        with patch(
+            "app.integrations.simple_plugins.registry.importlib.import_module",
+            wraps=importlib.import_module,
+        ) as import_module:
+            assert registry.get_reaction_handler("broken", "run") is None
+            assert registry.get_reaction_handler("broken", "run") is None
+
+        assert import_module.call_count == 1
+        assert registry.has_reaction_handler("broken", "run")
+
+    def test_call_metadata(self):
+        """Registered handlers reuse their metadata, swapped-in handlers are inspected."""
+        registry = PluginsRegistry(specs=())
+
+        async def handler(area, params, event, db=None):
+            pass
+
+        registry.register_handler("test", "run", handler, timeout_seconds=3)
+        metadata = registry.call_metadata("test", "run", handler)
+        assert metadata is registry.get_handler_metadata("test", "run")
+        assert (metadata.is_async, metadata.needs_db) == (True, True)
+        assert metadata.timeout_seconds == 3
+
+        def other(area, params, event):
+            pass
+
+        metadata = registry.call_metadata("test", "run", other)
+        assert metadata.handler is other
+        assert (metadata.is_async, metadata.needs_db, metadata.timeout_seconds) == (False, False, None)
+
 class TestSchedulerLogic:
     """Test scheduler due logic."""
 
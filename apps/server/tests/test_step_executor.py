@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
 import uuid
+from unittest.mock import patch
 
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, object_session, sessionmaker
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.models.area import Area
@@ -497,3 +501,247 @@ class TestExecuteAreaHelper:
         assert result["status"] == "success"
         assert result["steps_executed"] >= 1
         assert "execution_log" in result
+
+
+class TestStepExecutorPlans:
+    """Tests for execution through compiled plans."""
+
+    def test_diamond_branch_join_runs_once(self, db_session: Session):
+        """A step reached from two branches executes only once per run."""
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Diamond Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="debug",
+            reaction_action="log",
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+
+        join = AreaStep(area_id=area.id, step_type="action", order=3, service="debug", action="log",
+                        config={"message": "join"})
+        left = AreaStep(area_id=area.id, step_type="action", order=1, service="debug", action="log",
+                        config={"message": "left"})
+        right = AreaStep(area_id=area.id, step_type="action", order=2, service="debug", action="log",
+                         config={"message": "right"})
+        trigger = AreaStep(area_id=area.id, step_type="trigger", order=0, service="time",
+                           action="every_interval", config={})
+        db_session.add_all([join, left, right, trigger])
+        db_session.flush()
+        trigger.config = {"targets": [str(left.id), str(right.id)]}
+        left.config = {"message": "left", "targets": [str(join.id)]}
+        right.config = {"message": "right", "targets": [str(join.id)]}
+        db_session.commit()
+        db_session.refresh(area)
+
+        first = execute_area(db_session, area, {"tick": True})
+        second = execute_area(db_session, area, {"tick": True})
+
+        expected = [str(trigger.id), str(left.id), str(join.id), str(right.id)]
+        assert [log["step_id"] for log in first["execution_log"]] == expected
+        assert [log["step_id"] for log in second["execution_log"]] == expected
+
+    @staticmethod
+    def _fan_out_area(db_session: Session, branches: int) -> tuple[Area, list[AreaStep]]:
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Fan-out Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="debug",
+            reaction_action="log",
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+
+        trigger = AreaStep(area_id=area.id, step_type="trigger", order=0, service="time",
+                           action="every_interval", config={})
+        actions = [
+            AreaStep(area_id=area.id, step_type="action", order=index + 1, service="debug", action="log",
+                     config={"message": f"branch {index}"})
+            for index in range(branches)
+        ]
+        db_session.add_all([trigger, *actions])
+        db_session.flush()
+        trigger.config = {"targets": [str(action.id) for action in actions]}
+        db_session.commit()
+        db_session.refresh(area)
+        return area, [trigger, *actions]
+
+    def test_independent_branches_run_concurrently(self, db_session: Session):
+        """Fan-out branches overlap and their logs are merged in target order."""
+        area, steps = self._fan_out_area(db_session, branches=3)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def handler(area, params, event):
+            # Every branch must be running at once to get past the barrier
+            barrier.wait()
+            event[params["message"]] = threading.get_ident()
+
+        factory = sessionmaker(bind=db_session.get_bind(), autoflush=False, future=True)
+        with patch("app.db.session.SessionLocal", factory), patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=handler,
+        ):
+            trigger_data = {"tick": True}
+            result = execute_area(db_session, area, trigger_data)
+
+        assert result["status"] == "success"
+        assert [log["step_id"] for log in result["execution_log"]] == [str(step.id) for step in steps]
+        # Writes of every branch are merged back into the trigger data
+        assert len({trigger_data[f"branch {index}"] for index in range(3)}) == 3
+
+    def test_concurrent_branches_load_the_area_in_their_own_session(self, db_session: Session):
+        """Branches never touch the area and steps attached to the parent session."""
+        area, steps = self._fan_out_area(db_session, branches=3)
+        sessions = []
+
+        def handler(area, params, event):
+            sessions.append(object_session(area))
+            assert all(object_session(step) is sessions[-1] for step in area.steps)
+
+        factory = sessionmaker(bind=db_session.get_bind(), autoflush=False, future=True)
+        with patch("app.db.session.SessionLocal", factory), patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=handler,
+        ):
+            result = execute_area(db_session, area, {"tick": True})
+
+        assert result["status"] == "success"
+        assert len(sessions) == 3
+        assert sessions.count(db_session) == 1
+        assert len({id(session) for session in sessions}) == 3
+
+    def test_branches_run_inline_without_concurrency(self, db_session: Session, monkeypatch):
+        """With a concurrency of one, branches run one after another in order."""
+        monkeypatch.setattr("app.core.config.settings.execution_branch_concurrency", 1)
+        area, steps = self._fan_out_area(db_session, branches=2)
+        running = []
+        peak = []
+
+        def handler(area, params, event):
+            running.append(params["message"])
+            peak.append(len(running))
+            time.sleep(0.01)
+            running.remove(params["message"])
+
+        with patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=handler,
+        ):
+            result = execute_area(db_session, area, {"tick": True})
+
+        assert result["status"] == "success"
+        assert [log["step_id"] for log in result["execution_log"]] == [str(step.id) for step in steps]
+        assert max(peak) == 1
+
+
+class TestAsyncExecution:
+    """Tests for the native async execution path."""
+
+    @pytest.mark.asyncio
+    async def test_async_handler_is_awaited_on_running_loop(self, db_session: Session):
+        """Coroutine handlers run on the caller's loop, sync ones on the shared pool."""
+        from app.services.step_executor import execute_area_async
+
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Async Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="debug",
+            reaction_action="log",
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+        loop = asyncio.get_running_loop()
+        calls = {}
+
+        async def async_handler(area, params, event, db=None):
+            calls["loop"] = asyncio.get_running_loop()
+            calls["db"] = db
+
+        def sync_handler(area, params, event):
+            calls["thread"] = threading.current_thread().name
+
+        with patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=async_handler,
+        ):
+            result = await execute_area_async(db_session, area, {"tick": True})
+
+        assert result["status"] == "success"
+        assert calls["loop"] is loop
+        assert calls["db"] is db_session
+
+        with patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=sync_handler,
+        ):
+            result = await execute_area_async(db_session, area, {"tick": True})
+
+        assert result["status"] == "success"
+        assert calls["thread"].startswith("area-blocking")
+
+    def test_sync_wrapper_runs_async_handlers(self, db_session: Session):
+        """execute_area still runs coroutine handlers for synchronous callers."""
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Wrapper Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="debug",
+            reaction_action="log",
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+
+        async def async_handler(area, params, event):
+            await asyncio.sleep(0)
+            event["handled"] = True
+
+        trigger_data = {"tick": True}
+        with patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=async_handler,
+        ):
+            result = execute_area(db_session, area, trigger_data)
+
+        assert result["status"] == "success"
+        assert trigger_data["handled"] is True
+
+    @pytest.mark.asyncio
+    async def test_handler_timeout_fails_the_step(self, db_session: Session):
+        """A handler outliving its registered timeout fails the execution."""
+        from app.integrations.simple_plugins.registry import PluginsRegistry
+
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Timeout Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="debug",
+            reaction_action="log",
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+
+        async def slow_handler(area, params, event):
+            await asyncio.sleep(5)
+
+        executor = StepExecutor(db_session, area)
+        executor.registry = PluginsRegistry(specs=())
+        executor.registry.register_handler("debug", "log", slow_handler, timeout_seconds=0.05)
+
+        started = time.monotonic()
+        result = await executor.execute_async({"tick": True})
+
+        assert time.monotonic() - started < 2
+        assert result["status"] == "failed"
+        assert "timed out after 0.05 seconds" in result["execution_log"][0]["error"]
@@ -0,0 +1,47 @@
+"""Tests for the sync cursor repository helpers."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.sync_cursors import delete_sync_cursor, get_sync_cursor, set_sync_cursor
+
+
+@pytest.fixture
+def connection(db_session: Session) -> ServiceConnection:
+    user = User(email="cursor@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(
+        user_id=user.id,
+        service_name="gmail",
+        encrypted_access_token="token",
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection
+
+
+def test_set_sync_cursor_creates_then_moves_cursor(db_session: Session, connection: ServiceConnection) -> None:
+    created = set_sync_cursor(db_session, connection.id, "gmail:history", "100")
+    moved = set_sync_cursor(db_session, str(connection.id), "gmail:history", "200")
+
+    assert moved.id == created.id
+    assert get_sync_cursor(db_session, connection.id, "gmail:history").value == "200"
+
+
+def test_sync_cursors_are_keyed_per_connection_and_key(db_session: Session, connection: ServiceConnection) -> None:
+    set_sync_cursor(db_session, connection.id, "gmail:history", "100")
+
+    assert get_sync_cursor(db_session, connection.id, "outlook:delta") is None
+
+
+def test_delete_sync_cursor(db_session: Session, connection: ServiceConnection) -> None:
+    set_sync_cursor(db_session, connection.id, "gmail:history", "100")
+
+    assert delete_sync_cursor(db_session, connection.id, "gmail:history") is True
+    assert get_sync_cursor(db_session, connection.id, "gmail:history") is None
+    assert delete_sync_cursor(db_session, connection.id, "gmail:history") is False
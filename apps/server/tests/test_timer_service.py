@@ -0,0 +1,336 @@
+"""Tests for durable delay steps and the workflow timer service."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.area import Area
+from app.models.area_step import AreaStep
+from app.models.execution_log import ExecutionLog
+from app.models.workflow_timer import WorkflowTimer
+from app.services.execution_pool import ExecutionJob, run_execution_job, stop_execution_pool
+from app.services.step_executor import StepExecutor, resume_area_async
+from app.services.timer_service import WorkflowTimerService
+from app.services.workflow_timers import (
+    claim_due_timers,
+    create_workflow_timer,
+    next_timer_due_at,
+)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _stop_execution_pool():
+    yield
+    stop_execution_pool()
+    await asyncio.sleep(0)
+
+
+def _delayed_area(db_session: Session, delay: AreaStep | None = None) -> tuple[Area, list[AreaStep]]:
+    """Create trigger -> delay -> debug.log."""
+    area = Area(
+        user_id=uuid.uuid4(),
+        name="Delayed Area",
+        trigger_service="time",
+        trigger_action="every_interval",
+        reaction_service="debug",
+        reaction_action="log",
+        enabled=True,
+    )
+    db_session.add(area)
+    db_session.flush()
+
+    trigger = AreaStep(area_id=area.id, step_type="trigger", order=0, service="time", action="every_interval")
+    delay = delay or AreaStep(step_type="delay", config={"duration": 2, "unit": "days"})
+    delay.area_id = area.id
+    delay.order = 1
+    action = AreaStep(
+        area_id=area.id,
+        step_type="action",
+        order=2,
+        service="debug",
+        action="log",
+        config={"message": "After the delay"},
+    )
+    db_session.add_all([trigger, delay, action])
+    db_session.flush()
+
+    trigger.config = {"targets": [str(delay.id)]}
+    delay.config = {**delay.config, "targets": [str(action.id)]}
+    db_session.commit()
+    db_session.refresh(area)
+    return area, [trigger, delay, action]
+
+
+class TestDelaySteps:
+    """Test pausing and resuming runs on delay steps."""
+
+    def test_delay_step_persists_the_run(self, db_session: Session):
+        area, (trigger, delay, action) = _delayed_area(db_session)
+
+        before = datetime.now(timezone.utc)
+        result = StepExecutor(db_session, area).execute({"now": "2025-11-05T09:00:00Z", "tick": True})
+
+        assert result["status"] == "success"
+        assert [log["step_id"] for log in result["execution_log"]] == [str(trigger.id), str(delay.id)]
+
+        timer = db_session.query(WorkflowTimer).one()
+        assert result["execution_log"][1]["timer_id"] == str(timer.id)
+        assert timer.area_id == area.id
+        assert timer.delay_step_id == str(delay.id)
+        assert timer.next_step_ids == [str(action.id)]
+        assert timer.executed_step_ids == [str(trigger.id), str(delay.id)]
+        assert timer.trigger_data == {"now": "2025-11-05T09:00:00Z", "tick": True}
+        due_at = timer.due_at.replace(tzinfo=timezone.utc)
+        assert before + timedelta(days=2) <= due_at <= datetime.now(timezone.utc) + timedelta(days=2)
+
+    def test_delay_action_step_is_durable_too(self, db_session: Session):
+        delay = AreaStep(step_type="action", service="delay", action="wait", config={"duration": 5})
+        area, _ = _delayed_area(db_session, delay)
+
+        with patch("app.integrations.simple_plugins.delay_plugin.asyncio.sleep") as mock_sleep:
+            result = StepExecutor(db_session, area).execute({"tick": True})
+
+        assert result["status"] == "success"
+        mock_sleep.assert_not_called()
+        assert db_session.query(WorkflowTimer).count() == 1
+
+    def test_delay_without_following_step_creates_no_timer(self, db_session: Session):
+        area, (_, delay, _) = _delayed_area(db_session)
+        delay.config = {"duration": 1}
+        db_session.commit()
+
+        result = StepExecutor(db_session, area).execute({"tick": True})
+
+        assert result["status"] == "success"
+        assert db_session.query(WorkflowTimer).count() == 0
+
+    def test_delay_reaction_of_area_without_steps_does_not_sleep(self, db_session: Session):
+        area = Area(
+            user_id=uuid.uuid4(),
+            name="Delay Reaction Area",
+            trigger_service="time",
+            trigger_action="every_interval",
+            reaction_service="delay",
+            reaction_action="wait",
+            reaction_params={"duration": 2, "unit": "days"},
+            enabled=True,
+        )
+        db_session.add(area)
+        db_session.commit()
+
+        with patch("app.integrations.simple_plugins.delay_plugin.asyncio.sleep") as mock_sleep:
+            result = StepExecutor(db_session, area).execute({"tick": True})
+
+        assert result["status"] == "success"
+        assert result["execution_log"][0]["output"] == "Delay step has no following step"
+        mock_sleep.assert_not_called()
+        assert db_session.query(WorkflowTimer).count() == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_runs_the_following_steps(self, db_session: Session):
+        area, (trigger, delay, action) = _delayed_area(db_session)
+        timer = create_workflow_timer(
+            db_session,
+            area.id,
+            str(delay.id),
+            [str(action.id)],
+            {"trigger.now": "earlier"},
+            {"now": "earlier"},
+            [str(trigger.id), str(delay.id)],
+            datetime.now(timezone.utc),
+        )
+        seen = {}
+
+        def handler(area, params, event):
+            seen["params"] = params
+            seen["event"] = dict(event)
+
+        with patch(
+            "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+            return_value=handler,
+        ):
+            result = await resume_area_async(db_session, area, timer)
+
+        assert result["status"] == "success"
+        assert [log["step_id"] for log in result["execution_log"]] == [str(action.id)]
+        assert seen["event"] == {"now": "earlier"}
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_deleted_and_executed_steps(self, db_session: Session):
+        area, (trigger, delay, action) = _delayed_area(db_session)
+        timer = create_workflow_timer(
+            db_session,
+            area.id,
+            str(delay.id),
+            [str(uuid.uuid4()), str(trigger.id)],
+            {},
+            {},
+            [str(trigger.id), str(delay.id)],
+            datetime.now(timezone.utc),
+        )
+
+        result = await resume_area_async(db_session, area, timer)
+
+        assert result["status"] == "success"
+        assert result["steps_executed"] == 0
+
+
+class TestTimerRepository:
+    """Test claiming due timers."""
+
+    def _timer(self, db_session: Session, due_at: datetime) -> WorkflowTimer:
+        return create_workflow_timer(
+            db_session, uuid.uuid4(), "step", ["next"], {}, {}, [], due_at
+        )
+
+    def test_claims_due_timers_once_per_lease(self, db_session: Session):
+        now = datetime.now(timezone.utc)
+        due = self._timer(db_session, now - timedelta(seconds=1))
+        self._timer(db_session, now + timedelta(hours=1))
+
+        assert [timer.id for timer in claim_due_timers(db_session, now, 10, 60)] == [due.id]
+        assert claim_due_timers(db_session, now, 10, 60) == []
+
+        later = now + timedelta(seconds=61)
+        reclaimed = claim_due_timers(db_session, later, 10, 60)
+        assert [timer.id for timer in reclaimed] == [due.id]
+        assert reclaimed[0].attempts == 2
+
+    def test_next_due_ignores_claimed_timers(self, db_session: Session):
+        now = datetime.now(timezone.utc)
+        assert next_timer_due_at(db_session, now) is None
+
+        self._timer(db_session, now - timedelta(seconds=1))
+        upcoming = now + timedelta(minutes=5)
+        self._timer(db_session, upcoming)
+        claim_due_timers(db_session, now, 10, 60)
+
+        due_at = next_timer_due_at(db_session, now)
+        assert due_at.replace(tzinfo=timezone.utc) == upcoming
+
+
+class TestWorkflowTimerService:
+    """Test resuming due timers through the execution pool."""
+
+    @pytest.mark.asyncio
+    async def test_due_timers_are_enqueued(self, db_session: Session):
+        now = datetime.now(timezone.utc)
+        area_id = uuid.uuid4()
+        due = create_workflow_timer(db_session, area_id, "delay", ["next"], {}, {}, [], now)
+        create_workflow_timer(db_session, area_id, "delay", ["next"], {}, {}, [], now + timedelta(days=1))
+        jobs = []
+
+        async def submit(job):
+            jobs.append(job)
+
+        service = WorkflowTimerService(batch_size=1)
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.timer_service.submit_execution_job", side_effect=submit):
+            assert await service.run_once(now) == 1
+
+        assert [job.timer_id for job in jobs] == [str(due.id)]
+        assert jobs[0].area_id == str(area_id)
+        assert jobs[0].source == "Delay"
+
+    @pytest.mark.asyncio
+    async def test_timers_past_max_attempts_are_dropped(self, db_session: Session):
+        now = datetime.now(timezone.utc)
+        timer = create_workflow_timer(db_session, uuid.uuid4(), "delay", ["next"], {}, {}, [], now)
+        timer.attempts = 3
+        db_session.commit()
+
+        service = WorkflowTimerService(max_attempts=3)
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.timer_service.submit_execution_job") as mock_submit:
+            assert await service.run_once(now) == 0
+
+        mock_submit.assert_not_called()
+        assert db_session.query(WorkflowTimer).count() == 0
+
+    def test_resume_job_runs_the_continuation_and_deletes_the_timer(self, db_session: Session):
+        area, (trigger, delay, action) = _delayed_area(db_session)
+        timer = create_workflow_timer(
+            db_session,
+            area.id,
+            str(delay.id),
+            [str(action.id)],
+            {},
+            {"tick": True},
+            [str(trigger.id), str(delay.id)],
+            datetime.now(timezone.utc),
+        )
+        area_id, action_id = area.id, str(action.id)
+        job = ExecutionJob(area_id=str(area_id), trigger_data={}, source="Delay", timer_id=str(timer.id))
+
+        with patch("app.db.session.SessionLocal", return_value=db_session):
+            run_execution_job(job)
+
+        log = db_session.query(ExecutionLog).filter(ExecutionLog.area_id == area_id).one()
+        assert log.status == "Success"
+        assert log.output == "Delay trigger executed: 1 step(s)"
+        assert log.step_details["execution_log"][0]["step_id"] == action_id
+        assert db_session.query(WorkflowTimer).count() == 0
+
+    def test_timer_claimed_again_while_running_resumes_once(self, db_session: Session):
+        area, (trigger, delay, action) = _delayed_area(db_session)
+        area_id = area.id
+        now = datetime.now(timezone.utc)
+        create_workflow_timer(
+            db_session,
+            area_id,
+            str(delay.id),
+            [str(action.id)],
+            {},
+            {},
+            [str(trigger.id), str(delay.id)],
+            now,
+        )
+        service = WorkflowTimerService(lease_seconds=60)
+        # The lease expires while the first job is still queued, so the timer is claimed twice
+        first = service._claim(db_session, now)
+        second = service._claim(db_session, now + timedelta(seconds=61))
+        assert [job.timer_id for job in first] == [job.timer_id for job in second]
+
+        factory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+        calls = []
+
+        def handler(area, params, event):
+            calls.append(area.id)
+            if len(calls) == 1:
+                # The second job starts while the first one is still running
+                run_execution_job(second[0])
+
+        with patch("app.db.session.SessionLocal", side_effect=lambda **kwargs: factory(**kwargs)), \
+             patch(
+                 "app.integrations.simple_plugins.registry.PluginsRegistry.get_reaction_handler",
+                 return_value=handler,
+             ):
+            run_execution_job(first[0])
+            run_execution_job(second[0])
+
+        assert calls == [area_id]
+        logs = db_session.query(ExecutionLog).filter(ExecutionLog.area_id == area_id).all()
+        assert [log.status for log in logs] == ["Success"]
+        assert db_session.query(WorkflowTimer).count() == 0
+
+    def test_resume_job_of_disabled_area_drops_the_timer(self, db_session: Session):
+        area, (_, delay, action) = _delayed_area(db_session)
+        area.enabled = False
+        db_session.commit()
+        timer = create_workflow_timer(
+            db_session, area.id, str(delay.id), [str(action.id)], {}, {}, [], datetime.now(timezone.utc)
+        )
+
+        with patch("app.db.session.SessionLocal", return_value=db_session), \
+             patch("app.services.step_executor.resume_area_async") as mock_resume:
+            run_execution_job(ExecutionJob(area_id=str(area.id), trigger_data={}, timer_id=str(timer.id)))
+
+        mock_resume.assert_not_called()
+        assert db_session.query(WorkflowTimer).count() == 0
@@ -0,0 +1,135 @@
+"""Tests for the background token refresher."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.encryption import decrypt_token, encrypt_token
+from app.integrations.oauth.base import OAuth2TokenSet
+from app.integrations.oauth.exceptions import OAuth2RefreshError
+from app.models.service_connection import ServiceConnection
+from app.models.user import User
+from app.services.token_refresher import TokenRefresher
+
+
+@pytest.fixture()
+def session_local(db_session):
+    factory = sessionmaker(bind=db_session.get_bind(), autoflush=False, future=True)
+    with patch("app.db.session.SessionLocal", factory), patch(
+        "app.integrations.oauth.factory.OAuth2ProviderFactory.get_supported_providers",
+        return_value=["gmail", "outlook"],
+    ):
+        yield factory
+
+
+def _create_connection(db_session, service_name, expires_in, refresh_token="refresh", email=None):
+    user = User(email=email or f"{uuid.uuid4().hex}@example.com", hashed_password="test", is_confirmed=True)
+    db_session.add(user)
+    db_session.commit()
+    connection = ServiceConnection(
+        user_id=user.id,
+        service_name=service_name,
+        encrypted_access_token=encrypt_token("access"),
+        encrypted_refresh_token=encrypt_token(refresh_token) if refresh_token else None,
+        expires_at=None if expires_in is None else datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection
+
+
+def test_refresh_lead_is_stable_and_inside_window():
+    refresher = TokenRefresher(interval_seconds=60, window_seconds=1200)
+    earliest = settings.credential_refresh_margin_seconds + 60
+    leads = [refresher.refresh_lead(uuid.uuid4()) for _ in range(50)]
+
+    assert all(earliest <= lead <= 1200 for lead in leads)
+    assert len(set(leads)) > 1
+    connection_id = uuid.uuid4()
+    assert refresher.refresh_lead(connection_id) == refresher.refresh_lead(connection_id)
+
+
+def test_due_connections_selects_refreshable_expiring_tokens(db_session, session_local):
+    due = _create_connection(db_session, "gmail", expires_in=60)
+    _create_connection(db_session, "outlook", expires_in=7200)
+    _create_connection(db_session, "outlook", expires_in=60, refresh_token=None)
+    _create_connection(db_session, "github", expires_in=60)
+    _create_connection(db_session, "gmail", expires_in=None)
+
+    connections = TokenRefresher(interval_seconds=60, window_seconds=1200).due_connections(db_session)
+
+    assert [connection.id for connection in connections] == [due.id]
+
+
+def test_due_connections_waits_for_refresh_point(db_session, session_local):
+    connection = _create_connection(db_session, "gmail", expires_in=900)
+    refresher = TokenRefresher(interval_seconds=60, window_seconds=1200)
+    lead = refresher.refresh_lead(connection.id)
+    expires_at = connection.expires_at.replace(tzinfo=timezone.utc)
+
+    assert refresher.due_connections(db_session, now=expires_at - timedelta(seconds=lead + 1)) == []
+    assert refresher.due_connections(db_session, now=expires_at - timedelta(seconds=lead - 1)) == [connection]
+
+
+def test_run_once_refreshes_and_persists_tokens(db_session, session_local):
+    connection = _create_connection(db_session, "outlook", expires_in=60)
+    token_set = OAuth2TokenSet(access_token="new-access", refresh_token=None, expires_in=3600)
+
+    with patch(
+        "app.services.credential_manager.refresh_with_provider", return_value=token_set
+    ) as mock_refresh:
+        refreshed = asyncio.run(TokenRefresher(batch_size=1).run_once())
+
+    assert refreshed == 1
+    mock_refresh.assert_called_once()
+    db_session.refresh(connection)
+    assert decrypt_token(connection.encrypted_access_token) == "new-access"
+    assert decrypt_token(connection.encrypted_refresh_token) == "refresh"
+
+
+def test_run_once_isolates_failures(db_session, session_local):
+    _create_connection(db_session, "outlook", expires_in=30)
+    healthy = _create_connection(db_session, "gmail", expires_in=60)
+
+    def refresh(credentials):
+        if credentials.service_name == "outlook":
+            raise OAuth2RefreshError("revoked")
+        return OAuth2TokenSet(access_token="new-access", expires_in=3600)
+
+    with patch("app.services.credential_manager.refresh_with_provider", side_effect=refresh):
+        refreshed = asyncio.run(TokenRefresher(batch_size=1).run_once())
+
+    assert refreshed == 1
+    db_session.refresh(healthy)
+    assert decrypt_token(healthy.encrypted_access_token) == "new-access"
+
+
+def test_run_once_rate_limits_batches(db_session, session_local):
+    for _ in range(5):
+        _create_connection(db_session, "gmail", expires_in=60)
+    refresher = TokenRefresher(batch_size=2, batch_interval_seconds=0.5, jitter_ratio=0)
+    batches = []
+
+    def refresh_connection(connection_id):
+        batches[-1].append(connection_id)
+        return True
+
+    async def fake_sleep(delay):
+        assert delay == 0.5
+        batches.append([])
+
+    batches.append([])
+    with patch.object(refresher, "refresh_connection", side_effect=refresh_connection), patch(
+        "app.services.token_refresher.asyncio.sleep", side_effect=fake_sleep
+    ):
+        refreshed = asyncio.run(refresher.run_once())
+
+    assert refreshed == 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
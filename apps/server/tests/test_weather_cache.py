@@ -0,0 +1,96 @@
+"""Tests for the location-keyed weather cache."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from app.integrations.simple_plugins.weather_cache import WeatherCache, normalize_weather_params
+
+
+def test_city_names_are_normalized():
+    assert normalize_weather_params({"q": " Paris ,  FR"}) == {"units": "metric", "q": "paris,fr"}
+    assert normalize_weather_params({"q": "New  York,US", "units": "Imperial", "cnt": 8}) == {
+        "units": "imperial",
+        "cnt": 8,
+        "q": "new york,us",
+    }
+
+
+def test_coordinates_are_rounded_to_the_grid():
+    params = normalize_weather_params({"lat": 48.8566, "lon": 2.3522}, grid_degrees=0.01)
+
+    assert params == {"units": "metric", "lat": 48.86, "lon": 2.35}
+
+
+def test_lookups_of_the_same_location_share_a_response():
+    cache = WeatherCache(ttl_seconds=60)
+    fetch = Mock(return_value={"main": {"temp": 20}})
+
+    first = cache.get("weather", {"q": "Paris,FR"}, fetch)
+    second = cache.get("weather", {"q": "paris, fr", "units": "metric"}, fetch)
+    cache.get("weather", {"q": "Paris,FR", "units": "imperial"}, fetch)
+    cache.get("forecast", {"q": "Paris,FR"}, fetch)
+
+    assert first is second
+    assert fetch.call_count == 3
+    assert fetch.call_args_list[0].args[0] == {"units": "metric", "q": "paris,fr"}
+
+
+def test_expired_responses_are_fetched_again():
+    cache = WeatherCache(ttl_seconds=0)
+    fetch = Mock(return_value={})
+
+    cache.get("weather", {"q": "Paris"}, fetch)
+    cache.get("weather", {"q": "Paris"}, fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_failures_are_not_cached():
+    cache = WeatherCache(ttl_seconds=60)
+    fetch = Mock(side_effect=[RuntimeError("invalid key"), {"main": {}}])
+
+    with pytest.raises(RuntimeError):
+        cache.get("weather", {"q": "Paris"}, fetch)
+
+    assert cache.get("weather", {"q": "Paris"}, fetch) == {"main": {}}
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = WeatherCache(ttl_seconds=60)
+    release = threading.Event()
+    calls = []
+
+    def fetch(params):
+        calls.append(params)
+        release.wait(5)
+        return {"name": "Paris"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("weather", {"q": "Paris"}, fetch)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"name": "Paris"}] * 5
+
+
+def test_cache_is_bounded():
+    cache = WeatherCache(ttl_seconds=60, max_entries=2)
+    fetch = Mock(return_value={})
+
+    for city in ("Paris", "Berlin", "Rome", "Paris"):
+        cache.get("weather", {"q": city}, fetch)
+
+    assert fetch.call_count == 4
@@ -17,8 +17,18 @@ from app.integrations.simple_plugins.exceptions import (
     WeatherAPIError,
     WeatherConfigError,
 )
-from app.models.service_connection import ServiceConnection
 from app.models.area import Area
+from app.services.credential_manager import ConnectionCredentials
+
+
+def _api_key_credentials(api_key: str) -> ConnectionCredentials:
+    """Cached credentials of a Weather API key connection."""
+    return ConnectionCredentials(
+        connection_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        service_name="weather",
+        access_token=api_key,
+    )
 
 
 class TestWeatherPluginWithUserAPIKey:
@@ -33,27 +43,19 @@ class TestWeatherPluginWithUserAPIKey:
         area.user_id = uuid.uuid4()
         return area
 
-    @pytest.fixture
-    def mock_service_connection(self):
-        """Create a mock service connection."""
-        connection = ServiceConnection()
-        connection.encrypted_access_token = "encrypted_test_key"
-        return connection
-
-    def test_get_weather_api_key_success(self, area, mock_service_connection):
+    def test_get_weather_api_key_success(self, area):
         """Test successful retrieval of API key from service connection."""
         mock_db = MagicMock()
         
-        with patch("app.integrations.simple_plugins.weather_plugin.get_service_connection_by_user_and_service", return_value=mock_service_connection):
-            with patch("app.integrations.simple_plugins.weather_plugin.decrypt_token", return_value="decrypted_api_key"):
-                api_key = _get_weather_api_key(area, mock_db)
-                assert api_key == "decrypted_api_key"
+        with patch("app.integrations.simple_plugins.weather_plugin.credential_manager.get", return_value=_api_key_credentials("decrypted_api_key")):
+            api_key = _get_weather_api_key(area, mock_db)
+            assert api_key == "decrypted_api_key"
 
     def test_get_weather_api_key_no_connection(self, area):
         """Test that missing service connection raises WeatherConfigError."""
         mock_db = MagicMock()
         
-        with patch("app.integrations.simple_plugins.weather_plugin.get_service_connection_by_user_and_service", return_value=None):
+        with patch("app.integrations.simple_plugins.weather_plugin.credential_manager.get", return_value=None):
             with pytest.raises(WeatherConfigError, match="Weather service connection not found"):
                 _get_weather_api_key(area, mock_db)
 
@@ -80,29 +82,26 @@ class TestWeatherPluginWithUserAPIKey:
         }
         
         mock_db = MagicMock()
-        mock_connection = ServiceConnection()
-        mock_connection.encrypted_access_token = "encrypted_test_key"
         
         with patch("app.integrations.simple_plugins.weather_plugin.SessionLocal", return_value=mock_db):
-            with patch("app.integrations.simple_plugins.weather_plugin.get_service_connection_by_user_and_service", return_value=mock_connection):
-                with patch("app.integrations.simple_plugins.weather_plugin.decrypt_token", return_value="test_api_key"):
-                    with patch("httpx.get") as mock_get:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = mock_weather_data
-                        mock_response.raise_for_status.return_value = None
-                        mock_get.return_value = mock_response
+            with patch("app.integrations.simple_plugins.weather_plugin.credential_manager.get", return_value=_api_key_credentials("test_api_key")):
+                with patch("httpx.get") as mock_get:
+                    mock_response = Mock()
+                    mock_response.status_code = 200
+                    mock_response.json.return_value = mock_weather_data
+                    mock_response.raise_for_status.return_value = None
+                    mock_get.return_value = mock_response
                         
-                        get_current_weather_handler(area, params, event)
+                    get_current_weather_handler(area, params, event)
                         
-                        # Verify event populated correctly
-                        assert event["weather.temperature"] == 18.5
-                        assert event["weather.condition"] == "Clouds"
-                        assert event["weather.location"] == "Paris,FR"
-                        assert "weather_data" in event
+                    # Verify event populated correctly
+                    assert event["weather.temperature"] == 18.5
+                    assert event["weather.condition"] == "Clouds"
+                    assert event["weather.location"] == "Paris,FR"
+                    assert "weather_data" in event
                         
-                        # Verify DB session was closed
-                        mock_db.close.assert_called_once()
+                    # Verify DB session was closed
+                    mock_db.close.assert_called_once()
 
     def test_current_weather_handler_no_api_key(self, area):
         """Test current weather fails without API key."""
@@ -112,7 +111,7 @@ class TestWeatherPluginWithUserAPIKey:
         mock_db = MagicMock()
         
         with patch("app.integrations.simple_plugins.weather_plugin.SessionLocal", return_value=mock_db):
-            with patch("app.integrations.simple_plugins.weather_plugin.get_service_connection_by_user_and_service", return_value=None):
+            with patch("app.integrations.simple_plugins.weather_plugin.credential_manager.get", return_value=None):
                 with pytest.raises(WeatherConfigError, match="Weather service connection not found"):
                     get_current_weather_handler(area, params, event)
                 
@@ -139,29 +138,26 @@ class TestWeatherPluginWithUserAPIKey:
         }
         
         mock_db = MagicMock()
-        mock_connection = ServiceConnection()
-        mock_connection.encrypted_access_token = "encrypted_test_key"
         
         with patch("app.integrations.simple_plugins.weather_plugin.SessionLocal", return_value=mock_db):
-            with patch("app.integrations.simple_plugins.weather_plugin.get_service_connection_by_user_and_service", return_value=mock_connection):
-                with patch("app.integrations.simple_plugins.weather_plugin.decrypt_token", return_value="test_api_key"):
-                    with patch("httpx.get") as mock_get:
-                        mock_response = Mock()
-                        mock_response.status_code = 200
-                        mock_response.json.return_value = mock_forecast_data
-                        mock_response.raise_for_status.return_value = None
-                        mock_get.return_value = mock_response
+            with patch("app.integrations.simple_plugins.weather_plugin.credential_manager.get", return_value=_api_key_credentials("test_api_key")):
+                with patch("httpx.get") as mock_get:
+                    mock_response = Mock()
+                    mock_response.status_code = 200
+                    mock_response.json.return_value = mock_forecast_data
+                    mock_response.raise_for_status.return_value = None
+                    mock_get.return_value = mock_response
                         
-                        get_forecast_handler(area, params, event)
+                    get_forecast_handler(area, params, event)
                         
-                        # Verify event populated correctly
-                        assert event["weather.forecast_count"] == 1
-                        assert event["weather.location"] == "Berlin,DE"
-                        assert "weather_data" in event
-                        assert event["weather_data"]["type"] == "forecast"
+                    # Verify event populated correctly
+                    assert event["weather.forecast_count"] == 1
+                    assert event["weather.location"] == "Berlin,DE"
+                    assert "weather_data" in event
+                    assert event["weather_data"]["type"] == "forecast"
                         
-                        # Verify DB session was closed
-                        mock_db.close.assert_called_once()
+                    # Verify DB session was closed
+                    mock_db.close.assert_called_once()
 
     def test_missing_location_raises_error(self, area):
         """Test that missing location raises ValueError."""
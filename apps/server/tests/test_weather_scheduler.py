@@ -16,13 +16,11 @@ from app.integrations.simple_plugins.weather_scheduler import (
     _check_temperature_threshold,
     _check_weather_condition,
     _process_weather_trigger,
-    weather_scheduler_task,
-    start_weather_scheduler,
-    stop_weather_scheduler,
-    is_weather_scheduler_running,
+    WeatherTriggerSource,
     clear_weather_state,
     _last_weather_state,
 )
+from app.services.credential_manager import ConnectionCredentials
 
 
 class TestFetchWeatherData:
@@ -125,51 +123,64 @@ class TestFetchDueWeatherAreas:
 
 
 
-class TestWeatherSchedulerTask:
-    """Tests for weather_scheduler_task function."""
+class TestWeatherTriggerSource:
+    """Tests for WeatherTriggerSource polling."""
+
+    @staticmethod
+    def _area(params):
+        area = Mock()
+        area.id = uuid4()
+        area.user_id = uuid4()
+        area.trigger_action = "temperature_threshold"
+        area.trigger_params = params
+        return area
 
     @pytest.mark.asyncio
-    async def test_scheduler_task_cancellation(self):
-        """Test that scheduler task handles cancellation gracefully."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-            
-            # Make sleep raise CancelledError after first call
-            mock_sleep.side_effect = asyncio.CancelledError()
+    async def test_poll_emits_event_when_condition_met(self):
+        """Test an event carrying the weather data is emitted when the trigger fires."""
+        area = self._area({"location": "Paris", "threshold": 25.0})
+        weather_data = {"main": {"temp": 26.0}}
+
+        with patch("app.integrations.simple_plugins.weather_scheduler._get_weather_api_key", return_value="key"), \
+             patch("app.integrations.simple_plugins.weather_scheduler._fetch_weather_data", return_value=weather_data), \
+             patch(
+                 "app.integrations.simple_plugins.weather_scheduler._check_temperature_threshold",
+                 new_callable=AsyncMock,
+                 return_value=True,
+             ):
+            events = await WeatherTriggerSource().poll(Mock(), [area], datetime.now(timezone.utc))
+
+        assert len(events) == 1
+        assert events[0].area is area
+        assert events[0].payload == weather_data
+        assert events[0].event_id is None
+        clear_weather_state()
+
+    @pytest.mark.asyncio
+    async def test_poll_skips_area_without_api_key(self):
+        """Test areas without an API key are skipped before fetching weather."""
+        area = self._area({"location": "Paris", "threshold": 25.0})
 
-            # Should not raise exception, but exit gracefully
-            await weather_scheduler_task()
+        with patch("app.integrations.simple_plugins.weather_scheduler._get_weather_api_key", return_value=None), \
+             patch("app.integrations.simple_plugins.weather_scheduler._fetch_weather_data") as mock_fetch:
+            events = await WeatherTriggerSource().poll(Mock(), [area], datetime.now(timezone.utc))
 
-            # Verify sleep was called
-            mock_sleep.assert_called()
+        assert events == []
+        mock_fetch.assert_not_called()
+        clear_weather_state()
 
     @pytest.mark.asyncio
-    async def test_scheduler_task_handles_errors(self):
-        """Test that scheduler task handles errors and continues."""
-        with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-            
-            # Setup sleep side effects: first for regular polling, second for error backoff, third to cancel
-            mock_sleep.side_effect = [
-                None,  # First sleep (regular polling interval)
-                None,  # Second sleep (error backoff)
-                asyncio.CancelledError()  # Third sleep stops the loop
-            ]
-            
-            mock_db = Mock()
-            mock_db.__enter__ = Mock(return_value=mock_db)
-            mock_db.__exit__ = Mock(return_value=None)
-            mock_session.return_value = mock_db
-            
-            # Make _fetch_due_weather_areas raise error
-            with patch("app.integrations.simple_plugins.weather_scheduler._fetch_due_weather_areas") as mock_fetch:
-                mock_fetch.side_effect = Exception("Database error")
+    async def test_poll_skips_area_without_location(self):
+        """Test areas without a location or coordinates are skipped."""
+        area = self._area({"threshold": 25.0})
 
-                # Should not raise exception
-                await weather_scheduler_task()
+        with patch("app.integrations.simple_plugins.weather_scheduler._get_weather_api_key", return_value="key"), \
+             patch("app.integrations.simple_plugins.weather_scheduler._fetch_weather_data") as mock_fetch:
+            events = await WeatherTriggerSource().poll(Mock(), [area], datetime.now(timezone.utc))
 
-                # Verify error was handled and backoff was called
-                assert mock_sleep.call_count == 3
+        assert events == []
+        mock_fetch.assert_not_called()
+        clear_weather_state()
 
 
 class TestGetWeatherApiKey:
@@ -179,27 +190,28 @@ class TestGetWeatherApiKey:
         """Test successful API key retrieval."""
         user_id = "test-user-id"
         mock_db = Mock()
-        mock_connection = Mock()
-        mock_connection.encrypted_access_token = b"encrypted_key"
+        credentials = ConnectionCredentials(
+            connection_id=uuid4(),
+            user_id=uuid4(),
+            service_name="weather",
+            access_token="decrypted_api_key",
+        )
 
-        with patch("app.integrations.simple_plugins.weather_scheduler.get_service_connection_by_user_and_service") as mock_get_conn, \
-             patch("app.integrations.simple_plugins.weather_scheduler.decrypt_token") as mock_decrypt:
-            
-            mock_get_conn.return_value = mock_connection
-            mock_decrypt.return_value = "decrypted_api_key"
+        with patch("app.integrations.simple_plugins.weather_scheduler.credential_manager.get") as mock_get_creds:
+            mock_get_creds.return_value = credentials
 
             result = _get_weather_api_key(user_id, mock_db)
 
             assert result == "decrypted_api_key"
-            mock_get_conn.assert_called_once_with(mock_db, user_id, "weather")
+            mock_get_creds.assert_called_once_with(mock_db, user_id, "weather")
 
     def test_get_weather_api_key_no_connection(self):
         """Test API key retrieval when no connection exists."""
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.weather_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.return_value = None
+        with patch("app.integrations.simple_plugins.weather_scheduler.credential_manager.get") as mock_get_creds:
+            mock_get_creds.return_value = None
 
             result = _get_weather_api_key(user_id, mock_db)
 
@@ -210,8 +222,8 @@ class TestGetWeatherApiKey:
         user_id = "test-user-id"
         mock_db = Mock()
 
-        with patch("app.integrations.simple_plugins.weather_scheduler.get_service_connection_by_user_and_service") as mock_get_conn:
-            mock_get_conn.side_effect = Exception("Database error")
+        with patch("app.integrations.simple_plugins.weather_scheduler.credential_manager.get") as mock_get_creds:
+            mock_get_creds.side_effect = Exception("Database error")
 
             result = _get_weather_api_key(user_id, mock_db)
 
@@ -476,7 +488,7 @@ class TestProcessWeatherTrigger:
 
     @pytest.mark.asyncio
     async def test_process_weather_trigger_success(self):
-        """Test processing weather trigger successfully."""
+        """Test processing weather trigger queues an execution job."""
         from uuid import uuid4
 
         mock_db = Mock()
@@ -493,31 +505,25 @@ class TestProcessWeatherTrigger:
 
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.weather_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.weather_scheduler.execute_area") as mock_execute:
-
-            mock_log = Mock()
-            mock_log.status = "Started"
-            mock_create_log.return_value = mock_log
-            
-            mock_execute.return_value = {
-                "status": "success",
-                "steps_executed": 1,
-                "execution_log": []
-            }
-
+        with patch(
+            "app.integrations.simple_plugins.weather_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
             mock_db.merge.return_value = mock_area
 
             await _process_weather_trigger(mock_db, mock_area, weather_data, now)
 
-            mock_create_log.assert_called_once()
-            mock_execute.assert_called_once()
-            assert mock_log.status == "Success"
-            mock_db.commit.assert_called()
+            mock_submit.assert_awaited_once()
+            job = mock_submit.call_args[0][0]
+            assert job.area_id == str(mock_area.id)
+            assert job.source == "Weather"
+            assert job.event["temperature"] == 20.5
+            assert job.event["condition"] == "Clear"
+            assert job.details == {"weather_data": weather_data}
 
     @pytest.mark.asyncio
-    async def test_process_weather_trigger_failure(self):
-        """Test processing weather trigger with failure."""
+    async def test_process_weather_trigger_partial_data(self):
+        """Test processing weather trigger with partial weather data."""
         from uuid import uuid4
 
         mock_db = Mock()
@@ -532,71 +538,22 @@ class TestProcessWeatherTrigger:
 
         now = datetime.now(timezone.utc)
 
-        with patch("app.integrations.simple_plugins.weather_scheduler.create_execution_log") as mock_create_log, \
-             patch("app.integrations.simple_plugins.weather_scheduler.execute_area") as mock_execute:
-
-            mock_log = Mock()
-            mock_log.status = "Started"
-            mock_create_log.return_value = mock_log
-            
-            mock_execute.side_effect = Exception("Execution error")
+        with patch(
+            "app.integrations.simple_plugins.weather_scheduler.submit_execution_job",
+            new_callable=AsyncMock,
+        ) as mock_submit:
             mock_db.merge.return_value = mock_area
 
             await _process_weather_trigger(mock_db, mock_area, weather_data, now)
 
-            assert mock_log.status == "Failed"
-            mock_db.commit.assert_called()
+            job = mock_submit.call_args[0][0]
+            assert job.event["condition"] is None
+            assert job.trigger_data["user_id"] == str(mock_area.user_id)
 
 
 class TestWeatherSchedulerManagement:
     """Tests for weather scheduler management functions."""
 
-    def test_start_weather_scheduler(self):
-        """Test starting weather scheduler."""
-        with patch("app.integrations.simple_plugins.weather_scheduler._weather_scheduler_task", None), \
-             patch("app.integrations.simple_plugins.weather_scheduler.asyncio.get_running_loop") as mock_get_loop:
-            mock_loop = Mock()
-            mock_task = Mock()
-            mock_loop.create_task.return_value = mock_task
-            mock_get_loop.return_value = mock_loop
-
-            start_weather_scheduler()
-
-            mock_loop.create_task.assert_called_once()
-
-    def test_start_weather_scheduler_already_running(self):
-        """Test starting weather scheduler when already running."""
-        with patch("app.integrations.simple_plugins.weather_scheduler._weather_scheduler_task", Mock()):
-            # Should log warning but not crash
-            start_weather_scheduler()
-
-    def test_start_weather_scheduler_no_loop(self):
-        """Test starting weather scheduler with no event loop."""
-        with patch("app.integrations.simple_plugins.weather_scheduler.asyncio.get_running_loop") as mock_get_loop:
-            mock_get_loop.side_effect = RuntimeError("No loop")
-
-            # Should log error but not crash
-            start_weather_scheduler()
-
-    def test_stop_weather_scheduler(self):
-        """Test stopping weather scheduler."""
-        mock_task = Mock()
-        with patch("app.integrations.simple_plugins.weather_scheduler._weather_scheduler_task", mock_task):
-            stop_weather_scheduler()
-            mock_task.cancel.assert_called_once()
-
-    def test_is_weather_scheduler_running_true(self):
-        """Test checking if scheduler is running when it is."""
-        mock_task = Mock()
-        mock_task.done.return_value = False
-        with patch("app.integrations.simple_plugins.weather_scheduler._weather_scheduler_task", mock_task):
-            assert is_weather_scheduler_running() is True
-
-    def test_is_weather_scheduler_running_false(self):
-        """Test checking if scheduler is running when it's not."""
-        with patch("app.integrations.simple_plugins.weather_scheduler._weather_scheduler_task", None):
-            assert is_weather_scheduler_running() is False
-
     def test_clear_weather_state(self):
         """Test clearing weather state."""
         # Add some state
@@ -612,27 +569,25 @@ class TestWeatherSchedulerIntegration:
 
     @pytest.mark.asyncio
     async def test_weather_scheduler_processes_areas(self):
-        """Test weather scheduler processes areas correctly."""
+        """Test the polling engine dispatches weather triggers to the processor."""
         from uuid import uuid4
 
+        from app.integrations.simple_plugins.polling_engine import PollingEngine
+
         with patch("app.db.session.SessionLocal") as mock_session, \
-             patch("asyncio.sleep") as mock_sleep, \
              patch("app.integrations.simple_plugins.weather_scheduler._fetch_due_weather_areas") as mock_fetch_areas, \
              patch("app.integrations.simple_plugins.weather_scheduler._get_weather_api_key") as mock_get_key, \
              patch("app.integrations.simple_plugins.weather_scheduler._fetch_weather_data") as mock_fetch_weather, \
              patch("app.integrations.simple_plugins.weather_scheduler._check_temperature_threshold") as mock_check_temp, \
              patch("app.integrations.simple_plugins.weather_scheduler._process_weather_trigger") as mock_process:
 
-            # Setup mocks
-            mock_sleep.side_effect = [None, asyncio.CancelledError()]
-            
             mock_area = Mock()
             mock_area.id = uuid4()
             mock_area.user_id = uuid4()
             mock_area.name = "Test Weather Area"
             mock_area.trigger_action = "temperature_threshold"
             mock_area.trigger_params = {"location": "Paris", "threshold": 25.0}
-            
+
             mock_fetch_areas.return_value = [mock_area]
             mock_get_key.return_value = "test_api_key"
             mock_fetch_weather.return_value = {"main": {"temp": 26.0}}
@@ -643,11 +598,12 @@ class TestWeatherSchedulerIntegration:
             mock_db.__exit__ = Mock(return_value=None)
             mock_session.return_value = mock_db
 
-            # Run scheduler
-            await weather_scheduler_task()
+            source = WeatherTriggerSource()
+            await PollingEngine([source]).run_source(source)
 
             # Should have processed the trigger
             mock_process.assert_called()
+            clear_weather_state()
 
     def test_fetch_weather_with_lat_lon(self):
         """Test fetching weather data with lat/lon coordinates."""